@@ -0,0 +1,107 @@
+"""Benchmark `aoc_mod.automaton.Automaton` against stepping a set of tuples,
+on Game of Life soups and the 3-D and 4-D "Conway Cubes" of 2020 day 17.
+
+Run with:
+
+    python benchmarks/bench_automaton.py [--size 256] [--generations 100] [--repeat 3]
+
+The 2-D board starts as a random square soup (`--size` cells per side, 1 in 3
+cells alive) that grows and spreads over the unbounded board. The 3-D and 4-D
+boards start from a random 8x8 slice and are stepped 6 times, like the puzzle.
+The set of tuples counts the neighbors of every live cell in a dict, as most
+solutions do. Both backends of `Automaton` are timed: numpy (when installed)
+and bit-parallel Python ints.
+"""
+
+import time
+import random
+import argparse
+from itertools import product
+
+from aoc_mod.automaton import Automaton
+
+
+def step_set(cells: set, dimensions: int, generations: int) -> set:
+    offsets = [
+        offset for offset in product((-1, 0, 1), repeat=dimensions) if any(offset)
+    ]
+    for _ in range(generations):
+        counts = {}
+        for cell in cells:
+            for offset in offsets:
+                neighbor = tuple(c + o for c, o in zip(cell, offset))
+                counts[neighbor] = counts.get(neighbor, 0) + 1
+        cells = {
+            cell
+            for cell, count in counts.items()
+            if count == 3 or (count == 2 and cell in cells)
+        }
+    return cells
+
+
+def step_automaton(cells, dimensions: int, generations: int, use_numpy: bool) -> set:
+    automaton = Automaton(cells, dimensions=dimensions, use_numpy=use_numpy)
+    automaton.step(generations)
+    return set(automaton.cells())
+
+
+def best_time(func, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        import numpy  # noqa: F401
+
+        backends = [("numpy", True), ("ints", False)]
+    except ImportError:
+        backends = [("ints", False)]
+
+    rng = random.Random(2020)
+    soup = {
+        (row, col)
+        for row in range(args.size)
+        for col in range(args.size)
+        if rng.random() < 1 / 3
+    }
+    cubes = {(row, col) for row in range(8) for col in range(8) if rng.random() < 0.5}
+    cases = [
+        (f"2-D {args.size}x{args.size} soup", soup, 2, args.generations),
+        ("3-D cubes", {cell + (0,) for cell in cubes}, 3, 6),
+        ("4-D cubes", {cell + (0, 0) for cell in cubes}, 4, 6),
+    ]
+
+    print(f"best of {args.repeat}")
+    for name, cells, dimensions, generations in cases:
+        set_time, expected = best_time(
+            lambda: step_set(set(cells), dimensions, generations), args.repeat
+        )
+        print(
+            f"{name}, {generations} generations, {len(expected)} live cells at the end"
+        )
+        print(f"  set of tuples     {set_time:8.3f} s")
+        for backend, use_numpy in backends:
+            automaton_time, result = best_time(
+                lambda: step_automaton(cells, dimensions, generations, use_numpy),
+                args.repeat,
+            )
+            assert result == expected, f"{backend} differs from the set of tuples"
+            print(
+                f"  Automaton {backend:<7} {automaton_time:8.3f} s "
+                f"({set_time / automaton_time:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
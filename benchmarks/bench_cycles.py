@@ -0,0 +1,124 @@
+"""Benchmark `aoc_mod.cycles.fast_forward` against a dict of full state
+snapshots, on the rolling rocks "spin cycle" of 2023 day 14 over a synthetic
+grid (150x150 by default).
+
+Run with:
+
+    python benchmarks/bench_cycles.py [--size 150] [--steps 1000000000] [--repeat 3]
+
+The state is a tuple of the rows of the grid and each step tilts it north,
+west, south and east. The snapshot dict keeps every state seen so far, as
+most solutions do, while `fast_forward` keeps a 128-bit fingerprint of each
+state ("table"), of one state in 16 ("table, sample=16") or a single state
+("brent"). Memory is the peak of the traced allocations (tracemalloc) in a
+separate run, and every method must end with the same load on the north
+beams.
+"""
+
+import time
+import random
+import argparse
+import tracemalloc
+
+from aoc_mod.cycles import fast_forward
+
+
+def transpose(rows: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple("".join(column) for column in zip(*rows))
+
+
+def tilt_north(rows: tuple[str, ...]) -> tuple[str, ...]:
+    # roll the rocks west in the columns, "O" sorting before "."
+    return transpose(
+        tuple(
+            "#".join("".join(sorted(part, reverse=True)) for part in row.split("#"))
+            for row in transpose(rows)
+        )
+    )
+
+
+def spin(rows: tuple[str, ...]) -> tuple[str, ...]:
+    """tilt north, west, south and east by tilting north and rotating
+    clockwise 4 times"""
+    for _ in range(4):
+        rows = tuple("".join(column) for column in zip(*reversed(tilt_north(rows))))
+    return rows
+
+
+def north_load(rows: tuple[str, ...]) -> int:
+    return sum(row.count("O") * (len(rows) - index) for index, row in enumerate(rows))
+
+
+def snapshots(rows: tuple[str, ...], steps: int) -> tuple[str, ...]:
+    seen = {}
+    history = []
+    for current in range(steps):
+        if rows in seen:
+            start = seen[rows]
+            return history[start + (steps - start) % (current - start)]
+        seen[rows] = current
+        history.append(rows)
+        rows = spin(rows)
+    return rows
+
+
+def best_time(func, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def measure_memory(func) -> int:
+    """get the peak traced memory of a call"""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=150)
+    parser.add_argument("--steps", type=int, default=1_000_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(14)
+    rows = tuple(
+        "".join(rng.choices("O.#", weights=(3, 12, 2), k=args.size))
+        for _ in range(args.size)
+    )
+    cycle = fast_forward(rows, spin, None)
+    print(
+        f"{args.size}x{args.size} grid, cycle of {cycle.length} spins after "
+        f"{cycle.start}, {args.steps} spins, best of {args.repeat}"
+    )
+
+    methods = [
+        ("dict of snapshots", lambda: snapshots(rows, args.steps)),
+        ("table", lambda: fast_forward(rows, spin, args.steps).state),
+        (
+            "table, sample=16",
+            lambda: fast_forward(rows, spin, args.steps, sample=16).state,
+        ),
+        ("brent", lambda: fast_forward(rows, spin, args.steps, method="brent").state),
+    ]
+    baseline = None
+    for name, func in methods:
+        elapsed, state = best_time(func, args.repeat)
+        peak = measure_memory(func)
+        if baseline is None:
+            baseline = (elapsed, peak, north_load(state))
+        assert north_load(state) == baseline[2], f"{name} ended in another state"
+        print(
+            f"{name:<18} {elapsed:7.2f} s {peak / 2**20:8.2f} MiB "
+            f"({baseline[1] / peak:.1f}x less memory, {baseline[0] / elapsed:.2f}x speed)"
+        )
+
+
+if __name__ == "__main__":
+    main()
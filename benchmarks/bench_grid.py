@@ -0,0 +1,132 @@
+"""Benchmark `aoc_mod.grid.Grid` against a dict of (row, col) tuples on a
+synthetic grid (2000x2000 by default).
+
+Run with:
+
+    python benchmarks/bench_grid.py [--size 2000] [--repeat 3]
+
+Each grid is built from the rows of `parse_input`, and its memory is the
+growth of the traced allocations (tracemalloc) while building it. Neighbor
+throughput is measured by counting, for every cell, its 8 neighbors holding
+"@" (the usual "how many rolls/trees/seats are around" puzzle), with the dict
+(and `Grid.get`) checking tuples and the Grid loop adding `offsets8` to the
+cell indexes.
+"""
+
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from aoc_mod.grid import Grid
+from aoc_mod.utilities import parse_input
+
+DIRECTIONS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+
+def build_dict(rows: list[str]) -> dict:
+    return {
+        (row, col): char
+        for row, line in enumerate(rows)
+        for col, char in enumerate(line)
+    }
+
+
+def count_dict(grid: dict) -> int:
+    total = 0
+    for (row, col), char in grid.items():
+        for d_row, d_col in DIRECTIONS:
+            if grid.get((row + d_row, col + d_col)) == "@":
+                total += 1
+    return total
+
+
+def count_grid_cells(grid: Grid) -> int:
+    total = 0
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            for d_row, d_col in DIRECTIONS:
+                if grid.get((row + d_row, col + d_col)) == "@":
+                    total += 1
+    return total
+
+
+def count_grid_indexes(grid: Grid) -> int:
+    data = grid.data
+    offsets = grid.offsets8
+    roll = ord("@")
+    total = 0
+    for index in grid.cells():
+        for offset in offsets:
+            if data[index + offset] == roll:
+                total += 1
+    return total
+
+
+def measure_memory(build) -> tuple[int, object]:
+    """get the traced memory allocated by a build function and its result"""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def best_time(func, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(2024)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = Path(tmp_dir, "input.txt")
+        input_path.write_text(
+            "\n".join(
+                "".join(rng.choice("@..") for _ in range(args.size))
+                for _ in range(args.size)
+            )
+        )
+        rows = parse_input(input_path)
+
+        dict_size, dict_grid = measure_memory(lambda: build_dict(rows))
+        grid_size, grid = measure_memory(lambda: Grid(rows))
+        cells = args.size * args.size
+        print(f"{args.size}x{args.size} grid, best of {args.repeat}")
+        print(
+            f"dict of tuples memory {dict_size / 2**20:9.1f} MiB ({dict_size / cells:.0f} B/cell)"
+        )
+        print(
+            f"Grid memory           {grid_size / 2**20:9.1f} MiB ({grid_size / cells:.1f} B/cell, "
+            f"{dict_size / grid_size:.0f}x less)"
+        )
+
+        dict_time, expected = best_time(lambda: count_dict(dict_grid), args.repeat)
+        print(
+            f"dict neighbors        {dict_time:9.2f} s   {cells * 8 / dict_time / 1e6:6.1f} M/s"
+        )
+        for name, count in (
+            ("Grid.get neighbors", count_grid_cells),
+            ("Grid offsets8", count_grid_indexes),
+        ):
+            grid_time, total = best_time(lambda: count(grid), args.repeat)
+            assert total == expected, f"{name} counted {total} instead of {expected}"
+            print(
+                f"{name:<21} {grid_time:9.2f} s   {cells * 8 / grid_time / 1e6:6.1f} M/s "
+                f"({dict_time / grid_time:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
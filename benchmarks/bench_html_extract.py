@@ -0,0 +1,164 @@
+"""Benchmark converting puzzle pages to markdown with aoc_mod.html_markdown
+against parsing the whole page with BeautifulSoup and converting each child
+of <main> with markdownify.
+
+Run with:
+
+    python benchmarks/bench_html_extract.py [--pages 50] [--paragraphs 40]
+
+Time is the best of several runs over the whole corpus of synthetic puzzle
+pages and memory is the peak traced by tracemalloc while converting one page.
+Both approaches must produce the same markdown.
+"""
+
+import time
+import random
+import argparse
+import tracemalloc
+
+import markdownify
+from bs4 import BeautifulSoup
+
+from aoc_mod.html_markdown import (
+    HtmlElement,
+    extract_children,
+    html_to_markdown,
+    to_markdown,
+)
+
+HEAD = """<!DOCTYPE html>
+<html lang="en-us">
+<head>
+<meta charset="utf-8"/>
+<title>Day {day} - Advent of Code 2023</title>
+<link rel="stylesheet" type="text/css" href="/static/style.css?31"/>
+<script>window.addEventListener('click', function(e){{ if (a < b) {{}} }});</script>
+</head>
+<body>
+<header><div><h1 class="title-global"><a href="/">Advent of Code</a></h1><nav><ul>
+{nav}
+</ul></nav></div></header>
+<div id="sidebar"><div id="sponsor"><div class="quiet">Our <a href="/2023/sponsors">sponsors</a> help make Advent of Code possible:</div></div></div>
+<main>
+<script>window.addEventListener('copy', function(e) {{ }});</script>
+"""
+
+TAIL = """<p>Your puzzle answer was <code>{answer}</code>.</p>
+<form method="post" action="{day}/answer"><input type="hidden" name="level" value="2"/><p>Answer: <input type="text" name="answer" autocomplete="off"/> <input type="submit" value="[Submit]"/></p></form>
+</main>
+<script>(function(i,s,o,g,r,a,m){{i['GoogleAnalyticsObject']=r;}})(window,document,'script');</script>
+</body>
+</html>"""
+
+WORDS = "the elves trebuchet snow calibration value digit map star machine lava".split()
+
+
+def make_paragraph(rng: random.Random) -> str:
+    """a paragraph, list or code block like those in puzzle descriptions"""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(20, 60))]
+    for _ in range(rng.randint(1, 4)):
+        index = rng.randrange(len(words))
+        tag = rng.choice(["em", "code", "code"])
+        words[index] = f"<{tag}>{words[index]}_{rng.randrange(100)}</{tag}>"
+    kind = rng.random()
+    if kind < 0.15:
+        lines = "\n".join(
+            "".join(rng.choice("#.") for _ in range(20)) for _ in range(10)
+        )
+        return f"<pre><code>{lines}\n</code></pre>"
+    if kind < 0.25:
+        items = "".join(f"<li>{' '.join(words[i::4])}</li>\n" for i in range(4))
+        return f"<ul>\n{items}</ul>"
+    return f"<p>{' '.join(words)}</p>"
+
+
+def make_page(rng: random.Random, day: int, paragraphs: int) -> str:
+    """a synthetic puzzle page with both parts unlocked"""
+    nav = "\n".join(
+        f'<li><a href="/2023/{name}">[{name}]</a></li>'
+        for name in ("about", "events", "shop", "settings", "log out")
+    )
+    articles = []
+    for part in ("Day {day}: Synthetic", "Part Two"):
+        body = "\n".join(make_paragraph(rng) for _ in range(paragraphs))
+        articles.append(
+            f'<article class="day-desc"><h2>--- {part.format(day=day)} ---</h2>'
+            f"{body}\n</article>\n"
+        )
+    answer = rng.randrange(10**6)
+    return (
+        HEAD.format(day=day, nav=nav)
+        + articles[0]
+        + TAIL.split("<form")[0].format(answer=answer)
+        + articles[1]
+        + TAIL.format(day=day, answer=answer)
+    )
+
+
+def convert_bs4(html: str) -> list[str]:
+    """parse the whole page, then convert each child of <main>"""
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        markdownify.markdownify(str(entry).strip())
+        for entry in soup.main.contents
+        if str(entry).strip()
+    ]
+
+
+def convert_lean(html: str) -> list[str]:
+    """parse only <main>, then convert each of its children"""
+    markdown = []
+    for source_html, document in extract_children(html, "main"):
+        if not source_html.strip():
+            continue
+        if isinstance(document.children[0], HtmlElement):
+            markdown.append(to_markdown(document, source_html))
+        else:
+            markdown.append(html_to_markdown(source_html.strip()))
+    return markdown
+
+
+def measure(func, pages: list[str], repeat: int) -> tuple[float, float]:
+    """return the best time in seconds and the peak traced memory in MB"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(pages[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(2023)
+    pages = [make_page(rng, day % 25 + 1, args.paragraphs) for day in range(args.pages)]
+
+    for page in pages:
+        if convert_bs4(page) != convert_lean(page):
+            raise SystemExit("the converted markdown differs from markdownify")
+
+    size = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"{args.pages} pages of {size:.1f} KB")
+    bs4_time, bs4_mem = measure(convert_bs4, pages, args.repeat)
+    lean_time, lean_mem = measure(convert_lean, pages, args.repeat)
+    print(
+        f"bs4 + markdownify {bs4_time * 1000:8.1f} ms {bs4_mem:6.2f} MB  "
+        f"html_markdown {lean_time * 1000:8.1f} ms {lean_mem:6.2f} MB  "
+        f"({bs4_time / lean_time:4.1f}x faster, "
+        f"{bs4_mem / max(lean_mem, 1e-6):4.1f}x less memory)"
+    )
+
+
+if __name__ == "__main__":
+    main()
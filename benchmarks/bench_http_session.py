@@ -0,0 +1,142 @@
+"""Benchmark per-request latency of a 25-day bulk fetch against a local stub
+Advent of Code server, comparing module-level `requests.get` calls (a new
+connection per request, as AocMod used to do) with the pooled session owned by
+AocMod.
+
+Run with:
+
+    python benchmarks/bench_http_session.py [--days 25] [--rounds 5]
+        [--latency-ms 0] [--handshake-ms 0]
+
+The stub server speaks plain HTTP, so by default the numbers only include the
+TCP handshake cost. Against adventofcode.com every new connection also pays a
+TLS handshake, which can be simulated with --handshake-ms (a delay added to
+each new connection).
+"""
+
+import time
+import argparse
+import statistics
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from aoc_mod.utilities import AocMod
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """keep-alive handler returning a fixed size puzzle input"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b"1234567890\n" * 1000
+
+    def setup(self):
+        # simulate the extra round trips of a TLS handshake on each new connection
+        if self.server.handshake:
+            time.sleep(self.server.handshake)
+        super().setup()
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch_without_session(base_url: str, days: int) -> list[float]:
+    """fetch every day with a new connection per request"""
+    latencies = []
+    for day in range(1, days + 1):
+        start = time.perf_counter()
+        res = requests.get(
+            f"{base_url}/2023/day/{day}/input",
+            cookies={"session": "bench_session"},
+            timeout=5,
+        )
+        res.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def fetch_with_aoc_mod(aoc_mod: AocMod, days: int) -> list[float]:
+    """fetch every day through AocMod, bypassing the puzzle cache"""
+    latencies = []
+    for day in range(1, days + 1):
+        start = time.perf_counter()
+        aoc_mod.get_puzzle_input(2023, day, refresh=True)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def fetch_with_session(aoc_mod: AocMod, days: int) -> list[float]:
+    """fetch every day through AocMod's pooled session only"""
+    latencies = []
+    for day in range(1, days + 1):
+        start = time.perf_counter()
+        res = aoc_mod._session.get(
+            f"{aoc_mod.base_url}/2023/day/{day}/input", timeout=aoc_mod.timeout
+        )
+        res.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, rounds: list[list[float]]):
+    """print per-request latency statistics over every round"""
+    samples = sorted(x * 1000 for latencies in rounds for x in latencies)
+    p95 = samples[int(0.95 * (len(samples) - 1))]
+    total = statistics.mean(sum(latencies) for latencies in rounds) * 1000
+    print(
+        f"{name:<32} mean {statistics.mean(samples):7.3f} ms  "
+        f"median {statistics.median(samples):7.3f} ms  p95 {p95:7.3f} ms  "
+        f"bulk fetch {total:8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=25)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.latency = args.latency_ms / 1000
+    server.handshake = args.handshake_ms / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        aoc_mod = AocMod(
+            session_id="bench_session", cache_dir=cache_dir, base_url=base_url
+        )
+        aoc_mod._time_to_wait_after_pull = 0
+
+        print(f"{args.days}-day bulk fetch, {args.rounds} rounds, {base_url}")
+        report(
+            "requests.get (no pooling)",
+            [fetch_without_session(base_url, args.days) for _ in range(args.rounds)],
+        )
+        report(
+            "AocMod session",
+            [fetch_with_session(aoc_mod, args.days) for _ in range(args.rounds)],
+        )
+        report(
+            "AocMod.get_puzzle_input",
+            [fetch_with_aoc_mod(aoc_mod, args.days) for _ in range(args.rounds)],
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark peak memory and time of the puzzle input readers on a large
+synthetic input (500 MB by default).
+
+Run with:
+
+    python benchmarks/bench_input_memory.py [--size-mb 500] [--path input.txt]
+
+Each reader runs in a fresh interpreter, which reports the growth of its peak
+resident set size (ru_maxrss) while consuming the whole input. For
+read_input_bytes this includes the mapped file pages, which are shared with the
+page cache and can be dropped by the kernel at any time, unlike the heap memory
+used by the other readers.
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# each snippet consumes the whole input and prints a checksum
+READERS = {
+    "parse_input": "sum(len(line) for line in parse_input(path))",
+    "iter_input": "sum(len(line) for line in iter_input(path))",
+    "iter_blocks": "sum(len(block) for block in iter_blocks(path))",
+    "read_input_bytes": "sum(1 for _ in re.finditer(rb'\\n', read_input_bytes(path)))",
+}
+
+CHILD_SCRIPT = """
+import re, sys, json, time, resource
+from pathlib import Path
+from aoc_mod.utilities import iter_blocks, iter_input, parse_input, read_input_bytes
+
+path = Path(sys.argv[1])
+base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+checksum = {expression}
+elapsed = time.perf_counter() - start
+peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"checksum": checksum, "seconds": elapsed, "peak_kb": peak_rss - base_rss}}))
+"""
+
+
+def generate_input(path: Path, size_mb: int):
+    """write a synthetic input of blank-line separated blocks of number lines"""
+    rng = random.Random(2024)
+    target = size_mb * 1024 * 1024
+    written = 0
+    with path.open("w", encoding="utf-8") as f_out:
+        while written < target:
+            lines = [
+                " ".join(str(rng.randrange(10**6)) for _ in range(rng.randrange(1, 12)))
+                for _ in range(rng.randrange(1, 8))
+            ]
+            block = "\n".join(lines) + "\n\n"
+            f_out.write(block)
+            written += len(block)
+
+
+def run_reader(name: str, path: Path) -> dict:
+    """run a reader in a fresh interpreter and return its measurements"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CHILD_SCRIPT.format(expression=READERS[name]),
+            str(path),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--path", type=Path, help="use an existing input file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.path
+        if path is None:
+            path = Path(tmp_dir, "input.txt")
+            generate_input(path, args.size_mb)
+
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"input: {path} ({size_mb:.1f} MB)")
+        for name in READERS:
+            result = run_reader(name, path)
+            print(
+                f"{name:<18} peak memory {result['peak_kb'] / 1024:9.1f} MB  "
+                f"time {result['seconds']:7.2f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark `aoc_mod.memo.memoize` against `functools.cache` on a dynamic
+programming solution keyed by (node, frozenset of visited nodes) states.
+
+Run with:
+
+    python benchmarks/bench_memo.py [--nodes 12] [--maxbytes 1048576] [--repeat 3]
+
+The solution counts the paths through a random graph that visit every node
+once (the shape of "open the valves"/"visit every city" puzzles), from each
+start node. Its memory is the peak of the traced allocations (tracemalloc)
+in a separate run, which is mostly the cache. Each variant must count the same
+paths: functools.cache, memoize with the states themselves as keys, packed
+with `pack_key`, packed into a `pack_bits` mask and, with that mask, bounded with `maxbytes`
+(trading recomputed states for memory).
+"""
+
+import time
+import random
+import argparse
+import functools
+import tracemalloc
+
+from aoc_mod.memo import memoize, pack_bits
+
+
+def make_solver(neighbors: list[list[int]], decorate):
+    count = len(neighbors)
+
+    @decorate
+    def paths(node: int, visited: frozenset) -> int:
+        if len(visited) == count:
+            return 1
+        return sum(
+            paths(neighbor, visited | {neighbor})
+            for neighbor in neighbors[node]
+            if neighbor not in visited
+        )
+
+    def solve() -> int:
+        return sum(paths(node, frozenset({node})) for node in range(count))
+
+    return solve
+
+
+def best_time(func, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def measure_memory(func) -> int:
+    """get the peak traced memory of a call"""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=12)
+    parser.add_argument("--maxbytes", type=int, default=2**20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(2022)
+    neighbors = [[] for _ in range(args.nodes)]
+    for a in range(args.nodes):
+        for b in range(a + 1, args.nodes):
+            if rng.random() < 0.5:
+                neighbors[a].append(b)
+                neighbors[b].append(a)
+
+    def bits_key(node, visited):
+        return node << args.nodes | pack_bits(visited)
+
+    variants = [
+        ("functools.cache", functools.cache),
+        ("memoize", memoize),
+        ('memoize key="pack"', memoize(key="pack")),
+        ("memoize pack_bits key", memoize(key=bits_key)),
+        (
+            f"... maxbytes={args.maxbytes // 1024} KiB",
+            memoize(key=bits_key, maxbytes=args.maxbytes),
+        ),
+    ]
+
+    print(f"{args.nodes} nodes, best of {args.repeat}")
+    baseline = None
+    for name, decorate in variants:
+        # a new solver (and cache) for every run
+        elapsed, result = best_time(
+            lambda: make_solver(neighbors, decorate)(), args.repeat
+        )
+        peak = measure_memory(make_solver(neighbors, decorate))
+        if baseline is None:
+            baseline = (elapsed, peak, result)
+        assert result == baseline[2], f"{name} counted {result} paths"
+        print(
+            f"{name:<24} {elapsed:7.2f} s {peak / 2**20:8.1f} MiB "
+            f"({baseline[1] / peak:.1f}x less memory, {baseline[0] / elapsed:.2f}x speed)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark `cached_parse` against running a heavy parse function on a
+synthetic grid input (1000x1000 by default).
+
+Run with:
+
+    python benchmarks/bench_parse_cache.py [--size 1000] [--repeat 5]
+
+Two parse functions are measured: one building an adjacency dict of the open
+cells of the grid (many small Python objects) and one building a numpy array
+of the grid (one large buffer, skipped if numpy isn't installed). Each is
+timed uncached, then loaded from the cache by reading the entry and by
+mapping it into memory.
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+from aoc_mod.utilities import cached_parse, parse_char_grid
+
+
+def parse_graph(input_path: Path) -> dict:
+    """build the neighbours of each open cell of the grid"""
+    lines = input_path.read_text().splitlines()
+    graph = {}
+    for row, line in enumerate(lines):
+        for col, char in enumerate(line):
+            if char == "#":
+                continue
+            graph[row, col] = [
+                (row + d_row, col + d_col)
+                for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                if 0 <= row + d_row < len(lines)
+                and 0 <= col + d_col < len(line)
+                and lines[row + d_row][col + d_col] != "#"
+            ]
+    return graph
+
+
+def parse_grid(input_path: Path):
+    """read the grid into an int64 numpy array of the distances to a wall"""
+    grid = parse_char_grid(input_path, numpy=True).astype("int64")
+    return (grid != ord("#")).cumsum(axis=1)
+
+
+def best_time(func, input_path: Path, repeat: int) -> float:
+    """get the best time of calling a parse function"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(input_path)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    parse_funcs = {"graph": parse_graph}
+    try:
+        import numpy  # noqa: F401
+
+        parse_funcs["numpy grid"] = parse_grid
+    except ImportError:
+        print("numpy isn't installed, skipping the numpy grid", file=sys.stderr)
+
+    rng = random.Random(2024)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = Path(tmp_dir, "input.txt")
+        input_path.write_text(
+            "\n".join(
+                "".join(rng.choice("#....") for _ in range(args.size))
+                for _ in range(args.size)
+            )
+        )
+
+        print(f"{args.size}x{args.size} grid, best of {args.repeat}")
+        for name, func in parse_funcs.items():
+            parse_time = best_time(func, input_path, args.repeat)
+            print(f"{name:<12} parse     {parse_time * 1000:9.1f} ms")
+            for use_mmap in (False, True):
+                cached = cached_parse(func, use_mmap=use_mmap, cache_dir=tmp_dir)
+                cached(input_path)
+                cached_time = best_time(cached, input_path, args.repeat)
+                print(
+                    f"{name:<12} {'mmap' if use_mmap else 'read':<9} "
+                    f"{cached_time * 1000:9.1f} ms ({parse_time / cached_time:.1f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark the typed input parsers against the usual list-of-str approach
+of running a regular expression over each line returned by parse_input.
+
+Run with:
+
+    python benchmarks/bench_parsers.py [--lines 200000] [--grid-size 2000]
+
+Time is the best of several runs and memory is the peak traced by tracemalloc
+while parsing (which includes the parsed result).
+"""
+
+import re
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from aoc_mod.utilities import (
+    parse_char_grid,
+    parse_input,
+    parse_int_rows,
+    parse_ints,
+)
+
+
+def naive_ints(path: Path) -> list[int]:
+    """integers of every line of the input in one list"""
+    return [int(x) for line in parse_input(path) for x in re.findall(r"-?\d+", line)]
+
+
+def naive_int_rows(path: Path) -> list[list[int]]:
+    """integers of each line of the input"""
+    return [[int(x) for x in re.findall(r"-?\d+", line)] for line in parse_input(path)]
+
+
+def naive_char_grid(path: Path) -> list[list[str]]:
+    """characters of each line of the input"""
+    return [list(line) for line in parse_input(path)]
+
+
+def measure(func, path: Path, repeat: int) -> tuple[float, float]:
+    """return the best time in seconds and the peak traced memory in MB"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--grid-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(2024)
+    cases = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ints_path = Path(tmp_dir, "ints.txt")
+        ints_path.write_text(
+            "\n".join(
+                f"p={rng.randrange(-999, 999)},{rng.randrange(999)} "
+                f"v={rng.randrange(-99, 99)},{rng.randrange(-99, 99)}"
+                for _ in range(args.lines)
+            )
+        )
+        grid_path = Path(tmp_dir, "grid.txt")
+        grid_path.write_text(
+            "\n".join(
+                "".join(rng.choice("#.") for _ in range(args.grid_size))
+                for _ in range(args.grid_size)
+            )
+        )
+
+        cases = [
+            ("ints", ints_path, naive_ints, parse_ints),
+            ("int rows", ints_path, naive_int_rows, parse_int_rows),
+            ("char grid", grid_path, naive_char_grid, parse_char_grid),
+        ]
+        try:
+            import numpy  # noqa: F401
+
+            cases += [
+                (
+                    "ints (numpy)",
+                    ints_path,
+                    naive_ints,
+                    lambda path: parse_ints(path, numpy=True),
+                ),
+                (
+                    "char grid (numpy)",
+                    grid_path,
+                    naive_char_grid,
+                    lambda path: parse_char_grid(path, numpy=True),
+                ),
+            ]
+        except ImportError:
+            pass
+
+        print(f"{args.lines} lines of integers, {args.grid_size}x{args.grid_size} grid")
+        for name, path, naive, typed in cases:
+            naive_time, naive_mem = measure(naive, path, args.repeat)
+            typed_time, typed_mem = measure(typed, path, args.repeat)
+            print(
+                f"{name:<18} naive {naive_time * 1000:8.1f} ms {naive_mem:8.1f} MB  "
+                f"typed {typed_time * 1000:8.1f} ms {typed_mem:8.1f} MB  "
+                f"({naive_time / typed_time:4.1f}x faster, "
+                f"{naive_mem / max(typed_mem, 1e-6):5.1f}x less memory)"
+            )
+
+
+if __name__ == "__main__":
+    main()
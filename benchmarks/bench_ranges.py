@@ -0,0 +1,209 @@
+"""Benchmark `aoc_mod.ranges` against the list handling most range puzzle
+solutions use, on synthetic intervals, almanac maps and cuboids.
+
+Run with:
+
+    python benchmarks/bench_ranges.py [--ranges 10000] [--repeat 3]
+
+- merging: `--ranges` random intervals merged one by one into a list that is
+  scanned for overlaps, against building a `RangeSet` (sorting once) and
+  against `RangeSet.add`
+- lookups: 20000 point queries scanning the merged list, against `in`
+- mapping: the intervals mapped through 7 maps of 500 ranges each, splitting
+  every interval against every range of a map, against
+  `RangeMap.map_ranges`
+- cuboids: 400 random on/off cuboids, keeping a list of signed
+  intersections (inclusion-exclusion), against a `BoxSet`
+
+Every method must give the same result.
+"""
+
+import time
+import random
+import argparse
+
+from aoc_mod.ranges import BoxSet, RangeMap, RangeSet
+
+SPAN = 10**12
+
+
+def merge_list(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged = []
+    for start, stop in intervals:
+        kept = []
+        for other_start, other_stop in merged:
+            if other_stop < start or stop < other_start:
+                kept.append((other_start, other_stop))
+            else:
+                start, stop = min(start, other_start), max(stop, other_stop)
+        kept.append((start, stop))
+        merged = kept
+    return sorted(merged)
+
+
+def add_ranges(intervals: list[tuple[int, int]]) -> RangeSet:
+    ranges = RangeSet()
+    for start, stop in intervals:
+        ranges.add(start, stop)
+    return ranges
+
+
+def map_list(intervals: list[tuple[int, int]], maps: list[list[tuple]]) -> list:
+    for pieces in maps:
+        queue, mapped = list(intervals), []
+        while queue:
+            start, stop = queue.pop()
+            for piece_start, piece_stop, offset in pieces:
+                overlap_start = max(start, piece_start)
+                overlap_stop = min(stop, piece_stop)
+                if overlap_start < overlap_stop:
+                    mapped.append((overlap_start + offset, overlap_stop + offset))
+                    if start < overlap_start:
+                        queue.append((start, overlap_start))
+                    if overlap_stop < stop:
+                        queue.append((overlap_stop, stop))
+                    break
+            else:
+                mapped.append((start, stop))
+        intervals = mapped
+    return intervals
+
+
+def signed_volume(steps: list[tuple[bool, tuple]]) -> int:
+    cuboids = []
+    for on, box in steps:
+        added = []
+        for other, sign in cuboids:
+            overlap = tuple(
+                (max(start, other_start), min(stop, other_stop))
+                for (start, stop), (other_start, other_stop) in zip(box, other)
+            )
+            if all(start < stop for start, stop in overlap):
+                added.append((overlap, -sign))
+        if on:
+            added.append((box, 1))
+        cuboids += added
+    total = 0
+    for box, sign in cuboids:
+        size = sign
+        for start, stop in box:
+            size *= stop - start
+        total += size
+    return total
+
+
+def box_volume(steps: list[tuple[bool, tuple]]) -> int:
+    cubes = BoxSet()
+    for on, box in steps:
+        if on:
+            cubes.add(box)
+        else:
+            cubes.discard(box)
+    return cubes.volume
+
+
+def best_time(func, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def report(name: str, naive, optimized, repeat: int) -> None:
+    naive_time, expected = best_time(naive[1], repeat)
+    print(f"{name}\n  {naive[0]:<24} {naive_time:8.3f} s")
+    for label, func in optimized:
+        elapsed, result = best_time(func, repeat)
+        assert result == expected, f"{label} differs from {naive[0]}"
+        print(f"  {label:<24} {elapsed:8.3f} s ({naive_time / elapsed:.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ranges", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    gap = SPAN // args.ranges
+    intervals = []
+    for _ in range(args.ranges):
+        start = rng.randrange(SPAN)
+        intervals.append((start, start + rng.randint(1, 2 * gap)))
+    print(f"{args.ranges} intervals, best of {args.repeat}")
+
+    merged = merge_list(intervals)
+    report(
+        "merging",
+        ("list scans", lambda: merge_list(intervals)),
+        [
+            (
+                "RangeSet(intervals)",
+                lambda: [(r.start, r.stop) for r in RangeSet(intervals)],
+            ),
+            (
+                "RangeSet.add",
+                lambda: [(r.start, r.stop) for r in add_ranges(intervals)],
+            ),
+        ],
+        args.repeat,
+    )
+
+    queries = [rng.randrange(SPAN) for _ in range(20000)]
+    ranges = RangeSet(intervals)
+    report(
+        "lookups",
+        (
+            "list scans",
+            lambda: sum(
+                any(start <= query < stop for start, stop in merged)
+                for query in queries
+            ),
+        ),
+        [("in RangeSet", lambda: sum(query in ranges for query in queries))],
+        args.repeat,
+    )
+
+    maps = []
+    for _ in range(7):
+        bounds = sorted(rng.sample(range(SPAN), 1000))
+        maps.append(
+            [
+                (start, stop, rng.randint(-gap, gap))
+                for start, stop in zip(bounds[::2], bounds[1::2])
+            ]
+        )
+    range_maps = [RangeMap(pieces) for pieces in maps]
+
+    def map_ranges():
+        mapped = ranges
+        for range_map in range_maps:
+            mapped = range_map.map_ranges(mapped)
+        return mapped
+
+    report(
+        "mapping",
+        ("list splitting", lambda: RangeSet(map_list(list(merged), maps))),
+        [("RangeMap.map_ranges", map_ranges)],
+        args.repeat,
+    )
+
+    steps = []
+    for _ in range(400):
+        box = []
+        for _ in range(3):
+            start = rng.randrange(-50000, 50000)
+            box.append((start, start + rng.randrange(1000, 20000)))
+        steps.append((rng.random() < 0.7, tuple(box)))
+    report(
+        "cuboids",
+        ("signed intersections", lambda: signed_volume(steps)),
+        [("BoxSet", lambda: box_volume(steps))],
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark the wall time of running a whole 'challenges' tree with
+aoc_mod.runner.run_all for different numbers of worker processes.
+
+Run with:
+
+    python benchmarks/bench_run_all.py [--days 25] [--jobs 1 2 4]
+
+Every synthetic day busy-loops for a different amount of CPU time. Each
+job count is run twice, first without saved timings (days are started in
+year/day order) and then with the timings of the first run (longest first).
+"""
+
+import os
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+from aoc_mod.runner import TIMINGS_FILE, discover_days, run_all
+
+SOLUTION = """
+import time
+
+
+def part_one(_):
+    end = time.process_time() + {SECONDS}
+    while time.process_time() < end:
+        pass
+    return {DAY}
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=25)
+    parser.add_argument(
+        "--jobs", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1})
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=0.2,
+        help="CPU time of the longest day",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        for day in range(1, args.days + 1):
+            day_path = Path(root_dir, f"challenges/2024/day{day}")
+            day_path.mkdir(parents=True)
+            # the last days are the longest, the worst case for year/day order
+            seconds = args.max_seconds * day / args.days
+            day_path.joinpath(f"day{day}.py").write_text(
+                SOLUTION.replace("{SECONDS}", str(seconds)).replace("{DAY}", str(day))
+            )
+            day_path.joinpath(f"input_day{day}.txt").write_text("\n")
+
+        days = discover_days(root_dir)
+        print(f"{len(days)} days, {os.cpu_count()} CPUs")
+        baseline = None
+        for jobs in args.jobs:
+            for order in ("year/day order", "longest first"):
+                if order == "year/day order":
+                    Path(root_dir, TIMINGS_FILE).unlink(missing_ok=True)
+                start = time.perf_counter()
+                run_all(days, root_dir=root_dir, jobs=jobs)
+                wall_time = time.perf_counter() - start
+                baseline = baseline or wall_time
+                print(
+                    f"jobs {jobs:>2} {order:<15} wall {wall_time:6.2f} s "
+                    f"({baseline / wall_time:4.2f}x the first run)"
+                )
+
+
+if __name__ == "__main__":
+    main()
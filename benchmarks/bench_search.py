@@ -0,0 +1,207 @@
+"""Benchmark the searches of `aoc_mod.search` against the usual tuple and
+dict implementations on a large synthetic maze (1001x1001 by default).
+
+Run with:
+
+    python benchmarks/bench_search.py [--size 1001] [--repeat 3]
+
+The maze is a random spanning tree of the odd cells with a share of its walls
+knocked out, so that it has many paths of different lengths, and every open
+cell holds a digit, which is the cost of entering it for the weighted
+searches. Each search goes from the top left to the bottom right corner and
+the distances found are checked against the naive implementations.
+"""
+
+import sys
+import time
+import heapq
+import random
+import argparse
+from collections import deque
+
+from aoc_mod.search import (
+    astar,
+    bfs,
+    bidirectional_bfs,
+    dijkstra,
+    grid_astar,
+    grid_bfs,
+    grid_bidirectional_bfs,
+    grid_dijkstra,
+)
+
+
+def generate_maze(size: int, seed: int = 2024) -> list[str]:
+    """generate a size x size maze (size is rounded up to an odd number)"""
+    size |= 1
+    rng = random.Random(seed)
+    cells = [bytearray(b"#" * size) for _ in range(size)]
+    cells[1][1] = ord("1")
+    stack = [(1, 1)]
+    while stack:
+        row, col = stack[-1]
+        moves = [
+            (d_row, d_col)
+            for d_row, d_col in ((-2, 0), (2, 0), (0, -2), (0, 2))
+            if 0 < row + d_row < size - 1
+            and 0 < col + d_col < size - 1
+            and cells[row + d_row][col + d_col] == ord("#")
+        ]
+        if not moves:
+            stack.pop()
+            continue
+        d_row, d_col = rng.choice(moves)
+        cells[row + d_row // 2][col + d_col // 2] = ord("1")
+        cells[row + d_row][col + d_col] = ord("1")
+        stack.append((row + d_row, col + d_col))
+
+    # knock out a share of the inner walls and give the open cells costs
+    for row in range(1, size - 1):
+        for col in range(1, size - 1):
+            if cells[row][col] == ord("#") and rng.random() < 0.3:
+                cells[row][col] = ord("1")
+            if cells[row][col] != ord("#"):
+                cells[row][col] = ord(rng.choice("123456789"))
+    return [cells[row].decode() for row in range(size)]
+
+
+def naive_neighbors(grid: list[str], cell: tuple[int, int]):
+    row, col = cell
+    for next_row, next_col in (
+        (row - 1, col),
+        (row + 1, col),
+        (row, col - 1),
+        (row, col + 1),
+    ):
+        if 0 <= next_row < len(grid) and 0 <= next_col < len(grid[0]):
+            if grid[next_row][next_col] != "#":
+                yield next_row, next_col
+
+
+def naive_bfs(grid: list[str], start, goal) -> int | None:
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            return distances[cell]
+        for next_cell in naive_neighbors(grid, cell):
+            if next_cell not in distances:
+                distances[next_cell] = distances[cell] + 1
+                queue.append(next_cell)
+    return None
+
+
+def naive_dijkstra(grid: list[str], start, goal, heuristic: bool = False) -> int | None:
+    distances = {start: 0}
+    visited = set()
+    heap = [(0, start)]
+    while heap:
+        _, cell = heapq.heappop(heap)
+        if cell in visited:
+            continue
+        visited.add(cell)
+        if cell == goal:
+            return distances[cell]
+        for next_cell in naive_neighbors(grid, cell):
+            distance = distances[cell] + int(grid[next_cell[0]][next_cell[1]])
+            if distance < distances.get(next_cell, float("inf")):
+                distances[next_cell] = distance
+                priority = distance
+                if heuristic:
+                    priority += abs(goal[0] - next_cell[0]) + abs(
+                        goal[1] - next_cell[1]
+                    )
+                heapq.heappush(heap, (priority, next_cell))
+    return None
+
+
+def best_time(func, repeat: int):
+    """get the best time and the result of a call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1001)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    grid = generate_maze(args.size)
+    start, goal = (1, 1), (len(grid) - 2, len(grid) - 2)
+    digit_cost = lambda value: value - 48  # noqa: E731
+
+    def neighbors(cell):
+        return naive_neighbors(grid, cell)
+
+    def weighted_neighbors(cell):
+        return [
+            (next_cell, int(grid[next_cell[0]][next_cell[1]]))
+            for next_cell in naive_neighbors(grid, cell)
+        ]
+
+    def manhattan(cell):
+        return abs(goal[0] - cell[0]) + abs(goal[1] - cell[1])
+
+    benchmarks = [
+        (
+            "bfs",
+            lambda: naive_bfs(grid, start, goal),
+            {
+                "grid_bfs": lambda: grid_bfs(grid, start, goal).distance,
+                "grid_bidirectional_bfs": lambda: grid_bidirectional_bfs(
+                    grid, start, goal
+                ).distance,
+                "bfs (implicit)": lambda: bfs(start, neighbors, goal).distance,
+                "bidirectional_bfs (implicit)": lambda: bidirectional_bfs(
+                    start, goal, neighbors
+                ).distance,
+            },
+        ),
+        (
+            "dijkstra",
+            lambda: naive_dijkstra(grid, start, goal),
+            {
+                "grid_dijkstra": lambda: grid_dijkstra(
+                    grid, start, goal, cost=digit_cost
+                ).distance,
+                "dijkstra (implicit)": lambda: dijkstra(
+                    start, weighted_neighbors, goal
+                ).distance,
+            },
+        ),
+        (
+            "a*",
+            lambda: naive_dijkstra(grid, start, goal, heuristic=True),
+            {
+                "grid_astar": lambda: grid_astar(
+                    grid, start, goal, cost=digit_cost
+                ).distance,
+                "astar (implicit)": lambda: astar(
+                    start, weighted_neighbors, goal, manhattan
+                ).distance,
+            },
+        ),
+    ]
+
+    print(f"{len(grid)}x{len(grid)} maze, best of {args.repeat}")
+    for name, naive, searches in benchmarks:
+        naive_time, expected = best_time(naive, args.repeat)
+        print(f"naive {name:<28} {naive_time * 1000:9.1f} ms  distance {expected}")
+        for search_name, search in searches.items():
+            search_time, distance = best_time(search, args.repeat)
+            if distance != expected:
+                sys.exit(f"{search_name} found {distance} instead of {expected}")
+            print(
+                f"      {search_name:<28} {search_time * 1000:9.1f} ms  "
+                f"({naive_time / search_time:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""asyncio counterpart to the AocMod class"""
+
+import asyncio
+import weakref
+from typing import Any, Callable
+
+from aoc_mod.utilities import DEFAULT_POOL_SIZE, AocMod
+
+
+class AsyncAocMod:
+    """asyncio interface to an AocMod instance.
+
+    Requests are run in worker threads through the wrapped AocMod, so the
+    puzzle cache, rate-limit state and pooled HTTP session are shared with
+    the synchronous class (which creates them once, even when several
+    threads first use it at the same time). At most `max_concurrency`
+    requests made through this instance are in flight at once."""
+
+    def __init__(
+        self,
+        session_id: str = "",
+        aoc_mod: AocMod | None = None,
+        max_concurrency: int = DEFAULT_POOL_SIZE,
+        **kwargs,
+    ):
+        """initialize AsyncAocMod class
+
+        :param session_id: session-id from browser after logging into
+            Advent of Code, defaults to ""
+        :type session_id: str, optional
+        :param aoc_mod: an existing AocMod instance to share, defaults to a
+            new AocMod created with `session_id` and `kwargs`
+        :type aoc_mod: AocMod | None, optional
+        :param max_concurrency: maximum number of requests in flight at once,
+            defaults to 10
+        :type max_concurrency: int, optional
+        """
+        if aoc_mod is None:
+            aoc_mod = AocMod(session_id=session_id, **kwargs)
+
+        self.aoc_mod = aoc_mod
+        self.max_concurrency = max_concurrency
+
+        # semaphores belong to an event loop, so keep one per loop
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def session_id(self) -> str:
+        """session-id of the wrapped AocMod instance"""
+        return self.aoc_mod.session_id
+
+    @property
+    def curr_time(self):
+        """current local time of the wrapped AocMod instance"""
+        return self.aoc_mod.curr_time
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """get the concurrency limiting semaphore for the running event loop
+
+        :return: the semaphore for the running event loop
+        :rtype: asyncio.Semaphore
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """run a blocking AocMod method in a worker thread once a slot under
+        the concurrency limit is free
+
+        :param func: the blocking function to run
+        :type func: Callable
+        :return: the return value of the function
+        :rtype: Any
+        """
+        async with self._get_semaphore():
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def get_puzzle_instructions(
+        self, year: int, day: int, refresh: bool = False
+    ) -> str:
+        """get puzzle instructions for the entered (or current) year and day
+
+        :param year: year of AoC puzzle, defaults to current
+        :type year: int
+        :param day: day of AoC puzzle, defaults to current
+        :type day: int
+        :param refresh: ignore the local puzzle cache and pull the instructions
+            again, defaults to False
+        :type refresh: bool, optional
+        :raises AocModError: exception if we http request throws an error
+        :return: markdownify output string of puzzle instructions
+        :rtype: str
+        """
+        return await self._run(
+            self.aoc_mod.get_puzzle_instructions, year, day, refresh=refresh
+        )
+
+    async def get_puzzle_input(
+        self, year: int = 0, day: int = 0, refresh: bool = False
+    ) -> str:
+        """get puzzle input for specified year and day
+
+        :param year: year of the puzzle, defaults to 0
+        :type year: int, optional
+        :param day: day of the puzzle, defaults to 0
+        :type day: int, optional
+        :param refresh: ignore the local puzzle cache and pull the input
+            again, defaults to False
+        :type refresh: bool, optional
+        :raises AocModError: will raise for http request error or a
+            request exception
+        :return: the puzzle input as a string
+        :rtype: str
+        """
+        return await self._run(
+            self.aoc_mod.get_puzzle_input, year, day, refresh=refresh
+        )
+
+    async def submit_answer(self, year: int, day: int, level: int, answer: int) -> str:
+        """submit puzzle answer for the year, day and level (part)
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param level: puzzle level or part (either 1 or 2)
+        :type level: int
+        :param answer: the answer to be submitted
+        :type answer: int
+        :raises AocModError: will raise for http request error or a
+            request exception
+        :return: the result from the http post request
+        :rtype: str
+        """
+        return await self._run(self.aoc_mod.submit_answer, year, day, level, answer)
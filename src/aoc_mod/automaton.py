@@ -0,0 +1,593 @@
+"""Sparse cellular automaton on an unbounded board of any number of
+dimensions, for Game of Life style puzzles.
+
+Live cells are kept in fixed-size chunks (hypercubes of `chunk_size` cells
+per side) and each generation only steps the chunks holding live cells and
+the neighboring chunks their live cells touch. Neighbors are counted for a
+whole chunk at once: with numpy arrays when numpy is installed, otherwise
+with bit-parallel arithmetic on Python ints holding a row of cells each."""
+
+import math
+from itertools import product
+from typing import Any, Callable, Iterable, Iterator
+
+from aoc_mod.utilities import AocModError, _import_numpy
+
+# cells per side of a chunk by dimensions, chunks of 4096 cells (more in 1-D)
+# step fastest on typical boards with either backend
+DEFAULT_CHUNK_SIZES = {1: 256, 2: 64, 3: 16, 4: 8}
+MIN_CHUNK_SIZE = 8
+
+Cell = tuple[int, ...]
+Rule = str | tuple[Iterable[int], Iterable[int]] | Callable[[bool, int], bool]
+
+
+def parse_rule(rule: Rule, dimensions: int) -> tuple[frozenset, frozenset]:
+    """get the neighbor counts that give birth to a cell and that let a live
+    cell survive from a rule
+
+    :param rule: a "B3/S23" string (counts of 10 or more are separated with
+        commas, as in "B3/S2,3,13"), a (birth, survive) tuple of counts or a
+        function of whether a cell is alive and its number of live neighbors
+        returning whether it is alive in the next generation
+    :type rule: Rule
+    :param dimensions: number of dimensions of the board
+    :type dimensions: int
+    :raises AocModError: if the rule can't be parsed or gives birth to cells
+        without live neighbors, which would fill the unbounded board
+    :return: a tuple of (birth, survive) counts
+    :rtype: tuple[frozenset, frozenset]
+    """
+    max_neighbors = 3**dimensions - 1
+    if callable(rule):
+        birth = frozenset(
+            count for count in range(max_neighbors + 1) if rule(False, count)
+        )
+        survive = frozenset(
+            count for count in range(max_neighbors + 1) if rule(True, count)
+        )
+    elif isinstance(rule, str):
+        parts = {}
+        for part in rule.upper().replace(" ", "").split("/"):
+            if not part or part[0] not in "BS":
+                raise AocModError(f"unable to parse rule: {rule}")
+            counts = part[1:].split(",") if "," in part else list(part[1:])
+            try:
+                parts[part[0]] = frozenset(int(count) for count in counts if count)
+            except ValueError:
+                raise AocModError(f"unable to parse rule: {rule}") from None
+        birth, survive = parts.get("B", frozenset()), parts.get("S", frozenset())
+    else:
+        birth, survive = (frozenset(counts) for counts in rule)
+
+    if 0 in birth:
+        raise AocModError(
+            "rules giving birth to cells without neighbors aren't supported"
+        )
+    if any(not 0 <= count <= max_neighbors for count in birth | survive):
+        raise AocModError(f"neighbor counts must be between 0 and {max_neighbors}")
+    return birth, survive
+
+
+class _NumpyChunks:
+    """Chunks stored as numpy uint8 arrays of 0 and 1"""
+
+    def __init__(
+        self, size: int, dimensions: int, birth: frozenset, survive: frozenset
+    ):
+        self.np = _import_numpy()
+        self.size = size
+        self.dimensions = dimensions
+        self.dtype = self.np.uint8 if 3**dimensions < 256 else self.np.uint16
+
+        # next state by [alive, live cells in the 3x3(x3...) box around a cell]
+        self.table = self.np.zeros((2, 3**dimensions + 1), dtype=self.np.uint8)
+        for count in birth:
+            self.table[0, count] = 1
+        for count in survive:
+            self.table[1, count + 1] = 1
+
+        # where each neighboring chunk's cells go in the padded chunk
+        self.halo = []
+        for offset in product((-1, 0, 1), repeat=dimensions):
+            target = tuple(
+                slice(0, 1)
+                if o == -1
+                else slice(size + 1, size + 2)
+                if o == 1
+                else slice(1, size + 1)
+                for o in offset
+            )
+            source = tuple(
+                slice(size - 1, size)
+                if o == -1
+                else slice(0, 1)
+                if o == 1
+                else slice(None)
+                for o in offset
+            )
+            self.halo.append((offset, target, source))
+        # the face of a chunk touching each neighboring chunk
+        self.edges = [
+            (
+                offset,
+                tuple(
+                    slice(0, 1)
+                    if o == -1
+                    else slice(size - 1, size)
+                    if o == 1
+                    else slice(None)
+                    for o in offset
+                ),
+            )
+            for offset in product((-1, 0, 1), repeat=dimensions)
+            if any(offset)
+        ]
+
+    def empty(self) -> Any:
+        return self.np.zeros((self.size,) * self.dimensions, dtype=self.np.uint8)
+
+    def get(self, chunk: Any, local: Cell) -> bool:
+        return bool(chunk[local])
+
+    def set(self, chunk: Any, local: Cell, alive: bool) -> None:
+        chunk[local] = alive
+
+    def population(self, chunk: Any) -> int:
+        return int(self.np.count_nonzero(chunk))
+
+    def cells(self, chunk: Any) -> Iterator[Cell]:
+        return (tuple(map(int, local)) for local in self.np.argwhere(chunk))
+
+    def bounds(self, chunk: Any) -> tuple[Cell, Cell]:
+        locals_ = self.np.argwhere(chunk)
+        return (
+            tuple(map(int, locals_.min(axis=0))),
+            tuple(map(int, locals_.max(axis=0))),
+        )
+
+    def touching(self, chunk: Any) -> Iterator[Cell]:
+        return (offset for offset, source in self.edges if chunk[source].any())
+
+    def step(self, chunks: dict, key: Cell) -> Any | None:
+        padded = self.np.zeros((self.size + 2,) * self.dimensions, dtype=self.dtype)
+        for offset, target, source in self.halo:
+            chunk = chunks.get(tuple(k + o for k, o in zip(key, offset)))
+            if chunk is not None:
+                padded[target] = chunk[source]
+
+        # the box sums are separable: sum three neighbors along each axis
+        box = padded
+        for axis in range(self.dimensions):
+            box = (
+                box[(slice(None),) * axis + (slice(0, -2),)]
+                + box[(slice(None),) * axis + (slice(1, -1),)]
+                + box[(slice(None),) * axis + (slice(2, None),)]
+            )
+        alive = padded[(slice(1, -1),) * self.dimensions]
+        chunk = self.table[alive, box]
+        return chunk if chunk.any() else None
+
+
+def _add_planes(first: list[int], second: list[int]) -> list[int]:
+    """add two bit-sliced numbers, given as lists of bit planes (least
+    significant first), where bit i of each plane is a digit of number i"""
+    if not first:
+        return second
+    if not second:
+        return first
+    result = []
+    carry = 0
+    for plane in range(max(len(first), len(second))):
+        a = first[plane] if plane < len(first) else 0
+        b = second[plane] if plane < len(second) else 0
+        partial = a ^ b
+        result.append(partial ^ carry)
+        carry = (a & b) | (carry & partial)
+    if carry:
+        result.append(carry)
+    return result
+
+
+class _IntChunks:
+    """Chunks stored as lists of Python ints, each holding a row of cells
+    along the last axis as bits, so that a whole row is added or compared
+    with a handful of bitwise operations"""
+
+    def __init__(
+        self, size: int, dimensions: int, birth: frozenset, survive: frozenset
+    ):
+        self.size = size
+        self.dimensions = dimensions
+        self.mask = (1 << size) - 1
+        self.birth = sorted(birth)
+        # the box around a live cell counts the cell itself too
+        self.survive = sorted(count + 1 for count in survive)
+        self.row_count = size ** (dimensions - 1)
+
+        # the padded rows, by the offset of the chunks they come from (along
+        # every axis but the last) and the row in those chunks
+        self.prefixes = list(product((-1, 0, 1), repeat=dimensions - 1))
+        self.halo_rows = []
+        for padded in product(range(size + 2), repeat=dimensions - 1):
+            prefix = tuple(-1 if p == 0 else 1 if p == size + 1 else 0 for p in padded)
+            local = tuple(
+                size - 1 if p == 0 else 0 if p == size + 1 else p - 1 for p in padded
+            )
+            self.halo_rows.append((prefix, self._row_index(local)))
+
+        # the rows and bits on each face of a chunk, to find the neighboring
+        # chunks a chunk touches
+        self.edges = []
+        for offset in product((-1, 0, 1), repeat=dimensions):
+            if not any(offset):
+                continue
+            rows = [
+                self._row_index(local)
+                for local in product(range(size), repeat=dimensions - 1)
+                if all(
+                    o == 0 or (o == -1 and p == 0) or (o == 1 and p == size - 1)
+                    for o, p in zip(offset, local)
+                )
+            ]
+            bits = {-1: 1, 0: self.mask, 1: 1 << (size - 1)}[offset[-1]]
+            self.edges.append((offset, rows, bits))
+
+    def _row_index(self, local: Cell) -> int:
+        """get the index of the row of a cell (without its last coordinate)"""
+        index = 0
+        for coordinate in local:
+            index = index * self.size + coordinate
+        return index
+
+    def empty(self) -> list[int]:
+        return [0] * self.row_count
+
+    def get(self, chunk: list[int], local: Cell) -> bool:
+        return bool(chunk[self._row_index(local[:-1])] >> local[-1] & 1)
+
+    def set(self, chunk: list[int], local: Cell, alive: bool) -> None:
+        row = self._row_index(local[:-1])
+        if alive:
+            chunk[row] |= 1 << local[-1]
+        else:
+            chunk[row] &= ~(1 << local[-1])
+
+    def population(self, chunk: list[int]) -> int:
+        return sum(row.bit_count() for row in chunk)
+
+    def _row_local(self, row: int) -> Cell:
+        """get the coordinates of a row (without its last coordinate)"""
+        local = []
+        for _ in range(self.dimensions - 1):
+            row, coordinate = divmod(row, self.size)
+            local.append(coordinate)
+        return tuple(reversed(local))
+
+    def cells(self, chunk: list[int]) -> Iterator[Cell]:
+        for row, bits in enumerate(chunk):
+            if not bits:
+                continue
+            local = self._row_local(row)
+            while bits:
+                low_bit = bits & -bits
+                yield local + (low_bit.bit_length() - 1,)
+                bits ^= low_bit
+
+    def bounds(self, chunk: list[int]) -> tuple[Cell, Cell]:
+        rows = [row for row, bits in enumerate(chunk) if bits]
+        locals_ = [self._row_local(row) for row in rows]
+        combined = 0
+        for row in rows:
+            combined |= chunk[row]
+        return (
+            tuple(map(min, zip(*locals_))) + ((combined & -combined).bit_length() - 1,),
+            tuple(map(max, zip(*locals_))) + (combined.bit_length() - 1,),
+        )
+
+    def touching(self, chunk: list[int]) -> Iterator[Cell]:
+        for offset, rows, bits in self.edges:
+            if any(chunk[row] & bits for row in rows):
+                yield offset
+
+    def _matches(self, planes: list[int], counts: list[int]) -> int:
+        """get the bits of a row where the bit-sliced box sums equal any of
+        some counts"""
+        matches = 0
+        for count in counts:
+            if count.bit_length() > len(planes):
+                continue
+            equal = self.mask
+            for plane, bits in enumerate(planes):
+                equal &= bits if count >> plane & 1 else ~bits
+            matches |= equal
+        return matches
+
+    def step(self, chunks: dict, key: Cell) -> list[int] | None:
+        size = self.size
+        prefix_key = key[:-1]
+        neighbors = {}
+        for prefix in self.prefixes:
+            chunk_key = tuple(k + o for k, o in zip(prefix_key, prefix))
+            neighbors[prefix] = (
+                chunks.get(chunk_key + (key[-1] - 1,)),
+                chunks.get(chunk_key + (key[-1],)),
+                chunks.get(chunk_key + (key[-1] + 1,)),
+            )
+
+        # sum each padded row with its neighbors along the last axis, as 2
+        # bit planes
+        mask = self.mask
+        rows = []
+        for prefix, row in self.halo_rows:
+            left, middle, right = neighbors[prefix]
+            bits = middle[row] << 1 if middle is not None else 0
+            if left is not None:
+                bits |= left[row] >> (size - 1) & 1
+            if right is not None:
+                bits |= (right[row] & 1) << (size + 1)
+            if not bits:
+                rows.append([])
+                continue
+            a, b, c = bits & mask, bits >> 1 & mask, bits >> 2 & mask
+            partial = a ^ b
+            rows.append([partial ^ c, (a & b) | (c & partial)])
+
+        # then sum three neighboring rows along each of the other axes
+        dims = [size + 2] * (self.dimensions - 1)
+        for axis in range(self.dimensions - 1):
+            inner = math.prod(dims[axis + 1 :])
+            outer = math.prod(dims[:axis])
+            length = dims[axis]
+            summed = []
+            for block in range(outer):
+                start = block * length * inner
+                for index in range(start, start + (length - 2) * inner):
+                    summed.append(
+                        _add_planes(
+                            _add_planes(rows[index], rows[index + inner]),
+                            rows[index + 2 * inner],
+                        )
+                    )
+            rows = summed
+            dims[axis] = length - 2
+
+        center = neighbors[(0,) * (self.dimensions - 1)][1]
+        chunk = []
+        for row, planes in enumerate(rows):
+            if not planes:
+                chunk.append(0)
+                continue
+            alive = center[row] if center is not None else 0
+            chunk.append(
+                alive & self._matches(planes, self.survive)
+                | ~alive & self._matches(planes, self.birth)
+            )
+        return chunk if any(chunk) else None
+
+
+class Automaton:
+    """Cellular automaton with life-like rules on an unbounded board of any
+    number of dimensions, where every cell has 3**dimensions - 1 neighbors
+    (the Moore neighborhood).
+
+    Cells are tuples of `dimensions` integers (which may be negative) and
+    only live cells are stored, in chunks of `chunk_size` cells per side.
+    Stepping a generation only processes the chunks holding live cells and
+    their neighbors, and counts neighbors for a whole chunk at once (with
+    numpy when it is installed), so large and growing boards step much
+    faster than with sets of tuples."""
+
+    def __init__(
+        self,
+        cells: Iterable[Cell] = (),
+        rule: Rule = "B3/S23",
+        dimensions: int = 2,
+        chunk_size: int | None = None,
+        use_numpy: bool | None = None,
+    ):
+        """initialize the automaton
+
+        :param cells: the live cells, defaults to ()
+        :type cells: Iterable[Cell], optional
+        :param rule: the rule, as a "B3/S23" string, a (birth, survive) tuple
+            of neighbor counts or a function of whether a cell is alive and
+            its number of live neighbors (see `parse_rule`), defaults to
+            "B3/S23" (Conway's Game of Life)
+        :type rule: Rule, optional
+        :param dimensions: number of dimensions of the board, defaults to 2
+        :type dimensions: int, optional
+        :param chunk_size: number of cells per side of a chunk, defaults to
+            None (64 in 2-D, 16 in 3-D, 8 in 4-D)
+        :type chunk_size: int | None, optional
+        :param use_numpy: count neighbors with numpy, defaults to None (if
+            numpy is installed)
+        :type use_numpy: bool | None, optional
+        :raises AocModError: if the rule is invalid, numpy is requested but
+            not installed or a cell doesn't have `dimensions` coordinates
+        """
+        if dimensions < 1:
+            raise AocModError("an automaton needs at least one dimension")
+        if chunk_size is None:
+            chunk_size = DEFAULT_CHUNK_SIZES.get(dimensions, MIN_CHUNK_SIZE)
+        if chunk_size < 2:
+            raise AocModError("chunks must be at least 2 cells per side")
+        if use_numpy is None:
+            try:
+                _import_numpy()
+                use_numpy = True
+            except AocModError:
+                use_numpy = False
+
+        self.dimensions = dimensions
+        self.chunk_size = chunk_size
+        self.birth, self.survive = parse_rule(rule, dimensions)
+        backend = _NumpyChunks if use_numpy else _IntChunks
+        self._chunks_type = backend(chunk_size, dimensions, self.birth, self.survive)
+        self._chunks: dict[Cell, Any] = {}
+        self.generation = 0
+        for cell in cells:
+            self.add(cell)
+
+    @classmethod
+    def from_grid(
+        cls, grid: Iterable[str] | str, alive: str = "#", **kwargs
+    ) -> "Automaton":
+        """create an automaton from the rows of a grid, with cell (row, col)
+        of the grid at (row, col, 0, ...) on the board
+
+        :param grid: the rows of the grid (e.g. from `parse_input` or a
+            `Grid`), or the whole text of the grid
+        :type grid: Iterable[str] | str
+        :param alive: characters of the live cells, defaults to "#"
+        :type alive: str, optional
+        :param kwargs: the other arguments of `Automaton`
+        :return: the automaton
+        :rtype: Automaton
+        """
+        if isinstance(grid, str):
+            grid = grid.splitlines()
+        padding = (0,) * (kwargs.get("dimensions", 2) - 2)
+        return cls(
+            (
+                (row, col) + padding
+                for row, line in enumerate(grid)
+                for col, char in enumerate(line)
+                if char in alive
+            ),
+            **kwargs,
+        )
+
+    def _split(self, cell: Cell) -> tuple[Cell, Cell]:
+        """get the key of the chunk of a cell and its place in the chunk"""
+        if len(cell) != self.dimensions:
+            raise AocModError(f"cell {cell} doesn't have {self.dimensions} coordinates")
+        size = self.chunk_size
+        return (
+            tuple(coordinate // size for coordinate in cell),
+            tuple(coordinate % size for coordinate in cell),
+        )
+
+    def add(self, cell: Cell) -> None:
+        """make a cell alive
+
+        :param cell: the cell
+        :type cell: Cell
+        """
+        key, local = self._split(cell)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._chunks[key] = self._chunks_type.empty()
+        self._chunks_type.set(chunk, local, True)
+
+    def discard(self, cell: Cell) -> None:
+        """make a cell dead
+
+        :param cell: the cell
+        :type cell: Cell
+        """
+        key, local = self._split(cell)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks_type.set(chunk, local, False)
+            if not self._chunks_type.population(chunk):
+                del self._chunks[key]
+
+    def __contains__(self, cell: Cell) -> bool:
+        key, local = self._split(cell)
+        chunk = self._chunks.get(key)
+        return chunk is not None and self._chunks_type.get(chunk, local)
+
+    @property
+    def population(self) -> int:
+        """the number of live cells"""
+        return sum(
+            self._chunks_type.population(chunk) for chunk in self._chunks.values()
+        )
+
+    def __len__(self) -> int:
+        return self.population
+
+    @property
+    def chunk_count(self) -> int:
+        """the number of chunks holding live cells"""
+        return len(self._chunks)
+
+    def cells(self) -> Iterator[Cell]:
+        """iterate over the live cells, chunk by chunk
+
+        :return: an iterator of cells
+        :rtype: Iterator[Cell]
+        """
+        size = self.chunk_size
+        for key, chunk in self._chunks.items():
+            origin = tuple(k * size for k in key)
+            for local in self._chunks_type.cells(chunk):
+                yield tuple(o + c for o, c in zip(origin, local))
+
+    def bounds(self) -> tuple[Cell, Cell] | None:
+        """get the bounding box of the live cells, from the bounds of each
+        chunk
+
+        :return: a tuple of the (min, max) corners of the box, both included,
+            None if no cell is alive
+        :rtype: tuple[Cell, Cell] | None
+        """
+        if not self._chunks:
+            return None
+        size = self.chunk_size
+        mins, maxs = [], []
+        for key, chunk in self._chunks.items():
+            chunk_min, chunk_max = self._chunks_type.bounds(chunk)
+            mins.append(tuple(k * size + c for k, c in zip(key, chunk_min)))
+            maxs.append(tuple(k * size + c for k, c in zip(key, chunk_max)))
+        return tuple(map(min, zip(*mins))), tuple(map(max, zip(*maxs)))
+
+    def step(self, generations: int = 1) -> None:
+        """advance the automaton
+
+        :param generations: number of generations, defaults to 1
+        :type generations: int, optional
+        """
+        chunks_type = self._chunks_type
+        for _ in range(generations):
+            active = set(self._chunks)
+            for key, chunk in self._chunks.items():
+                for offset in chunks_type.touching(chunk):
+                    active.add(tuple(k + o for k, o in zip(key, offset)))
+
+            chunks = {}
+            for key in active:
+                chunk = chunks_type.step(self._chunks, key)
+                if chunk is not None:
+                    chunks[key] = chunk
+            self._chunks = chunks
+            self.generation += 1
+
+    def render(self, alive: str = "#", dead: str = ".") -> str:
+        """draw the bounding box of a 2-D board as text
+
+        :param alive: character of the live cells, defaults to "#"
+        :type alive: str, optional
+        :param dead: character of the dead cells, defaults to "."
+        :type dead: str, optional
+        :raises AocModError: if the board isn't 2-D
+        :return: the rows of the bounding box, joined by newlines
+        :rtype: str
+        """
+        if self.dimensions != 2:
+            raise AocModError("only 2-D boards can be drawn")
+        bounds = self.bounds()
+        if bounds is None:
+            return ""
+        (min_row, min_col), (max_row, max_col) = bounds
+        rows = [[dead] * (max_col - min_col + 1) for _ in range(max_row - min_row + 1)]
+        for row, col in self.cells():
+            rows[row - min_row][col - min_col] = alive
+        return "\n".join("".join(row) for row in rows)
+
+    def __repr__(self) -> str:
+        return (
+            f"Automaton(dimensions={self.dimensions}, generation={self.generation}, "
+            f"population={self.population})"
+        )
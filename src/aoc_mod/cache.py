@@ -0,0 +1,448 @@
+"""Persistent, content-addressed cache for puzzle input and instructions, and
+the on-disk store of parsed puzzle input"""
+
+import gc
+import io
+import os
+import mmap
+import json
+import struct
+import pickle
+import hashlib
+import tempfile
+import threading
+import contextlib
+from array import array
+from pathlib import Path
+from typing import Any, Iterator
+
+CACHE_DIR_ENV_VAR = "AOC_MOD_CACHE_DIR"
+ANONYMOUS_USER = "anonymous"
+
+
+def get_cache_dir() -> Path:
+    """get the directory used for the puzzle cache and request state. this is
+    the AOC_MOD_CACHE_DIR environment variable, if set, and otherwise
+    "aoc_mod" in the XDG cache directory ($XDG_CACHE_HOME or ~/.cache)
+
+    :return: path to the cache directory (which may not exist yet)
+    :rtype: Path
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR, "")
+    if cache_dir:
+        return Path(cache_dir).expanduser()
+
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME", "")
+    if not xdg_cache_home:
+        xdg_cache_home = Path.home().joinpath(".cache")
+    return Path(xdg_cache_home).joinpath("aoc_mod")
+
+
+def hash_content(content: str) -> str:
+    """get the sha256 hex digest of a string
+
+    :param content: the string to hash
+    :type content: str
+    :return: the sha256 hex digest of the utf-8 encoded string
+    :rtype: str
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def hash_session(session_id: str) -> str:
+    """get a short, non-reversible identifier for a session-id so that cached
+    puzzle data is kept separate per user without storing the session-id
+
+    :param session_id: session-id from browser after logging into Advent of Code
+    :type session_id: str
+    :return: the first 16 characters of the session-id sha256 digest or
+        "anonymous" for an empty session-id
+    :rtype: str
+    """
+    if not session_id:
+        return ANONYMOUS_USER
+    return hash_content(session_id)[:16]
+
+
+def write_atomic(path: Path, data: str | list[bytes | memoryview]) -> None:
+    """write a file by writing a temporary file next to it and then replacing
+    the original so that readers never see a partially written file
+
+    :param path: path to the file to write
+    :type path: Path
+    :param data: text data to write to the file, or chunks of binary data
+    :type data: str | list[bytes | memoryview]
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        if isinstance(data, str):
+            with os.fdopen(fd, "w", encoding="utf-8") as f_out:
+                f_out.write(data)
+        else:
+            with os.fdopen(fd, "wb") as f_out:
+                for chunk in data:
+                    f_out.write(chunk)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+@contextlib.contextmanager
+def _lock_file(path: Path) -> Iterator[None]:
+    """hold an exclusive lock on a lock file, so that a read-modify-write of
+    a file shared with other processes isn't interleaved with theirs. the lock
+    is an `fcntl.flock`, on platforms without `fcntl` only the caller's own
+    locking applies
+
+    :param path: path to the lock file, created if missing
+    :type path: Path
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as lock_file:
+        # closing the file releases the lock
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+class PuzzleCache:
+    """On-disk store of puzzle data. Content is stored once per sha256 digest
+    under "objects/" and an index maps "{user}/{year}/{day}/{kind}" keys to
+    those digests (plus any metadata) so that lookups are a single dictionary
+    access once the index is loaded."""
+
+    def __init__(self, cache_dir: Path | str | None = None, session_id: str = ""):
+        """initialize the puzzle cache. nothing is read from or written to disk
+        until the cache is first used
+
+        :param cache_dir: directory where the cache is stored, defaults to
+            the directory from `get_cache_dir`
+        :type cache_dir: Path | str | None, optional
+        :param session_id: session-id used to separate cached data per user,
+            defaults to ""
+        :type session_id: str, optional
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir()
+        self.user = hash_session(session_id)
+
+        self._objects_dir = self.cache_dir.joinpath("objects")
+        self._index_file = self.cache_dir.joinpath("index.json")
+        self._index_lock_file = self.cache_dir.joinpath("index.json.lock")
+        self._index: dict[str, dict] | None = None
+        self._lock = threading.Lock()
+
+    def _key(self, year: int, day: int, kind: str) -> str:
+        """build the index key for a user, year, day and kind of data"""
+        return f"{self.user}/{year}/{day}/{kind}"
+
+    def _read_index(self) -> dict[str, dict]:
+        """read the index from disk, returning an empty index if the file is
+        missing or unreadable"""
+        try:
+            with self._index_file.open("r", encoding="utf-8") as f_in:
+                return json.load(f_in).get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    @property
+    def index(self) -> dict[str, dict]:
+        """the in-memory index, loaded from disk on first access"""
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _object_path(self, digest: str) -> Path:
+        """get the path of the object file for a digest"""
+        return self._objects_dir.joinpath(digest[:2], digest[2:])
+
+    def read_object(self, digest: str) -> str | None:
+        """read content from the object store
+
+        :param digest: sha256 digest of the content
+        :type digest: str
+        :return: the content or None if it is not in the store
+        :rtype: str | None
+        """
+        try:
+            return self._object_path(digest).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def write_object(self, content: str) -> str:
+        """write content to the object store, if not already present
+
+        :param content: the content to store
+        :type content: str
+        :return: sha256 digest of the content
+        :rtype: str
+        """
+        digest = hash_content(content)
+        obj_path = self._object_path(digest)
+        if not obj_path.exists():
+            write_atomic(obj_path, content)
+        return digest
+
+    def get_entry(self, year: int, day: int, kind: str) -> dict | None:
+        """get the index entry for a year, day and kind of data
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param kind: kind of data (e.g. "input" or "instructions")
+        :type kind: str
+        :return: a copy of the entry metadata or None on a cache miss
+        :rtype: dict | None
+        """
+        entry = self.index.get(self._key(year, day, kind))
+        return dict(entry) if entry is not None else None
+
+    def set_entry(self, year: int, day: int, kind: str, entry: dict) -> None:
+        """set the index entry for a year, day and kind of data
+
+        the on-disk index is re-read before writing, under a lock shared with
+        other threads and processes, so that entries written by them since this
+        cache was loaded are not lost
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param kind: kind of data (e.g. "input" or "instructions")
+        :type kind: str
+        :param entry: metadata to store for the entry
+        :type entry: dict
+        """
+        key = self._key(year, day, kind)
+        with self._lock, _lock_file(self._index_lock_file):
+            index = self._read_index()
+            index[key] = entry
+            write_atomic(self._index_file, json.dumps({"version": 1, "entries": index}))
+            self._index = index
+
+    def get(self, year: int, day: int, kind: str) -> str | None:
+        """get cached content for a year, day and kind of data
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param kind: kind of data (e.g. "input" or "instructions")
+        :type kind: str
+        :return: the cached content or None on a cache miss
+        :rtype: str | None
+        """
+        entry = self.index.get(self._key(year, day, kind))
+        if entry is None:
+            return None
+        return self.read_object(entry["sha256"])
+
+    def put(self, year: int, day: int, kind: str, content: str, **metadata) -> str:
+        """store content for a year, day and kind of data
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param kind: kind of data (e.g. "input" or "instructions")
+        :type kind: str
+        :param content: the content to store
+        :type content: str
+        :return: sha256 digest of the content
+        :rtype: str
+        """
+        digest = self.write_object(content)
+        self.set_entry(year, day, kind, {"sha256": digest, **metadata})
+        return digest
+
+
+# parsed input files start with a header of (magic, format version, number of
+# buffers, pickle size), followed by an (offset, size) entry for each buffer,
+# the pickle stream and then the buffers themselves, each aligned to
+# PARSED_ALIGNMENT bytes
+PARSED_MAGIC = b"AOCPARSE"
+PARSED_VERSION = 1
+PARSED_ALIGNMENT = 64
+_PARSED_HEADER = struct.Struct("<8sIIQ")
+_PARSED_BUFFER = struct.Struct("<QQ")
+
+
+def _load_array(typecode: str, buffer: memoryview) -> array:
+    """rebuild an array.array from its buffer"""
+    value = array(typecode)
+    value.frombytes(buffer)
+    return value
+
+
+def _load_memoryview(buffer: memoryview, fmt: str, shape: tuple) -> memoryview:
+    """rebuild a (possibly multi-dimensional) memoryview from its buffer"""
+    return memoryview(buffer).cast("B").cast(fmt, shape)
+
+
+class _ParsedPickler(pickle.Pickler):
+    """Pickler that also passes the data of array.array objects and
+    memoryviews (such as the grids of `parse_char_grid`) out of band, next to
+    numpy arrays, instead of copying it into the pickle stream"""
+
+    def reducer_override(self, obj: Any) -> Any:
+        if type(obj) is array:
+            return _load_array, (obj.typecode, pickle.PickleBuffer(obj))
+        if type(obj) is memoryview:
+            if not obj.c_contiguous:
+                obj = (
+                    memoryview(bytearray(obj.tobytes()))
+                    .cast("B")
+                    .cast(obj.format, obj.shape)
+                )
+            return _load_memoryview, (pickle.PickleBuffer(obj), obj.format, obj.shape)
+        return NotImplemented
+
+
+def dump_parsed(value: Any) -> list[bytes | memoryview]:
+    """serialize a parsed input with pickle protocol 5, keeping the data of
+    numpy arrays, array.array objects and memoryviews in aligned buffers
+    after the pickle stream so they can be loaded without copying
+
+    :param value: the value to serialize
+    :type value: Any
+    :raises pickle.PicklingError: if the value can't be pickled
+    :return: the chunks of the serialized value
+    :rtype: list[bytes | memoryview]
+    """
+    buffers: list[pickle.PickleBuffer] = []
+    stream = io.BytesIO()
+    _ParsedPickler(stream, protocol=5, buffer_callback=buffers.append).dump(value)
+    pickled = stream.getbuffer()
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
+    offset = _PARSED_HEADER.size + len(raw_buffers) * _PARSED_BUFFER.size
+    offset += len(pickled)
+    entries, buffer_chunks = [], []
+    for raw in raw_buffers:
+        padding = -offset % PARSED_ALIGNMENT
+        buffer_chunks += [bytes(padding), raw]
+        entries.append(_PARSED_BUFFER.pack(offset + padding, raw.nbytes))
+        offset += padding + raw.nbytes
+
+    header = _PARSED_HEADER.pack(
+        PARSED_MAGIC, PARSED_VERSION, len(raw_buffers), len(pickled)
+    )
+    return [header, *entries, pickled, *buffer_chunks]
+
+
+def load_parsed(data: memoryview) -> Any:
+    """deserialize a parsed input written by `dump_parsed`. the buffers of
+    the value are slices of the data, so they share its memory
+
+    :param data: the serialized value
+    :type data: memoryview
+    :raises ValueError: if the data isn't a serialized value of this version
+    :return: the deserialized value
+    :rtype: Any
+    """
+    magic, version, count, size = _PARSED_HEADER.unpack_from(data)
+    if magic != PARSED_MAGIC or version != PARSED_VERSION:
+        raise ValueError("not a parsed input of this version")
+
+    start = _PARSED_HEADER.size + count * _PARSED_BUFFER.size
+    buffers = [
+        data[offset : offset + buffer_size]
+        for offset, buffer_size in _PARSED_BUFFER.iter_unpack(
+            data[_PARSED_HEADER.size : start]
+        )
+    ]
+    # unpickling a large graph creates millions of containers, and letting
+    # the cyclic garbage collector run over them takes longer than the load
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.loads(data[start : start + size], buffers=buffers)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+class ParseCache:
+    """On-disk store of parsed puzzle input. Each parse function and input
+    file (the "name") keeps a single entry under "parsed/", stored under a
+    key that changes with the input and the parse function, so a new entry
+    replaces the stale one.
+
+    Entries are pickles, so only load a cache directory you wrote yourself."""
+
+    def __init__(self, cache_dir: Path | str | None = None):
+        """initialize the parse cache. nothing is read from or written to disk
+        until the cache is first used
+
+        :param cache_dir: directory where the cache is stored, defaults to
+            the directory from `get_cache_dir`
+        :type cache_dir: Path | str | None, optional
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir()
+        self._parsed_dir = self.cache_dir.joinpath("parsed")
+
+    def _path(self, name: str, key: str) -> Path:
+        """get the path of the entry for a name and key"""
+        return self._parsed_dir.joinpath(name, key)
+
+    def get(self, name: str, key: str, use_mmap: bool = False) -> tuple[bool, Any]:
+        """get a parsed input from the cache
+
+        :param name: name of the parse function and input
+        :type name: str
+        :param key: key of the entry, which changes with the input and the
+            parse function
+        :type key: str
+        :param use_mmap: map the entry into memory (copy-on-write) instead of
+            reading it, so array data is only paged in when it is used,
+            defaults to False
+        :type use_mmap: bool, optional
+        :return: a tuple of (whether the entry was found, parsed input). an
+            entry that can't be loaded (e.g. a class it uses was renamed) is
+            treated as missing
+        :rtype: tuple[bool, Any]
+        """
+        try:
+            with self._path(name, key).open("rb") as f_in:
+                if use_mmap:
+                    data = memoryview(
+                        mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_COPY)
+                    )
+                else:
+                    data = memoryview(bytearray(f_in.read()))
+            return True, load_parsed(data)
+        except Exception:
+            return False, None
+
+    def put(self, name: str, key: str, value: Any) -> bool:
+        """store a parsed input in the cache, replacing any other entry with
+        the same name
+
+        :param name: name of the parse function and input
+        :type name: str
+        :param key: key of the entry, which changes with the input and the
+            parse function
+        :type key: str
+        :param value: the parsed input
+        :type value: Any
+        :return: True if it was stored, False if it can't be pickled or
+            written
+        :rtype: bool
+        """
+        path = self._path(name, key)
+        try:
+            write_atomic(path, dump_parsed(value))
+        except Exception:
+            return False
+
+        for stale_path in path.parent.iterdir():
+            if stale_path.name != key and not stale_path.name.startswith("."):
+                stale_path.unlink(missing_ok=True)
+        return True
@@ -0,0 +1,256 @@
+"""Find the cycle of a repeating simulation and skip ahead to the state after
+any number of steps, for puzzles asking for the state after 1000000000 steps.
+
+States are compared by a key (the state itself by default). Instead of
+keeping every state seen so far, the "table" method keeps a fingerprint of
+each key (a 128-bit blake2b digest of its bytes, or of the keys packed by
+`aoc_mod.memo.pack_key`, and the key itself for other types, since a hash
+alone could collide) and the "brent" method keeps a single key, with Brent's
+algorithm. Both need the step function to return a new state rather than
+change the one it is given, since states may be stepped again from the
+start to find where the cycle begins."""
+
+import hashlib
+from typing import Any, Callable
+
+from aoc_mod.memo import pack_key
+from aoc_mod.utilities import AocModError
+
+CYCLE_METHODS = ("table", "brent")
+
+
+def _get_fingerprint(key: Any) -> Any:
+    """get a small fingerprint of a state key: the blake2b digest of its bytes
+    or of its packed form, or the key itself if it can't be packed"""
+    if not isinstance(key, (bytes, bytearray, memoryview)):
+        try:
+            key = pack_key(key)
+        except AocModError:
+            return key
+    return hashlib.blake2b(key, digest_size=16).digest()
+
+
+def _default_key(state: Any) -> Any:
+    """get the key of a state: its bytes if it has `tobytes` (as `Grid` and
+    numpy arrays do), the state itself otherwise"""
+    tobytes = getattr(state, "tobytes", None)
+    return tobytes() if tobytes is not None else state
+
+
+class CycleResult:
+    """The state of a simulation after some number of steps and the cycle
+    found on the way, if any"""
+
+    def __init__(
+        self,
+        state: Any,
+        steps: int,
+        simulated: int,
+        length: int | None,
+        start: int | None,
+        find_start: Callable[[], int] | None = None,
+    ):
+        """initialize the result
+
+        :param state: the state after `steps` steps
+        :type state: Any
+        :param steps: the number of steps
+        :type steps: int
+        :param simulated: the number of calls of the step function it took
+        :type simulated: int
+        :param length: the length of the cycle, None if no cycle was found
+            before `steps` steps
+        :type length: int | None
+        :param start: the first step of the cycle, None if it isn't known yet
+        :type start: int | None
+        :param find_start: function finding the start of the cycle, defaults
+            to None
+        :type find_start: Callable[[], int] | None, optional
+        """
+        self.state = state
+        self.steps = steps
+        self.simulated = simulated
+        self.length = length
+        self._start = start
+        self._find_start = find_start
+
+    @property
+    def start(self) -> int | None:
+        """the first step of the cycle (the number of steps before the first
+        repeated state), None if no cycle was found. it is found when first
+        asked for if the method didn't give it, by stepping from the initial
+        state again"""
+        if self._start is None and self._find_start is not None:
+            self._start = self._find_start()
+            self._find_start = None
+        return self._start
+
+    def __repr__(self) -> str:
+        return (
+            f"CycleResult(steps={self.steps}, length={self.length}, "
+            f"start={self._start}, simulated={self.simulated})"
+        )
+
+
+def _find_start(
+    state: Any, step: Callable[[Any], Any], key: Callable[[Any], Any], length: int
+) -> int:
+    """find the first step of a cycle of known length from the initial state,
+    with two states `length` steps apart (the second phase of Brent's
+    algorithm)"""
+    ahead = state
+    for _ in range(length):
+        ahead = step(ahead)
+    start = 0
+    while key(state) != key(ahead):
+        state, ahead = step(state), step(ahead)
+        start += 1
+    return start
+
+
+def _advance(state: Any, step: Callable[[Any], Any], count: int) -> Any:
+    for _ in range(count):
+        state = step(state)
+    return state
+
+
+def fast_forward(
+    state: Any,
+    step: Callable[[Any], Any],
+    steps: int | None,
+    key: Callable[[Any], Any] | None = None,
+    method: str = "table",
+    sample: int = 1,
+    max_steps: int | None = None,
+) -> CycleResult:
+    """get the state of a simulation after a number of steps, skipping whole
+    cycles once the simulation repeats a state
+
+    :param state: the initial state
+    :type state: Any
+    :param step: function returning the next state of a state (without
+        changing it)
+    :type step: Callable[[Any], Any]
+    :param steps: the number of steps, None to stop at the first cycle found
+    :type steps: int | None
+    :param key: function returning a hashable key of a state, equal for
+        equal states (such as `pack_key` or the bytes of a grid), defaults to
+        None (the bytes of states with `tobytes` and the states otherwise)
+    :type key: Callable[[Any], Any] | None, optional
+    :param method: "table" to keep a fingerprint of each state (or of one
+        state in `sample`), "brent" to keep a single key with Brent's
+        algorithm (stepping up to about twice as many states), defaults to
+        "table"
+    :type method: str, optional
+    :param sample: with "table", only keep the fingerprint of one state in
+        `sample`, so that the table is `sample` times smaller and a cycle is
+        found up to `sample` steps later, defaults to 1
+    :type sample: int, optional
+    :param max_steps: maximum number of steps to simulate, defaults to None
+        (no maximum)
+    :type max_steps: int | None, optional
+    :raises AocModError: if the method is unknown, or `steps` is None and no
+        cycle was found within `max_steps`
+    :return: the state after `steps` steps (or after the steps it took to
+        find the cycle) with the cycle's `length` and `start`
+    :rtype: CycleResult
+    """
+    if method not in CYCLE_METHODS:
+        raise AocModError(f"unknown cycle detection method: {method}")
+    if key is None:
+        key = _default_key
+    initial = state
+    limit = steps if steps is not None else max_steps
+
+    def make_result(state, current, length, start):
+        target = steps if steps is not None else current
+        if length is not None and target > current:
+            state = _advance(state, step, (target - current) % length)
+        return CycleResult(
+            state,
+            target,
+            simulated,
+            length,
+            start,
+            None
+            if start is not None
+            else lambda: _find_start(initial, step, key, length),
+        )
+
+    current = simulated = 0
+    if method == "table":
+        seen: dict[Any, int] = {}
+        while True:
+            # every state is looked up, but only one in `sample` is kept: the
+            # first kept state in the cycle is found again a cycle later
+            fingerprint = _get_fingerprint(key(state))
+            previous = seen.get(fingerprint)
+            if previous is not None:
+                # with every state kept, the first repeat is the start
+                start = previous if sample == 1 else None
+                return make_result(state, current, current - previous, start)
+            if current % sample == 0:
+                seen[fingerprint] = current
+            if limit is not None and current >= limit:
+                break
+            state = step(state)
+            current += 1
+            simulated += 1
+    elif limit is None or limit > 0:
+        # compare each state with the last checkpoint, moving the checkpoint
+        # to the current state after 1, 2, 4, 8... steps
+        power = length = 1
+        checkpoint = key(state)
+        state = step(state)
+        current = simulated = 1
+        while True:
+            state_key = key(state)
+            if state_key == checkpoint:
+                return make_result(state, current, length, None)
+            if limit is not None and current >= limit:
+                break
+            if power == length:
+                checkpoint = state_key
+                power *= 2
+                length = 0
+            state = step(state)
+            current += 1
+            simulated += 1
+            length += 1
+
+    if steps is None:
+        raise AocModError(f"no cycle found within {max_steps} steps")
+    return CycleResult(state, current, simulated, None, None)
+
+
+def find_cycle(
+    state: Any,
+    step: Callable[[Any], Any],
+    key: Callable[[Any], Any] | None = None,
+    method: str = "table",
+    sample: int = 1,
+    max_steps: int | None = None,
+) -> CycleResult:
+    """simulate until a state repeats and get the cycle, see fast_forward()
+
+    :param state: the initial state
+    :type state: Any
+    :param step: function returning the next state of a state
+    :type step: Callable[[Any], Any]
+    :param key: function returning a hashable key of a state, defaults to
+        None
+    :type key: Callable[[Any], Any] | None, optional
+    :param method: "table" or "brent", defaults to "table"
+    :type method: str, optional
+    :param sample: with "table", keep one state in `sample`, defaults to 1
+    :type sample: int, optional
+    :param max_steps: maximum number of steps to simulate, defaults to None
+    :type max_steps: int | None, optional
+    :raises AocModError: if no cycle was found within `max_steps`
+    :return: the cycle's `length` and `start`, with the state after the
+        steps it took to find it
+    :rtype: CycleResult
+    """
+    return fast_forward(
+        state, step, None, key=key, method=method, sample=sample, max_steps=max_steps
+    )
@@ -0,0 +1,426 @@
+"""Compact grid of characters for grid puzzles, stored in one flat bytearray"""
+
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from aoc_mod.utilities import AocModError, _import_numpy, read_input_bytes
+
+# byte value of the border around the grid, which no cell can hold
+BORDER = 0
+
+
+class Grid:
+    """Grid of characters stored row by row in one flat bytearray with a
+    border of BORDER bytes around it, one byte per cell.
+
+    Cells are addressed by (row, col) tuples, like a dict of tuples, or by
+    integer indexes into `data`, which are much faster to work with: the
+    neighbors of a cell are at the index plus each of `offsets4` (up, right,
+    down, left) or `offsets8` (clockwise from up), and thanks to the border a
+    neighbor outside the grid is a BORDER byte instead of a wrapped around
+    cell, so no bounds checks are needed.
+
+    `transpose`, `rotate`, `flip_vertical` and `flip_horizontal` return views
+    sharing the same bytes, so changes to a view are changes to the grid.
+    Indexes are always indexes into `data`, so an index means the same cell
+    in every view of a grid."""
+
+    __slots__ = (
+        "_data",
+        "_width",
+        "_offset",
+        "_row_step",
+        "_col_step",
+        "rows",
+        "cols",
+        "offsets4",
+        "offsets8",
+    )
+
+    def __init__(self, rows: Iterable[str | bytes] | str | bytes):
+        """initialize the grid
+
+        :param rows: the rows of the grid (e.g. from `parse_input`), or the
+            whole text of the grid
+        :type rows: Iterable[str | bytes] | str | bytes
+        :raises AocModError: if the grid is empty, not rectangular or holds
+            NUL bytes
+        """
+        if isinstance(rows, (str, bytes, bytearray)):
+            rows = rows.splitlines()
+        lines = [
+            row.encode("latin-1") if isinstance(row, str) else bytes(row)
+            for row in rows
+        ]
+        while lines and not lines[-1]:
+            lines.pop()
+
+        cols = len(lines[0]) if lines else 0
+        if not cols or any(len(line) != cols for line in lines):
+            raise AocModError("grid is empty or not rectangular")
+        if any(b"\0" in line for line in lines):
+            raise AocModError("grid cells can't hold NUL bytes")
+
+        width = cols + 2
+        border = bytes(width + 1)
+        data = bytearray(border + b"\0\0".join(lines) + border)
+        self._set_view(data, width, width + 1, width, 1, len(lines), cols)
+
+    def _set_view(
+        self,
+        data: bytearray,
+        width: int,
+        offset: int,
+        row_step: int,
+        col_step: int,
+        rows: int,
+        cols: int,
+    ) -> None:
+        """set the bytes of the grid and how the cells are laid out in them:
+        cell (row, col) is at offset + row * row_step + col * col_step"""
+        self._data = data
+        self._width = width
+        self._offset = offset
+        self._row_step = row_step
+        self._col_step = col_step
+        self.rows = rows
+        self.cols = cols
+        self.offsets4 = (-row_step, col_step, row_step, -col_step)
+        self.offsets8 = (
+            -row_step,
+            col_step - row_step,
+            col_step,
+            row_step + col_step,
+            row_step,
+            row_step - col_step,
+            -col_step,
+            -row_step - col_step,
+        )
+
+    def _view(self, offset: int, row_step: int, col_step: int) -> "Grid":
+        """get a view of the same bytes with another layout"""
+        grid = Grid.__new__(Grid)
+        rows, cols = (self.rows, self.cols)
+        if abs(row_step) != abs(self._row_step):
+            rows, cols = cols, rows
+        grid._set_view(self._data, self._width, offset, row_step, col_step, rows, cols)
+        return grid
+
+    @classmethod
+    def from_input(cls, input_path: Path) -> "Grid":
+        """read a grid from the puzzle input
+
+        :param input_path: path to the input file
+        :type input_path: Path
+        :raises AocModError: if the file can't be read or isn't a rectangular
+            grid
+        :return: the grid
+        :rtype: Grid
+        """
+        lines = bytes(read_input_bytes(input_path)).splitlines()
+        try:
+            return cls(lines)
+        except AocModError as err:
+            raise AocModError(
+                f"input is not a valid grid ({err}): {input_path}"
+            ) from None
+
+    @classmethod
+    def from_numpy(cls, array: Any) -> "Grid":
+        """copy a 2-D numpy array of byte values into a grid
+
+        :param array: the array, such as one from `to_numpy`
+        :type array: numpy.ndarray
+        :raises AocModError: if numpy isn't installed or the array isn't a
+            valid grid
+        :return: the grid
+        :rtype: Grid
+        """
+        np = _import_numpy()
+        array = np.asarray(array, dtype=np.uint8)
+        if array.ndim != 2:
+            raise AocModError("grid arrays must be 2-D")
+        return cls([row.tobytes() for row in array])
+
+    @property
+    def data(self) -> bytearray:
+        """the bytes of the grid, border included, indexed by cell index"""
+        return self._data
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """the (rows, cols) of the grid"""
+        return self.rows, self.cols
+
+    def index(self, row: int, col: int) -> int:
+        """get the index of a cell
+
+        :param row: row of the cell
+        :type row: int
+        :param col: column of the cell
+        :type col: int
+        :raises IndexError: if the cell is outside the grid
+        :return: the index of the cell in `data`
+        :rtype: int
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError(f"cell {(row, col)} is outside the grid")
+        return self._offset + row * self._row_step + col * self._col_step
+
+    def cell(self, index: int) -> tuple[int, int]:
+        """get the (row, col) cell at an index
+
+        :param index: the index of the cell in `data`
+        :type index: int
+        :raises IndexError: if the index isn't a cell of the grid
+        :return: the cell
+        :rtype: tuple[int, int]
+        """
+        data_row, data_col = divmod(index, self._width)
+        offset_row, offset_col = divmod(self._offset, self._width)
+        row_delta, col_delta = data_row - offset_row, data_col - offset_col
+        # each step is either +/-1 or +/-width, depending on the orientation
+        if abs(self._col_step) == 1:
+            row = row_delta * self._row_step // self._width
+            col = col_delta * self._col_step
+        else:
+            row = col_delta * self._row_step
+            col = row_delta * self._col_step // self._width
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError(f"index {index} isn't a cell of the grid")
+        return row, col
+
+    def cells(self) -> Iterator[int]:
+        """iterate over the indexes of the cells, row by row
+
+        :return: an iterator of cell indexes
+        :rtype: Iterator[int]
+        """
+        for row in range(self.rows):
+            start = self._offset + row * self._row_step
+            yield from range(start, start + self.cols * self._col_step, self._col_step)
+
+    def neighbors(self, index: int, diagonal: bool = False) -> list[int]:
+        """get the indexes of the neighbors of a cell inside the grid
+
+        :param index: the index of the cell
+        :type index: int
+        :param diagonal: include the diagonal neighbors, defaults to False
+        :type diagonal: bool, optional
+        :return: the indexes of the neighbors, clockwise from up
+        :rtype: list[int]
+        """
+        data = self._data
+        offsets = self.offsets8 if diagonal else self.offsets4
+        return [index + offset for offset in offsets if data[index + offset]]
+
+    def _get_index(self, key: tuple[int, int] | int) -> int:
+        """get the index of a (row, col) cell or check an index"""
+        if isinstance(key, tuple):
+            return self.index(*key)
+        if not 0 <= key < len(self._data) or self._data[key] == BORDER:
+            raise IndexError(f"index {key} isn't a cell of the grid")
+        return key
+
+    def __getitem__(self, key: tuple[int, int] | int) -> str:
+        return chr(self._data[self._get_index(key)])
+
+    def __setitem__(self, key: tuple[int, int] | int, value: str | int) -> None:
+        if isinstance(value, str):
+            value = ord(value)
+        if value == BORDER:
+            raise AocModError("grid cells can't hold NUL bytes")
+        self._data[self._get_index(key)] = value
+
+    def get(self, cell: tuple[int, int], default: Any = None) -> str | Any:
+        """get the character of a cell, or a default outside the grid
+
+        :param cell: the (row, col) cell
+        :type cell: tuple[int, int]
+        :param default: value returned outside the grid, defaults to None
+        :type default: Any, optional
+        :return: the character of the cell or the default
+        :rtype: str | Any
+        """
+        row, col = cell
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return chr(
+                self._data[self._offset + row * self._row_step + col * self._col_step]
+            )
+        return default
+
+    def __contains__(self, cell: tuple[int, int]) -> bool:
+        row, col = cell
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def find_all(self, chars: str) -> list[tuple[int, int]]:
+        """find the cells holding any of some characters
+
+        :param chars: the characters to find
+        :type chars: str
+        :return: the (row, col) cells, row by row
+        :rtype: list[tuple[int, int]]
+        """
+        data = self._data
+        cells = []
+        for value in chars.encode("latin-1"):
+            index = data.find(value)
+            while index != -1:
+                cells.append(self.cell(index))
+                index = data.find(value, index + 1)
+        return sorted(cells)
+
+    def find(self, chars: str) -> tuple[int, int] | None:
+        """find the first cell holding any of some characters
+
+        :param chars: the characters to find
+        :type chars: str
+        :return: the first (row, col) cell found, row by row, or None
+        :rtype: tuple[int, int] | None
+        """
+        if self._row_step == self._width and self._col_step == 1:
+            # the grid isn't transformed, so the first index is the first cell
+            indexes = [self._data.find(value) for value in chars.encode("latin-1")]
+            indexes = [index for index in indexes if index != -1]
+            return self.cell(min(indexes)) if indexes else None
+
+        cells = self.find_all(chars)
+        return cells[0] if cells else None
+
+    def count(self, chars: str) -> int:
+        """count the cells holding any of some characters
+
+        :param chars: the characters to count
+        :type chars: str
+        :return: the number of cells
+        :rtype: int
+        """
+        return sum(self._data.count(value) for value in chars.encode("latin-1"))
+
+    def replace(self, old: str, new: str) -> None:
+        """replace characters in every cell of the grid, like str.translate
+
+        :param old: the characters to replace
+        :type old: str
+        :param new: the character replacing each of them (the same length as
+            old)
+        :type new: str
+        :raises AocModError: if a replacement is a NUL byte
+        """
+        table = bytes.maketrans(old.encode("latin-1"), new.encode("latin-1"))
+        if b"\0" in new.encode("latin-1"):
+            raise AocModError("grid cells can't hold NUL bytes")
+        self._data[:] = self._data.translate(table)
+
+    def transpose(self) -> "Grid":
+        """get a view of the grid with rows and columns swapped
+
+        :return: the transposed view
+        :rtype: Grid
+        """
+        return self._view(self._offset, self._col_step, self._row_step)
+
+    def flip_vertical(self) -> "Grid":
+        """get a view of the grid upside down
+
+        :return: the flipped view
+        :rtype: Grid
+        """
+        return self._view(
+            self._offset + (self.rows - 1) * self._row_step,
+            -self._row_step,
+            self._col_step,
+        )
+
+    def flip_horizontal(self) -> "Grid":
+        """get a view of the grid mirrored left to right
+
+        :return: the flipped view
+        :rtype: Grid
+        """
+        return self._view(
+            self._offset + (self.cols - 1) * self._col_step,
+            self._row_step,
+            -self._col_step,
+        )
+
+    def rotate(self, turns: int = 1) -> "Grid":
+        """get a view of the grid rotated clockwise
+
+        :param turns: number of quarter turns, negative to rotate
+            counter-clockwise, defaults to 1
+        :type turns: int, optional
+        :return: the rotated view
+        :rtype: Grid
+        """
+        grid = self
+        for _ in range(turns % 4):
+            grid = grid.transpose().flip_horizontal()
+        return grid
+
+    def copy(self) -> "Grid":
+        """copy the grid (or view) into a new grid with its own bytes
+
+        :return: the copy
+        :rtype: Grid
+        """
+        return Grid(self.row_bytes(row) for row in range(self.rows))
+
+    def row_bytes(self, row: int) -> bytes:
+        """get the bytes of a row
+
+        :param row: the row
+        :type row: int
+        :return: the bytes of the cells of the row
+        :rtype: bytes
+        """
+        start = self.index(row, 0)
+        # the border keeps the end of the slice from going below 0
+        return bytes(
+            self._data[start : start + self.cols * self._col_step : self._col_step]
+        )
+
+    def tobytes(self) -> bytes:
+        """get the bytes of every cell, row by row
+
+        :return: the bytes
+        :rtype: bytes
+        """
+        return b"".join(self.row_bytes(row) for row in range(self.rows))
+
+    def to_numpy(self) -> Any:
+        """get a 2-D numpy uint8 array sharing the bytes of the grid, so that
+        changes to either one are seen by the other
+
+        :raises AocModError: if numpy isn't installed
+        :return: the array
+        :rtype: numpy.ndarray
+        """
+        np = _import_numpy()
+        return np.ndarray(
+            (self.rows, self.cols),
+            dtype=np.uint8,
+            buffer=self._data,
+            offset=self._offset,
+            strides=(self._row_step, self._col_step),
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(self.rows):
+            yield self.row_bytes(row).decode("latin-1")
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __str__(self) -> str:
+        return "\n".join(self)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.shape == other.shape and self.tobytes() == other.tobytes()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Grid(rows={self.rows}, cols={self.cols})"
@@ -0,0 +1,663 @@
+"""Lean extraction of puzzle page content and its conversion to markdown.
+
+Puzzle pages only need the children of their <main> element (and submission
+responses the first child of their <article>), so instead of building a
+BeautifulSoup tree of the whole page and running markdownify over each
+child, the page is tokenized with the standard library's html.parser and
+only that subtree is built, as a tree of small slotted nodes. The nodes are
+converted to markdown in one pass by a port of markdownify's converter
+(with its default options), which produces the same markdown byte for byte.
+
+Elements whose markdownify conversion isn't ported (tables, definition
+lists and videos, none of which are used on puzzle pages) raise
+UnsupportedHtml, and callers fall back to markdownify for that element.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Union
+
+# tags that BeautifulSoup closes as soon as they are opened
+VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "basefont",
+        "bgsound",
+        "br",
+        "col",
+        "command",
+        "embed",
+        "frame",
+        "hr",
+        "image",
+        "img",
+        "input",
+        "isindex",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "nextid",
+        "param",
+        "source",
+        "spacer",
+        "track",
+        "wbr",
+    }
+)
+# tags whose whitespace-only strings BeautifulSoup keeps as they are
+PRESERVE_WHITESPACE_TAGS = frozenset({"pre", "textarea"})
+# tags with a markdownify conversion that isn't ported
+UNSUPPORTED_TAGS = frozenset(
+    {
+        "caption",
+        "dd",
+        "dl",
+        "dt",
+        "figcaption",
+        "list",
+        "table",
+        "td",
+        "th",
+        "tr",
+        "video",
+    }
+)
+# block-level tags (besides headings) that drop the whitespace inside them
+BLOCK_TAGS = frozenset(
+    {
+        "p",
+        "blockquote",
+        "article",
+        "div",
+        "section",
+        "ol",
+        "ul",
+        "li",
+        "dl",
+        "dt",
+        "dd",
+        "table",
+        "thead",
+        "tbody",
+        "tfoot",
+        "tr",
+        "td",
+        "th",
+    }
+)
+DOCUMENT = "[document]"
+
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+_HEADING = re.compile(r"h(\d+)")
+_LINE_WITH_CONTENT = re.compile(r"^(.*)", flags=re.MULTILINE)
+_WHITESPACE = re.compile(r"[\t ]+")
+_ALL_WHITESPACE = re.compile(r"[\t \r\n]+")
+_NEWLINE_WHITESPACE = re.compile(r"[\t \r\n]*[\r\n][\t \r\n]*")
+_PRE_LSTRIP = re.compile(r"^[ \n]*\n")
+_PRE_RSTRIP = re.compile(r"[ \n]*$")
+_EXTRACT_NEWLINES = re.compile(r"^(\n*)((?:.*[^\n])?)(\n*)$", flags=re.DOTALL)
+_BACKTICK_RUNS = re.compile(r"`+")
+_INLINE_MARKUP = {
+    "b": "**",
+    "strong": "**",
+    "em": "*",
+    "i": "*",
+    "del": "~~",
+    "s": "~~",
+    "sub": "",
+    "sup": "",
+}
+
+
+class UnsupportedHtml(Exception):
+    """raised for html that can't be converted like markdownify would"""
+
+
+class HtmlElement:
+    """an html element with its attributes and child nodes"""
+
+    __slots__ = ("name", "attrs", "children", "parent")
+
+    def __init__(self, name: str, attrs: dict[str, str], parent=None):
+        self.name = name
+        self.attrs = attrs
+        self.children: list[HtmlNode] = []
+        self.parent = parent
+
+
+class HtmlText:
+    """a string (or comment) in an html document"""
+
+    __slots__ = ("data", "parent", "is_comment")
+
+    def __init__(self, data: str, parent: HtmlElement, is_comment: bool = False):
+        self.data = data
+        self.parent = parent
+        self.is_comment = is_comment
+
+
+HtmlNode = Union[HtmlElement, HtmlText]
+
+
+class _StopParsing(Exception):
+    """raised to stop parsing once the container element has been closed"""
+
+
+class _SubtreeParser(HTMLParser):
+    """html parser that builds the children of the first `container`
+    element (or the whole document) like BeautifulSoup's "html.parser" tree
+    builder would, giving each child its own document node"""
+
+    def __init__(self, container: str = ""):
+        super().__init__(convert_charrefs=True)
+        self.container = container
+        # (source html, document node) of each child of the container
+        self.children: list[tuple[str, HtmlElement]] = []
+        # open elements, starting with the container (or the document)
+        self.stack: list[HtmlElement] = []
+        self._data: list[str] = []
+        self._html = ""
+        self._child_start = 0
+        self._line_offsets = [0]
+
+        if not container:
+            self.stack.append(HtmlElement(DOCUMENT, {}))
+
+    def _get_offset(self) -> int:
+        """get the offset of the current position in the source html"""
+        line, column = self.getpos()
+        return self._line_offsets[line - 1] + column
+
+    def parse(self, html: str) -> None:
+        """parse an html document
+
+        :param html: the html document
+        :type html: str
+        """
+        self._html = html
+        offset = html.find("\n")
+        while offset != -1:
+            self._line_offsets.append(offset + 1)
+            offset = html.find("\n", offset + 1)
+
+        try:
+            self.feed(html)
+            self.close()
+        except _StopParsing:
+            return
+
+        # close the elements left open at the end of the document
+        self._flush_data()
+        if self.container and len(self.stack) > 1:
+            self.children.append((html[self._child_start :], self.stack[1].parent))
+
+    def _flush_data(self, is_comment: bool = False) -> None:
+        """add the text collected since the last tag to the open element"""
+        if not self._data or not self.stack:
+            self._data = []
+            return
+
+        data = "".join(self._data)
+        self._data = []
+        if not any(element.name in PRESERVE_WHITESPACE_TAGS for element in self.stack):
+            if not data.strip(_ASCII_SPACES):
+                data = "\n" if "\n" in data else " "
+        self._add_child(HtmlText(data, self.stack[-1], is_comment))
+
+    def _add_child(self, node: HtmlNode) -> None:
+        """add a node to the open element. children of the container get a
+        document node of their own"""
+        parent = self.stack[-1]
+        if self.container and len(self.stack) == 1:
+            document = HtmlElement(DOCUMENT, {})
+            document.children.append(node)
+            node.parent = document
+            if isinstance(node, HtmlText):
+                self.children.append((node.data, document))
+        else:
+            parent.children.append(node)
+
+    def handle_starttag(self, tag, attrs, is_void: bool = True):
+        if not self.stack:
+            if tag == self.container:
+                self.stack.append(HtmlElement(tag, {}))
+            return
+
+        self._flush_data()
+        attr_dict = {name: "" if value is None else value for name, value in attrs}
+        if self.container and len(self.stack) == 1:
+            self._child_start = self._get_offset()
+        element = HtmlElement(tag, attr_dict, self.stack[-1])
+        self._add_child(element)
+        self.stack.append(element)
+
+        if is_void and tag in VOID_TAGS:
+            self._pop(
+                len(self.stack) - 1, self._child_start + len(self.get_starttag_text())
+            )
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, is_void=False)
+        if self.stack and self.stack[-1].name == tag:
+            self._pop(
+                len(self.stack) - 1, self._child_start + len(self.get_starttag_text())
+            )
+
+    def handle_endtag(self, tag):
+        if not self.stack:
+            return
+
+        self._flush_data()
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index].name == tag:
+                offset = self._get_offset()
+                self._pop(index, self._html.find(">", offset) + 1 or offset)
+                return
+
+    def _pop(self, index: int, end_offset: int) -> None:
+        """close the open elements from an index of the stack upwards"""
+        if self.container:
+            if index == 0:
+                # the end of the container also closes a child left open,
+                # whose source ends where the container's end tag starts
+                if len(self.stack) > 1:
+                    self.children.append(
+                        (
+                            self._html[self._child_start : self._get_offset()],
+                            self.stack[1].parent,
+                        )
+                    )
+                raise _StopParsing
+            if index == 1:
+                self.children.append(
+                    (
+                        self._html[self._child_start : end_offset],
+                        self.stack[1].parent,
+                    )
+                )
+        elif index == 0:
+            # the document itself is never closed
+            return
+        del self.stack[index:]
+
+    def handle_data(self, data):
+        if self.stack:
+            self._data.append(data)
+
+    def handle_comment(self, data):
+        if self.stack:
+            self._flush_data()
+            self._data.append(data)
+            self._flush_data(is_comment=True)
+
+
+def extract_children(html: str, container: str) -> list[tuple[str, HtmlElement]]:
+    """get the children of the first element with a tag name in an html page
+
+    :param html: the html page
+    :type html: str
+    :param container: tag name of the element, e.g. "main"
+    :type container: str
+    :return: the (source html, document node) of each child, where the
+        document node holds the child as it would be parsed from its source
+        html on its own. strings and comments directly in the element have
+        their text as the source html
+    :rtype: list[tuple[str, HtmlElement]]
+    """
+    parser = _SubtreeParser(container)
+    parser.parse(html)
+    return parser.children
+
+
+def parse_html(html: str) -> HtmlElement:
+    """parse an html fragment like BeautifulSoup(html, "html.parser")
+
+    :param html: the html fragment
+    :type html: str
+    :return: the document node
+    :rtype: HtmlElement
+    """
+    parser = _SubtreeParser()
+    parser.parse(html)
+    return parser.stack[0]
+
+
+def _is_falsy(node: HtmlNode | None) -> bool:
+    """check if a sibling is missing (or an empty string)"""
+    return node is None or (isinstance(node, HtmlText) and not node.data)
+
+
+def _remove_whitespace_inside(node: HtmlNode | None) -> bool:
+    """check if whitespace inside a node is removed (block elements)"""
+    return isinstance(node, HtmlElement) and (
+        node.name in BLOCK_TAGS or _HEADING.match(node.name) is not None
+    )
+
+
+def _remove_whitespace_outside(node: HtmlNode | None) -> bool:
+    """check if whitespace next to a node is removed (block elements and pre)"""
+    return _remove_whitespace_inside(node) or (
+        isinstance(node, HtmlElement) and node.name == "pre"
+    )
+
+
+def _chomp(text: str) -> tuple[str, str, str]:
+    """move a leading and trailing space of inline markup text outside of it"""
+    prefix = " " if text and text[0] == " " else ""
+    suffix = " " if text and text[-1] == " " else ""
+    return prefix, suffix, text.strip()
+
+
+def _next_block_content_sibling(element: HtmlElement) -> HtmlNode | None:
+    """get the next sibling that is an element or non-whitespace string"""
+    siblings = element.parent.children if element.parent else []
+    for sibling in siblings[siblings.index(element) + 1 :]:
+        if isinstance(sibling, HtmlElement):
+            return sibling
+        if not sibling.is_comment and sibling.data.strip() != "":
+            return sibling
+    return None
+
+
+class MarkdownConverter:
+    """Port of markdownify's MarkdownConverter (with its default options)
+    to the nodes built by parse_html() and extract_children()"""
+
+    def convert(self, document: HtmlElement) -> str:
+        """convert a document node to markdown
+
+        :param document: the document node
+        :type document: HtmlElement
+        :raises UnsupportedHtml: if the document contains an element whose
+            conversion isn't ported
+        :return: the markdown
+        :rtype: str
+        """
+        return self.process_element(document, frozenset())
+
+    def process_element(self, node: HtmlElement, parent_tags: frozenset) -> str:
+        """convert an element and its children to markdown"""
+        remove_inside = _remove_whitespace_inside(node)
+        children = node.children
+
+        children_tags = set(parent_tags)
+        children_tags.add(node.name)
+        if _HEADING.match(node.name) is not None or node.name in ("td", "th"):
+            children_tags.add("_inline")
+        if node.name in ("pre", "code", "kbd", "samp"):
+            children_tags.add("_noformat")
+        children_tags = frozenset(children_tags)
+
+        child_strings = []
+        last_index = len(children) - 1
+        for index, child in enumerate(children):
+            if isinstance(child, HtmlElement):
+                child_string = self.process_element(child, children_tags)
+            elif child.is_comment:
+                continue
+            else:
+                prev_sibling = children[index - 1] if index else None
+                next_sibling = children[index + 1] if index < last_index else None
+                if child.data.strip() == "" and (
+                    (
+                        remove_inside
+                        and (_is_falsy(prev_sibling) or _is_falsy(next_sibling))
+                    )
+                    or _remove_whitespace_outside(prev_sibling)
+                    or _remove_whitespace_outside(next_sibling)
+                ):
+                    continue
+                child_string = self.process_text(
+                    child, prev_sibling, next_sibling, children_tags
+                )
+            if child_string:
+                child_strings.append(child_string)
+
+        # collapse newlines at child boundaries, except inside <pre>
+        if node.name != "pre" and "pre" not in parent_tags:
+            collapsed = [""]
+            for child_string in child_strings:
+                leading_nl, content, trailing_nl = _EXTRACT_NEWLINES.match(
+                    child_string
+                ).groups()
+                if collapsed[-1] and leading_nl:
+                    prev_trailing_nl = collapsed.pop()
+                    leading_nl = "\n" * min(
+                        2, max(len(prev_trailing_nl), len(leading_nl))
+                    )
+                collapsed.extend([leading_nl, content, trailing_nl])
+            child_strings = collapsed
+
+        text = "".join(child_strings)
+        return self._apply_conversion(node, text, parent_tags)
+
+    def process_text(
+        self,
+        node: HtmlText,
+        prev_sibling: HtmlNode | None,
+        next_sibling: HtmlNode | None,
+        parent_tags: frozenset,
+    ) -> str:
+        """normalize and escape a string"""
+        text = node.data
+        if "pre" not in parent_tags:
+            text = _NEWLINE_WHITESPACE.sub("\n", text)
+            text = _WHITESPACE.sub(" ", text)
+        if "_noformat" not in parent_tags and text:
+            text = text.replace("*", r"\*").replace("_", r"\_")
+
+        if _remove_whitespace_outside(prev_sibling) or (
+            _remove_whitespace_inside(node.parent) and _is_falsy(prev_sibling)
+        ):
+            text = text.lstrip(" \t\r\n")
+        if _remove_whitespace_outside(next_sibling) or (
+            _remove_whitespace_inside(node.parent) and _is_falsy(next_sibling)
+        ):
+            text = text.rstrip()
+        return text
+
+    def _apply_conversion(
+        self, element: HtmlElement, text: str, parent_tags: frozenset
+    ) -> str:
+        """apply the markdown conversion of an element to its converted
+        children"""
+        name = element.name
+        if name in UNSUPPORTED_TAGS:
+            raise UnsupportedHtml(f"<{name}> elements are not supported")
+
+        if name in _INLINE_MARKUP:
+            if "_noformat" in parent_tags:
+                return text
+            prefix, suffix, text = _chomp(text)
+            if not text:
+                return ""
+            markup = _INLINE_MARKUP[name]
+            return f"{prefix}{markup}{text}{markup}{suffix}"
+
+        if name == DOCUMENT:
+            return text.strip("\n")
+        convert_func = getattr(self, f"convert_{name}", None)
+        if convert_func is not None:
+            return convert_func(element, text, parent_tags)
+
+        match = _HEADING.match(name)
+        if match:
+            return self._convert_heading(int(match.group(1)), text, parent_tags)
+        return text
+
+    def convert_a(self, element, text, parent_tags):
+        if "_noformat" in parent_tags:
+            return text
+        prefix, suffix, text = _chomp(text)
+        if not text:
+            return ""
+        href = element.attrs.get("href")
+        title = element.attrs.get("title")
+        if text.replace(r"\_", "_") == href and not title:
+            return f"<{href}>"
+        title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
+        return f"{prefix}[{text}]({href}{title_part}){suffix}" if href else text
+
+    def convert_blockquote(self, element, text, parent_tags):
+        text = (text or "").strip(" \t\r\n")
+        if "_inline" in parent_tags:
+            return " " + text + " "
+        if not text:
+            return "\n"
+        text = _LINE_WITH_CONTENT.sub(
+            lambda match: "> " + match.group(1) if match.group(1) else ">", text
+        )
+        return "\n" + text + "\n\n"
+
+    def convert_br(self, element, text, parent_tags):
+        if "_inline" in parent_tags:
+            return text + " " if text else " "
+        return "  \n" + text
+
+    def convert_code(self, element, text, parent_tags):
+        if "_noformat" in parent_tags:
+            return text
+        prefix, suffix, text = _chomp(text)
+        if not text:
+            return ""
+        max_backticks = max(
+            (len(match) for match in _BACKTICK_RUNS.findall(text)), default=0
+        )
+        delimiter = "`" * (max_backticks + 1)
+        if max_backticks > 0:
+            text = " " + text + " "
+        return f"{prefix}{delimiter}{text}{delimiter}{suffix}"
+
+    convert_kbd = convert_code
+    convert_samp = convert_code
+
+    def convert_div(self, element, text, parent_tags):
+        if "_inline" in parent_tags:
+            return " " + text.strip() + " "
+        text = text.strip()
+        return f"\n\n{text}\n\n" if text else ""
+
+    convert_article = convert_div
+    convert_section = convert_div
+
+    def _convert_heading(self, level, text, parent_tags):
+        if "_inline" in parent_tags:
+            return text
+        level = max(1, min(6, level))
+        text = text.strip()
+        if level <= 2:
+            text = text.rstrip()
+            line = "=" if level == 1 else "-"
+            return f"\n\n{text}\n{line * len(text)}\n\n" if text else ""
+        text = _ALL_WHITESPACE.sub(" ", text)
+        return f"\n\n{'#' * level} {text}\n\n"
+
+    def convert_hr(self, element, text, parent_tags):
+        return "\n\n---\n\n"
+
+    def convert_img(self, element, text, parent_tags):
+        alt = element.attrs.get("alt") or ""
+        src = element.attrs.get("src") or ""
+        title = element.attrs.get("title") or ""
+        title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
+        if "_inline" in parent_tags:
+            return alt
+        return f"![{alt}]({src}{title_part})"
+
+    def convert_ul(self, element, text, parent_tags):
+        next_sibling = _next_block_content_sibling(element)
+        before_paragraph = next_sibling is not None and (
+            not isinstance(next_sibling, HtmlElement)
+            or next_sibling.name not in ("ul", "ol")
+        )
+        if "li" in parent_tags:
+            return "\n" + text.rstrip()
+        return "\n\n" + text + ("\n" if before_paragraph else "")
+
+    convert_ol = convert_ul
+
+    def convert_li(self, element, text, parent_tags):
+        text = (text or "").strip()
+        if not text:
+            return "\n"
+
+        parent = element.parent
+        if parent is not None and parent.name == "ol":
+            start = parent.attrs.get("start")
+            start = int(start) if start and start.isnumeric() else 1
+            siblings = parent.children
+            previous_items = sum(
+                1
+                for sibling in siblings[: siblings.index(element)]
+                if isinstance(sibling, HtmlElement) and sibling.name == "li"
+            )
+            bullet = f"{start + previous_items}."
+        else:
+            depth = -1
+            node = element
+            while node is not None:
+                if node.name == "ul":
+                    depth += 1
+                node = node.parent
+            bullet = "*+-"[depth % 3]
+        bullet += " "
+        indent = " " * len(bullet)
+
+        text = _LINE_WITH_CONTENT.sub(
+            lambda match: indent + match.group(1) if match.group(1) else "", text
+        )
+        return bullet + text[len(bullet) :] + "\n"
+
+    def convert_p(self, element, text, parent_tags):
+        if "_inline" in parent_tags:
+            return " " + text.strip(" \t\r\n") + " "
+        text = text.strip(" \t\r\n")
+        return f"\n\n{text}\n\n" if text else ""
+
+    def convert_pre(self, element, text, parent_tags):
+        if not text:
+            return ""
+        text = _PRE_RSTRIP.sub("", _PRE_LSTRIP.sub("", text))
+        return f"\n\n```\n{text}\n```\n\n"
+
+    def convert_q(self, element, text, parent_tags):
+        return '"' + text + '"'
+
+    def convert_script(self, element, text, parent_tags):
+        return ""
+
+    convert_style = convert_script
+
+
+def to_markdown(document: HtmlElement, source_html: str) -> str:
+    """convert a document node to the same markdown as
+    markdownify.markdownify(source_html), falling back to markdownify when
+    the document contains an element whose conversion isn't ported
+
+    :param document: the document node, from parse_html() or
+        extract_children()
+    :type document: HtmlElement
+    :param source_html: the html the document was parsed from
+    :type source_html: str
+    :return: the markdown
+    :rtype: str
+    """
+    try:
+        return MarkdownConverter().convert(document)
+    except UnsupportedHtml:
+        import markdownify
+
+        return markdownify.markdownify(source_html)
+
+
+def html_to_markdown(html: str) -> str:
+    """convert an html fragment to markdown, like markdownify.markdownify
+
+    :param html: the html fragment
+    :type html: str
+    :return: the markdown
+    :rtype: str
+    """
+    return to_markdown(parse_html(html), html)
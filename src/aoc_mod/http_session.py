@@ -0,0 +1,80 @@
+"""Pooled HTTP session with retries for requests to Advent of Code"""
+
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from aoc_mod.utilities import DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE
+
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+# server errors (and rate limiting) that are worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """urllib3 retry policy that randomizes the exponential backoff between
+    attempts so that several clients failing at once don't retry in lockstep"""
+
+    def get_backoff_time(self) -> float:
+        """get the exponential backoff time scaled by a random factor in [0.5, 1.5)
+
+        :return: the number of seconds to sleep before the next attempt
+        :rtype: float
+        """
+        backoff_time = super().get_backoff_time()
+        return backoff_time * random.uniform(0.5, 1.5)  # nosec B311
+
+
+def create_session(
+    user_agent: str,
+    session_id: str = "",
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+) -> requests.Session:
+    """create a requests session that keeps connections alive in a pool and
+    retries connection errors and server errors with jittered exponential
+    backoff, honouring any Retry-After header sent by the server
+
+    only GET requests are retried after the request was sent, so an answer
+    submission is never posted twice
+
+    :param user_agent: User-Agent header sent with every request
+    :type user_agent: str
+    :param session_id: Advent of Code session-id sent as the "session"
+        cookie, defaults to "" (no cookie)
+    :type session_id: str, optional
+    :param pool_size: maximum number of pooled connections per host,
+        defaults to 10
+    :type pool_size: int, optional
+    :param max_retries: maximum number of retries per request, defaults to 3
+    :type max_retries: int, optional
+    :param backoff_factor: base of the exponential backoff in seconds,
+        defaults to 0.5
+    :type backoff_factor: float, optional
+    :return: the configured session
+    :rtype: requests.Session
+    """
+    retry = JitteredRetry(
+        total=max_retries,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        status_forcelist=RETRY_STATUS_CODES,
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = user_agent
+    if session_id:
+        session.cookies.set("session", session_id)
+
+    return session
@@ -16,12 +16,17 @@ Author: David Eyrich
 
 import os
 import sys
+import asyncio
 import argparse
 import importlib.metadata
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from aoc_mod.utilities import AocMod, AocModError
 
+if TYPE_CHECKING:
+    from aoc_mod.async_utilities import AsyncAocMod
+
 LOCAL_PUZZLE_FILEPATH = "challenges/{YEAR}/day{DAY}"
 DEFAULT_FILE_TEMPLATE = (
     Path(__file__).absolute().parent.joinpath("templates/solution_template.py")
@@ -63,6 +68,169 @@ def create_solution_file(filename_in: str, day_path: Path, year: int, day: int):
         raise AocModError("Failed to create solution file") from err
 
 
+def write_instructions_file(
+    aoc_mod: AocMod, year: int, day: int, instructions_path: Path, instructions: str
+) -> None:
+    """write puzzle instructions to a file. if the file already exists, only
+    the articles (one per unlocked part) it doesn't contain yet are appended,
+    so that notes added to the file are kept and an unchanged file is not
+    rewritten
+
+    :param aoc_mod: AocMod instance the instructions were pulled with
+    :type aoc_mod: AocMod
+    :param year: year of the AoC puzzle
+    :type year: int
+    :param day: day of the AoC puzzle
+    :type day: int
+    :param instructions_path: path to the instructions file
+    :type instructions_path: Path
+    :param instructions: the puzzle instructions
+    :type instructions: str
+    """
+    if not instructions_path.exists():
+        with instructions_path.open("w", encoding="utf-8") as f_out:
+            f_out.write(instructions)
+        print(f"{year}, Day {day} instructions file created: {instructions_path}")
+        return
+
+    existing = instructions_path.read_text(encoding="utf-8")
+    new_articles = [
+        article
+        for article in aoc_mod.get_instruction_articles(year, day)
+        if article not in existing
+    ]
+    if not new_articles:
+        print(f"{year}, Day {day} instructions file is up to date.")
+        return
+
+    # separate the new articles from the existing text by a blank line
+    trailing_newlines = len(existing) - len(existing.rstrip("\n"))
+    separator = "\n" * max(0, 2 - trailing_newlines) if existing else ""
+    with instructions_path.open("a", encoding="utf-8") as f_out:
+        f_out.write(separator + "\n\n".join(new_articles))
+    print(f"{year}, Day {day} instructions file updated: {instructions_path}")
+
+
+def update_instructions_file(
+    aoc_mod: AocMod, year: int, day: int, instructions_path: Path
+) -> None:
+    """pull the puzzle instructions (from the puzzle cache if nothing new has
+    been unlocked) and write any new articles to the instructions file
+
+    :param aoc_mod: AocMod instance used for the request
+    :type aoc_mod: AocMod
+    :param year: year of the AoC puzzle
+    :type year: int
+    :param day: day of the AoC puzzle
+    :type day: int
+    :param instructions_path: path to the instructions file
+    :type instructions_path: Path
+    :raises AocModError: if the instructions could not be pulled
+    """
+    instructions = aoc_mod.get_puzzle_instructions(year, day)
+    write_instructions_file(aoc_mod, year, day, instructions_path, instructions)
+
+
+async def fetch_puzzle_data(
+    aoc_mod: "AocMod | AsyncAocMod",
+    year: int,
+    day: int,
+    get_input: bool = True,
+    get_instructions: bool = True,
+) -> tuple[str, str]:
+    """get the puzzle input and instructions for a year and day concurrently.
+    failures are printed rather than raised so that one failed request
+    doesn't discard the result of the other
+
+    :param aoc_mod: AocMod (or AsyncAocMod) instance used for the requests
+    :type aoc_mod: AocMod | AsyncAocMod
+    :param year: year of the AoC puzzle
+    :type year: int
+    :param day: day of the AoC puzzle
+    :type day: int
+    :param get_input: whether to get the puzzle input, defaults to True
+    :type get_input: bool, optional
+    :param get_instructions: whether to get the puzzle instructions,
+        defaults to True
+    :type get_instructions: bool, optional
+    :return: a tuple of (input_data, instructions), where either is an empty
+        string if it was not requested or the request failed
+    :rtype: tuple[str, str]
+    """
+    from aoc_mod.async_utilities import AsyncAocMod
+
+    if not isinstance(aoc_mod, AsyncAocMod):
+        aoc_mod = AsyncAocMod(aoc_mod=aoc_mod)
+
+    async def _fetch(get_func, name: str) -> str:
+        try:
+            return await get_func(year, day)
+        except AocModError as err:
+            print(f"Failed to get puzzle {name} for {year}, Day {day} ({err})")
+            return ""
+
+    async def _skip() -> str:
+        return ""
+
+    input_data, instructions = await asyncio.gather(
+        _fetch(aoc_mod.get_puzzle_input, "input") if get_input else _skip(),
+        _fetch(aoc_mod.get_puzzle_instructions, "instructions")
+        if get_instructions
+        else _skip(),
+    )
+    return input_data, instructions
+
+
+def get_puzzle_data(
+    aoc_mod: AocMod,
+    year: int,
+    day: int,
+    get_input: bool = True,
+    get_instructions: bool = True,
+) -> tuple[str, str]:
+    """get the puzzle input and instructions for a year and day, concurrently
+    when both are needed and no event loop is running in this thread (as in
+    Jupyter or async callers), one after the other otherwise. failures are
+    printed rather than raised
+
+    :param aoc_mod: AocMod instance used for the requests
+    :type aoc_mod: AocMod
+    :param year: year of the AoC puzzle
+    :type year: int
+    :param day: day of the AoC puzzle
+    :type day: int
+    :param get_input: whether to get the puzzle input, defaults to True
+    :type get_input: bool, optional
+    :param get_instructions: whether to get the puzzle instructions,
+        defaults to True
+    :type get_instructions: bool, optional
+    :return: a tuple of (input_data, instructions), where either is an empty
+        string if it was not requested or the request failed
+    :rtype: tuple[str, str]
+    """
+    try:
+        asyncio.get_running_loop()
+        loop_running = True
+    except RuntimeError:
+        loop_running = False
+
+    if get_input and get_instructions and not loop_running:
+        return asyncio.run(fetch_puzzle_data(aoc_mod, year, day))
+
+    input_data = instructions = ""
+    if get_input:
+        try:
+            input_data = aoc_mod.get_puzzle_input(year, day)
+        except AocModError as err:
+            print(f"Failed to get puzzle input for {year}, Day {day} ({err})")
+    if get_instructions:
+        try:
+            instructions = aoc_mod.get_puzzle_instructions(year, day)
+        except AocModError as err:
+            print(f"Failed to get puzzle instructions for {year}, Day {day} ({err})")
+    return input_data, instructions
+
+
 def setup_challenge_day_template(
     aoc_mod: AocMod,
     year: int,
@@ -95,28 +263,26 @@ def setup_challenge_day_template(
     input_path = day_path.joinpath(f"input_day{day}.txt")
     instructions_path = day_path.joinpath(f"instructions_day{day}.md")
 
-    # attempt to get puzzle input and instructions
-    input_data = ""
-    instructions = ""
+    # an existing instructions file is only updated when solving a part has
+    # unlocked more of the puzzle since the instructions were pulled
+    update_instructions = instructions_path.exists() and aoc_mod.has_new_instructions(
+        year, day
+    )
 
-    # get puzzle input data
-    if not input_path.exists():
-        try:
-            input_data = aoc_mod.get_puzzle_input(year, day)
-        except AocModError as err:
-            print(f"Failed to get puzzle input for {year}, Day {day} ({err})")
-    else:
+    # get puzzle input and instruction data, if we don't have them yet
+    if input_path.exists():
         print(f"{year}, Day {day} input file already exists.")
-
-    # get instruction input data
-    if not instructions_path.exists():
-        try:
-            instructions = aoc_mod.get_puzzle_instructions(year, day)
-        except AocModError as err:
-            print(f"Failed to get puzzle instructions for {year}, Day {day} ({err})")
-    else:
+    if instructions_path.exists() and not update_instructions:
         print(f"{year}, Day {day} instruction file already exists.")
 
+    input_data, instructions = get_puzzle_data(
+        aoc_mod,
+        year,
+        day,
+        get_input=not input_path.exists(),
+        get_instructions=not instructions_path.exists() or update_instructions,
+    )
+
     # create the challenges directory structure if we have input/instruction data
     if input_data or instructions:
         day_path.mkdir(parents=True, exist_ok=True)
@@ -132,9 +298,7 @@ def setup_challenge_day_template(
         print(f"{year}, Day {day} input file created: {input_path}")
 
     if instructions:
-        with instructions_path.open("w", encoding="utf-8") as f_out:
-            f_out.write(instructions)
-        print(f"{year}, Day {day} instructions file created: {instructions_path}")
+        write_instructions_file(aoc_mod, year, day, instructions_path, instructions)
 
     # create the solution file from the template, if specified
     try:
@@ -162,6 +326,29 @@ def file_exists(filepath: str) -> str:
     return filepath
 
 
+def int_range(value: str) -> list[int]:
+    """parse a range of integers like "2015-2024" or "1,3,5-7" for argparse
+
+    :param value: comma separated integers or inclusive "start-end" ranges
+    :type value: str
+    :raises argparse.ArgumentTypeError: raise if the range is invalid
+    :return: the sorted, de-duplicated integers in the range
+    :rtype: list[int]
+    """
+    numbers = set()
+    try:
+        for part in value.split(","):
+            start, _, end = part.strip().partition("-")
+            start_num = int(start)
+            end_num = int(end) if end else start_num
+            if end_num < start_num:
+                raise ValueError
+            numbers.update(range(start_num, end_num + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Error: invalid range '{value}'") from None
+    return sorted(numbers)
+
+
 def get_argument_parser() -> argparse.ArgumentParser:
     """create an argument parser and parse user args
 
@@ -191,13 +378,14 @@ def get_argument_parser() -> argparse.ArgumentParser:
     )
 
     subparsers = parser.add_subparsers(
-        dest="command", help="run with '{setup, submit} -h' for more info"
+        dest="command",
+        help="run with '{setup, submit, run, watch, perf} -h' for more info",
     )
 
     ### define setup arguments ###
 
     setup_parser = subparsers.add_parser(
-        "setup", help="setup challenge files for AoC puzzle"
+        "setup", help="setup challenge files for AoC puzzle", allow_abbrev=False
     )
     setup_parser.add_argument(
         "-t",
@@ -213,6 +401,18 @@ def get_argument_parser() -> argparse.ArgumentParser:
         default="",
         help="root path where the 'challenges' folder structure will be created",
     )
+    setup_parser.add_argument(
+        "--years",
+        type=int_range,
+        help="set up several years at once (e.g. 2015-2024), "
+        "defaults to the year option when --days is set",
+    )
+    setup_parser.add_argument(
+        "--days",
+        type=int_range,
+        help="set up several days at once (e.g. 1-25), "
+        "defaults to 1-25 when --years is set",
+    )
 
     ### define submission arguments ###
 
@@ -231,6 +431,169 @@ def get_argument_parser() -> argparse.ArgumentParser:
         required=True,
     )
 
+    ### define run arguments ###
+
+    run_parser = subparsers.add_parser(
+        "run", help="run and time the solution for an AoC puzzle", allow_abbrev=False
+    )
+    run_parser.add_argument(
+        "-o",
+        "--output-root-dir",
+        type=str,
+        default="",
+        help="root path where the 'challenges' folder structure is located",
+    )
+    run_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="number of timed runs of each part, defaults to 1",
+    )
+    run_parser.add_argument(
+        "--warmup",
+        type=int,
+        default=0,
+        help="number of untimed runs of each part before the timed runs, defaults to 0",
+    )
+    run_parser.add_argument(
+        "--json", action="store_true", help="print the results as JSON"
+    )
+    run_parser.add_argument(
+        "--profile",
+        choices=["cpu", "mem"],
+        default="",
+        help="profile each part with cProfile and stack sampling (cpu) or "
+        "tracemalloc (mem), writing the results to the day's 'profile' folder",
+    )
+    run_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="run every day in the 'challenges' folder instead of a single day",
+    )
+    run_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="number of days run in parallel with --all, defaults to the number of CPUs",
+    )
+    run_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=0,
+        help="wall time limit in seconds of each part (with all of its runs), "
+        "which then runs in a child process",
+    )
+    run_parser.add_argument(
+        "--cpu-limit",
+        type=float,
+        default=0,
+        help="CPU time limit in seconds of each part (RLIMIT_CPU), which then "
+        "runs in a child process",
+    )
+    run_parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=0,
+        help="address space limit in MiB of each part (RLIMIT_AS), which then "
+        "runs in a child process",
+    )
+    run_parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="don't append the timings to the run history used by 'aoc-mod perf'",
+    )
+
+    ### define watch arguments ###
+
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="run the solution for an AoC puzzle again whenever it is saved",
+        allow_abbrev=False,
+    )
+    watch_parser.add_argument(
+        "-o",
+        "--output-root-dir",
+        type=str,
+        default="",
+        help="root path where the 'challenges' folder structure is located",
+    )
+    watch_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="number of timed runs of each part, defaults to 1",
+    )
+    watch_parser.add_argument(
+        "--warmup",
+        type=int,
+        default=0,
+        help="number of untimed runs of each part before the timed runs, defaults to 0",
+    )
+    watch_parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="poll the files for changes instead of using inotify",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.1,
+        help="seconds between checks of the files when polling, defaults to 0.1",
+    )
+
+    ### define perf arguments ###
+
+    perf_parser = subparsers.add_parser(
+        "perf", help="compare solution run times between runs", allow_abbrev=False
+    )
+    perf_subparsers = perf_parser.add_subparsers(dest="perf_command", required=True)
+    compare_parser = perf_subparsers.add_parser(
+        "compare",
+        help="compare the run times of two commits or of the latest runs, "
+        "exiting with 1 if any part regressed",
+        allow_abbrev=False,
+    )
+    compare_parser.add_argument(
+        "commits",
+        nargs="*",
+        metavar="commit",
+        help="baseline commit and the commit to compare with it, which "
+        "defaults to the checked out commit (without commits, the latest run "
+        "of each day is compared with the runs before it)",
+    )
+    compare_parser.add_argument(
+        "-o",
+        "--output-root-dir",
+        type=str,
+        default="",
+        help="root path where the 'challenges' folder structure is located",
+    )
+    compare_parser.add_argument(
+        "-n",
+        "--last",
+        type=int,
+        default=1,
+        help="number of runs before the latest run of each day to compare "
+        "with it, defaults to 1",
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change of the median run time of a part that counts as "
+        "a regression, defaults to 0.1 (10%%)",
+    )
+    compare_parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="significance level of the Mann-Whitney U test, defaults to 0.05",
+    )
+    compare_parser.add_argument(
+        "--json", action="store_true", help="print the comparison as JSON"
+    )
+
     return parser
 
 
@@ -248,14 +611,14 @@ def interactive():
     if not known_opts.command:
         parser.print_usage(file=sys.stderr)
         print(
-            "aoc-mod: error: the following arguments are required: [setup|submit]",
+            "aoc-mod: error: the following arguments are required: [setup|submit|run|watch|perf]",
             file=sys.stderr,
         )
         exit(2)
 
     # get the session id from the environment variable
     session_id = os.environ.get("SESSION_ID", "")
-    if not session_id:
+    if not session_id and known_opts.command not in ("run", "watch", "perf"):
         print("Warning: SESSION_ID environment variable not set.")
 
     # create an AOCMod class instance
@@ -273,7 +636,24 @@ def interactive():
         year = aoc_mod.curr_time.tm_year
         day = aoc_mod.curr_time.tm_mday
 
-    print(f"Year: {year}\tDay: {day}")
+    bulk_setup = known_opts.command == "setup" and (known_opts.years or known_opts.days)
+    if not bulk_setup and known_opts.command not in ("run", "watch", "perf"):
+        print(f"Year: {year}\tDay: {day}")
+
+    if known_opts.command == "run":
+        from aoc_mod.runner import run_command
+
+        exit(run_command(year, day, known_opts))
+
+    if known_opts.command == "watch":
+        from aoc_mod.watch import watch_command
+
+        exit(watch_command(year, day, known_opts))
+
+    if known_opts.command == "perf":
+        from aoc_mod.perf import perf_command
+
+        exit(perf_command(known_opts))
 
     # if we are submitting, let's do it, otherwise we'll setup the template
     if known_opts.command == "submit":
@@ -285,6 +665,27 @@ def interactive():
         except AocModError as err:
             print(f"Failed to submit puzzle answer ({err})")
 
+    elif bulk_setup:
+        from aoc_mod.scheduler import SetupScheduler
+
+        scheduler = SetupScheduler(
+            aoc_mod,
+            output_root_dir=known_opts.output_root_dir,
+            template_path=known_opts.template,
+        )
+        scheduler.add(
+            known_opts.years or [known_opts.year or year],
+            known_opts.days or list(range(1, 26)),
+        )
+
+        try:
+            summary = scheduler.run()
+        except KeyboardInterrupt:
+            print("Interrupted, run the same command again to resume.")
+            exit(130)
+
+        print(f"Set up {summary['set_up']} days, skipped {summary['skipped']} days.")
+
     else:
         setup_challenge_day_template(
             aoc_mod,
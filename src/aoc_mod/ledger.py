@@ -0,0 +1,208 @@
+"""Local ledger of submitted answers and the verdicts Advent of Code gave them"""
+
+import re
+import time
+from typing import Any
+
+from aoc_mod.cache import hash_session
+from aoc_mod.state import StateStore
+
+VERDICT_CORRECT = "correct"
+VERDICT_TOO_HIGH = "too high"
+VERDICT_TOO_LOW = "too low"
+VERDICT_WRONG = "wrong"
+VERDICT_RATE_LIMITED = "rate limited"
+VERDICT_WRONG_LEVEL = "wrong level"
+VERDICT_UNKNOWN = "unknown"
+
+# "You have 1m 5s left to wait." after submitting too soon
+_WAIT_LEFT_PATTERN = re.compile(r"you have (?:(\d+)m\s*)?(\d+)s left to wait")
+# "please wait one minute before trying again." after a wrong answer
+_WAIT_AGAIN_PATTERN = re.compile(r"wait (one|\d+) minutes? before trying again")
+
+
+def parse_verdict(response_text: str) -> tuple[str, int]:
+    """get the verdict of an answer submission from the response page
+
+    :param response_text: text of the submission response
+    :type response_text: str
+    :return: a tuple of (verdict, seconds to wait before submitting again),
+        where the verdict is one of the VERDICT_* constants
+    :rtype: tuple[str, int]
+    """
+    text = response_text.lower()
+
+    wait_time = 0
+    if match := _WAIT_LEFT_PATTERN.search(text):
+        wait_time = int(match.group(1) or 0) * 60 + int(match.group(2))
+    elif match := _WAIT_AGAIN_PATTERN.search(text):
+        minutes = match.group(1)
+        wait_time = 60 * (1 if minutes == "one" else int(minutes))
+
+    if "that's the right answer" in text:
+        return VERDICT_CORRECT, 0
+    if "you gave an answer too recently" in text:
+        return VERDICT_RATE_LIMITED, wait_time
+    if "you don't seem to be solving the right level" in text:
+        return VERDICT_WRONG_LEVEL, 0
+    if "that's not the right answer" in text:
+        if "your answer is too high" in text:
+            return VERDICT_TOO_HIGH, wait_time
+        if "your answer is too low" in text:
+            return VERDICT_TOO_LOW, wait_time
+        return VERDICT_WRONG, wait_time
+    return VERDICT_UNKNOWN, wait_time
+
+
+def _to_int(answer: Any) -> int | None:
+    """get an answer as an int, or None if it isn't an integer"""
+    try:
+        return int(str(answer).strip())
+    except ValueError:
+        return None
+
+
+class SubmissionLedger:
+    """Ledger of every answer submitted for each year, day and level (per
+    user) and the verdict it got, kept in the request state store.
+
+    It answers what a new submission would get without asking Advent of
+    Code whenever the answer follows from earlier verdicts: a known correct
+    answer, an answer that was already wrong, an answer outside the bounds
+    learned from "too high" and "too low" verdicts or any answer while a
+    wait from an earlier submission is running."""
+
+    def __init__(self, state: StateStore, session_id: str = ""):
+        """initialize the ledger
+
+        :param state: the state store the ledger is kept in
+        :type state: StateStore
+        :param session_id: session-id the submissions are made with,
+            defaults to ""
+        :type session_id: str, optional
+        """
+        self._state = state
+        self._user = hash_session(session_id)
+
+    def _get_key(self, year: int, day: int, level: int) -> str:
+        """get the state key of a year, day and level"""
+        return f"submissions/{self._user}/{year}/{day}/{level}"
+
+    def get(self, year: int, day: int, level: int) -> dict[str, Any]:
+        """get the ledger entry of a year, day and level
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param level: puzzle level (either 1 or 2)
+        :type level: int
+        :return: the "submissions" made, as dicts of "answer", "verdict" and
+            "time", the "correct" answer and its "response" once known, the
+            "low" and "high" bounds learned so far and the time until which
+            submissions must "wait"
+        :rtype: dict[str, Any]
+        """
+        return self._state.get(
+            self._get_key(year, day, level),
+            {
+                "submissions": [],
+                "correct": None,
+                "response": None,
+                "low": None,
+                "high": None,
+                "wait": 0.0,
+            },
+        )
+
+    def check(self, year: int, day: int, level: int, answer: Any) -> str | None:
+        """get the verdict an answer would get, as far as the ledger knows
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param level: puzzle level (either 1 or 2)
+        :type level: int
+        :param answer: the answer to check
+        :type answer: Any
+        :return: a reason the answer shouldn't be submitted, None if it has
+            to be submitted to know its verdict
+        :rtype: str | None
+        """
+        entry = self.get(year, day, level)
+        answer_str = str(answer).strip()
+
+        if entry["correct"] is not None:
+            if answer_str == entry["correct"]:
+                return VERDICT_CORRECT
+            return f"wrong, the correct answer is {entry['correct']}"
+
+        for submission in entry["submissions"]:
+            if submission["answer"] == answer_str and submission["verdict"] in (
+                VERDICT_TOO_HIGH,
+                VERDICT_TOO_LOW,
+                VERDICT_WRONG,
+            ):
+                return f"{submission['verdict']}, it was already submitted"
+
+        answer_int = _to_int(answer_str)
+        if answer_int is not None:
+            if entry["high"] is not None and answer_int >= entry["high"]:
+                return f"too high, {entry['high']} was already too high"
+            if entry["low"] is not None and answer_int <= entry["low"]:
+                return f"too low, {entry['low']} was already too low"
+
+        wait_time = entry["wait"] - time.time()
+        if wait_time > 0:
+            return f"{VERDICT_RATE_LIMITED}, please wait {int(wait_time) + 1} seconds"
+        return None
+
+    def record(
+        self,
+        year: int,
+        day: int,
+        level: int,
+        answer: Any,
+        response_text: str,
+    ) -> str:
+        """record a submission and the verdict parsed from its response
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param level: puzzle level (either 1 or 2)
+        :type level: int
+        :param answer: the submitted answer
+        :type answer: Any
+        :param response_text: text of the submission response
+        :type response_text: str
+        :return: the verdict of the submission
+        :rtype: str
+        """
+        verdict, wait_time = parse_verdict(response_text)
+        answer_str = str(answer).strip()
+        answer_int = _to_int(answer_str)
+        now = time.time()
+
+        with self._state.transaction():
+            entry = self.get(year, day, level)
+            entry["submissions"].append(
+                {"answer": answer_str, "verdict": verdict, "time": now}
+            )
+
+            if verdict == VERDICT_CORRECT:
+                entry["correct"] = answer_str
+                entry["response"] = response_text
+            elif verdict == VERDICT_TOO_HIGH and answer_int is not None:
+                if entry["high"] is None or answer_int < entry["high"]:
+                    entry["high"] = answer_int
+            elif verdict == VERDICT_TOO_LOW and answer_int is not None:
+                if entry["low"] is None or answer_int > entry["low"]:
+                    entry["low"] = answer_int
+            if wait_time:
+                entry["wait"] = now + wait_time
+
+            self._state.set(self._get_key(year, day, level), entry)
+        return verdict
@@ -0,0 +1,179 @@
+"""Run solution parts in a child process with wall time, CPU time and memory
+limits for `aoc-mod run --timeout/--cpu-limit/--memory-limit`"""
+
+import os
+import sys
+import math
+import signal
+import multiprocessing
+from typing import Any, Callable
+
+from aoc_mod.utilities import AocModError
+
+ERROR_TIMED_OUT = "timed out"
+ERROR_OUT_OF_MEMORY = "out of memory"
+
+
+class ResourceLimits:
+    """Limits of the resources a solution part may use. A limit of 0 means
+    unlimited."""
+
+    def __init__(self, wall_time: float = 0, cpu_time: float = 0, memory: int = 0):
+        """initialize the limits
+
+        :param wall_time: wall time limit in seconds, defaults to 0
+        :type wall_time: float, optional
+        :param cpu_time: CPU time limit in seconds (rounded up to whole
+            seconds), defaults to 0
+        :type cpu_time: float, optional
+        :param memory: address space limit in bytes, defaults to 0
+        :type memory: int, optional
+        """
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.memory = memory
+
+    def __bool__(self) -> bool:
+        return bool(self.wall_time or self.cpu_time or self.memory)
+
+    def apply(self) -> None:
+        """apply the CPU time and memory limits to the current process with
+        `resource.setrlimit`. the wall time limit is enforced by the parent
+        process instead
+
+        :raises AocModError: if resource limits aren't supported
+        """
+        try:
+            import resource
+        except ImportError:
+            raise AocModError("resource limits aren't supported on this platform")
+
+        if self.cpu_time:
+            # SIGXCPU is sent at the soft limit, SIGKILL at the hard one
+            soft_limit = math.ceil(self.cpu_time)
+            _, hard_limit = resource.getrlimit(resource.RLIMIT_CPU)
+            if hard_limit == resource.RLIM_INFINITY or hard_limit > soft_limit + 1:
+                hard_limit = soft_limit + 1
+            resource.setrlimit(resource.RLIMIT_CPU, (soft_limit, hard_limit))
+
+        if self.memory:
+            soft_limit = self.memory
+            _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+            if hard_limit != resource.RLIM_INFINITY:
+                soft_limit = min(soft_limit, hard_limit)
+            resource.setrlimit(resource.RLIMIT_AS, (soft_limit, hard_limit))
+
+
+def _to_bytes(max_rss: int) -> int:
+    """convert a `ru_maxrss` value to bytes"""
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_peak_rss() -> int:
+    """get the peak resident set size of the current process
+
+    :return: the peak RSS in bytes, 0 if it isn't available
+    :rtype: int
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+
+    return _to_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _run_child(conn, call: Callable[[], Any], limits: ResourceLimits) -> None:
+    """apply the limits, make the call and send back a tuple of (return
+    value, error)"""
+    try:
+        limits.apply()
+        message = (call(), None)
+    except MemoryError:
+        message = (None, ERROR_OUT_OF_MEMORY)
+    except BaseException as err:
+        message = (None, f"{type(err).__name__}: {err}")
+
+    try:
+        conn.send(message)
+    except Exception as err:
+        conn.send((None, f"unable to return the result ({err})"))
+    conn.close()
+
+
+def _get_exit_error(exitcode: int | None) -> str:
+    """describe why a child process ended without sending a result"""
+    if exitcode == -signal.SIGXCPU:
+        return ERROR_TIMED_OUT
+    if exitcode is not None and exitcode < 0:
+        return f"crashed ({signal.Signals(-exitcode).name})"
+    return f"exited with code {exitcode}"
+
+
+def run_limited(
+    call: Callable[[], Any], limits: ResourceLimits
+) -> tuple[Any, str | None, int]:
+    """make a call in a forked child process with resource limits, so that
+    running out of time or memory (or crashing) only ends the child process.
+
+    the child is forked, so the call doesn't need to be picklable, but its
+    return value is sent back to this process and does
+
+    :param call: the call to make
+    :type call: Callable[[], Any]
+    :param limits: the limits of the child process
+    :type limits: ResourceLimits
+    :raises AocModError: if processes can't be forked on this platform
+    :return: a tuple of (return value, error, peak RSS in bytes), where the
+        error is None if the call returned, "timed out" if it ran out of wall
+        or CPU time, "out of memory" if an allocation failed or a description
+        of the exception or crash otherwise. the peak RSS is the one of the
+        child process, also when it was killed
+    :rtype: tuple[Any, str | None, int]
+    """
+    if not hasattr(os, "fork") or not hasattr(os, "wait4"):
+        raise AocModError("resource limits need processes to be forked")
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    # flush buffered output first, or the child would write it again
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        exitcode = 1
+        try:
+            receiver.close()
+            sys.stdin.close()
+            sys.stdin = open(os.devnull)
+            _run_child(sender, call, limits)
+            exitcode = 0
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(exitcode)
+    sender.close()
+
+    result = None
+    finished = False
+    try:
+        if receiver.poll(limits.wall_time or None):
+            try:
+                result = receiver.recv()
+            except EOFError:
+                pass
+            finished = True
+        else:
+            result = (None, ERROR_TIMED_OUT)
+    finally:
+        receiver.close()
+        if not finished:
+            os.kill(pid, signal.SIGKILL)
+        # reaping the child gives its resource usage, even once killed
+        _, status, usage = os.wait4(pid, 0)
+
+    if result is None:
+        result = (None, _get_exit_error(os.waitstatus_to_exitcode(status)))
+    return (*result, _to_bytes(usage.ru_maxrss))
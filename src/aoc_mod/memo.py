@@ -0,0 +1,418 @@
+"""Memoization for recursive (dynamic programming) solutions, with bounded
+caches, compact keys, evaluation without deep recursion and statistics that
+`aoc-mod run` reports for each part"""
+
+import sys
+import struct
+import weakref
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, NamedTuple
+
+from aoc_mod.utilities import AocModError
+
+# nested calls of an iterative function before it continues from a fresh stack
+DEFAULT_SEGMENT = 200
+# measured bytes of a cache slot besides its key and value, in a dict and in
+# the OrderedDict of a bounded cache (with its linked list node)
+ENTRY_OVERHEAD = 56
+BOUNDED_ENTRY_OVERHEAD = 110
+
+_KWARGS_MARK = object()
+_SMALL_INTS = {
+    value: b"i\x01" + value.to_bytes(1, "little", signed=True)
+    for value in range(-128, 128)
+}
+
+
+class MemoStats(NamedTuple):
+    """Statistics of a memoized function"""
+
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+    evictions: int
+
+
+class _Counters:
+    """Statistics of a memoized function, kept up to date as it is called and
+    registered until another function of the same name is memoized (such as
+    the same solution loaded again).
+
+    the bytes of the cache are only counted as entries are added when the
+    cache is bounded by bytes, and otherwise measured when the statistics are
+    read (and once more when the function is garbage collected), to keep
+    sizing values out of every call"""
+
+    __slots__ = ("hits", "misses", "entries", "bytes", "evictions", "measure")
+
+    def __init__(self, measure: Callable[[], int] | None = None):
+        self.measure = measure
+        self.reset()
+
+    def reset(self) -> None:
+        self.hits = self.misses = self.entries = self.bytes = self.evictions = 0
+
+    def freeze(self) -> None:
+        """measure the cache a last time and stop referencing it"""
+        if self.measure is not None:
+            self.bytes = self.measure()
+            self.measure = None
+
+    def get(self) -> MemoStats:
+        size = self.measure() if self.measure is not None else self.bytes
+        return MemoStats(self.hits, self.misses, self.entries, size, self.evictions)
+
+
+# counters of every memoized function, by (module, qualified name)
+_registry: dict[tuple[str, str], _Counters] = {}
+
+
+class _Deferred(BaseException):
+    """Raised by an iterative memoized function nested too deep, to evaluate
+    that call first from the bottom of the stack. a BaseException, so that
+    `except Exception` in the function doesn't catch it"""
+
+    def __init__(self, owner: Any, key: Any, args: tuple, kwargs: dict):
+        super().__init__()
+        self.owner = owner
+        self.key = key
+        self.args_kwargs = (args, kwargs)
+
+
+def _pack_length(length: int) -> bytes:
+    return bytes((length,)) if length < 255 else b"\xff" + length.to_bytes(8, "little")
+
+
+def _pack(value: Any, out: list[bytes]) -> None:
+    """append the encoding of a value to a list of byte strings"""
+    kind = type(value)
+    if kind is int:
+        packed = _SMALL_INTS.get(value)
+        if packed is None:
+            data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+            packed = b"i" + _pack_length(len(data)) + data
+        out.append(packed)
+    elif kind is tuple:
+        out.append(b"(" + _pack_length(len(value)))
+        for item in value:
+            _pack(item, out)
+    elif kind is frozenset or kind is set:
+        # equal sets can iterate in different orders, so pack them sorted
+        out.append(b"{" + _pack_length(len(value)))
+        try:
+            items = sorted(value)
+        except TypeError:
+            out += sorted(pack_key(item) for item in value)
+            return
+        for item in items:
+            _pack(item, out)
+    elif value is None or value is True or value is False:
+        out.append(b"N" if value is None else b"T" if value else b"F")
+    elif isinstance(value, int):
+        _pack(int(value), out)
+    elif isinstance(value, (str, bytes)):
+        data = value.encode() if isinstance(value, str) else value
+        out += (b"s" if isinstance(value, str) else b"b", _pack_length(len(data)), data)
+    elif isinstance(value, float):
+        out += (b"f", struct.pack("<d", value))
+    elif isinstance(value, (tuple, frozenset, set)):
+        _pack(tuple(value) if isinstance(value, tuple) else frozenset(value), out)
+    else:
+        raise AocModError(f"unable to pack a key of type {type(value).__name__}")
+
+
+def pack_key(value: Any) -> bytes:
+    """pack a state (nested tuples and frozensets of ints, strings, bytes,
+    floats, bools and None) into a compact bytes key. equal states give equal
+    keys, and a tuple of 4 small ints takes 47 bytes instead of 152 while
+    large nested states shrink by 3x or more
+
+    :param value: the state
+    :type value: Any
+    :raises AocModError: if the state holds a value of another type
+    :return: the packed key
+    :rtype: bytes
+    """
+    out: list[bytes] = []
+    _pack(value, out)
+    return b"".join(out)
+
+
+def pack_bits(items: Iterable[int]) -> int:
+    """pack a set of small non-negative ints (such as the indexes of the valves
+    opened so far) into an int with one bit set per item
+
+    :param items: the ints
+    :type items: Iterable[int]
+    :return: the bit mask
+    :rtype: int
+    """
+    mask = 0
+    for item in items:
+        mask |= 1 << item
+    return mask
+
+
+def _sizeof(value: Any) -> int:
+    """estimate the memory of a value and the containers in it"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list, frozenset, set)):
+        size += sum(_sizeof(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_sizeof(key) + _sizeof(item) for key, item in value.items())
+    return size
+
+
+def memoize(
+    func: Callable | None = None,
+    *,
+    maxsize: int | None = None,
+    maxbytes: int | None = None,
+    key: str | Callable | None = None,
+    iterative: bool = False,
+    segment: int = DEFAULT_SEGMENT,
+) -> Callable:
+    """decorator caching the results of a function by its arguments, like
+    `functools.cache`, with optional bounds, key packing and iterative
+    evaluation. the wrapper has `stats()` (a `MemoStats` of its hits,
+    misses, entries, estimated bytes of its keys and values and evictions)
+    and `cache_clear()`
+
+    with `iterative`, a call nested more than `segment` calls deep is
+    evaluated first from the bottom of the stack and the calls above it are
+    then run again (now finding its result), so recursions of any depth work
+    without raising the recursion limit. the function must not have side
+    effects, since the calls above a deferred call run more than once
+
+    :param func: the function, when used as @memoize without arguments
+    :type func: Callable | None, optional
+    :param maxsize: maximum number of cached results, the least recently used
+        ones are evicted beyond it, defaults to None (unbounded)
+    :type maxsize: int | None, optional
+    :param maxbytes: maximum estimated bytes of the cached keys and results,
+        the least recently used ones are evicted beyond it, defaults to None
+        (unbounded)
+    :type maxbytes: int | None, optional
+    :param key: "pack" to key the cache by `pack_key` of the arguments, or a
+        function of the arguments returning the key (such as a `pack_bits`
+        mask), defaults to None (the arguments themselves)
+    :type key: str | Callable | None, optional
+    :param iterative: evaluate deep recursions without deep stacks, defaults
+        to False
+    :type iterative: bool, optional
+    :param segment: with `iterative`, how deep calls nest before being
+        deferred, defaults to 200
+    :type segment: int, optional
+    :raises AocModError: if `key` is an unknown string
+    :return: the memoized function, or a decorator when `func` is None
+    :rtype: Callable
+    """
+    if func is None:
+        return functools.partial(
+            memoize,
+            maxsize=maxsize,
+            maxbytes=maxbytes,
+            key=key,
+            iterative=iterative,
+            segment=segment,
+        )
+
+    if key == "pack":
+
+        def make_key(args, kwargs):
+            if kwargs:
+                return b"k" + pack_key((args, tuple(sorted(kwargs.items()))))
+            return pack_key(args)
+    elif callable(key):
+
+        def make_key(args, kwargs):
+            return key(*args, **kwargs)
+    elif key is None:
+
+        def make_key(args, kwargs):
+            if kwargs:
+                return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+            # a single hashable argument is its own key, as in functools
+            return args[0] if len(args) == 1 and type(args[0]) in (int, str) else args
+    else:
+        raise AocModError(f"unknown key codec: {key}")
+
+    bounded = maxsize is not None or maxbytes is not None
+    cache: dict = OrderedDict() if bounded else {}
+    overhead = BOUNDED_ENTRY_OVERHEAD if bounded else ENTRY_OVERHEAD
+    counters = _Counters(
+        None
+        if maxbytes is not None
+        else lambda: sum(
+            overhead + _sizeof(cache_key) + _sizeof(value)
+            for cache_key, value in cache.items()
+        )
+    )
+    _registry[(func.__module__, func.__qualname__)] = counters
+    # while an iterative call is being evaluated: the depth of nested calls,
+    # the results of deferred calls, the [key, calls made, calls replayed] of
+    # each running call and the number of calls each call aborted by a
+    # deferred call had made, which it makes again (uncounted) when it runs
+    # again
+    state = {"depth": 0, "pending": None, "frames": [], "replays": {}}
+    missing = object()
+
+    def store(cache_key, value):
+        cache[cache_key] = value
+        counters.entries += 1
+        if maxbytes is not None:
+            counters.bytes += overhead + _sizeof(cache_key) + _sizeof(value)
+        if bounded:
+            while cache and (
+                (maxsize is not None and len(cache) > maxsize)
+                or (maxbytes is not None and counters.bytes > maxbytes)
+            ):
+                evicted_key, evicted = cache.popitem(last=False)
+                counters.entries -= 1
+                counters.evictions += 1
+                if maxbytes is not None:
+                    counters.bytes -= overhead + _sizeof(evicted_key) + _sizeof(evicted)
+
+    def evaluate(cache_key, args, kwargs):
+        """evaluate a call from the bottom of the stack, first evaluating the
+        calls it defers"""
+        pending = state["pending"] = {}
+        stack = [(cache_key, args, kwargs)]
+        try:
+            while stack:
+                call_key, call_args, call_kwargs = stack[-1]
+                state["depth"] = 1
+                try:
+                    value = run_frame(call_key, call_args, call_kwargs)
+                except _Deferred as deferred:
+                    if deferred.owner is not wrapper:
+                        raise
+                    stack.append((deferred.key, *deferred.args_kwargs))
+                    continue
+                counters.misses += 1
+                pending[call_key] = value
+                if call_key not in cache:
+                    store(call_key, value)
+                stack.pop()
+            return pending[cache_key]
+        finally:
+            state["depth"] = 0
+            state["pending"] = None
+            state["replays"].clear()
+
+    def run_frame(cache_key, args, kwargs):
+        """call the function as a frame of an iterative evaluation, keeping
+        the number of calls it made if a deferred call aborts it"""
+        frame = [cache_key, 0, state["replays"].pop(cache_key, 0)]
+        state["frames"].append(frame)
+        try:
+            return func(*args, **kwargs)
+        except _Deferred:
+            state["replays"][cache_key] = frame[1]
+            raise
+        finally:
+            state["frames"].pop()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cache_key = make_key(args, kwargs)
+        # a call made again by a call running again after being aborted was
+        # already counted
+        replayed = False
+        if iterative and state["frames"]:
+            frame = state["frames"][-1]
+            frame[1] += 1
+            replayed = frame[1] <= frame[2]
+
+        value = cache.get(cache_key, missing)
+        if value is not missing:
+            if not replayed:
+                counters.hits += 1
+            if bounded:
+                cache.move_to_end(cache_key)
+            return value
+
+        if iterative:
+            pending = state["pending"]
+            if pending is not None and cache_key in pending:
+                if not replayed:
+                    counters.hits += 1
+                return pending[cache_key]
+            depth = state["depth"]
+            if depth == 0:
+                return evaluate(cache_key, args, kwargs)
+            if depth >= segment:
+                raise _Deferred(wrapper, cache_key, args, kwargs)
+            state["depth"] = depth + 1
+            try:
+                value = run_frame(cache_key, args, kwargs)
+            finally:
+                state["depth"] = depth
+        else:
+            value = func(*args, **kwargs)
+
+        # misses are counted once the value is computed, so that calls aborted
+        # by a deferred call aren't counted twice
+        counters.misses += 1
+        if cache_key not in cache:
+            store(cache_key, value)
+        return value
+
+    def cache_clear():
+        """empty the cache and reset the statistics"""
+        cache.clear()
+        counters.reset()
+
+    wrapper.stats = counters.get
+    wrapper.cache_clear = cache_clear
+    # keep the size of the cache of a function that is gone, such as one
+    # defined inside a part function
+    weakref.finalize(wrapper, counters.freeze).atexit = False
+    return wrapper
+
+
+def memo_stats(module: str | None = None) -> dict[str, MemoStats]:
+    """get the statistics of the memoized functions, by qualified name
+
+    :param module: only get the functions of this module, defaults to None
+        (every module, with names prefixed by the module)
+    :type module: str | None, optional
+    :return: the statistics of each function
+    :rtype: dict[str, MemoStats]
+    """
+    return {
+        name if module is not None else f"{func_module}.{name}": counters.get()
+        for (func_module, name), counters in _registry.items()
+        if module is None or func_module == module
+    }
+
+
+def get_stats_delta(
+    before: dict[str, MemoStats], after: dict[str, MemoStats]
+) -> dict[str, dict[str, int]]:
+    """get the hits, misses and evictions of each memoized function between
+    two calls of memo_stats(), with its entries and bytes at the second
+
+    :param before: the earlier statistics
+    :type before: dict[str, MemoStats]
+    :param after: the later statistics
+    :type after: dict[str, MemoStats]
+    :return: the statistics of the functions called in between
+    :rtype: dict[str, dict[str, int]]
+    """
+    delta = {}
+    for name, stats in after.items():
+        previous = before.get(name, MemoStats(0, 0, 0, 0, 0))
+        counts = {
+            "hits": stats.hits - previous.hits,
+            "misses": stats.misses - previous.misses,
+            "evictions": stats.evictions - previous.evictions,
+        }
+        # a function memoized again (cache_clear or a reload) starts over
+        if any(count < 0 for count in counts.values()):
+            counts = {name: getattr(stats, name) for name in counts}
+        if counts["hits"] or counts["misses"]:
+            delta[name] = {**counts, "entries": stats.entries, "bytes": stats.bytes}
+    return delta
@@ -0,0 +1,490 @@
+"""History of solution run times and detection of performance regressions
+between runs for `aoc-mod perf`"""
+
+import sys
+import json
+import math
+import time
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any
+
+from aoc_mod.runner import format_seconds
+
+# one JSON record per line for every day run by `aoc-mod run`
+HISTORY_FILE = "challenges/.aoc_mod_history.jsonl"
+
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_ALPHA = 0.05
+
+# largest number of samples (of both runs together) tested with the exact
+# distribution of the U statistic instead of its normal approximation
+MAX_EXACT_SAMPLES = 40
+
+STATUS_REGRESSED = "regressed"
+STATUS_IMPROVED = "improved"
+STATUS_UNCHANGED = "unchanged"
+STATUS_INCONCLUSIVE = "inconclusive"
+STATUS_TOO_FEW_SAMPLES = "too few samples"
+STATUS_INPUT_CHANGED = "input changed"
+STATUS_MISSING = "missing"
+
+
+def get_git_commit(root_dir: str = "") -> tuple[str, bool]:
+    """get the commit checked out in the git repository containing a folder
+
+    :param root_dir: path inside the repository, defaults to the current
+        directory
+    :type root_dir: str, optional
+    :return: a tuple of (commit hash, whether there are uncommitted changes),
+        where the hash is "" outside of a git repository
+    :rtype: tuple[str, bool]
+    """
+    cwd = root_dir or None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "", False
+    return commit, bool(status.strip())
+
+
+def resolve_commit(ref: str, root_dir: str = "") -> str:
+    """get the commit hash of a git revision (a branch, tag, "HEAD~2", ...)
+
+    :param ref: the git revision
+    :type ref: str
+    :param root_dir: path inside the repository, defaults to the current
+        directory
+    :type root_dir: str, optional
+    :return: the commit hash, or the revision itself if git can't resolve it
+        (so that it can still match the start of a recorded commit hash)
+    :rtype: str
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+            cwd=root_dir or None,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ref
+
+
+def append_history(results: list[dict[str, Any]], root_dir: str = "") -> None:
+    """append the timings of each successful day run (and each of its parts
+    that didn't fail) to the history file
+
+    :param results: return values of run_solution()
+    :type results: list[dict[str, Any]]
+    :param root_dir: path containing the 'challenges' folder, defaults to the
+        current directory
+    :type root_dir: str, optional
+    """
+    commit, dirty = get_git_commit(root_dir)
+    now = time.time()
+
+    history_path = Path(root_dir).joinpath(HISTORY_FILE)
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with history_path.open("a", encoding="utf-8") as f_out:
+        for result in results:
+            if "error" in result:
+                continue
+            record = {
+                "time": now,
+                "commit": commit,
+                "dirty": dirty,
+                "year": result["year"],
+                "day": result["day"],
+                "input_sha256": result["input_sha256"],
+                "parse": result["parse"]["samples"],
+                "parts": {
+                    str(part): part_results["samples"]
+                    for part, part_results in result["parts"].items()
+                    if "error" not in part_results
+                },
+            }
+            f_out.write(json.dumps(record) + "\n")
+
+
+def load_history(root_dir: str = "") -> list[dict[str, Any]]:
+    """load every record of the history file, oldest first. lines that can't
+    be read (such as one cut short by an interrupted run) are skipped
+
+    :param root_dir: path containing the 'challenges' folder, defaults to the
+        current directory
+    :type root_dir: str, optional
+    :return: the records, empty if there is no history
+    :rtype: list[dict[str, Any]]
+    """
+    records = []
+    try:
+        with Path(root_dir).joinpath(HISTORY_FILE).open("r", encoding="utf-8") as f_in:
+            for line in f_in:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        return []
+    return records
+
+
+def _rank(values: list[float]) -> tuple[list[float], list[int]]:
+    """rank values from 1, giving tied values the mean of their ranks
+
+    :return: a tuple of (rank of each value, size of each group of ties)
+    """
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = []
+    start = 0
+    while start < len(order):
+        end = start
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+            end += 1
+        for index in order[start : end + 1]:
+            ranks[index] = (start + end) / 2 + 1
+        ties.append(end - start + 1)
+        start = end + 1
+    return ranks, ties
+
+
+def _exact_p_value(u_stat: float, n_a: int, n_b: int) -> float:
+    """two-sided p-value of a U statistic from its exact distribution (which
+    assumes there are no ties)"""
+    # counts[j][u] is the number of orderings of i and j samples giving U = u
+    counts = [[1] + [0] * (n_a * n_b) for _ in range(n_b + 1)]
+    for i in range(1, n_a + 1):
+        previous = counts
+        counts = [[0] * (n_a * n_b + 1) for _ in range(n_b + 1)]
+        counts[0][0] = 1
+        for j in range(1, n_b + 1):
+            for u in range(i * j + 1):
+                counts[j][u] = counts[j - 1][u] + (previous[j][u - j] if u >= j else 0)
+
+    distribution = counts[n_b]
+    total = math.comb(n_a + n_b, n_a)
+    lower = min(u_stat, n_a * n_b - u_stat)
+    tail = sum(distribution[: math.floor(lower) + 1])
+    return min(1.0, 2 * tail / total)
+
+
+def mann_whitney_u(samples_a: list[float], samples_b: list[float]) -> float:
+    """two-sided Mann-Whitney U test of whether the values in one sample tend
+    to be larger than those in the other, without assuming they are normally
+    distributed (run times aren't)
+
+    the p-value comes from the exact distribution of U for small samples
+    without ties, otherwise from the normal approximation with a continuity
+    and tie correction
+
+    :param samples_a: the first sample
+    :type samples_a: list[float]
+    :param samples_b: the second sample
+    :type samples_b: list[float]
+    :return: the p-value, 1.0 if either sample is empty
+    :rtype: float
+    """
+    n_a, n_b = len(samples_a), len(samples_b)
+    if not n_a or not n_b:
+        return 1.0
+
+    ranks, ties = _rank(list(samples_a) + list(samples_b))
+    u_stat = sum(ranks[:n_a]) - n_a * (n_a + 1) / 2
+
+    if n_a + n_b <= MAX_EXACT_SAMPLES and all(count == 1 for count in ties):
+        return _exact_p_value(u_stat, n_a, n_b)
+
+    n_total = n_a + n_b
+    tie_term = sum(count**3 - count for count in ties) / (n_total * (n_total - 1))
+    variance = n_a * n_b / 12 * (n_total + 1 - tie_term)
+    if variance <= 0:
+        # every value is the same
+        return 1.0
+    z_score = (abs(u_stat - n_a * n_b / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z_score, 0.0) / math.sqrt(2)))
+
+
+def min_p_value(n_a: int, n_b: int) -> float:
+    """smallest two-sided p-value the Mann-Whitney U test can give for samples
+    of these sizes (when they don't overlap at all). a change can't be
+    significant at a level `alpha` unless this is below it
+
+    :param n_a: size of the first sample
+    :type n_a: int
+    :param n_b: size of the second sample
+    :type n_b: int
+    :return: the p-value, 1.0 if either sample is empty
+    :rtype: float
+    """
+    if not n_a or not n_b:
+        return 1.0
+    return min(1.0, 2 / math.comb(n_a + n_b, n_a))
+
+
+def min_samples(alpha: float = DEFAULT_ALPHA) -> int:
+    """get the number of samples each of two runs needs for the Mann-Whitney
+    U test to be able to find a change significant at a level `alpha`
+
+    :param alpha: significance level, defaults to 0.05
+    :type alpha: float, optional
+    :return: the number of samples (the `--repeat` of `aoc-mod run`)
+    :rtype: int
+    """
+    count = 1
+    while min_p_value(count, count) >= alpha:
+        count += 1
+    return count
+
+
+def _group_samples(
+    records: list[dict[str, Any]],
+) -> dict[tuple[int, int, str], dict[str, Any]]:
+    """pool the samples of the records of each year, day and part (or
+    "parse") with the input digests they were run with"""
+    groups: dict[tuple[int, int, str], dict[str, Any]] = {}
+    for record in records:
+        parts = {"parse": record["parse"], **record["parts"]}
+        for part, samples in parts.items():
+            group = groups.setdefault(
+                (record["year"], record["day"], part),
+                {"samples": [], "inputs": set()},
+            )
+            group["samples"] += samples
+            group["inputs"].add(record["input_sha256"])
+    return groups
+
+
+def compare_runs(
+    baseline: list[dict[str, Any]],
+    candidate: list[dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+) -> list[dict[str, Any]]:
+    """compare the run times of each part between two sets of history records
+
+    a part "regressed" (or "improved") when its median run time changed by
+    more than the threshold and the Mann-Whitney U test says the change is
+    significant. a change beyond the threshold that could be noise is
+    "inconclusive", or "too few samples" when the samples are too few for any
+    change to be significant (see `min_samples` and `aoc-mod run --repeat`).
+    parts run with different inputs aren't compared
+
+    :param baseline: history records to compare against
+    :type baseline: list[dict[str, Any]]
+    :param candidate: history records to compare
+    :type candidate: list[dict[str, Any]]
+    :param threshold: relative change of the median run time that counts as
+        a regression or improvement, defaults to 0.1 (10%)
+    :type threshold: float, optional
+    :param alpha: largest p-value of a significant change, defaults to 0.05
+    :type alpha: float, optional
+    :return: the "year", "day", "part", median run times ("baseline",
+        "candidate"), their "ratio", the "p_value", the number of "samples" of
+        both and the "status" (one of the STATUS_* constants) of each part,
+        sorted by year, day and part
+    :rtype: list[dict[str, Any]]
+    """
+    baseline_groups = _group_samples(baseline)
+    candidate_groups = _group_samples(candidate)
+
+    rows = []
+    for key in sorted(baseline_groups.keys() | candidate_groups.keys()):
+        year, day, part = key
+        row = {
+            "year": year,
+            "day": day,
+            "part": part,
+            "baseline": None,
+            "candidate": None,
+            "ratio": None,
+            "p_value": None,
+            "samples": None,
+            "status": STATUS_MISSING,
+        }
+        rows.append(row)
+        if key not in baseline_groups or key not in candidate_groups:
+            continue
+
+        before, after = baseline_groups[key], candidate_groups[key]
+        row["baseline"] = statistics.median(before["samples"])
+        row["candidate"] = statistics.median(after["samples"])
+        row["samples"] = [len(before["samples"]), len(after["samples"])]
+        if before["inputs"] != after["inputs"]:
+            row["status"] = STATUS_INPUT_CHANGED
+            continue
+
+        row["ratio"] = row["candidate"] / row["baseline"] if row["baseline"] else 1.0
+        row["p_value"] = mann_whitney_u(before["samples"], after["samples"])
+        if abs(row["ratio"] - 1) <= threshold:
+            row["status"] = STATUS_UNCHANGED
+        elif min_p_value(*row["samples"]) >= alpha:
+            row["status"] = STATUS_TOO_FEW_SAMPLES
+        elif row["p_value"] >= alpha:
+            row["status"] = STATUS_INCONCLUSIVE
+        elif row["ratio"] > 1:
+            row["status"] = STATUS_REGRESSED
+        else:
+            row["status"] = STATUS_IMPROVED
+    return rows
+
+
+def select_commit(records: list[dict[str, Any]], commit: str) -> list[dict[str, Any]]:
+    """get the records of the runs made at a commit
+
+    :param records: history records
+    :type records: list[dict[str, Any]]
+    :param commit: full commit hash or the start of one
+    :type commit: str
+    :return: the records whose commit starts with `commit`
+    :rtype: list[dict[str, Any]]
+    """
+    return [
+        record
+        for record in records
+        if record["commit"] and record["commit"].startswith(commit)
+    ]
+
+
+def select_last_runs(
+    records: list[dict[str, Any]], count: int = 1
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """split the records into the latest run of each day and the `count`
+    runs of that day before it
+
+    :param records: history records, oldest first
+    :type records: list[dict[str, Any]]
+    :param count: number of earlier runs of each day to compare against,
+        defaults to 1
+    :type count: int, optional
+    :return: a tuple of (baseline records, candidate records)
+    :rtype: tuple[list[dict[str, Any]], list[dict[str, Any]]]
+    """
+    runs: dict[tuple[int, int], list[dict[str, Any]]] = {}
+    for record in records:
+        runs.setdefault((record["year"], record["day"]), []).append(record)
+
+    baseline, candidate = [], []
+    for day_runs in runs.values():
+        if len(day_runs) < 2:
+            continue
+        candidate.append(day_runs[-1])
+        baseline += day_runs[-count - 1 : -1]
+    return baseline, candidate
+
+
+def format_comparison(rows: list[dict[str, Any]]) -> str:
+    """format the return value of compare_runs() as a table
+
+    :param rows: return value of compare_runs()
+    :type rows: list[dict[str, Any]]
+    :return: the table
+    :rtype: str
+    """
+    lines = [
+        f"{'year':<6}{'day':>4}{'part':>7}{'baseline':>12}{'candidate':>12}"
+        f"{'change':>9}{'p-value':>9}  status"
+    ]
+    for row in rows:
+        before = format_seconds(row["baseline"]) if row["baseline"] is not None else "-"
+        after = (
+            format_seconds(row["candidate"]) if row["candidate"] is not None else "-"
+        )
+        change = f"{row['ratio'] - 1:+.0%}" if row["ratio"] is not None else "-"
+        p_value = f"{row['p_value']:.3f}" if row["p_value"] is not None else "-"
+        lines.append(
+            f"{row['year']:<6}{row['day']:>4}{row['part']:>7}{before:>12}"
+            f"{after:>12}{change:>9}{p_value:>9}  {row['status']}"
+        )
+    return "\n".join(lines)
+
+
+def perf_command(options) -> int:
+    """compare run times for the `aoc-mod perf compare` command
+
+    :param options: parsed command-line options
+    :type options: argparse.Namespace
+    :return: the exit code, 1 if any part regressed (or there is nothing to
+        compare, or too few samples to find a significant change in any part),
+        2 if more than two commits are given and 0 otherwise
+    :rtype: int
+    """
+    if len(options.commits) > 2:
+        print(
+            "aoc-mod perf compare: error: expected at most 2 commits, "
+            f"got {len(options.commits)}",
+            file=sys.stderr,
+        )
+        return 2
+
+    records = load_history(options.output_root_dir)
+
+    if options.commits:
+        baseline_commit = resolve_commit(options.commits[0], options.output_root_dir)
+        if len(options.commits) > 1:
+            candidate_commit = resolve_commit(
+                options.commits[1], options.output_root_dir
+            )
+        else:
+            candidate_commit = get_git_commit(options.output_root_dir)[0]
+        baseline = select_commit(records, baseline_commit)
+        candidate = select_commit(records, candidate_commit)
+    else:
+        baseline, candidate = select_last_runs(records, options.last)
+
+    if not baseline or not candidate:
+        print("No runs to compare, record some with 'aoc-mod run'.", file=sys.stderr)
+        return 1
+
+    rows = compare_runs(
+        baseline, candidate, threshold=options.threshold, alpha=options.alpha
+    )
+    if options.json:
+        print(json.dumps(rows))
+    else:
+        print(format_comparison(rows))
+
+    # with a single sample per run (the default of `aoc-mod run`) no change
+    # can ever be significant, which must not pass as "no regression"
+    testable = [
+        min_p_value(*row["samples"]) < options.alpha
+        for row in rows
+        if row["p_value"] is not None
+    ]
+    if not any(testable):
+        print(
+            f"Too few samples to find a significant change at alpha={options.alpha}, "
+            f"record runs with 'aoc-mod run --repeat {min_samples(options.alpha)}' "
+            "or more.",
+            file=sys.stderr,
+        )
+        return 1
+    untested = [
+        f"{row['year']} day {row['day']} "
+        + (row["part"] if row["part"] == "parse" else f"part {row['part']}")
+        for row in rows
+        if row["status"] == STATUS_TOO_FEW_SAMPLES
+    ]
+    if untested:
+        print(
+            "Changed beyond the threshold with too few samples to test: "
+            + ", ".join(untested),
+            file=sys.stderr,
+        )
+    return 1 if any(row["status"] == STATUS_REGRESSED for row in rows) else 0
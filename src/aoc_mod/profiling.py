@@ -0,0 +1,243 @@
+"""CPU and memory profiling of solution parts for `aoc-mod run --profile`"""
+
+import sys
+import cProfile
+import inspect
+import functools
+import threading
+import tracemalloc
+from pathlib import Path
+from collections import Counter
+from types import FrameType
+from typing import Any, Callable
+
+from aoc_mod.utilities import AocModError
+
+DEFAULT_SAMPLE_INTERVAL = 0.001
+DEFAULT_TOP_ALLOCATIONS = 10
+
+
+class StackSampler:
+    """Samples the call stack of a thread from a background thread and
+    counts each distinct stack, for flame graphs of where time is spent.
+
+    Stacks are cut at the frame running `root_code`, so only the code called
+    from it is counted, and samples taken outside of it are dropped."""
+
+    def __init__(
+        self,
+        root_code,
+        thread_id: int | None = None,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ):
+        """initialize the sampler, which doesn't sample until started
+
+        :param root_code: code object of the outermost function to sample
+        :type root_code: CodeType
+        :param thread_id: id of the thread to sample, defaults to the
+            current thread
+        :type thread_id: int | None, optional
+        :param interval: seconds between samples, defaults to 0.001
+        :type interval: float, optional
+        """
+        self.root_code = root_code
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._switch_interval = sys.getswitchinterval()
+
+    @staticmethod
+    def _format_frame(frame: FrameType) -> str:
+        """format a frame as "function (file:line)" for a collapsed stack"""
+        code = frame.f_code
+        return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+    def sample(self) -> None:
+        """take one sample of the sampled thread's stack"""
+        frame = sys._current_frames().get(self.thread_id)
+        names = []
+        while frame is not None:
+            names.append(self._format_frame(frame))
+            if frame.f_code is self.root_code:
+                self.stacks[";".join(reversed(names))] += 1
+                return
+            frame = frame.f_back
+
+    def _run(self) -> None:
+        """take samples until stopped"""
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        """start sampling in a background thread"""
+        # the sampler can only run when the sampled thread releases the GIL,
+        # so let it switch threads as often as it samples
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """stop sampling and wait for the background thread to finish"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+
+    def write_collapsed(self, path: Path) -> None:
+        """write the sampled stacks in the collapsed format read by
+        flamegraph.pl, speedscope and similar tools: one "a;b;c count" line
+        per distinct stack
+
+        :param path: path to the output file
+        :type path: Path
+        """
+        with path.open("w", encoding="utf-8") as f_out:
+            for stack, count in sorted(self.stacks.items()):
+                f_out.write(f"{stack} {count}\n")
+
+
+def _find_code(func: Callable[..., Any]):
+    """find the code object run by calling func, looking through decorators,
+    functools.partial objects and callable instances
+
+    :param func: the function to look into
+    :type func: Callable[..., Any]
+    :return: the code object, or None if func isn't python code
+    :rtype: CodeType | None
+    """
+    func = inspect.unwrap(func)
+    while isinstance(func, functools.partial):
+        func = inspect.unwrap(func.func)
+    code = getattr(func, "__code__", None)
+    if code is None and not inspect.isroutine(func):
+        code = getattr(inspect.unwrap(type(func).__call__), "__code__", None)
+    return code
+
+
+def profile_cpu(
+    func: Callable[[Any], Any],
+    arg: Any,
+    output_prefix: Path,
+    interval: float = DEFAULT_SAMPLE_INTERVAL,
+) -> dict[str, str]:
+    """profile a function call with cProfile, then sample a second call of
+    it with a StackSampler. the calls are made separately so that the
+    overhead of cProfile doesn't skew the sampled stacks. functions without
+    python code to sample from (such as builtins) are only run with cProfile
+
+    :param func: the function to profile
+    :type func: Callable[[Any], Any]
+    :param arg: the argument passed to the function
+    :type arg: Any
+    :param output_prefix: path and file name prefix of the output files
+    :type output_prefix: Path
+    :param interval: seconds between stack samples, defaults to 0.001
+    :type interval: float, optional
+    :return: paths of the "pstats" file and the "collapsed" stacks file, if
+        the function was sampled
+    :rtype: dict[str, str]
+    """
+    output_prefix.parent.mkdir(parents=True, exist_ok=True)
+    pstats_path = output_prefix.with_name(f"{output_prefix.name}.pstats")
+    collapsed_path = output_prefix.with_name(f"{output_prefix.name}.collapsed")
+
+    profiler = cProfile.Profile()
+    profiler.runcall(func, arg)
+    profiler.dump_stats(pstats_path)
+
+    root_code = _find_code(func)
+    if root_code is None:
+        return {"pstats": str(pstats_path)}
+
+    sampler = StackSampler(root_code, interval=interval)
+    sampler.start()
+    try:
+        func(arg)
+    finally:
+        sampler.stop()
+    sampler.write_collapsed(collapsed_path)
+
+    return {"pstats": str(pstats_path), "collapsed": str(collapsed_path)}
+
+
+def profile_memory(
+    func: Callable[[Any], Any],
+    arg: Any,
+    output_prefix: Path,
+    limit: int = DEFAULT_TOP_ALLOCATIONS,
+) -> dict[str, Any]:
+    """trace the memory allocated by a function call with tracemalloc
+
+    :param func: the function to profile
+    :type func: Callable[[Any], Any]
+    :param arg: the argument passed to the function
+    :type arg: Any
+    :param output_prefix: path and file name prefix of the report file
+    :type output_prefix: Path
+    :param limit: number of top allocation sites to report, defaults to 10
+    :type limit: int, optional
+    :return: the "peak" traced memory in bytes, the "top" allocation sites
+        still allocated when the function returned, as (location, bytes,
+        count) and the path of the text "report"
+    :rtype: dict[str, Any]
+    """
+    output_prefix.parent.mkdir(parents=True, exist_ok=True)
+    report_path = output_prefix.with_name(f"{output_prefix.name}.memory.txt")
+
+    tracemalloc.start()
+    try:
+        # keep the return value alive so that its allocations are reported
+        result = func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    top = [
+        (
+            f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            stat.size,
+            stat.count,
+        )
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+    with report_path.open("w", encoding="utf-8") as f_out:
+        f_out.write(f"peak traced memory: {peak} bytes\n")
+        f_out.write(f"top {len(top)} allocation sites when the call returned:\n")
+        for location, size, count in top:
+            f_out.write(f"{size:>12} bytes {count:>8} blocks  {location}\n")
+
+    return {"peak": peak, "top": top, "report": str(report_path)}
+
+
+def profile_call(
+    kind: str, func: Callable[[Any], Any], arg: Any, output_prefix: Path
+) -> dict[str, Any]:
+    """profile a function call with profile_cpu() or profile_memory()
+
+    :param kind: "cpu" or "mem"
+    :type kind: str
+    :param func: the function to profile
+    :type func: Callable[[Any], Any]
+    :param arg: the argument passed to the function
+    :type arg: Any
+    :param output_prefix: path and file name prefix of the output files
+    :type output_prefix: Path
+    :raises AocModError: if the kind of profile is unknown
+    :return: the return value of the profile function
+    :rtype: dict[str, Any]
+    """
+    if kind == "cpu":
+        return profile_cpu(func, arg, output_prefix)
+    if kind == "mem":
+        return profile_memory(func, arg, output_prefix)
+    raise AocModError(f"unknown profile kind: {kind}")
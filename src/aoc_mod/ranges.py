@@ -0,0 +1,559 @@
+"""Sets of integer ranges, maps shifting whole ranges and sets of N-D boxes,
+for puzzles about intervals, almanac-style lookup tables and cuboids whose
+integers are far too many to expand one by one.
+
+Ranges are half-open like Python's `range`: (start, stop) holds start up to
+but not including stop. `from_inclusive` builds sets from the inclusive
+bounds most puzzles use, and the bounds must fit in 64-bit signed integers."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+
+from aoc_mod.utilities import AocModError
+
+Range = tuple[int, int]
+Box = tuple[Range, ...]
+
+
+def _to_pair(item: range | Range) -> Range:
+    """get the (start, stop) bounds of a range or a pair"""
+    if isinstance(item, range):
+        if item.step != 1:
+            raise AocModError(f"only ranges with a step of 1 are supported: {item}")
+        return item.start, item.stop
+    start, stop = item
+    return start, stop
+
+
+class RangeSet:
+    """Set of integers stored as sorted, disjoint ranges in two arrays of
+    starts and stops. membership is a binary search (O(log n)) and the union,
+    intersection and difference of two sets are a single merge of their
+    ranges (O(n + m)).
+
+    `len()` and iteration are over the disjoint ranges (as `range` objects)
+    and `size` is the number of integers in the set."""
+
+    __slots__ = ("_starts", "_stops")
+
+    def __init__(self, ranges: Iterable[range | Range] = ()):
+        """initialize the set, merging overlapping and adjacent ranges
+
+        :param ranges: the ranges, as `range` objects or (start, stop) pairs,
+            defaults to ()
+        :type ranges: Iterable[range | Range], optional
+        :raises AocModError: if a range has a step other than 1
+        """
+        self._starts = array("q")
+        self._stops = array("q")
+        for start, stop in sorted(_to_pair(item) for item in ranges):
+            if start >= stop:
+                continue
+            if self._stops and start <= self._stops[-1]:
+                if stop > self._stops[-1]:
+                    self._stops[-1] = stop
+            else:
+                self._starts.append(start)
+                self._stops.append(stop)
+
+    @classmethod
+    def from_inclusive(cls, ranges: Iterable[Range]) -> "RangeSet":
+        """create a set from (first, last) pairs including both ends, such as
+        the "3-5" ranges of a puzzle
+
+        :param ranges: the (first, last) pairs
+        :type ranges: Iterable[Range]
+        :return: the set
+        :rtype: RangeSet
+        """
+        return cls((first, last + 1) for first, last in ranges)
+
+    @classmethod
+    def _from_arrays(cls, starts: array, stops: array) -> "RangeSet":
+        """create a set from arrays of ranges that are already sorted, disjoint
+        and not adjacent"""
+        ranges = cls.__new__(cls)
+        ranges._starts = starts
+        ranges._stops = stops
+        return ranges
+
+    def copy(self) -> "RangeSet":
+        """get a copy of the set"""
+        return self._from_arrays(array("q", self._starts), array("q", self._stops))
+
+    @property
+    def size(self) -> int:
+        """the number of integers in the set"""
+        return sum(self._stops) - sum(self._starts)
+
+    def bounds(self) -> Range | None:
+        """get the smallest range holding the whole set
+
+        :return: the (start, stop) bounds, None if the set is empty
+        :rtype: Range | None
+        """
+        return (self._starts[0], self._stops[-1]) if self._starts else None
+
+    def __contains__(self, value: int) -> bool:
+        index = bisect_right(self._starts, value) - 1
+        return index >= 0 and value < self._stops[index]
+
+    def find(self, value: int) -> range | None:
+        """get the range of the set holding a value
+
+        :param value: the value
+        :type value: int
+        :return: the range, None if the value isn't in the set
+        :rtype: range | None
+        """
+        index = bisect_right(self._starts, value) - 1
+        if index >= 0 and value < self._stops[index]:
+            return range(self._starts[index], self._stops[index])
+        return None
+
+    def add(self, start: int, stop: int) -> None:
+        """add a range to the set, merging it with the ranges it overlaps or
+        touches
+
+        :param start: first integer of the range
+        :type start: int
+        :param stop: integer after the last one of the range
+        :type stop: int
+        """
+        if start >= stop:
+            return
+        first = bisect_left(self._stops, start)
+        last = bisect_right(self._starts, stop)
+        if first < last:
+            start = min(start, self._starts[first])
+            stop = max(stop, self._stops[last - 1])
+        self._starts[first:last] = array("q", (start,))
+        self._stops[first:last] = array("q", (stop,))
+
+    def discard(self, start: int, stop: int) -> None:
+        """remove a range from the set
+
+        :param start: first integer of the range
+        :type start: int
+        :param stop: integer after the last one of the range
+        :type stop: int
+        """
+        if start >= stop:
+            return
+        first = bisect_right(self._stops, start)
+        last = bisect_left(self._starts, stop)
+        if first >= last:
+            return
+        starts, stops = array("q"), array("q")
+        if self._starts[first] < start:
+            starts.append(self._starts[first])
+            stops.append(start)
+        if self._stops[last - 1] > stop:
+            starts.append(stop)
+            stops.append(self._stops[last - 1])
+        self._starts[first:last] = starts
+        self._stops[first:last] = stops
+
+    def union(self, other: "RangeSet") -> "RangeSet":
+        """get the integers in either set
+
+        :param other: the other set
+        :type other: RangeSet
+        :return: the union
+        :rtype: RangeSet
+        """
+        a_starts, a_stops, b_starts, b_stops = (
+            self._starts,
+            self._stops,
+            other._starts,
+            other._stops,
+        )
+        starts, stops = array("q"), array("q")
+        i = j = 0
+        while i < len(a_starts) or j < len(b_starts):
+            if j == len(b_starts) or (i < len(a_starts) and a_starts[i] <= b_starts[j]):
+                start, stop = a_starts[i], a_stops[i]
+                i += 1
+            else:
+                start, stop = b_starts[j], b_stops[j]
+                j += 1
+            if stops and start <= stops[-1]:
+                if stop > stops[-1]:
+                    stops[-1] = stop
+            else:
+                starts.append(start)
+                stops.append(stop)
+        return self._from_arrays(starts, stops)
+
+    def intersection(self, other: "RangeSet") -> "RangeSet":
+        """get the integers in both sets
+
+        :param other: the other set
+        :type other: RangeSet
+        :return: the intersection
+        :rtype: RangeSet
+        """
+        a_starts, a_stops, b_starts, b_stops = (
+            self._starts,
+            self._stops,
+            other._starts,
+            other._stops,
+        )
+        starts, stops = array("q"), array("q")
+        i = j = 0
+        while i < len(a_starts) and j < len(b_starts):
+            start = max(a_starts[i], b_starts[j])
+            stop = min(a_stops[i], b_stops[j])
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+            if a_stops[i] < b_stops[j]:
+                i += 1
+            else:
+                j += 1
+        return self._from_arrays(starts, stops)
+
+    def difference(self, other: "RangeSet") -> "RangeSet":
+        """get the integers in this set but not in the other one
+
+        :param other: the other set
+        :type other: RangeSet
+        :return: the difference
+        :rtype: RangeSet
+        """
+        b_starts, b_stops = other._starts, other._stops
+        starts, stops = array("q"), array("q")
+        j = 0
+        for start, stop in zip(self._starts, self._stops):
+            while j < len(b_starts) and b_stops[j] <= start:
+                j += 1
+            k = j
+            while k < len(b_starts) and b_starts[k] < stop:
+                if b_starts[k] > start:
+                    starts.append(start)
+                    stops.append(b_starts[k])
+                start = max(start, b_stops[k])
+                k += 1
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+        return self._from_arrays(starts, stops)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __iter__(self) -> Iterator[range]:
+        return map(range, self._starts, self._stops)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RangeSet):
+            return NotImplemented
+        return self._starts == other._starts and self._stops == other._stops
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        ranges = ", ".join(
+            f"({start}, {stop})" for start, stop in zip(self._starts, self._stops)
+        )
+        return f"RangeSet([{ranges}])"
+
+
+class RangeMap:
+    """Map shifting integers by a different offset in each of its ranges
+    (and leaving the integers outside them as they are), like the lookup
+    tables of an almanac. `map_ranges` maps a whole `RangeSet` at once, piece
+    by piece, without expanding it."""
+
+    __slots__ = ("_starts", "_stops", "_offsets")
+
+    def __init__(self, pieces: Iterable[tuple[int, int, int]] = ()):
+        """initialize the map
+
+        :param pieces: (start, stop, offset) triples, mapping every integer
+            from start up to stop by adding the offset, defaults to ()
+        :type pieces: Iterable[tuple[int, int, int]], optional
+        :raises AocModError: if two pieces overlap
+        """
+        self._starts = array("q")
+        self._stops = array("q")
+        self._offsets = array("q")
+        for start, stop, offset in sorted(pieces):
+            if start >= stop:
+                continue
+            if self._stops and start < self._stops[-1]:
+                raise AocModError(f"overlapping ranges in map: {start}-{stop}")
+            self._starts.append(start)
+            self._stops.append(stop)
+            self._offsets.append(offset)
+
+    @classmethod
+    def from_lengths(cls, entries: Iterable[tuple[int, int, int]]) -> "RangeMap":
+        """create a map from (destination, source, length) entries, mapping
+        source up to source + length to destination onwards
+
+        :param entries: the entries, such as `parse_int_rows` of the lines of
+            a map in the almanac of 2023 day 5
+        :type entries: Iterable[tuple[int, int, int]]
+        :raises AocModError: if two entries overlap
+        :return: the map
+        :rtype: RangeMap
+        """
+        return cls(
+            (source, source + length, destination - source)
+            for destination, source, length in entries
+        )
+
+    def map_value(self, value: int) -> int:
+        """map an integer
+
+        :param value: the integer
+        :type value: int
+        :return: the integer shifted by the offset of its range, or the
+            integer itself if it isn't in a range of the map
+        :rtype: int
+        """
+        index = bisect_right(self._starts, value) - 1
+        if index >= 0 and value < self._stops[index]:
+            return value + self._offsets[index]
+        return value
+
+    def map_ranges(self, ranges: RangeSet) -> RangeSet:
+        """map every integer of a set, splitting its ranges where the ranges
+        of the map start and stop
+
+        :param ranges: the set
+        :type ranges: RangeSet
+        :return: the set of mapped integers
+        :rtype: RangeSet
+        """
+        starts, stops, offsets = self._starts, self._stops, self._offsets
+        pieces = []
+        for start, stop in zip(ranges._starts, ranges._stops):
+            index = bisect_right(starts, start) - 1
+            if index < 0 or stops[index] <= start:
+                index += 1
+            # from here on, the map's range at `index` (if any) stops after
+            # `start`
+            while start < stop:
+                if index < len(starts) and starts[index] <= start:
+                    end = min(stop, stops[index])
+                    offset = offsets[index]
+                    pieces.append((start + offset, end + offset))
+                    index += 1
+                else:
+                    end = min(stop, starts[index]) if index < len(starts) else stop
+                    pieces.append((start, end))
+                start = end
+        return RangeSet(pieces)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        return zip(self._starts, self._stops, self._offsets)
+
+    def __repr__(self) -> str:
+        return f"RangeMap({list(self)})"
+
+
+def _overlaps(first: Box, second: Box) -> bool:
+    return all(
+        start < other_stop and other_start < stop
+        for (start, stop), (other_start, other_stop) in zip(first, second)
+    )
+
+
+def _subtract_box(box: Box, other: Box) -> list[Box]:
+    """split the part of a box outside an overlapping box into disjoint boxes,
+    cutting off the slabs before and after the other box along each axis"""
+    pieces = []
+    remaining = list(box)
+    for axis, ((start, stop), (other_start, other_stop)) in enumerate(zip(box, other)):
+        if start < other_start:
+            pieces.append(
+                tuple(remaining[:axis] + [(start, other_start)] + remaining[axis + 1 :])
+            )
+        if other_stop < stop:
+            pieces.append(
+                tuple(remaining[:axis] + [(other_stop, stop)] + remaining[axis + 1 :])
+            )
+        remaining[axis] = (max(start, other_start), min(stop, other_stop))
+    return pieces
+
+
+class BoxSet:
+    """Set of integer points in N dimensions stored as disjoint boxes, for
+    cuboid puzzles: adding or removing a box only splits the boxes it
+    overlaps, so the volume of any number of overlapping boxes is a sum.
+
+    a box is a tuple of (start, stop) bounds per axis, such as
+    ((x0, x1), (y0, y1), (z0, z1))"""
+
+    __slots__ = ("_boxes",)
+
+    def __init__(self, boxes: Iterable[Box] = ()):
+        """initialize the set
+
+        :param boxes: the boxes, which may overlap, defaults to ()
+        :type boxes: Iterable[Box], optional
+        """
+        self._boxes: list[Box] = []
+        for box in boxes:
+            self.add(box)
+
+    @classmethod
+    def from_inclusive(cls, boxes: Iterable[Box]) -> "BoxSet":
+        """create a set from boxes given by (first, last) pairs including both
+        ends, such as "x=10..12,y=10..12,z=10..12"
+
+        :param boxes: the boxes
+        :type boxes: Iterable[Box]
+        :return: the set
+        :rtype: BoxSet
+        """
+        return cls(tuple((first, last + 1) for first, last in box) for box in boxes)
+
+    def copy(self) -> "BoxSet":
+        """get a copy of the set"""
+        boxes = BoxSet()
+        boxes._boxes = self._boxes.copy()
+        return boxes
+
+    @staticmethod
+    def _normalize(box: Box) -> Box | None:
+        box = tuple(_to_pair(bounds) for bounds in box)
+        return box if all(start < stop for start, stop in box) else None
+
+    def add(self, box: Box) -> None:
+        """add the points of a box
+
+        :param box: the box
+        :type box: Box
+        """
+        box = self._normalize(box)
+        if box is None:
+            return
+        self.discard(box)
+        self._boxes.append(box)
+
+    def discard(self, box: Box) -> None:
+        """remove the points of a box
+
+        :param box: the box
+        :type box: Box
+        """
+        box = self._normalize(box)
+        if box is None:
+            return
+        boxes = []
+        for existing in self._boxes:
+            if _overlaps(existing, box):
+                boxes += _subtract_box(existing, box)
+            else:
+                boxes.append(existing)
+        self._boxes = boxes
+
+    @property
+    def volume(self) -> int:
+        """the number of points in the set"""
+        total = 0
+        for box in self._boxes:
+            size = 1
+            for start, stop in box:
+                size *= stop - start
+            total += size
+        return total
+
+    def bounds(self) -> Box | None:
+        """get the smallest box holding the whole set
+
+        :return: the box, None if the set is empty
+        :rtype: Box | None
+        """
+        if not self._boxes:
+            return None
+        return tuple(
+            (min(start for start, _ in axis), max(stop for _, stop in axis))
+            for axis in zip(*self._boxes)
+        )
+
+    def __contains__(self, point: tuple[int, ...]) -> bool:
+        return any(
+            all(
+                start <= coordinate < stop
+                for coordinate, (start, stop) in zip(point, box)
+            )
+            for box in self._boxes
+        )
+
+    def union(self, other: "BoxSet") -> "BoxSet":
+        """get the points in either set
+
+        :param other: the other set
+        :type other: BoxSet
+        :return: the union
+        :rtype: BoxSet
+        """
+        boxes = self.copy()
+        for box in other._boxes:
+            boxes.add(box)
+        return boxes
+
+    def intersection(self, other: "BoxSet") -> "BoxSet":
+        """get the points in both sets
+
+        :param other: the other set
+        :type other: BoxSet
+        :return: the intersection
+        :rtype: BoxSet
+        """
+        boxes = BoxSet()
+        # the boxes of each set are disjoint, so their overlaps are too
+        boxes._boxes = [
+            tuple(
+                (max(start, other_start), min(stop, other_stop))
+                for (start, stop), (other_start, other_stop) in zip(box, other_box)
+            )
+            for box in self._boxes
+            for other_box in other._boxes
+            if _overlaps(box, other_box)
+        ]
+        return boxes
+
+    def difference(self, other: "BoxSet") -> "BoxSet":
+        """get the points in this set but not in the other one
+
+        :param other: the other set
+        :type other: BoxSet
+        :return: the difference
+        :rtype: BoxSet
+        """
+        boxes = self.copy()
+        for box in other._boxes:
+            boxes.discard(box)
+        return boxes
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __iter__(self) -> Iterator[Box]:
+        return iter(self._boxes)
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __bool__(self) -> bool:
+        return bool(self._boxes)
+
+    def __repr__(self) -> str:
+        return f"BoxSet(boxes={len(self._boxes)}, volume={self.volume})"
@@ -0,0 +1,666 @@
+"""Run and time the solution files created by `aoc-mod setup`"""
+
+import io
+import os
+import sys
+import json
+import math
+import hashlib
+import functools
+import time
+import traceback
+import statistics
+import contextlib
+import importlib.util
+import importlib.machinery
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from aoc_mod.cache import write_atomic
+from aoc_mod.interactive import LOCAL_PUZZLE_FILEPATH
+from aoc_mod.limits import ResourceLimits, run_limited
+from aoc_mod.memo import get_stats_delta, memo_stats
+from aoc_mod.utilities import AocModError, get_year_and_day, parse_input
+
+PART_FUNCTIONS = {1: "part_one", 2: "part_two"}
+
+# total run time of each day from the last run, used to schedule long days first
+TIMINGS_FILE = "challenges/.aoc_mod_timings.json"
+
+
+def get_solution_paths(year: int, day: int, root_dir: str = "") -> tuple[Path, Path]:
+    """get the paths to the solution file and puzzle input of a challenge day
+
+    :param year: year of the puzzle
+    :type year: int
+    :param day: day of the puzzle
+    :type day: int
+    :param root_dir: path containing the 'challenges' folder, defaults to the
+        current directory
+    :type root_dir: str, optional
+    :raises AocModError: if the solution file or the puzzle input is missing
+    :return: a tuple of (solution_path, input_path)
+    :rtype: tuple[Path, Path]
+    """
+    day_path = Path(root_dir).joinpath(LOCAL_PUZZLE_FILEPATH.format(YEAR=year, DAY=day))
+    if get_year_and_day(day_path) != (year, day):
+        raise AocModError(f"invalid challenge directory: {day_path}")
+
+    solution_path = day_path.joinpath(f"day{day}.py")
+    input_path = day_path.joinpath(f"input_day{day}.txt")
+    for path in (solution_path, input_path):
+        if not path.is_file():
+            raise AocModError(f"{year}, Day {day} is missing {path}")
+    return solution_path, input_path
+
+
+class _SourceLoader(importlib.machinery.SourceFileLoader):
+    """Loader that always compiles the source file. cached bytecode is only
+    checked against the whole-second modification time and the size of the
+    source, so it can hide an edit saved within a second of the last one"""
+
+    def get_code(self, fullname: str):
+        return self.source_to_code(self.get_data(self.path), self.path)
+
+
+def load_solution(solution_path: Path) -> ModuleType:
+    """import a solution file as a module without running its main function.
+    the file is compiled on every load, so loading it again after an edit
+    always gets the new code
+
+    :param solution_path: path to the solution file
+    :type solution_path: Path
+    :raises AocModError: if the solution file can't be imported
+    :return: the imported module
+    :rtype: ModuleType
+    """
+    module_name = (
+        f"aoc_mod_solution_{solution_path.parent.parent.name}_{solution_path.stem}"
+    )
+    spec = importlib.util.spec_from_file_location(
+        module_name,
+        solution_path,
+        loader=_SourceLoader(module_name, str(solution_path)),
+    )
+    if spec is None or spec.loader is None:
+        raise AocModError(f"unable to import solution file: {solution_path}")
+
+    # register the module first, like a regular import, so that dataclasses
+    # and pickling work in solution files
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception as err:
+        del sys.modules[module_name]
+        raise AocModError(f"unable to import solution file: {solution_path}") from err
+    return module
+
+
+def summarize_times(times_ns: list[int]) -> dict[str, float]:
+    """summarize timings as the min, median and 95th percentile (nearest rank)
+
+    :param times_ns: timings in nanoseconds
+    :type times_ns: list[int]
+    :return: "min", "median" and "p95" in seconds
+    :rtype: dict[str, float]
+    """
+    times = sorted(times_ns)
+    p95_index = max(0, -(-len(times) * 95 // 100) - 1)
+    return {
+        "min": times[0] / 1e9,
+        "median": statistics.median(times) / 1e9,
+        "p95": times[p95_index] / 1e9,
+    }
+
+
+def time_call(
+    func: Callable[[Any], Any],
+    arg: Any,
+    repeat: int = 1,
+    warmup: int = 0,
+    quiet: bool = True,
+) -> tuple[Any, dict[str, Any]]:
+    """call a function `warmup` times untimed and then `repeat` times timed,
+    with anything it prints discarded unless `quiet` is False
+
+    :param func: the function to call
+    :type func: Callable[[Any], Any]
+    :param arg: the argument passed to every call
+    :type arg: Any
+    :param repeat: number of timed calls, defaults to 1
+    :type repeat: int, optional
+    :param warmup: number of untimed calls before the timed ones, defaults to 0
+    :type warmup: int, optional
+    :param quiet: discard anything printed by the function, defaults to True
+    :type quiet: bool, optional
+    :return: a tuple of (return value of the last call, timings), where the
+        timings hold summarize_times() of the "wall" and "cpu" time and the
+        wall time "samples" of each timed call in seconds
+    :rtype: tuple[Any, dict[str, Any]]
+    """
+    wall_times, cpu_times = [], []
+    result = None
+
+    output = io.StringIO() if quiet else sys.stdout
+    with contextlib.redirect_stdout(output):
+        for _ in range(warmup):
+            func(arg)
+        for _ in range(max(1, repeat)):
+            wall_start = time.perf_counter_ns()
+            cpu_start = time.process_time_ns()
+            result = func(arg)
+            cpu_times.append(time.process_time_ns() - cpu_start)
+            wall_times.append(time.perf_counter_ns() - wall_start)
+
+    return result, {
+        "wall": summarize_times(wall_times),
+        "cpu": summarize_times(cpu_times),
+        "samples": [wall_time / 1e9 for wall_time in wall_times],
+    }
+
+
+def time_part(
+    func: Callable[[Any], Any],
+    parsed_input: Any,
+    module_name: str,
+    repeat: int = 1,
+    warmup: int = 0,
+    quiet: bool = True,
+) -> tuple[Any, dict[str, Any]]:
+    """time a part of a solution with time_call() and add the statistics of
+    the memoized functions (see aoc_mod.memo) of its module that the part
+    called, as "memo"
+
+    :param func: the part function
+    :type func: Callable[[Any], Any]
+    :param parsed_input: the parsed puzzle input
+    :type parsed_input: Any
+    :param module_name: name of the solution module
+    :type module_name: str
+    :param repeat: number of timed calls, defaults to 1
+    :type repeat: int, optional
+    :param warmup: number of untimed calls before the timed ones, defaults to 0
+    :type warmup: int, optional
+    :param quiet: discard anything printed by the part, defaults to True
+    :type quiet: bool, optional
+    :return: a tuple of (return value of the last call, timings)
+    :rtype: tuple[Any, dict[str, Any]]
+    """
+    before = memo_stats(module_name)
+    output, timings = time_call(
+        func, parsed_input, repeat=repeat, warmup=warmup, quiet=quiet
+    )
+    memo = get_stats_delta(before, memo_stats(module_name))
+    if memo:
+        timings["memo"] = memo
+    return output, timings
+
+
+def run_solution(
+    year: int,
+    day: int,
+    root_dir: str = "",
+    repeat: int = 1,
+    warmup: int = 0,
+    profile: str = "",
+    limits: ResourceLimits | None = None,
+) -> dict[str, Any]:
+    """import the solution file of a challenge day, parse its input once and
+    time each part with the same parsed input.
+
+    the input is parsed with the solution's own `parse(input_path)` function,
+    if it defines one, or with `parse_input` otherwise. both parts (and every
+    repeat) are passed the same parsed object, so they shouldn't modify it.
+
+    with `profile`, each part is profiled in separate calls after it was
+    timed and the profiles are written to a "profile" folder in the day's
+    directory (see aoc_mod.profiling)
+
+    the hits, misses, entries and bytes of the solution's functions decorated
+    with `aoc_mod.memo.memoize` are reported as the "memo" of each part
+
+    a part that raises gets an "error" (and the "traceback") instead of a
+    result and timings and isn't profiled. with `limits`, each part (with all
+    of its runs) is run in a child process with those limits (see
+    aoc_mod.limits) and a part that runs out of time or memory or crashes
+    gets an "error" as well
+
+    :param year: year of the puzzle
+    :type year: int
+    :param day: day of the puzzle
+    :type day: int
+    :param root_dir: path containing the 'challenges' folder, defaults to the
+        current directory
+    :type root_dir: str, optional
+    :param repeat: number of timed runs of each part, defaults to 1
+    :type repeat: int, optional
+    :param warmup: number of untimed runs of each part before the timed ones,
+        defaults to 0
+    :type warmup: int, optional
+    :param profile: "cpu" or "mem" to profile each part, defaults to "" (no
+        profiling)
+    :type profile: str, optional
+    :param limits: resource limits of each part, defaults to None (run the
+        parts in this process)
+    :type limits: ResourceLimits | None, optional
+    :raises AocModError: if the solution can't be found or imported
+    :return: the "year", "day", sha256 digest of the input ("input_sha256"),
+        "parse" timings and the "result", timings and any "memo" statistics
+        and "profile" of each of the solution's "parts", or their "error" and, with limits, the
+        "peak_rss" in bytes of the process running each part
+    :rtype: dict[str, Any]
+    """
+    start = time.perf_counter()
+    solution_path, input_path = get_solution_paths(year, day, root_dir)
+    module = load_solution(solution_path)
+
+    parse_func = getattr(module, "parse", parse_input)
+    parsed_input, parse_timings = time_call(parse_func, input_path)
+
+    results = {
+        "year": year,
+        "day": day,
+        "input_sha256": hashlib.sha256(input_path.read_bytes()).hexdigest(),
+        "parse": parse_timings,
+        "parts": {},
+    }
+    for part, func_name in PART_FUNCTIONS.items():
+        func = getattr(module, func_name, None)
+        if func is None:
+            continue
+
+        if limits:
+            value, error, peak_rss = run_limited(
+                functools.partial(
+                    time_part,
+                    func,
+                    parsed_input,
+                    module.__name__,
+                    repeat=repeat,
+                    warmup=warmup,
+                ),
+                limits,
+            )
+            if error is not None:
+                results["parts"][part] = {"error": error, "peak_rss": peak_rss}
+                continue
+            output, timings = value
+            timings["peak_rss"] = peak_rss
+        else:
+            try:
+                output, timings = time_part(
+                    func, parsed_input, module.__name__, repeat=repeat, warmup=warmup
+                )
+            except Exception as err:
+                results["parts"][part] = {
+                    "error": f"{type(err).__name__}: {err}",
+                    "traceback": traceback.format_exc(),
+                }
+                continue
+        # the solution template returns dict(result=..., submit=...)
+        answer = output.get("result") if isinstance(output, dict) else output
+        results["parts"][part] = {"result": answer, **timings}
+
+        if profile:
+            from aoc_mod.profiling import profile_call
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                results["parts"][part]["profile"] = profile_call(
+                    profile,
+                    func,
+                    parsed_input,
+                    solution_path.parent.joinpath("profile", f"part{part}"),
+                )
+
+    results["total"] = time.perf_counter() - start
+    return results
+
+
+def discover_days(root_dir: str = "") -> list[tuple[int, int]]:
+    """find every challenge day with a solution file under the 'challenges'
+    folder
+
+    :param root_dir: path containing the 'challenges' folder, defaults to the
+        current directory
+    :type root_dir: str, optional
+    :return: sorted (year, day) tuples
+    :rtype: list[tuple[int, int]]
+    """
+    days = []
+    for day_path in Path(root_dir).joinpath("challenges").glob("*/day*"):
+        if not day_path.parent.name.isdigit() or not day_path.name[3:].isdigit():
+            continue
+        year, day = get_year_and_day(day_path)
+        if day_path.joinpath(f"day{day}.py").is_file():
+            days.append((year, day))
+    return sorted(days)
+
+
+def load_timings(root_dir: str = "") -> dict[str, float]:
+    """load the total run time of each day from the last run
+
+    :param root_dir: path containing the 'challenges' folder, defaults to the
+        current directory
+    :type root_dir: str, optional
+    :return: seconds keyed by "{year}/{day}", empty if there are none
+    :rtype: dict[str, float]
+    """
+    try:
+        with Path(root_dir).joinpath(TIMINGS_FILE).open("r", encoding="utf-8") as f_in:
+            return json.load(f_in)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(results: list[dict[str, Any]], root_dir: str = "") -> None:
+    """merge the total run time of each successful day into the timings file
+
+    :param results: return values of run_solution()
+    :type results: list[dict[str, Any]]
+    :param root_dir: path containing the 'challenges' folder, defaults to the
+        current directory
+    :type root_dir: str, optional
+    """
+    timings = load_timings(root_dir)
+    for result in results:
+        if not has_failed(result):
+            timings[f"{result['year']}/{result['day']}"] = result["total"]
+    write_atomic(Path(root_dir).joinpath(TIMINGS_FILE), json.dumps(timings))
+
+
+def _run_day(
+    year: int, day: int, root_dir: str, run_options: dict[str, Any]
+) -> dict[str, Any]:
+    """run_solution() for a worker process, returning any error in the
+    results instead of raising it so that one failing day doesn't stop the
+    others"""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_solution(year, day, root_dir, **run_options)
+    except KeyboardInterrupt:
+        raise
+    except BaseException as err:
+        return {"year": year, "day": day, "error": f"{type(err).__name__}: {err}"}
+
+
+def run_all(
+    days: list[tuple[int, int]],
+    root_dir: str = "",
+    jobs: int = 0,
+    repeat: int = 1,
+    warmup: int = 0,
+    profile: str = "",
+    limits: ResourceLimits | None = None,
+) -> list[dict[str, Any]]:
+    """run the solutions of many days across a pool of worker processes.
+
+    days are started longest first, using the run times saved by the last
+    run (days without one are started before all others), so that a long day
+    doesn't start last and hold up the whole run. an exception (or exit) in a
+    solution is reported as an "error" in that day's results. if a worker
+    process dies, the days that were left unfinished are run again one at a
+    time in a fresh process so the crash is only reported for its own day
+
+    :param days: (year, day) tuples to run
+    :type days: list[tuple[int, int]]
+    :param root_dir: path containing the 'challenges' folder, defaults to the
+        current directory
+    :type root_dir: str, optional
+    :param jobs: number of worker processes, defaults to the number of CPUs
+    :type jobs: int, optional
+    :param repeat: number of timed runs of each part, defaults to 1
+    :type repeat: int, optional
+    :param warmup: number of untimed runs of each part before the timed ones,
+        defaults to 0
+    :type warmup: int, optional
+    :param profile: "cpu" or "mem" to profile each part, defaults to "" (no
+        profiling)
+    :type profile: str, optional
+    :param limits: resource limits of each part, defaults to None (no limits)
+    :type limits: ResourceLimits | None, optional
+    :return: the return value of run_solution(), or the "year", "day" and
+        "error" of each day, sorted by year and day
+    :rtype: list[dict[str, Any]]
+    """
+    timings = load_timings(root_dir)
+    days = sorted(
+        days,
+        key=lambda year_day: timings.get(f"{year_day[0]}/{year_day[1]}", math.inf),
+        reverse=True,
+    )
+
+    run_options = {
+        "repeat": repeat,
+        "warmup": warmup,
+        "profile": profile,
+        "limits": limits,
+    }
+    results = []
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(_run_day, year, day, root_dir, run_options): (year, day)
+            for year, day in days
+        }
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                unfinished.append(futures[future])
+
+    for year, day in unfinished:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            try:
+                results.append(
+                    pool.submit(_run_day, year, day, root_dir, run_options).result()
+                )
+            except BrokenProcessPool:
+                results.append(
+                    {"year": year, "day": day, "error": "worker process crashed"}
+                )
+
+    save_timings(results, root_dir)
+    return sorted(results, key=lambda result: (result["year"], result["day"]))
+
+
+def format_seconds(seconds: float) -> str:
+    """format a duration in seconds with a unit suited to its magnitude
+
+    :param seconds: number of seconds
+    :type seconds: float
+    :return: a duration like "12.3 us", "4.56 ms" or "1.23 s"
+    :rtype: str
+    """
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def format_results(results: dict[str, Any]) -> str:
+    """format the results of run_solution() as a table
+
+    :param results: return value of run_solution()
+    :type results: dict[str, Any]
+    :return: the table, one row for parsing and one per part
+    :rtype: str
+    """
+    rows = [("parse", "", results["parse"])]
+    rows += [
+        (f"part {part}", str(part_results.get("result")), part_results)
+        for part, part_results in results["parts"].items()
+    ]
+
+    lines = [
+        f"{results['year']}, Day {results['day']}",
+        f"{'':<8}{'result':>16}{'wall min':>12}{'median':>12}{'p95':>12}{'cpu median':>12}",
+    ]
+    for name, answer, timings in rows:
+        if "error" in timings:
+            lines.append(f"{name:<8}  error: {timings['error']}")
+            continue
+        wall, cpu = timings["wall"], timings["cpu"]
+        lines.append(
+            f"{name:<8}{answer:>16}{format_seconds(wall['min']):>12}"
+            f"{format_seconds(wall['median']):>12}{format_seconds(wall['p95']):>12}"
+            f"{format_seconds(cpu['median']):>12}"
+        )
+
+    for part, part_results in results["parts"].items():
+        for name, stats in part_results.get("memo", {}).items():
+            calls = stats["hits"] + stats["misses"]
+            lines.append(
+                f"part {part} memo {name}: {stats['hits']} hits, "
+                f"{stats['misses']} misses ({stats['hits'] / calls:.1%} hit rate), "
+                f"{stats['entries']} entries, {stats['bytes'] / 1024:.1f} KiB, "
+                f"{stats['evictions']} evictions"
+            )
+        if part_results.get("peak_rss"):
+            lines.append(
+                f"part {part} peak RSS {part_results['peak_rss'] / 1024**2:.1f} MiB"
+            )
+        profile = part_results.get("profile", {})
+        if "peak" in profile:
+            lines.append(
+                f"part {part} peak memory {profile['peak'] / 1024:.1f} KiB, "
+                f"report: {profile['report']}"
+            )
+            lines += [
+                f"    {size / 1024:10.1f} KiB {count:>8} blocks  {location}"
+                for location, size, count in profile["top"]
+            ]
+        for name in ("pstats", "collapsed"):
+            if name in profile:
+                lines.append(f"part {part} {name}: {profile[name]}")
+    return "\n".join(lines)
+
+
+def format_summary(results: list[dict[str, Any]], wall_time: float) -> str:
+    """format the results of run_all() as a table with one row per day
+
+    :param results: return value of run_all()
+    :type results: list[dict[str, Any]]
+    :param wall_time: wall time of the whole run in seconds
+    :type wall_time: float
+    :return: the table
+    :rtype: str
+    """
+    lines = [f"{'year':<6}{'day':>4}{'part 1':>18}{'part 2':>18}{'total':>12}"]
+    for result in results:
+        prefix = f"{result['year']:<6}{result['day']:>4}"
+        if "error" in result:
+            lines.append(f"{prefix}  error: {result['error']}")
+            continue
+
+        answers = []
+        for part in PART_FUNCTIONS:
+            part_results = result["parts"].get(part, {"result": "-"})
+            if "error" in part_results:
+                answers.append(part_results["error"][:17])
+            else:
+                answers.append(str(part_results["result"]))
+        lines.append(
+            f"{prefix}{answers[0]:>18}{answers[1]:>18}"
+            f"{format_seconds(result['total']):>12}"
+        )
+
+    failed = sum(has_failed(result) for result in results)
+    total_time = sum(result.get("total", 0.0) for result in results)
+    lines.append(
+        f"{len(results)} days, {failed} failed, "
+        f"{format_seconds(total_time)} of solutions in {format_seconds(wall_time)}"
+    )
+    return "\n".join(lines)
+
+
+def has_failed(results: dict[str, Any]) -> bool:
+    """check if a day or any of its parts failed to run
+
+    :param results: return value of run_solution() or an item of run_all()
+    :type results: dict[str, Any]
+    :return: True if there is an "error" in the results
+    :rtype: bool
+    """
+    return "error" in results or any(
+        "error" in part_results for part_results in results["parts"].values()
+    )
+
+
+def run_command(year: int, day: int, options) -> int:
+    """run a solution for the `aoc-mod run` command, print the results and
+    append the timings to the run history (see aoc_mod.perf)
+
+    :param year: year of the puzzle
+    :type year: int
+    :param day: day of the puzzle
+    :type day: int
+    :param options: parsed command-line options
+    :type options: argparse.Namespace
+    :return: the exit code
+    :rtype: int
+    """
+    from aoc_mod.perf import append_history
+
+    limits = ResourceLimits(
+        wall_time=options.timeout,
+        cpu_time=options.cpu_limit,
+        memory=options.memory_limit * 1024**2,
+    )
+    if options.all:
+        start = time.perf_counter()
+        results = run_all(
+            discover_days(options.output_root_dir),
+            root_dir=options.output_root_dir,
+            jobs=options.jobs,
+            repeat=options.repeat,
+            warmup=options.warmup,
+            profile=options.profile,
+            limits=limits,
+        )
+        wall_time = time.perf_counter() - start
+        if not options.no_history:
+            append_history(results, options.output_root_dir)
+
+        if options.json:
+            print(json.dumps({"results": results, "wall_time": wall_time}, default=str))
+        else:
+            print(format_summary(results, wall_time))
+        return 1 if any(has_failed(result) for result in results) else 0
+
+    try:
+        results = run_solution(
+            year,
+            day,
+            root_dir=options.output_root_dir,
+            repeat=options.repeat,
+            warmup=options.warmup,
+            profile=options.profile,
+            limits=limits,
+        )
+    except AocModError as err:
+        print(f"Failed to run {year}, Day {day} ({err})", file=sys.stderr)
+        return 1
+    except Exception as err:
+        # the solution failed to import or to parse its input
+        traceback.print_exc()
+        print(
+            f"Failed to run {year}, Day {day} ({type(err).__name__}: {err})",
+            file=sys.stderr,
+        )
+        return 1
+    if not options.no_history:
+        append_history([results], options.output_root_dir)
+
+    if options.json:
+        print(json.dumps(results, default=str))
+    else:
+        for part_results in results["parts"].values():
+            if "traceback" in part_results:
+                print(part_results["traceback"], file=sys.stderr, end="")
+        print(format_results(results))
+    return 1 if has_failed(results) else 0
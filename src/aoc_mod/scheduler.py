@@ -0,0 +1,276 @@
+"""Rate-aware scheduler for setting up many challenge days at once"""
+
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+from aoc_mod.interactive import LOCAL_PUZZLE_FILEPATH, setup_challenge_day_template
+from aoc_mod.utilities import AocMod
+
+
+def format_duration(seconds: float) -> str:
+    """format a number of seconds as a short human readable duration
+
+    :param seconds: number of seconds
+    :type seconds: float
+    :return: a duration like "1h 02m 03s", "2m 03s" or "3s"
+    :rtype: str
+    """
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m {secs:02d}s"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
+
+
+class TokenBucket:
+    """Token bucket rate limiter. Tokens are added at `rate` per second up to
+    `capacity` and each request consumes one, so requests are paced instead
+    of rejected when they come in faster than the rate allows."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """initialize a full token bucket
+
+        :param rate: tokens added per second, where 0 disables rate limiting
+        :type rate: float
+        :param capacity: maximum number of tokens in the bucket, defaults to 1.0
+        :type capacity: float, optional
+        :param clock: monotonic clock function, defaults to time.monotonic
+        :type clock: Callable[[], float], optional
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._last_refill = clock()
+
+    def _refill(self) -> None:
+        """add the tokens accumulated since the last refill"""
+        now = self._clock()
+        if self.rate:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._last_refill) * self.rate
+            )
+        self._last_refill = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """get the number of seconds until enough tokens are available
+
+        :param tokens: number of tokens needed, defaults to 1.0
+        :type tokens: float, optional
+        :return: seconds to wait, 0.0 if the tokens are available now
+        :rtype: float
+        """
+        if not self.rate:
+            return 0.0
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+    def consume(self, tokens: float = 1.0) -> None:
+        """remove tokens from the bucket, which may leave it in debt
+
+        :param tokens: number of tokens to remove, defaults to 1.0
+        :type tokens: float, optional
+        """
+        if self.rate:
+            self._refill()
+            self.tokens -= tokens
+
+
+class SetupScheduler:
+    """Queue of challenge days to set up with `setup_challenge_day_template`.
+
+    Days that are already fully present on disk are skipped, so an
+    interrupted run resumes where it left off when it is started again.
+    Network requests for each kind of puzzle data (input and instructions)
+    are paced with a token bucket that refills once per AocMod request
+    timeout, and the scheduler also waits out any timeout still running from
+    other processes sharing the same state, rather than letting AocMod raise."""
+
+    def __init__(
+        self,
+        aoc_mod: AocMod,
+        output_root_dir: str = "",
+        template_path: str = "",
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """initialize the scheduler with an empty queue
+
+        :param aoc_mod: AocMod instance used for all requests
+        :type aoc_mod: AocMod
+        :param output_root_dir: path to be prepended to the template folders,
+            defaults to the current directory
+        :type output_root_dir: str, optional
+        :param template_path: path to a template file to use for solution
+            code, defaults to ""
+        :type template_path: str, optional
+        :param sleep: function used to wait, defaults to time.sleep
+        :type sleep: Callable[[float], None], optional
+        :param clock: monotonic clock function, defaults to time.monotonic
+        :type clock: Callable[[], float], optional
+        """
+        self.aoc_mod = aoc_mod
+        self.output_root_dir = output_root_dir
+        self.template_path = template_path
+        self.queue: deque[tuple[int, int]] = deque()
+
+        self._sleep = sleep
+        self._clock = clock
+
+        interval = aoc_mod._time_to_wait_after_pull
+        rate = 1 / interval if interval else 0
+        self._buckets = {
+            kind: TokenBucket(rate, clock=clock) for kind in ("input", "instructions")
+        }
+
+    def add(self, years: list[int], days: list[int]) -> None:
+        """queue every combination of years and days
+
+        :param years: years of the puzzles
+        :type years: list[int]
+        :param days: days of the puzzles
+        :type days: list[int]
+        """
+        for year in years:
+            for day in days:
+                self.queue.append((year, day))
+
+    def _get_day_path(self, year: int, day: int) -> Path:
+        """get the challenge directory for a year and day"""
+        return Path(self.output_root_dir).joinpath(
+            LOCAL_PUZZLE_FILEPATH.format(YEAR=year, DAY=day)
+        )
+
+    def is_complete(self, year: int, day: int) -> bool:
+        """check if the input, instructions and solution file for a day are
+        already present on disk
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :return: True if there is nothing left to set up for the day
+        :rtype: bool
+        """
+        day_path = self._get_day_path(year, day)
+        files = [f"input_day{day}.txt", f"instructions_day{day}.md"]
+        if self.template_path:
+            files.append(f"day{day}{Path(self.template_path).suffix}")
+        return all(day_path.joinpath(name).exists() for name in files)
+
+    def get_pending_requests(self, year: int, day: int) -> list[str]:
+        """get the kinds of network requests needed to set up a day
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :return: a list containing "input" and/or "instructions"
+        :rtype: list[str]
+        """
+        day_path = self._get_day_path(year, day)
+        pending = []
+        if (
+            self.aoc_mod.session_id
+            and not day_path.joinpath(f"input_day{day}.txt").exists()
+            and not self.aoc_mod.is_cached(year, day, "input")
+        ):
+            pending.append("input")
+        if day_path.joinpath(f"instructions_day{day}.md").exists():
+            if self.aoc_mod.has_new_instructions(year, day):
+                pending.append("instructions")
+        elif not self.aoc_mod.is_cached(year, day, "instructions"):
+            pending.append("instructions")
+        return pending
+
+    def _wait_for_requests(self, kinds: list[str]) -> None:
+        """wait until a request of every kind may be made and consume a token
+        for each of them
+
+        :param kinds: kinds of requests that are about to be made
+        :type kinds: list[str]
+        """
+        wait_time = max(
+            (
+                max(
+                    self._buckets[kind].wait_time(),
+                    self.aoc_mod.get_request_wait_time(kind),
+                )
+                for kind in kinds
+            ),
+            default=0.0,
+        )
+        if wait_time > 0:
+            print(f"Waiting {format_duration(wait_time)} for the request timeout...")
+            self._sleep(wait_time)
+
+        for kind in kinds:
+            self._buckets[kind].consume()
+
+    def estimate_time_left(self) -> float:
+        """estimate the number of seconds needed to work through the queue,
+        assuming it is dominated by waiting for request timeouts
+
+        :return: estimated seconds left
+        :rtype: float
+        """
+        pending = {kind: 0 for kind in self._buckets}
+        for year, day in self.queue:
+            for kind in self.get_pending_requests(year, day):
+                pending[kind] += 1
+
+        return max(
+            (
+                self._buckets[kind].wait_time(count)
+                for kind, count in pending.items()
+                if count
+            ),
+            default=0.0,
+        )
+
+    def run(self) -> dict[str, int]:
+        """set up every queued day, printing progress and an estimate of the
+        time left after each day
+
+        :return: number of days that were "set_up" and "skipped"
+        :rtype: dict[str, int]
+        """
+        summary = {"set_up": 0, "skipped": 0}
+        total = len(self.queue)
+        start = self._clock()
+
+        while self.queue:
+            year, day = self.queue.popleft()
+            done = total - len(self.queue)
+
+            if self.is_complete(year, day):
+                summary["skipped"] += 1
+                print(f"[{done}/{total}] {year}, Day {day} already set up, skipping.")
+                continue
+
+            self._wait_for_requests(self.get_pending_requests(year, day))
+            setup_challenge_day_template(
+                self.aoc_mod,
+                year,
+                day,
+                output_root_dir=self.output_root_dir,
+                template_path=self.template_path,
+            )
+            summary["set_up"] += 1
+
+            print(
+                f"[{done}/{total}] {year}, Day {day} set up "
+                f"(elapsed {format_duration(self._clock() - start)}, "
+                f"ETA {format_duration(self.estimate_time_left())})"
+            )
+
+        return summary
@@ -0,0 +1,857 @@
+"""Graph searches (BFS, Dijkstra, A* and bidirectional BFS) for grid and
+state-space puzzles.
+
+States of implicit graphs are numbered in the order they are found and grid
+cells by their position, so the searches keep distances and parents in flat
+arrays, mark visited states in bytearrays and push plain integers onto their
+heaps instead of tuples of states. Paths are only built when asked for."""
+
+import heapq
+from abc import ABC, abstractmethod
+from array import array
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+from aoc_mod.grid import Grid
+from aoc_mod.utilities import AocModError
+
+UNREACHED = -1
+GRID_WALLS = b"#"
+
+# heap entries pack a priority and a state number into one int, which orders
+# the same as the tuple (priority, number) for any priority
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+class SearchResult(ABC):
+    """Result of a search: the goal it found and its distance, the distance
+    to every state the search reached and the paths to them, which are only
+    built when asked for"""
+
+    def __init__(self, goal: Any, distance: int | None):
+        """initialize the result
+
+        :param goal: the goal the search found, None if it found none
+        :type goal: Any
+        :param distance: distance from the start to the goal, None if the
+            goal wasn't found
+        :type distance: int | None
+        """
+        self.goal = goal
+        self.distance = distance
+
+    @abstractmethod
+    def distance_to(self, state: Any) -> int | None:
+        """get the distance from the start to a state
+
+        :param state: the state
+        :type state: Any
+        :return: the distance, None if the search didn't reach the state (or,
+            for weighted searches that stopped at the goal, didn't settle its
+            distance)
+        :rtype: int | None
+        """
+
+    @abstractmethod
+    def path(self, state: Any = None) -> list:
+        """build the path from the start to a state
+
+        :param state: the state, defaults to the goal
+        :type state: Any, optional
+        :return: the states of the path, from the start to the state
+            included, empty if the state wasn't reached
+        :rtype: list
+        """
+
+    @abstractmethod
+    def reached(self) -> Iterator[tuple[Any, int]]:
+        """iterate over the states the search reached
+
+        :return: an iterator of (state, distance) tuples
+        :rtype: Iterator[tuple[Any, int]]
+        """
+
+    def __contains__(self, state: Any) -> bool:
+        return self.distance_to(state) is not None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(goal={self.goal!r}, distance={self.distance})"
+
+
+class _GraphResult(SearchResult):
+    """Result of a search of an implicit graph, with the states numbered in
+    the order they were found"""
+
+    def __init__(
+        self,
+        index: dict[Hashable, int],
+        states: list[Hashable],
+        distances: array,
+        parents: array,
+        goal_id: int,
+        settled: bytearray | None = None,
+    ):
+        self._index = index
+        self._states = states
+        self._distances = distances
+        self._parents = parents
+        self._settled = settled
+        if goal_id == UNREACHED:
+            super().__init__(None, None)
+        else:
+            super().__init__(states[goal_id], distances[goal_id])
+
+    def _get_id(self, state: Hashable) -> int:
+        """get the number of a reached state, UNREACHED for other states"""
+        state_id = self._index.get(state, UNREACHED)
+        if state_id == UNREACHED or self._distances[state_id] == UNREACHED:
+            return UNREACHED
+        if self._settled is not None and not self._settled[state_id]:
+            return UNREACHED
+        return state_id
+
+    def distance_to(self, state: Hashable) -> int | None:
+        state_id = self._get_id(state)
+        return None if state_id == UNREACHED else self._distances[state_id]
+
+    def path(self, state: Hashable = None) -> list:
+        if state is None:
+            if self.goal is None:
+                return []
+            state = self.goal
+        state_id = self._get_id(state)
+        path = []
+        while state_id != UNREACHED:
+            path.append(self._states[state_id])
+            state_id = self._parents[state_id]
+        path.reverse()
+        return path
+
+    def reached(self) -> Iterator[tuple[Hashable, int]]:
+        for state_id, state in enumerate(self._states):
+            if self._get_id(state) == state_id:
+                yield state, self._distances[state_id]
+
+
+def _split_goal(goal: Any) -> tuple[bool, Callable[[Any], bool] | None]:
+    """split a goal, which is a state, a function telling whether a state is
+    a goal or None to search the whole graph, into whether it is a state and
+    the function"""
+    if callable(goal):
+        return False, goal
+    return goal is not None, None
+
+
+def bfs(
+    start: Hashable,
+    neighbors: Callable[[Hashable], Iterable[Hashable]],
+    goal: Hashable | Callable[[Hashable], bool] | None = None,
+) -> SearchResult:
+    """breadth-first search of an implicit graph, where every step costs 1
+
+    :param start: the start state
+    :type start: Hashable
+    :param neighbors: function returning the states one step from a state
+    :type neighbors: Callable[[Hashable], Iterable[Hashable]]
+    :param goal: the goal state, or a function telling whether a state is a
+        goal, defaults to None (search every reachable state)
+    :type goal: Hashable | Callable[[Hashable], bool] | None, optional
+    :return: the result of the search
+    :rtype: SearchResult
+    """
+    goal_is_state, is_goal = _split_goal(goal)
+    index = {start: 0}
+    states = [start]
+    distances = array("q", [0])
+    parents = array("q", [UNREACHED])
+    add_state = states.append
+    add_parent = parents.append
+
+    # states are numbered in the order they are found, so each level of the
+    # search is a range of numbers
+    goal_id = UNREACHED
+    if (goal_is_state and start == goal) or (is_goal is not None and is_goal(start)):
+        goal_id = 0
+    level_start, level_end = 0, 1
+    depth = 0
+    while level_start < level_end and goal_id == UNREACHED:
+        depth += 1
+        for state_id in range(level_start, level_end):
+            first_id = len(states)
+            for next_state in neighbors(states[state_id]):
+                if next_state not in index:
+                    index[next_state] = len(states)
+                    add_state(next_state)
+                    add_parent(state_id)
+
+            if goal_is_state:
+                goal_id = index.get(goal, UNREACHED)
+            elif is_goal is not None and len(states) > first_id:
+                goal_id = next(
+                    (
+                        next_id
+                        for next_id in range(first_id, len(states))
+                        if is_goal(states[next_id])
+                    ),
+                    UNREACHED,
+                )
+            if goal_id != UNREACHED:
+                break
+        distances.extend(array("q", [depth]) * (len(states) - len(distances)))
+        level_start, level_end = level_end, len(states)
+
+    return _GraphResult(index, states, distances, parents, goal_id)
+
+
+def _best_first(
+    start: Hashable,
+    neighbors: Callable[[Hashable], Iterable[tuple[Hashable, int]]],
+    goal: Any,
+    heuristic: Callable[[Hashable], int] | None,
+) -> SearchResult:
+    """Dijkstra's algorithm, or A* with a heuristic, over an implicit graph"""
+    goal_is_state, is_goal = _split_goal(goal)
+    index = {start: 0}
+    states = [start]
+    distances = array("q", [0])
+    parents = array("q", [UNREACHED])
+    settled = bytearray(1)
+
+    goal_id = UNREACHED
+    heap = [(heuristic(start) if heuristic is not None else 0) << _ID_BITS]
+    while heap:
+        state_id = heapq.heappop(heap) & _ID_MASK
+        if settled[state_id]:
+            continue
+        settled[state_id] = 1
+        state = states[state_id]
+        if (goal_is_state and state == goal) or (
+            is_goal is not None and is_goal(state)
+        ):
+            goal_id = state_id
+            break
+
+        distance = distances[state_id]
+        for next_state, cost in neighbors(state):
+            next_distance = distance + cost
+            next_id = index.get(next_state)
+            if next_id is None:
+                next_id = len(states)
+                index[next_state] = next_id
+                states.append(next_state)
+                distances.append(next_distance)
+                parents.append(state_id)
+                settled.append(0)
+            elif settled[next_id] or distances[next_id] <= next_distance:
+                continue
+            else:
+                distances[next_id] = next_distance
+                parents[next_id] = state_id
+
+            if heuristic is not None:
+                next_distance += heuristic(next_state)
+            heapq.heappush(heap, next_distance << _ID_BITS | next_id)
+
+    return _GraphResult(index, states, distances, parents, goal_id, settled)
+
+
+def dijkstra(
+    start: Hashable,
+    neighbors: Callable[[Hashable], Iterable[tuple[Hashable, int]]],
+    goal: Hashable | Callable[[Hashable], bool] | None = None,
+) -> SearchResult:
+    """Dijkstra's algorithm over an implicit graph with integer step costs
+
+    :param start: the start state
+    :type start: Hashable
+    :param neighbors: function returning (state, cost) tuples for the steps
+        from a state, with non-negative integer costs
+    :type neighbors: Callable[[Hashable], Iterable[tuple[Hashable, int]]]
+    :param goal: the goal state, or a function telling whether a state is a
+        goal, defaults to None (search every reachable state)
+    :type goal: Hashable | Callable[[Hashable], bool] | None, optional
+    :return: the result of the search
+    :rtype: SearchResult
+    """
+    return _best_first(start, neighbors, goal, None)
+
+
+def astar(
+    start: Hashable,
+    neighbors: Callable[[Hashable], Iterable[tuple[Hashable, int]]],
+    goal: Hashable | Callable[[Hashable], bool],
+    heuristic: Callable[[Hashable], int],
+) -> SearchResult:
+    """A* search over an implicit graph with integer step costs
+
+    :param start: the start state
+    :type start: Hashable
+    :param neighbors: function returning (state, cost) tuples for the steps
+        from a state, with non-negative integer costs
+    :type neighbors: Callable[[Hashable], Iterable[tuple[Hashable, int]]]
+    :param goal: the goal state, or a function telling whether a state is a
+        goal
+    :type goal: Hashable | Callable[[Hashable], bool]
+    :param heuristic: integer estimate of the distance from a state to the
+        goal. it must be consistent (never more than the cost of a step plus
+        the estimate after it, such as the Manhattan distance on a grid) for
+        the distance found to be the shortest
+    :type heuristic: Callable[[Hashable], int]
+    :return: the result of the search
+    :rtype: SearchResult
+    """
+    return _best_first(start, neighbors, goal, heuristic)
+
+
+class _BidirectionalResult(SearchResult):
+    """Result of a bidirectional search, made of the results of the searches
+    from the start and from the goal and the state where they met"""
+
+    def __init__(
+        self,
+        forward: SearchResult,
+        backward: SearchResult,
+        goal: Any,
+        meeting: Any,
+        distance: int | None,
+    ):
+        super().__init__(goal if distance is not None else None, distance)
+        self._forward = forward
+        self._backward = backward
+        self._meeting = meeting
+
+    def distance_to(self, state: Any) -> int | None:
+        return self._forward.distance_to(state)
+
+    def path(self, state: Any = None) -> list:
+        if state is not None and state != self.goal:
+            return self._forward.path(state)
+        if self.distance is None:
+            return []
+        return (
+            self._forward.path(self._meeting)
+            + self._backward.path(self._meeting)[-2::-1]
+        )
+
+    def reached(self) -> Iterator[tuple[Any, int]]:
+        return self._forward.reached()
+
+
+def bidirectional_bfs(
+    start: Hashable,
+    goal: Hashable,
+    neighbors: Callable[[Hashable], Iterable[Hashable]],
+    reverse_neighbors: Callable[[Hashable], Iterable[Hashable]] | None = None,
+) -> SearchResult:
+    """breadth-first search from both the start and the goal of an implicit
+    graph, which visits far fewer states than a search from the start alone
+    when the graph branches a lot. the side with the smaller frontier is
+    expanded a level at a time until the sides meet
+
+    :param start: the start state
+    :type start: Hashable
+    :param goal: the goal state
+    :type goal: Hashable
+    :param neighbors: function returning the states one step from a state
+    :type neighbors: Callable[[Hashable], Iterable[Hashable]]
+    :param reverse_neighbors: function returning the states one step before
+        a state, defaults to None (the graph is undirected)
+    :type reverse_neighbors: Callable[[Hashable], Iterable[Hashable]] | None,
+        optional
+    :return: the result of the search. its distance_to() and reached() only
+        cover the states reached from the start
+    :rtype: SearchResult
+    """
+    index = {start: 0}
+    states = [start]
+    if goal not in index:
+        index[goal] = 1
+        states.append(goal)
+
+    sides = []
+    for side_start, side_neighbors in (
+        (start, neighbors),
+        (goal, reverse_neighbors or neighbors),
+    ):
+        state_id = index[side_start]
+        distances = array("q", [UNREACHED]) * len(states)
+        distances[state_id] = 0
+        sides.append(
+            {
+                "neighbors": side_neighbors,
+                "distances": distances,
+                "parents": array("q", [UNREACHED]) * len(states),
+                "frontier": [state_id],
+                "depth": 0,
+            }
+        )
+
+    meeting_id = 0 if start == goal else UNREACHED
+    best = 0 if start == goal else None
+    while best is None and sides[0]["frontier"] and sides[1]["frontier"]:
+        side, other = sides
+        if len(other["frontier"]) < len(side["frontier"]):
+            side, other = other, side
+        side_distances = side["distances"]
+        other_distances = other["distances"]
+        side["depth"] += 1
+        depth = side["depth"]
+
+        next_frontier = []
+        for state_id in side["frontier"]:
+            for next_state in side["neighbors"](states[state_id]):
+                next_id = index.get(next_state)
+                if next_id is None:
+                    next_id = len(states)
+                    index[next_state] = next_id
+                    states.append(next_state)
+                    for each_side in sides:
+                        each_side["distances"].append(UNREACHED)
+                        each_side["parents"].append(UNREACHED)
+                elif side_distances[next_id] != UNREACHED:
+                    continue
+                side_distances[next_id] = depth
+                side["parents"][next_id] = state_id
+                next_frontier.append(next_id)
+
+                other_distance = other_distances[next_id]
+                if other_distance != UNREACHED and (
+                    best is None or depth + other_distance < best
+                ):
+                    best = depth + other_distance
+                    meeting_id = next_id
+        side["frontier"] = next_frontier
+
+    forward, backward = (
+        _GraphResult(index, states, side["distances"], side["parents"], UNREACHED)
+        for side in sides
+    )
+    meeting = states[meeting_id] if meeting_id != UNREACHED else None
+    return _BidirectionalResult(forward, backward, goal, meeting, best)
+
+
+class _GridLayout:
+    """Grid of cells stored row by row in one flat buffer, with a border of
+    walls around it so that the four neighbors of a cell never need bounds
+    checks. cell (row, col) is at index (row + 1) * width + col + 1"""
+
+    def __init__(self, grid: Any, walls: bytes | str = GRID_WALLS):
+        """lay out a grid
+
+        :param grid: the grid, as a `Grid`, a 2-D memoryview or numpy array
+            of bytes (see `parse_char_grid`), a list of str or bytes rows or
+            the whole text of the grid
+        :type grid: Any
+        :param walls: characters of the cells that can't be entered, defaults
+            to "#"
+        :type walls: bytes | str, optional
+        :raises AocModError: if the grid is empty or not rectangular
+        """
+        rows = _get_grid_rows(grid)
+        self.rows = len(rows)
+        self.cols = len(rows[0]) if rows else 0
+        if not self.cols or any(len(row) != self.cols for row in rows):
+            raise AocModError("grid is empty or not rectangular")
+        self.width = self.cols + 2
+
+        if isinstance(walls, str):
+            walls = walls.encode("latin-1")
+        passable_table = bytes(0 if value in walls else 1 for value in range(256))
+        border = bytes(self.width + 1)
+        self.cells = border + b"\0\0".join(rows) + border
+        # byte values of the cells that can be entered
+        self.values = set(b"".join(rows).translate(None, walls))
+        self.passable = bytearray(
+            border
+            + b"\0\0".join(row.translate(passable_table) for row in rows)
+            + border
+        )
+
+    def encode(self, cell: tuple[int, int], strict: bool = True) -> int:
+        """get the index of a (row, col) cell
+
+        :param cell: the cell
+        :type cell: tuple[int, int]
+        :param strict: raise an error for cells outside the grid, defaults to
+            True (return UNREACHED)
+        :type strict: bool, optional
+        :raises AocModError: if strict and the cell is outside the grid
+        :return: the index of the cell
+        :rtype: int
+        """
+        try:
+            row, col = cell
+            if 0 <= row < self.rows and 0 <= col < self.cols:
+                return (row + 1) * self.width + col + 1
+        except (TypeError, ValueError):
+            pass
+        if strict:
+            raise AocModError(f"cell {cell!r} is outside the grid")
+        return UNREACHED
+
+    def decode(self, index: int) -> tuple[int, int]:
+        """get the (row, col) cell at an index"""
+        row, col = divmod(index, self.width)
+        return row - 1, col - 1
+
+    def get_step_costs(self, cost: Callable[[int], int] | None) -> list[int]:
+        """get the cost of entering a cell for each byte value, calling the
+        cost function once for each value in the grid"""
+        step_costs = [1] * 256
+        if cost is not None:
+            for value in self.values:
+                step_costs[value] = cost(value)
+        return step_costs
+
+
+def _get_grid_rows(grid: Any) -> list[bytes]:
+    """get the rows of a grid as bytes"""
+    if isinstance(grid, Grid):
+        return [grid.row_bytes(row) for row in range(grid.rows)]
+    if isinstance(grid, (str, bytes, bytearray)):
+        grid = grid.splitlines()
+        while grid and not grid[-1]:
+            grid.pop()
+
+    shape = getattr(grid, "shape", None)
+    if shape is not None:
+        if len(shape) != 2 or grid.itemsize != 1:
+            raise AocModError("grid arrays must be 2-D arrays of bytes")
+        data = grid.tobytes()
+        return [data[row * shape[1] : (row + 1) * shape[1]] for row in range(shape[0])]
+    return [
+        row.encode("latin-1") if isinstance(row, str) else bytes(row) for row in grid
+    ]
+
+
+class _GridResult(SearchResult):
+    """Result of a search of a grid, with distances indexed by cell index"""
+
+    def __init__(
+        self,
+        layout: _GridLayout,
+        distances: array,
+        goal_index: int,
+        parents: array | None = None,
+        settled: bytearray | None = None,
+    ):
+        self._layout = layout
+        self._distances = distances
+        self._parents = parents
+        self._settled = settled
+        if goal_index == UNREACHED or distances[goal_index] == UNREACHED:
+            super().__init__(None, None)
+        else:
+            super().__init__(layout.decode(goal_index), distances[goal_index])
+
+    def _get_index(self, cell: tuple[int, int]) -> int:
+        """get the index of a reached cell, UNREACHED for other cells"""
+        index = self._layout.encode(cell, strict=False)
+        if index == UNREACHED or self._distances[index] == UNREACHED:
+            return UNREACHED
+        if self._settled is not None and not self._settled[index]:
+            return UNREACHED
+        return index
+
+    def distance_to(self, cell: tuple[int, int]) -> int | None:
+        index = self._get_index(cell)
+        return None if index == UNREACHED else self._distances[index]
+
+    def path(self, cell: tuple[int, int] | None = None) -> list[tuple[int, int]]:
+        if cell is None:
+            if self.goal is None:
+                return []
+            cell = self.goal
+        index = self._get_index(cell)
+        if index == UNREACHED:
+            return []
+
+        indexes = [index]
+        if self._parents is not None:
+            while (index := self._parents[index]) != UNREACHED:
+                indexes.append(index)
+        else:
+            # every step of a breadth-first search costs 1, so a cell one step
+            # closer to the start is always next to it
+            distances = self._distances
+            width = self._layout.width
+            for distance in range(distances[index] - 1, -1, -1):
+                for index in (index - 1, index + 1, index - width, index + width):
+                    if distances[index] == distance:
+                        break
+                indexes.append(index)
+
+        return [self._layout.decode(index) for index in reversed(indexes)]
+
+    def reached(self) -> Iterator[tuple[tuple[int, int], int]]:
+        for index, distance in enumerate(self._distances):
+            if distance != UNREACHED and (
+                self._settled is None or self._settled[index]
+            ):
+                yield self._layout.decode(index), distance
+
+
+def _grid_bfs_distances(
+    layout: _GridLayout, start: int, goal: int = UNREACHED
+) -> array:
+    """get the distances of a breadth-first search of a grid from a cell
+    index, stopping once the goal index is found"""
+    width = layout.width
+    unvisited = layout.passable[:]
+    distances = array("q", [UNREACHED]) * len(unvisited)
+    unvisited[start] = 0
+    distances[start] = 0
+
+    frontier = [start]
+    depth = 0
+    while frontier and distances[goal] == UNREACHED:
+        depth += 1
+        next_frontier = []
+        for index in frontier:
+            for next_index in (index - 1, index + 1, index - width, index + width):
+                if unvisited[next_index]:
+                    unvisited[next_index] = 0
+                    distances[next_index] = depth
+                    next_frontier.append(next_index)
+        frontier = next_frontier
+    return distances
+
+
+def grid_bfs(
+    grid: Any,
+    start: tuple[int, int],
+    goal: tuple[int, int] | None = None,
+    walls: bytes | str = GRID_WALLS,
+) -> SearchResult:
+    """breadth-first search of a grid, moving up, down, left and right. this
+    gets the distances of every cell from the start (or until the goal is
+    found) without creating any tuples until the results are read
+
+    :param grid: the grid, as a `Grid`, a 2-D memoryview or numpy array of
+        bytes (see `parse_char_grid`), a list of str or bytes rows or the
+        whole text of the grid
+    :type grid: Any
+    :param start: (row, col) cell to start from
+    :type start: tuple[int, int]
+    :param goal: (row, col) cell to stop at, defaults to None (search every
+        reachable cell)
+    :type goal: tuple[int, int] | None, optional
+    :param walls: characters of the cells that can't be entered, defaults to
+        "#"
+    :type walls: bytes | str, optional
+    :raises AocModError: if the grid isn't rectangular or the start or goal
+        is outside the grid
+    :return: the result of the search, with (row, col) cells as states
+    :rtype: SearchResult
+    """
+    layout = _GridLayout(grid, walls)
+    start_index = layout.encode(start)
+    # the last index is on the border, which is never reached
+    goal_index = layout.encode(goal) if goal is not None else len(layout.cells) - 1
+    distances = _grid_bfs_distances(layout, start_index, goal_index)
+    return _GridResult(layout, distances, goal_index if goal is not None else UNREACHED)
+
+
+def _grid_best_first(
+    layout: _GridLayout,
+    start: int,
+    goal: int,
+    cost: Callable[[int], int] | None,
+    use_heuristic: bool,
+) -> SearchResult:
+    """Dijkstra's algorithm, or A* with the Manhattan distance to the goal,
+    over a grid"""
+    width = layout.width
+    cells = layout.cells
+    passable = layout.passable
+    step_costs = layout.get_step_costs(cost)
+    distances = array("q", [UNREACHED]) * len(cells)
+    parents = array("q", [UNREACHED]) * len(cells)
+    settled = bytearray(len(cells))
+    distances[start] = 0
+
+    # the Manhattan distance is scaled by the cheapest step, to never
+    # overestimate the distance left
+    min_step = min((step_costs[value] for value in layout.values), default=0)
+    goal_row, goal_col = divmod(goal, width)
+    use_heuristic = use_heuristic and min_step > 0
+
+    heap = [start]
+    while heap:
+        index = heapq.heappop(heap) & _ID_MASK
+        if settled[index]:
+            continue
+        settled[index] = 1
+        if index == goal:
+            break
+
+        distance = distances[index]
+        for next_index in (index - 1, index + 1, index - width, index + width):
+            if not passable[next_index] or settled[next_index]:
+                continue
+            next_distance = distance + step_costs[cells[next_index]]
+            old_distance = distances[next_index]
+            if old_distance != UNREACHED and old_distance <= next_distance:
+                continue
+            distances[next_index] = next_distance
+            parents[next_index] = index
+
+            if use_heuristic:
+                row, col = divmod(next_index, width)
+                next_distance += min_step * (abs(row - goal_row) + abs(col - goal_col))
+            heapq.heappush(heap, next_distance << _ID_BITS | next_index)
+
+    return _GridResult(layout, distances, goal, parents, settled)
+
+
+def grid_dijkstra(
+    grid: Any,
+    start: tuple[int, int],
+    goal: tuple[int, int] | None = None,
+    cost: Callable[[int], int] | None = None,
+    walls: bytes | str = GRID_WALLS,
+) -> SearchResult:
+    """Dijkstra's algorithm over a grid, moving up, down, left and right with
+    a cost for entering each cell
+
+        # cost of entering a cell is its digit
+        grid_dijkstra(grid, (0, 0), (rows - 1, cols - 1), cost=lambda value: value - 48)
+
+    :param grid: the grid, as a `Grid`, a 2-D memoryview or numpy array of
+        bytes (see `parse_char_grid`), a list of str or bytes rows or the
+        whole text of the grid
+    :type grid: Any
+    :param start: (row, col) cell to start from
+    :type start: tuple[int, int]
+    :param goal: (row, col) cell to stop at, defaults to None (search every
+        reachable cell)
+    :type goal: tuple[int, int] | None, optional
+    :param cost: function of the byte value of a cell returning the
+        non-negative integer cost of entering it, called once for each value
+        in the grid, defaults to None (every step costs 1)
+    :type cost: Callable[[int], int] | None, optional
+    :param walls: characters of the cells that can't be entered, defaults to
+        "#"
+    :type walls: bytes | str, optional
+    :raises AocModError: if the grid isn't rectangular or the start or goal
+        is outside the grid
+    :return: the result of the search, with (row, col) cells as states
+    :rtype: SearchResult
+    """
+    layout = _GridLayout(grid, walls)
+    start_index = layout.encode(start)
+    goal_index = layout.encode(goal) if goal is not None else UNREACHED
+    return _grid_best_first(layout, start_index, goal_index, cost, False)
+
+
+def grid_astar(
+    grid: Any,
+    start: tuple[int, int],
+    goal: tuple[int, int],
+    cost: Callable[[int], int] | None = None,
+    walls: bytes | str = GRID_WALLS,
+) -> SearchResult:
+    """A* search over a grid, moving up, down, left and right with a cost for
+    entering each cell. the heuristic is the Manhattan distance to the goal
+    times the cheapest step in the grid
+
+    :param grid: the grid, as a `Grid`, a 2-D memoryview or numpy array of
+        bytes (see `parse_char_grid`), a list of str or bytes rows or the
+        whole text of the grid
+    :type grid: Any
+    :param start: (row, col) cell to start from
+    :type start: tuple[int, int]
+    :param goal: (row, col) cell to find the shortest path to
+    :type goal: tuple[int, int]
+    :param cost: function of the byte value of a cell returning the
+        non-negative integer cost of entering it, called once for each value
+        in the grid, defaults to None (every step costs 1)
+    :type cost: Callable[[int], int] | None, optional
+    :param walls: characters of the cells that can't be entered, defaults to
+        "#"
+    :type walls: bytes | str, optional
+    :raises AocModError: if the grid isn't rectangular or the start or goal
+        is outside the grid
+    :return: the result of the search, with (row, col) cells as states
+    :rtype: SearchResult
+    """
+    layout = _GridLayout(grid, walls)
+    start_index = layout.encode(start)
+    goal_index = layout.encode(goal)
+    return _grid_best_first(layout, start_index, goal_index, cost, True)
+
+
+def grid_bidirectional_bfs(
+    grid: Any,
+    start: tuple[int, int],
+    goal: tuple[int, int],
+    walls: bytes | str = GRID_WALLS,
+) -> SearchResult:
+    """breadth-first search of a grid from both the start and the goal,
+    moving up, down, left and right. the side with the smaller frontier is
+    expanded a level at a time until the sides meet
+
+    :param grid: the grid, as a `Grid`, a 2-D memoryview or numpy array of
+        bytes (see `parse_char_grid`), a list of str or bytes rows or the
+        whole text of the grid
+    :type grid: Any
+    :param start: (row, col) cell to start from
+    :type start: tuple[int, int]
+    :param goal: (row, col) cell to find the shortest path to
+    :type goal: tuple[int, int]
+    :param walls: characters of the cells that can't be entered, defaults to
+        "#"
+    :type walls: bytes | str, optional
+    :raises AocModError: if the grid isn't rectangular or the start or goal
+        is outside the grid
+    :return: the result of the search. its distance_to() and reached() only
+        cover the cells reached from the start
+    :rtype: SearchResult
+    """
+    layout = _GridLayout(grid, walls)
+    width = layout.width
+    start_index = layout.encode(start)
+    goal_index = layout.encode(goal)
+
+    passable = layout.passable
+    sides = []
+    for side_start in (start_index, goal_index):
+        distances = array("q", [UNREACHED]) * len(layout.cells)
+        distances[side_start] = 0
+        sides.append({"distances": distances, "frontier": [side_start], "depth": 0})
+    # a goal on a wall can't be entered
+    if not passable[goal_index]:
+        sides[1]["frontier"] = []
+
+    meeting = start_index if start_index == goal_index else UNREACHED
+    best = 0 if start_index == goal_index else None
+    while best is None and sides[0]["frontier"] and sides[1]["frontier"]:
+        side, other = sides
+        if len(other["frontier"]) < len(side["frontier"]):
+            side, other = other, side
+        side_distances = side["distances"]
+        other_distances = other["distances"]
+        side["depth"] += 1
+        depth = side["depth"]
+
+        next_frontier = []
+        for index in side["frontier"]:
+            for next_index in (index - 1, index + 1, index - width, index + width):
+                if not passable[next_index] or side_distances[next_index] != UNREACHED:
+                    continue
+                side_distances[next_index] = depth
+                next_frontier.append(next_index)
+
+                other_distance = other_distances[next_index]
+                if other_distance != UNREACHED and (
+                    best is None or depth + other_distance < best
+                ):
+                    best = depth + other_distance
+                    meeting = next_index
+        side["frontier"] = next_frontier
+
+    forward, backward = (
+        _GridResult(layout, side["distances"], UNREACHED) for side in sides
+    )
+    meeting_cell = layout.decode(meeting) if meeting != UNREACHED else None
+    return _BidirectionalResult(forward, backward, goal, meeting_cell, best)
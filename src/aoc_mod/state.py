@@ -0,0 +1,155 @@
+"""Concurrency-safe key/value store for AocMod request state"""
+
+import io
+import json
+import pickle  # nosec B403 - only used through _LegacyUnpickler below
+import sqlite3
+import threading
+import contextlib
+from pathlib import Path
+from typing import Any, Iterator
+
+DEFAULT_STATE_FILE = "state.sqlite3"
+LEGACY_CACHE_FILE = ".aoc_mod_cache.pkl"
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """unpickler for the legacy cache file that refuses to load any class or
+    function, so only plain containers, numbers and strings can be decoded"""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"refusing to load {module}.{name}")
+
+
+class StateStore:
+    """Small transactional key/value store backed by sqlite in WAL mode.
+
+    Values are stored as JSON, one row per key, so a single key can be read or
+    updated without rewriting the rest of the store. Several processes may
+    use the same store at once: readers never block and writers are
+    serialized by sqlite, and `transaction` can be used to make a
+    read-check-write sequence atomic across processes."""
+
+    def __init__(self, path: Path | str):
+        """open (and create, if needed) the state store
+
+        :param path: path to the sqlite database file
+        :type path: Path | str
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    def close(self) -> None:
+        """close the connection to the state store"""
+        self._conn.close()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator["StateStore"]:
+        """context manager that holds the store's write lock for its duration,
+        committing on exit or rolling back if an exception is raised
+
+        :return: the state store
+        :rtype: Iterator[StateStore]
+        """
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+                return
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield self
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """get the value of a key
+
+        :param key: the key to look up
+        :type key: str
+        :param default: value to return if the key is not set, defaults to None
+        :type default: Any, optional
+        :return: the stored value or the default
+        :rtype: Any
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key: str, value: Any) -> None:
+        """set the value of a key
+
+        :param key: the key to set
+        :type key: str
+        :param value: a JSON serializable value
+        :type value: Any
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value)),
+            )
+
+    def delete(self, key: str) -> None:
+        """remove a key from the store, if present
+
+        :param key: the key to remove
+        :type key: str
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM state WHERE key = ?", (key,))
+
+    def migrate_legacy_cache(self, legacy_path: Path | str = LEGACY_CACHE_FILE) -> bool:
+        """import the request times from a legacy pickle-hex cache file and
+        remove it. keys that are already set in the store are not overwritten
+
+        :param legacy_path: path to the legacy cache file, defaults to
+            ".aoc_mod_cache.pkl" in the current directory
+        :type legacy_path: Path | str, optional
+        :return: True if a legacy cache file was migrated
+        :rtype: bool
+        """
+        legacy_path = Path(legacy_path)
+        if not legacy_path.is_file():
+            return False
+
+        try:
+            raw_data = bytes.fromhex(legacy_path.read_text())
+            legacy_data = _LegacyUnpickler(io.BytesIO(raw_data)).load()
+        except EOFError:
+            legacy_data = {}
+        except (OSError, ValueError, pickle.UnpicklingError):
+            return False
+
+        if isinstance(legacy_data, dict):
+            with self.transaction():
+                for key, value in legacy_data.items():
+                    if isinstance(value, (int, float)) and self.get(key) is None:
+                        self.set(key, value)
+
+        legacy_path.unlink(missing_ok=True)
+        return True
@@ -6,6 +6,20 @@ from pathlib import Path
 from aoc_mod.utilities import AocMod, AocModError, get_year_and_day, parse_input
 
 
+# for a heavy parse, import `cached_parse` from aoc_mod.utilities and decorate
+# this function with `@cached_parse` to keep the result on disk until the
+# input or this function changes
+def parse(input_path: Path) -> list[str]:
+    """parse the puzzle input for both parts here
+
+    :param input_path: path to the input file
+    :type input_path: Path
+    :return: list of strings from parsed input
+    :rtype: list[str]
+    """
+    return parse_input(input_path)
+
+
 def part_one(parsed_input: list[str]) -> dict[str, int]:
     """create the part one solution here
 
@@ -36,6 +50,28 @@ def part_two(parsed_input: list[str]) -> dict[str, int]:
     return output
 
 
+def update_instructions(aoc_mod: AocMod, year: int, day: int, day_path: Path):
+    """append newly unlocked parts of the puzzle to the instructions file
+
+    :param aoc_mod: AocMod instance used for the request
+    :type aoc_mod: AocMod
+    :param year: year of the puzzle
+    :type year: int
+    :param day: day of the puzzle
+    :type day: int
+    :param day_path: path to the folder of the puzzle files
+    :type day_path: Path
+    """
+    from aoc_mod.interactive import update_instructions_file
+
+    try:
+        update_instructions_file(
+            aoc_mod, year, day, day_path.joinpath(f"instructions_day{day}.md")
+        )
+    except AocModError as err:
+        print(f"Error occurred while updating the instructions: {err}")
+
+
 def main():
     """main driver function"""
     # set up aoc_mod
@@ -57,8 +93,11 @@ def main():
 
     print(f"{year}:Day{day}")
 
+    # parse the input once for both parts
+    parsed_input = parse(input_path)
+
     # get the answer for part one
-    answer_one = part_one(parse_input(input_path))
+    answer_one = part_one(parsed_input)
 
     # submit part one, if ready
     if answer_one["submit"]:
@@ -68,12 +107,12 @@ def main():
             print(f"Error occurred while submitting part one answer: {err}")
             exit(1)
 
-        # if we get the correct answer for part one, we'll retrieve the instructions for part two
+        # if we get the correct answer for part one, we'll add the instructions for part two to the instructions file
         if "That's the right answer" in result:
-            aoc_mod.get_puzzle_instructions(year, day)
+            update_instructions(aoc_mod, year, day, current_path_to_file)
 
     # get the answer for part two
-    answer_two = part_two(parse_input(input_path))
+    answer_two = part_two(parsed_input)
 
     # submit part two, if ready
     if answer_two["submit"]:
@@ -83,9 +122,9 @@ def main():
             print(f"Error occurred while submitting part two answer: {err}")
             exit(1)
 
-        # if we get the correct answer for part two, we'll retrieve the rest of the instructions
+        # if we get the correct answer for part two, we'll add the rest of the instructions to the instructions file
         if "That's the right answer" in result:
-            aoc_mod.get_puzzle_instructions(year, day)
+            update_instructions(aoc_mod, year, day, current_path_to_file)
 
 
 if __name__ == "__main__":
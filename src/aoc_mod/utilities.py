@@ -2,18 +2,59 @@
 
 import os
 import re
+import sys
+import mmap
 import time
-import pickle
+import hashlib
+import functools
+import threading
+from array import array
 from pathlib import Path
+from typing import IO, Any, Callable, Iterator
 
-import markdownify
-import requests
-from bs4 import BeautifulSoup
+# the HTTP library (requests) is imported in the functions that use it, so that
+# solutions only reading local input don't pay for importing it. puzzle pages
+# are converted to markdown by aoc_mod.html_markdown, which only needs the
+# standard library
 
-URL_PUZZLE_MAIN = "https://adventofcode.com/{YEAR}/day/{DAY}"
+from aoc_mod.cache import (
+    PARSED_VERSION,
+    ParseCache,
+    PuzzleCache,
+    get_cache_dir,
+    hash_content,
+)
+from aoc_mod.html_markdown import (
+    HtmlElement,
+    extract_children,
+    html_to_markdown,
+    to_markdown,
+)
+from aoc_mod.ledger import VERDICT_CORRECT, SubmissionLedger
+from aoc_mod.state import DEFAULT_STATE_FILE, StateStore
+
+URL_BASE = "https://adventofcode.com"
+URL_PUZZLE_MAIN = f"{URL_BASE}/{{YEAR}}/day/{{DAY}}"
 URL_PUZZLE_INPUT = f"{URL_PUZZLE_MAIN}/input"
 URL_PUZZLE_ANSWER = f"{URL_PUZZLE_MAIN}/answer"
 
+OFFLINE_ENV_VAR = "AOC_MOD_OFFLINE"
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (5.0, 10.0)  # (connect, read) timeouts in seconds
+DEFAULT_MAX_RETRIES = 3
+
+# integer patterns used by the typed input parsers
+INT_PATTERN = re.compile(rb"-?\d+")
+UINT_PATTERN = re.compile(rb"\d+")
+
+# state keys holding the time of the last request of each kind
+REQUEST_STATE_KEYS = {
+    "input": "last_input_pull",
+    "instructions": "last_instruction_pull",
+    "submission": "last_submission_push",
+}
+
 
 class AocModError(Exception):
     """General exception for an AOC_MOD library error"""
@@ -25,12 +66,39 @@ class AocModError(Exception):
 class AocMod:
     """Main utility class for the AOC_MOD library"""
 
-    def __init__(self, session_id: str = ""):
+    def __init__(
+        self,
+        session_id: str = "",
+        cache_dir: Path | str | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_url: str = URL_BASE,
+        offline: bool | None = None,
+    ):
         """initialize AocMod class with time and auth data
 
         :param session_id: session-id from browser after logging into
             Advent of Code, defaults to ""
         :type session_id: str, optional
+        :param cache_dir: directory of the local puzzle cache and request
+            state, defaults to $AOC_MOD_CACHE_DIR or "aoc_mod" in the XDG
+            cache directory
+        :type cache_dir: Path | str | None, optional
+        :param pool_size: maximum number of pooled HTTP connections, defaults to 10
+        :type pool_size: int, optional
+        :param timeout: (connect, read) timeouts for HTTP requests in seconds,
+            defaults to (5.0, 10.0)
+        :type timeout: tuple[float, float], optional
+        :param max_retries: maximum number of retries for connection errors
+            and server errors, defaults to 3
+        :type max_retries: int, optional
+        :param base_url: base url of the Advent of Code website, defaults to
+            "https://adventofcode.com"
+        :type base_url: str, optional
+        :param offline: never make requests or touch the puzzle cache and
+            request state, defaults to the AOC_MOD_OFFLINE environment variable
+        :type offline: bool | None, optional
         :param year: year of AoC for puzzle data, defaults to 0
         :type year: int, optional
         :param day: day of AoC for puzzle data, defaults to 0
@@ -49,22 +117,82 @@ class AocMod:
         else:
             self.session_id = self._get_auth_data()
 
-        self._cache_file = Path(".aoc_mod_cache.pkl")
-        self._cache_file.touch(exist_ok=True)
-        self._cache_data = {
-            "last_input_pull": None,
-            "last_instruction_pull": None,
-            "last_submission_push": None,
-        }
+        # reuse pooled connections for every request made by this instance
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._pool_size = pool_size
+        self._max_retries = max_retries
+        self._http_session = None
 
-        # if the cache file is empty, initialize it with the default cache data
-        try:
-            self._cache_data = pickle.loads(bytes.fromhex(self._cache_file.read_text()))
-        except EOFError:
-            self._cache_file.write_text(pickle.dumps(self._cache_data).hex())
+        if offline is None:
+            offline = is_offline()
+        self.offline = offline
+
+        # puzzle input and instructions never change for a user, so keep them
+        # locally (the cache is only read or written once it is used)
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir()
+        self._puzzle_cache = PuzzleCache(self.cache_dir, self.session_id)
+
+        # rate-limit state is shared by every process using the same cache
+        # directory and is opened on the first request
+        self._state_store = None
+        # guards the lazy creation of the session and state store, which
+        # threads sharing this instance (as setup does) may ask for at once
+        self._lazy_lock = threading.Lock()
 
         self._time_to_wait_after_pull = 120  # seconds to wait after pulling input or instructions before allowing another pull
 
+    @property
+    def _session(self):
+        """pooled HTTP session for this instance, created on first use
+
+        :return: the HTTP session
+        :rtype: requests.Session
+        """
+        if self._http_session is None:
+            from aoc_mod.http_session import create_session
+
+            with self._lazy_lock:
+                if self._http_session is None:
+                    self._http_session = create_session(
+                        self.user_agent,
+                        self.session_id,
+                        pool_size=self._pool_size,
+                        max_retries=self._max_retries,
+                    )
+        return self._http_session
+
+    @property
+    def _state(self) -> StateStore:
+        """request state store for this instance, opened on first use (which
+        also migrates any legacy cache file in the current directory)
+
+        :raises AocModError: if the instance is in offline mode
+        :return: the state store
+        :rtype: StateStore
+        """
+        self._verify_online()
+        if self._state_store is None:
+            with self._lazy_lock:
+                if self._state_store is None:
+                    state_store = StateStore(
+                        self.cache_dir.joinpath(DEFAULT_STATE_FILE)
+                    )
+                    state_store.migrate_legacy_cache()
+                    self._state_store = state_store
+        return self._state_store
+
+    def _verify_online(self) -> None:
+        """make sure that this instance is allowed to make requests and use
+        its request state
+
+        :raises AocModError: if the instance is in offline mode
+        """
+        if self.offline:
+            raise AocModError(
+                f"aoc_mod is in offline mode (unset {OFFLINE_ENV_VAR} to make requests)"
+            )
+
     def _get_auth_data(self) -> str:
         """will return the SESSION_ID environment variable, if set
 
@@ -81,29 +209,20 @@ class AocMod:
         """
         return time.localtime(time.time())
 
-    def _get_cache_data(self) -> dict:
-        """get the cache data from the cache file
+    def _get_url(self, url_template: str, year: int, day: int) -> str:
+        """build the url for a puzzle year and day relative to the base url
 
-        :return: the cache data as a dictionary
-        :rtype: dict
-        """
-        try:
-            return pickle.loads(bytes.fromhex(self._cache_file.read_text()))
-        except EOFError:
-            # cache file is empty, return default cache data
-            return {
-                "last_input_pull": None,
-                "last_instruction_pull": None,
-                "last_submission_push": None,
-            }
-
-    def _set_cache_data(self, cache_data: dict) -> None:
-        """set the cache data in the cache file
-
-        :param cache_data: the cache data to set
-        :type cache_data: dict
+        :param url_template: one of the URL_PUZZLE_* templates
+        :type url_template: str
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :return: the url for the request
+        :rtype: str
         """
-        self._cache_file.write_text(pickle.dumps(cache_data).hex())
+        url = url_template.format(YEAR=year, DAY=day)
+        return self.base_url + url.removeprefix(URL_BASE)
 
     def _is_request_timed_out(self, last_pull_time: float) -> tuple[bool, int]:
         """check if the last pull time is within the timeout period
@@ -121,118 +240,343 @@ class AocMod:
         )
         return is_timed_out, timed_out_seconds_left
 
-    def get_puzzle_instructions(self, year: int, day: int) -> str:
+    def _claim_request_window(self, key: str, error_msg: str) -> None:
+        """atomically check that the timeout since the last request of a kind
+        has passed and record the current time as the last request time
+
+        :param key: state key holding the time of the last request of this kind
+        :type key: str
+        :param error_msg: message for the raised error, where "{SECONDS}" is
+            replaced with the number of seconds left in the timeout
+        :type error_msg: str
+        :raises AocModError: if the last request was made too recently
+        """
+        state = self._state
+        with state.transaction():
+            last_pull_time = state.get(key)
+            if last_pull_time:
+                is_timed_out, seconds_left = self._is_request_timed_out(last_pull_time)
+                if is_timed_out:
+                    raise AocModError(error_msg.format(SECONDS=seconds_left))
+
+            state.set(key, time.time())
+
+    def get_request_wait_time(self, kind: str) -> float:
+        """get the number of seconds until a request of a kind is allowed
+
+        :param kind: kind of request, one of "input", "instructions" or "submission"
+        :type kind: str
+        :return: seconds left in the timeout since the last request of this
+            kind, or 0.0 if a request can be made now (or in offline mode)
+        :rtype: float
+        """
+        if self.offline:
+            return 0.0
+
+        last_pull_time = self._state.get(REQUEST_STATE_KEYS[kind])
+        if not last_pull_time:
+            return 0.0
+        return max(0.0, self._time_to_wait_after_pull - (time.time() - last_pull_time))
+
+    def is_cached(self, year: int, day: int, kind: str) -> bool:
+        """check if puzzle data would be served from the local puzzle cache
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param kind: kind of puzzle data, either "input" or "instructions"
+        :type kind: str
+        :return: True if no request is needed to get the puzzle data
+            (always False in offline mode)
+        :rtype: bool
+        """
+        if self.offline:
+            return False
+
+        entry = self._puzzle_cache.get_entry(year, day, kind)
+        if entry is None:
+            return False
+        if kind == "instructions":
+            return entry["solved"] >= self._get_solved_level(year, day)
+        return True
+
+    def _get_solved_level(self, year: int, day: int) -> int:
+        """get the highest puzzle level known to be solved for a year and day
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :return: the highest solved level (0, 1 or 2)
+        :rtype: int
+        """
+        entry = self._puzzle_cache.get_entry(year, day, "solved")
+        return entry["level"] if entry else 0
+
+    def _set_solved_level(self, year: int, day: int, level: int) -> None:
+        """record that a puzzle level has been solved for a year and day
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param level: the puzzle level that was solved
+        :type level: int
+        """
+        if level > self._get_solved_level(year, day):
+            self._puzzle_cache.set_entry(year, day, "solved", {"level": level})
+
+    def _instructions_to_markdown(
+        self, children: list[tuple[str, HtmlElement]], known_articles: dict[str, str]
+    ) -> tuple[str, dict[str, str]]:
+        """convert the children of the <main> element of a puzzle page to markdown
+
+        each <article> (one per unlocked part) is converted separately and its
+        markdown is stored in the puzzle cache, keyed by the article html
+        digest, so that part one is not converted again once part two unlocks.
+        the other children between two articles are joined and converted
+        together, so the markdown is the same as converting the whole of
+        <main> at once
+
+        :param children: (source html, document node) of each child of the
+            <main> element, from extract_children()
+        :type children: list[tuple[str, HtmlElement]]
+        :param known_articles: mapping of article html digests to markdown
+            digests from a previous pull of the instructions
+        :type known_articles: dict[str, str]
+        :return: a tuple of (markdown, articles) where articles is the updated
+            mapping of article html digests to markdown digests
+        :rtype: tuple[str, dict[str, str]]
+        """
+        articles = {}
+        sections = []
+        # stripped html of the children since the last article
+        between = []
+
+        def convert_between():
+            section = html_to_markdown("".join(between)) if between else ""
+            if section:
+                sections.append(section)
+            between.clear()
+
+        for source_html, document in children:
+            node = document.children[0]
+            if not isinstance(node, HtmlElement) or node.name != "article":
+                line = source_html.strip()
+                if line:
+                    between.append(line)
+                continue
+
+            convert_between()
+            html_digest = hash_content(source_html)
+            section = None
+            if html_digest in known_articles:
+                section = self._puzzle_cache.read_object(known_articles[html_digest])
+            if section is None:
+                section = to_markdown(document, source_html)
+            articles[html_digest] = self._puzzle_cache.write_object(section)
+            if section:
+                sections.append(section)
+
+        convert_between()
+        return "\n\n".join(sections), articles
+
+    def get_puzzle_instructions(
+        self, year: int, day: int, refresh: bool = False
+    ) -> str:
         """get puzzle instructions for the entered (or current) year and day
 
+        instructions are served from the local puzzle cache unless a part has
+        been solved since they were last pulled (unlocking more of the page)
+        or a refresh is requested. cached instructions are revalidated with a
+        conditional request (using the ETag and Last-Modified headers of the
+        last pull) and the page is only converted to markdown again if its
+        <main> element changed, in which case only new articles are converted
+
         :param year: year of AoC puzzle, defaults to current
         :type year: int
         :param day: day of AoC puzzle, defaults to current
         :type day: int
+        :param refresh: ignore the local puzzle cache and pull the instructions
+            again, defaults to False
+        :type refresh: bool, optional
         :raises AocModError: exception if we http request throws an error
         :return: markdownify output string of puzzle instructions
         :rtype: str
         """
-
-        # get the cache data for the last instruction pull, and if it was less than 60 seconds ago, raise an error
-        cache_data = self._get_cache_data()
-        if cache_data["last_instruction_pull"]:
-            is_timed_out, seconds_left = self._is_request_timed_out(
-                cache_data["last_instruction_pull"]
-            )
-            if is_timed_out:
-                raise AocModError(
-                    f"puzzle instructions were pulled too recently, please wait {seconds_left} seconds before pulling again"
-                )
-            else:
-                cache_data["last_instruction_pull"] = time.time()
-                self._set_cache_data(cache_data)
-        else:
-            cache_data["last_instruction_pull"] = time.time()
-            self._set_cache_data(cache_data)
+        self._verify_online()
 
         # if this function wasn't provided with a date, get current year, day
         if not year or not day:
             year = self.curr_time.tm_year
             day = self.curr_time.tm_mday
 
-        # request the puzzle input for the current year and day
+        # serve the cached instructions if no more of the page has been unlocked
+        solved_level = self._get_solved_level(year, day)
+        entry = self._puzzle_cache.get_entry(year, day, "instructions")
+        cached_instructions = None
+        if entry and not refresh:
+            cached_instructions = self._puzzle_cache.read_object(entry["sha256"])
+            if cached_instructions is not None and entry["solved"] >= solved_level:
+                return cached_instructions
+
+        # claim the request window for the instruction pull, raising an error if the last one was too recent
+        self._claim_request_window(
+            "last_instruction_pull",
+            "puzzle instructions were pulled too recently, please wait {SECONDS} seconds before pulling again",
+        )
+
+        import requests
+
+        # ask for the page only if it changed since the cached instructions were pulled
+        headers = {}
+        if cached_instructions is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        # request the puzzle instructions for the current year and day
         try:
-            if self.session_id:
-                res = requests.get(
-                    URL_PUZZLE_MAIN.format(YEAR=year, DAY=day),
-                    cookies={"session": self.session_id, "User-Agent": self.user_agent},
-                    timeout=5,
-                )
-            else:
-                res = requests.get(
-                    URL_PUZZLE_MAIN.format(YEAR=year, DAY=day), timeout=5
-                )
+            res = self._session.get(
+                self._get_url(URL_PUZZLE_MAIN, year, day),
+                timeout=self.timeout,
+                headers=headers,
+            )
             res.raise_for_status()
         except requests.exceptions.HTTPError as err:
             raise AocModError(
                 "http error when getting puzzle instructions (check session-id)"
             ) from err
+        except requests.exceptions.RequestException as err:
+            raise AocModError("request error when getting puzzle instructions") from err
 
-        # run the instruction output through BeautifulSoup for html parsing
-        soup = BeautifulSoup(res.content, "html.parser")
+        if res.status_code == 304 and cached_instructions is not None:
+            instructions = cached_instructions
+            main_digest = entry.get("main_sha256", "")
+            articles = entry.get("articles", {})
+        else:
+            page = _decode_html(res.content)
+            main_digest = hash_content(_get_main_html(page))
+            if cached_instructions is not None and main_digest == entry.get(
+                "main_sha256"
+            ):
+                # the page changed outside of <main>, so there is nothing to convert
+                instructions = cached_instructions
+                articles = entry.get("articles", {})
+            else:
+                # turn the children of <main> (the instructions) into markdown
+                instructions, articles = self._instructions_to_markdown(
+                    extract_children(page, "main"),
+                    entry.get("articles", {}) if entry else {},
+                )
 
-        result_content = ""
-        for entry in soup.main.contents:  # type: ignore
-            line = str(entry).strip()
-            if not line:
-                continue
+        self._puzzle_cache.put(
+            year,
+            day,
+            "instructions",
+            instructions,
+            solved=solved_level,
+            articles=articles,
+            main_sha256=main_digest,
+            etag=res.headers.get("ETag") or (entry or {}).get("etag", ""),
+            last_modified=res.headers.get("Last-Modified")
+            or (entry or {}).get("last_modified", ""),
+        )
+
+        return instructions
+
+    def has_new_instructions(self, year: int, day: int) -> bool:
+        """check if a part of a puzzle was solved since its instructions were
+        last pulled, so that pulling them again would unlock more of the page
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :return: True if the instructions were pulled before and are outdated
+            (always False in offline mode)
+        :rtype: bool
+        """
+        if self.offline:
+            return False
 
-            result_content += line
+        entry = self._puzzle_cache.get_entry(year, day, "instructions")
+        return entry is not None and entry["solved"] < self._get_solved_level(year, day)
 
-        # turn the instructions into markdown
-        return markdownify.markdownify(result_content)
+    def get_instruction_articles(self, year: int, day: int) -> list[str]:
+        """get the markdown of each article (one per unlocked part) of the
+        cached puzzle instructions, without making a request
 
-    def get_puzzle_input(self, year: int = 0, day: int = 0) -> str:
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :return: the markdown of each article, in page order
+        :rtype: list[str]
+        """
+        entry = self._puzzle_cache.get_entry(year, day, "instructions")
+        if entry is None:
+            return []
+
+        articles = []
+        for digest in entry.get("articles", {}).values():
+            article = self._puzzle_cache.read_object(digest)
+            if article is not None:
+                articles.append(article)
+        return articles
+
+    def get_puzzle_input(
+        self, year: int = 0, day: int = 0, refresh: bool = False
+    ) -> str:
         """get puzzle input for specified year and day
 
+        input is served from the local puzzle cache after the first pull
+
         :param year: yeah of the puzzle, defaults to 0
         :type year: int, optional
         :param day: day of the puzzle, defaults to 0
         :type day: int, optional
+        :param refresh: ignore the local puzzle cache and pull the input
+            again, defaults to False
+        :type refresh: bool, optional
         :raises AocModError: will raise for http request error or a
             request exception
         :return: the puzzle input as a string
         :rtype: str
         """
+        self._verify_online()
+
         # verify that we have a valid session-id, otherwise we can't get input
         if not self.session_id:
             raise AocModError(
                 "unable to get puzzle input from an unauthenticated session"
             )
 
-        # get the cache data for the last input pull, and if it was less than 60 seconds ago, raise an error
-        cache_data = self._get_cache_data()
-        if cache_data["last_input_pull"]:
-            is_timed_out, seconds_left = self._is_request_timed_out(
-                cache_data["last_input_pull"]
-            )
-            if is_timed_out:
-                raise AocModError(
-                    f"puzzle input was pulled too recently, please wait {seconds_left} seconds before pulling again"
-                )
-            else:
-                cache_data["last_input_pull"] = time.time()
-                self._set_cache_data(cache_data)
-        else:
-            cache_data["last_input_pull"] = time.time()
-            self._set_cache_data(cache_data)
-
         # if this function wasn't provided with a date, get current year, day
         if not year or not day:
             year = self.curr_time.tm_year
             day = self.curr_time.tm_mday
 
+        # puzzle input never changes for a user, so serve it from the cache if we have it
+        if not refresh:
+            puzzle_input = self._puzzle_cache.get(year, day, "input")
+            if puzzle_input is not None:
+                return puzzle_input
+
+        # claim the request window for the input pull, raising an error if the last one was too recent
+        self._claim_request_window(
+            "last_input_pull",
+            "puzzle input was pulled too recently, please wait {SECONDS} seconds before pulling again",
+        )
+
+        import requests
+
         # request the puzzle input for the current year and day
         try:
-            res = requests.get(
-                URL_PUZZLE_INPUT.format(YEAR=year, DAY=day),
-                cookies={"session": self.session_id, "User-Agent": self.user_agent},
-                timeout=5,
+            res = self._session.get(
+                self._get_url(URL_PUZZLE_INPUT, year, day), timeout=self.timeout
             )
             res.raise_for_status()
         except requests.exceptions.HTTPError as err:
@@ -244,11 +588,31 @@ class AocMod:
                 "it is likely that an invalid session key was provided when getting puzzle input"
             ) from err
 
-        return res.text.strip()
+        puzzle_input = res.text.strip()
+        self._puzzle_cache.put(year, day, "input", puzzle_input)
+
+        return puzzle_input
+
+    @property
+    def ledger(self) -> SubmissionLedger:
+        """ledger of the answers submitted with this session-id, kept in the
+        request state
+
+        :raises AocModError: if the instance is in offline mode
+        :return: the submission ledger
+        :rtype: SubmissionLedger
+        """
+        return SubmissionLedger(self._state, self.session_id)
 
     def submit_answer(self, year: int, day: int, level: int, answer: int) -> str:
         """submit puzzle answer for the year, day and level (part)
 
+        every submission and its verdict is recorded in the submission ledger.
+        an answer whose verdict already follows from the ledger isn't
+        submitted: a known correct answer returns the response it got
+        originally, and a known wrong answer (or any answer while Advent of
+        Code asks to wait) raises an AocModError
+
         :param year: year of the puzzle
         :type year: int
         :param day: day of the puzzle
@@ -258,10 +622,11 @@ class AocMod:
         :param answer: the answer to be submitted
         :type answer: int
         :raises AocModError: will raise for http request error or a
-            request exception
+            request exception, or if the answer is known to be wrong
         :return: the result from the http post request
         :rtype: str
         """
+        self._verify_online()
 
         # verify that we have a valid session-id, otherwise we can't submit
         if not self.session_id:
@@ -269,30 +634,32 @@ class AocMod:
                 "unable to submit puzzle answer to an unauthenticated session"
             )
 
-        # get the cache data for the last submission, and if it was less than 60 seconds ago, raise an error
-        cache_data = self._get_cache_data()
-        if cache_data["last_submission_push"]:
-            is_timed_out, seconds_left = self._is_request_timed_out(
-                cache_data["last_submission_push"]
+        # don't submit answers whose verdict we already know
+        ledger = self.ledger
+        known_verdict = ledger.check(year, day, level, answer)
+        if known_verdict == VERDICT_CORRECT:
+            print(f"{answer} is the right answer (from the submission ledger).")
+            return ledger.get(year, day, level)["response"]
+        if known_verdict is not None:
+            raise AocModError(
+                f"not submitting {answer}, the answer is {known_verdict} "
+                "(from the submission ledger)"
             )
-            if is_timed_out:
-                raise AocModError(
-                    f"puzzle answers were submitted too recently, please wait {seconds_left} seconds before submitting again"
-                )
-            else:
-                cache_data["last_submission_push"] = time.time()
-                self._set_cache_data(cache_data)
-        else:
-            cache_data["last_submission_push"] = time.time()
-            self._set_cache_data(cache_data)
+
+        # claim the request window for the submission, raising an error if the last one was too recent
+        self._claim_request_window(
+            "last_submission_push",
+            "puzzle answers were submitted too recently, please wait {SECONDS} seconds before submitting again",
+        )
+
+        import requests
 
         # submit the puzzle answer
         try:
-            res = requests.post(
-                URL_PUZZLE_ANSWER.format(YEAR=year, DAY=day),
+            res = self._session.post(
+                self._get_url(URL_PUZZLE_ANSWER, year, day),
                 data={"level": level, "answer": answer},
-                cookies={"session": self.session_id, "User-Agent": self.user_agent},
-                timeout=5,
+                timeout=self.timeout,
             )
             res.raise_for_status()
         except requests.exceptions.HTTPError as err:
@@ -304,22 +671,55 @@ class AocMod:
                 "an invalid session key or invalid answer during submission. "
             ) from err
 
-        # run the response output through BeautifulSoup for html parsing
-        soup = BeautifulSoup(res.content, "html.parser")
-
-        for entry in soup.article.contents:  # type: ignore
-            line = str(entry)
-            if not line:
+        # print the response message, the first child of its <article>
+        for source_html, document in extract_children(
+            _decode_html(res.content), "article"
+        ):
+            if not source_html:
                 continue
 
-            result_content = line
+            if isinstance(document.children[0], HtmlElement):
+                print(to_markdown(document, source_html))
+            else:
+                print(html_to_markdown(source_html))
             break
 
-        print(markdownify.markdownify(result_content))
+        # a correct answer unlocks more of the puzzle instructions
+        if ledger.record(year, day, level, answer, res.text) == VERDICT_CORRECT:
+            self._set_solved_level(year, day, level)
 
         return res.text
 
 
+def _decode_html(content: bytes | str) -> str:
+    """decode the body of an html response (Advent of Code pages are utf-8)
+
+    :param content: the response body
+    :type content: bytes | str
+    :return: the decoded html
+    :rtype: str
+    """
+    if isinstance(content, str):
+        return content
+    return content.decode("utf-8", errors="replace")
+
+
+def _get_main_html(page: str) -> str:
+    """get the html of the <main> element of a puzzle page, without parsing it
+
+    :param page: html of the whole page
+    :type page: str
+    :return: the html from the start of <main> up to its end tag, or the whole
+        page if there is no <main> element
+    :rtype: str
+    """
+    start = page.find("<main")
+    end = page.rfind("</main>")
+    if start < 0 or end < start:
+        return page
+    return page[start:end]
+
+
 def get_year_and_day(filepath: Path) -> tuple[int, int]:
     """utility function to get current year and day from the
     path to this file
@@ -345,6 +745,25 @@ def get_year_and_day(filepath: Path) -> tuple[int, int]:
     return (year_num, day_num)
 
 
+def _open_input(input_path: Path, binary: bool = False) -> IO:
+    """open a puzzle input file for reading
+
+    :param input_path: path to the input file
+    :type input_path: Path
+    :param binary: open the file in binary mode, defaults to False
+    :type binary: bool, optional
+    :raises AocModError: if the file can't be opened
+    :return: the open file
+    :rtype: IO
+    """
+    try:
+        if binary:
+            return input_path.open("rb")
+        return input_path.open("r", encoding="utf-8")
+    except OSError:
+        raise AocModError(f"unable to open input file: {input_path}") from None
+
+
 def parse_input(input_path: Path) -> list[str]:
     """utility function to read in puzzle input and
     place it into a list of str values
@@ -356,11 +775,269 @@ def parse_input(input_path: Path) -> list[str]:
     """
     # read in input data from file
     try:
-        with input_path.open("r", encoding="utf-8") as f_in:
+        with _open_input(input_path) as f_in:
             raw_input = f_in.read()
     except OSError:
-        raise AocModError(f"unable to open input file: {input_path}") from None
+        raise AocModError(f"unable to read input file: {input_path}") from None
 
     # parse the input data
     input_data = raw_input.splitlines()
     return input_data
+
+
+def _iter_lines(f_in: IO, input_path: Path) -> Iterator[str]:
+    """yield the lines of an open file without line endings, closing the file
+    once it is exhausted"""
+    with f_in:
+        try:
+            for line in f_in:
+                yield line[:-1] if line.endswith("\n") else line
+        except OSError:
+            raise AocModError(f"unable to read input file: {input_path}") from None
+
+
+def iter_input(input_path: Path) -> Iterator[str]:
+    """utility function to lazily read in puzzle input one line at a
+    time, for inputs too large to hold in memory as a list
+
+    :param input_path: path to the input file
+    :type input_path: Path
+    :raises AocModError: if the file can't be opened or read
+    :return: an iterator over the lines of the input (without line endings)
+    :rtype: Iterator[str]
+    """
+    # open the file now so that a missing file raises here rather than on first use
+    return _iter_lines(_open_input(input_path), input_path)
+
+
+def iter_blocks(input_path: Path) -> Iterator[list[str]]:
+    """utility function to lazily read in puzzle input as groups of
+    lines separated by blank lines
+
+    :param input_path: path to the input file
+    :type input_path: Path
+    :raises AocModError: if the file can't be opened or read
+    :return: an iterator over lists of the lines in each group
+    :rtype: Iterator[list[str]]
+    """
+
+    def _iter_blocks(lines: Iterator[str]) -> Iterator[list[str]]:
+        block = []
+        for line in lines:
+            if line:
+                block.append(line)
+            elif block:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    return _iter_blocks(iter_input(input_path))
+
+
+def read_input_bytes(input_path: Path) -> memoryview:
+    """utility function to memory-map puzzle input so that it can be
+    scanned (e.g. with bytes regular expressions) and sliced without copying
+
+    :param input_path: path to the input file
+    :type input_path: Path
+    :raises AocModError: if the file can't be opened or mapped
+    :return: a read-only view of the input bytes, backed by an mmap that is
+        unmapped once the view and any slices of it are released
+    :rtype: memoryview
+    """
+    with _open_input(input_path, binary=True) as f_in:
+        try:
+            # empty files can't be mapped
+            if not os.fstat(f_in.fileno()).st_size:
+                return memoryview(b"")
+            return memoryview(mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ))
+        except (OSError, ValueError):
+            raise AocModError(f"unable to map input file: {input_path}") from None
+
+
+def _import_numpy():
+    """import numpy, which is an optional dependency of aoc_mod
+
+    :raises AocModError: if numpy isn't installed
+    :return: the numpy module
+    :rtype: module
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise AocModError(
+            "numpy is required for this option (pip install aoc-mod[numpy])"
+        ) from None
+    return numpy
+
+
+def parse_ints(input_path: Path, signed: bool = True, numpy: bool = False) -> Any:
+    """utility function to read every integer in the puzzle input into a
+    compact array with a single regular expression scan of the file
+
+    :param input_path: path to the input file
+    :type input_path: Path
+    :param signed: treat a "-" before a number as a minus sign, set this to
+        False for inputs with ranges like "3-5", defaults to True
+    :type signed: bool, optional
+    :param numpy: return a numpy int64 array instead, defaults to False
+    :type numpy: bool, optional
+    :raises AocModError: if the file can't be read or numpy isn't installed
+    :return: the integers in the order they appear in the input
+    :rtype: array.array | numpy.ndarray
+    """
+    pattern = INT_PATTERN if signed else UINT_PATTERN
+    data = read_input_bytes(input_path)
+
+    if numpy:
+        np = _import_numpy()
+        return np.fromiter(map(int, pattern.findall(data)), dtype=np.int64)
+    return array("q", map(int, pattern.findall(data)))
+
+
+def parse_int_rows(input_path: Path, signed: bool = True) -> list[array]:
+    """utility function to read the integers on each line of the puzzle
+    input, for inputs where lines hold different numbers of integers
+
+    :param input_path: path to the input file
+    :type input_path: Path
+    :param signed: treat a "-" before a number as a minus sign, set this to
+        False for inputs with ranges like "3-5", defaults to True
+    :type signed: bool, optional
+    :raises AocModError: if the file can't be read
+    :return: an array of integers for each line of the input
+    :rtype: list[array.array]
+    """
+    pattern = INT_PATTERN if signed else UINT_PATTERN
+    data = read_input_bytes(input_path)
+
+    return [
+        array("q", map(int, pattern.findall(line))) for line in bytes(data).splitlines()
+    ]
+
+
+def parse_char_grid(input_path: Path, numpy: bool = False) -> Any:
+    """utility function to read a rectangular grid of characters from the
+    puzzle input into one contiguous 2-D buffer of byte values, indexed as
+    grid[row, col] (e.g. grid[0, 2] == ord("#"))
+
+    :param input_path: path to the input file
+    :type input_path: Path
+    :param numpy: return a numpy uint8 array instead, defaults to False
+    :type numpy: bool, optional
+    :raises AocModError: if the file can't be read, is empty, the lines of
+        the grid aren't all the same length or numpy isn't installed
+    :return: a (rows, cols) memoryview over a bytearray or a numpy array
+    :rtype: memoryview | numpy.ndarray
+    """
+    rows = bytes(read_input_bytes(input_path)).splitlines()
+    while rows and not rows[-1]:
+        rows.pop()
+
+    width = len(rows[0]) if rows else 0
+    if not width or any(len(row) != width for row in rows):
+        raise AocModError(f"input is not a rectangular grid: {input_path}")
+
+    buffer = bytearray().join(rows)
+    if numpy:
+        np = _import_numpy()
+        return np.frombuffer(buffer, dtype=np.uint8).reshape(len(rows), width)
+    return memoryview(buffer).cast("B", shape=(len(rows), width))
+
+
+def _hash_function_source(func: Callable) -> str:
+    """get the sha256 digest of the source of a function, or of its compiled
+    code if the source isn't available"""
+    import inspect
+    import marshal
+
+    try:
+        return hash_content(inspect.getsource(func))
+    except (OSError, TypeError):
+        return hashlib.sha256(marshal.dumps(func.__code__)).hexdigest()
+
+
+def is_offline() -> bool:
+    """check whether offline mode is set by the AOC_MOD_OFFLINE environment
+    variable
+
+    :return: True if requests and disk state should be avoided
+    :rtype: bool
+    """
+    return os.environ.get(OFFLINE_ENV_VAR, "").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+
+
+def cached_parse(
+    func: Callable[[Path], Any] | None = None,
+    *,
+    use_mmap: bool = False,
+    cache_dir: Path | str | None = None,
+) -> Any:
+    """decorator that caches what a parse function returns on disk, so that a
+    heavy parse (such as building a graph or grid) runs once per input
+    instead of on every run of the solution
+
+    the cached value is keyed by the sha256 digests of the input file and of
+    the source of the parse function, so it is parsed again whenever either
+    one changes. changes to helpers called by the parse function are not
+    noticed, clear the cache (the "parsed" folder of the cache directory) or
+    change the parse function after editing them. values are stored with
+    pickle protocol 5 and the data of numpy arrays, array.array objects and
+    memoryviews is kept in raw buffers; values that can't be pickled are
+    returned without being cached. in offline mode (AOC_MOD_OFFLINE) nothing
+    is read from or written to the cache
+
+        @cached_parse
+        def parse(input_path: Path) -> Graph:
+            ...
+
+    :param func: the parse function, which takes the path to the input file
+    :type func: Callable[[Path], Any] | None, optional
+    :param use_mmap: map the cached value into memory (copy-on-write) instead
+        of reading it, so the data of large arrays is only read when it is
+        used, defaults to False
+    :type use_mmap: bool, optional
+    :param cache_dir: directory where the cache is stored, defaults to the
+        directory from `get_cache_dir`
+    :type cache_dir: Path | str | None, optional
+    :return: the wrapped parse function, or a decorator if only keyword
+        arguments are given
+    :rtype: Callable[[Path], Any]
+    """
+
+    def decorator(parse_func: Callable[[Path], Any]) -> Callable[[Path], Any]:
+        parse_cache = ParseCache(cache_dir)
+        source_digest = _hash_function_source(parse_func)
+        func_name = f"{parse_func.__module__}.{parse_func.__qualname__}"
+
+        @functools.wraps(parse_func)
+        def wrapper(input_path: Path) -> Any:
+            input_path = Path(input_path)
+            if is_offline():
+                return parse_func(input_path)
+            try:
+                with input_path.open("rb") as f_in:
+                    input_digest = hashlib.file_digest(f_in, "sha256").hexdigest()
+            except OSError:
+                # let the parse function report the missing input
+                return parse_func(input_path)
+
+            name = hash_content(f"{func_name}:{input_path.absolute()}")[:16]
+            key = hash_content(
+                f"{PARSED_VERSION}:{sys.version_info[:2]}:{source_digest}:{input_digest}"
+            )
+            found, value = parse_cache.get(name, key, use_mmap=use_mmap)
+            if not found:
+                value = parse_func(input_path)
+                parse_cache.put(name, key, value)
+            return value
+
+        return wrapper
+
+    return decorator if func is None else decorator(func)
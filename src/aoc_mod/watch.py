@@ -0,0 +1,352 @@
+"""Re-run a solution whenever it is saved for `aoc-mod watch`, from a warm
+interpreter that keeps the parsed puzzle input in memory"""
+
+import os
+import sys
+import time
+import ctypes
+import select
+import inspect
+import traceback
+from pathlib import Path
+from typing import Any
+
+from aoc_mod.runner import (
+    PART_FUNCTIONS,
+    format_results,
+    format_seconds,
+    get_solution_paths,
+    load_solution,
+    time_call,
+    time_part,
+)
+from aoc_mod.utilities import AocModError, parse_input
+
+DEFAULT_POLL_INTERVAL = 0.1
+# time for a save to settle before the files are checked again
+SETTLE_TIME = 0.02
+
+# inotify events of a file being written, created or moved into place
+_IN_CLOSE_WRITE = 0x08
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_INOTIFY_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+
+class FileWatcher:
+    """Waits for files to change. The directories of the files are watched
+    with inotify on Linux, so a save is noticed as soon as the file is
+    closed; elsewhere (or if inotify isn't available) the files are polled.
+
+    Either way, a file has changed when its modification time, size or inode
+    did, so editors that save by replacing the file are handled too."""
+
+    def __init__(
+        self,
+        paths: list[Path],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        """initialize the watcher and record the current state of the files
+
+        :param paths: paths of the files to watch
+        :type paths: list[Path]
+        :param poll_interval: seconds between checks of the files when
+            polling, defaults to 0.1
+        :type poll_interval: float, optional
+        :param use_inotify: use inotify where it is available, defaults to
+            True
+        :type use_inotify: bool, optional
+        """
+        self.paths = [Path(path).absolute() for path in paths]
+        self.poll_interval = poll_interval
+        self._inotify_fd = self._init_inotify() if use_inotify else None
+        self._stats = self._get_stats()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """whether the files are watched with inotify instead of polled"""
+        return self._inotify_fd is not None
+
+    def _init_inotify(self) -> int | None:
+        """create an inotify instance watching the directories of the files
+
+        :return: the inotify file descriptor, None if inotify isn't available
+        :rtype: int | None
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            inotify_fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if inotify_fd < 0:
+            return None
+
+        for directory in {path.parent for path in self.paths}:
+            watch_fd = libc.inotify_add_watch(
+                inotify_fd, os.fsencode(directory), _INOTIFY_MASK
+            )
+            if watch_fd < 0:
+                os.close(inotify_fd)
+                return None
+        return inotify_fd
+
+    def _get_stats(self) -> dict[Path, tuple[int, int, int] | None]:
+        """get the modification time, size and inode of each file (None for a
+        missing file)"""
+        stats = {}
+        for path in self.paths:
+            try:
+                stat = path.stat()
+                stats[path] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            except OSError:
+                stats[path] = None
+        return stats
+
+    def _get_changes(self) -> list[Path]:
+        """get the files that changed since the last check"""
+        stats = self._get_stats()
+        changed = [path for path in self.paths if stats[path] != self._stats[path]]
+        self._stats = stats
+        return changed
+
+    def _wait_for_event(self, timeout: float | None) -> None:
+        """wait for an inotify event (or the poll interval) and discard the
+        events, which only wake the watcher up to check the files"""
+        if self._inotify_fd is None:
+            if timeout is not None:
+                timeout = min(timeout, self.poll_interval)
+            time.sleep(self.poll_interval if timeout is None else timeout)
+            return
+
+        readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+        if readable:
+            try:
+                while os.read(self._inotify_fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def wait(self, timeout: float | None = None) -> list[Path]:
+        """wait for any of the files to change
+
+        :param timeout: maximum number of seconds to wait, defaults to None
+            (wait until a file changes)
+        :type timeout: float | None, optional
+        :return: the files that changed, empty if the timeout expired
+        :rtype: list[Path]
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            self._wait_for_event(remaining)
+
+            changed = self._get_changes()
+            if changed:
+                # let the rest of a save (such as a second file) land first
+                time.sleep(SETTLE_TIME)
+                return sorted(set(changed + self._get_changes()))
+            if deadline is not None and time.monotonic() >= deadline:
+                return []
+
+    def close(self) -> None:
+        """stop watching the files"""
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _get_parse_key(parse_func: Any, input_path: Path) -> tuple:
+    """get a key that changes whenever the input file or the source of the
+    parse function does, so that the parsed input can be reused otherwise"""
+    stat = input_path.stat()
+    try:
+        source = inspect.getsource(parse_func)
+    except (OSError, TypeError):
+        source = getattr(parse_func, "__qualname__", repr(parse_func))
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino, source)
+
+
+class SolutionWatcher:
+    """Runs the parts of a solution from a warm interpreter, again whenever
+    the solution file or the puzzle input changes. Only the solution module
+    is reloaded and the parsed input is reused until the input file or the
+    solution's `parse` function changes."""
+
+    def __init__(
+        self,
+        year: int,
+        day: int,
+        root_dir: str = "",
+        repeat: int = 1,
+        warmup: int = 0,
+    ):
+        """initialize the watcher for a challenge day
+
+        :param year: year of the puzzle
+        :type year: int
+        :param day: day of the puzzle
+        :type day: int
+        :param root_dir: path containing the 'challenges' folder, defaults to
+            the current directory
+        :type root_dir: str, optional
+        :param repeat: number of timed runs of each part, defaults to 1
+        :type repeat: int, optional
+        :param warmup: number of untimed runs of each part before the timed
+            ones, defaults to 0
+        :type warmup: int, optional
+        :raises AocModError: if the solution file or the puzzle input is missing
+        """
+        self.year = year
+        self.day = day
+        self.repeat = repeat
+        self.warmup = warmup
+        self.solution_path, self.input_path = get_solution_paths(year, day, root_dir)
+
+        self._parse_key: tuple | None = None
+        self._parsed_input: Any = None
+        self._parse_timings: dict[str, Any] = {}
+
+    def run(self) -> dict[str, Any]:
+        """reload the solution and run its parts, printing their output
+
+        :raises AocModError: if the solution can't be imported
+        :return: the same results as run_solution(), plus the seconds taken to
+            "reload" the solution and whether the parsed input was reused
+            ("input_cached"). a part that raised has an "error" instead of a
+            result and timings
+        :rtype: dict[str, Any]
+        """
+        start = time.perf_counter()
+        module = load_solution(self.solution_path)
+        reload_time = time.perf_counter() - start
+
+        parse_func = getattr(module, "parse", parse_input)
+        parse_key = _get_parse_key(parse_func, self.input_path)
+        input_cached = parse_key == self._parse_key
+        if not input_cached:
+            self._parse_key = None
+            self._parsed_input, self._parse_timings = time_call(
+                parse_func, self.input_path, quiet=False
+            )
+            self._parse_key = parse_key
+
+        results = {
+            "year": self.year,
+            "day": self.day,
+            "reload": reload_time,
+            "input_cached": input_cached,
+            "parse": self._parse_timings,
+            "parts": {},
+        }
+        for part, func_name in PART_FUNCTIONS.items():
+            func = getattr(module, func_name, None)
+            if func is None:
+                continue
+            try:
+                output, timings = time_part(
+                    func,
+                    self._parsed_input,
+                    module.__name__,
+                    repeat=self.repeat,
+                    warmup=self.warmup,
+                    quiet=False,
+                )
+            except Exception as err:
+                traceback.print_exc()
+                results["parts"][part] = {"error": f"{type(err).__name__}: {err}"}
+                continue
+            answer = output.get("result") if isinstance(output, dict) else output
+            results["parts"][part] = {"result": answer, **timings}
+
+        results["total"] = time.perf_counter() - start
+        return results
+
+    def run_and_print(self) -> None:
+        """run the solution and print the results, or why it couldn't run"""
+        print(f"[{time.strftime('%H:%M:%S')}] running {self.solution_path}")
+        try:
+            results = self.run()
+        except AocModError as err:
+            # show where the solution failed to import
+            traceback.print_exception(err.__cause__ or err)
+            return
+        except (Exception, SystemExit):
+            traceback.print_exc()
+            return
+        except KeyboardInterrupt:
+            print("Interrupted, waiting for the next change.")
+            return
+
+        print(format_results(results))
+        print(
+            f"reloaded in {format_seconds(results['reload'])}, input "
+            f"{'cached' if results['input_cached'] else 'parsed'}, "
+            f"{format_seconds(results['total'])} in total"
+        )
+
+    def watch(
+        self, poll_interval: float = DEFAULT_POLL_INTERVAL, use_inotify: bool = True
+    ) -> None:
+        """run the solution, then run it again whenever the solution file or
+        the puzzle input changes, until interrupted
+
+        :param poll_interval: seconds between checks of the files when
+            polling, defaults to 0.1
+        :type poll_interval: float, optional
+        :param use_inotify: use inotify where it is available, defaults to
+            True
+        :type use_inotify: bool, optional
+        """
+        with FileWatcher(
+            [self.solution_path, self.input_path],
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        ) as watcher:
+            self.run_and_print()
+            mode = "inotify" if watcher.uses_inotify else "polling"
+            print(f"Watching for changes ({mode}), press Ctrl+C to stop.")
+            while True:
+                watcher.wait()
+                self.run_and_print()
+
+
+def watch_command(year: int, day: int, options) -> int:
+    """watch a solution for the `aoc-mod watch` command
+
+    :param year: year of the puzzle
+    :type year: int
+    :param day: day of the puzzle
+    :type day: int
+    :param options: parsed command-line options
+    :type options: argparse.Namespace
+    :return: the exit code
+    :rtype: int
+    """
+    try:
+        watcher = SolutionWatcher(
+            year,
+            day,
+            root_dir=options.output_root_dir,
+            repeat=options.repeat,
+            warmup=options.warmup,
+        )
+    except AocModError as err:
+        print(f"Failed to watch {year}, Day {day} ({err})", file=sys.stderr)
+        return 1
+
+    try:
+        watcher.watch(poll_interval=options.interval, use_inotify=not options.poll)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    return 0
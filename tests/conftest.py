@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def run_in_tmp_path(tmp_path, monkeypatch):
+    """run every test from a temporary directory, with the aoc_mod cache inside
+    it, so that cache and state files created by AocMod don't leak out"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AOC_MOD_CACHE_DIR", str(tmp_path.joinpath(".aoc_mod_cache")))
+    monkeypatch.delenv("AOC_MOD_OFFLINE", raising=False)
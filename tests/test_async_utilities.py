@@ -0,0 +1,184 @@
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from aoc_mod import utilities
+from aoc_mod.async_utilities import AsyncAocMod
+from aoc_mod.interactive import (
+    fetch_puzzle_data,
+    get_puzzle_data,
+    setup_challenge_day_template,
+)
+from aoc_mod.state import StateStore
+from aoc_mod.utilities import AocMod, AocModError
+
+
+class AsyncStubServer:
+    """minimal keep-alive HTTP/1.1 server that answers every request after a
+    delay and tracks the number of requests in flight"""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.paths = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.server = None
+
+    async def handle(self, reader, writer):
+        while request_line := await reader.readline():
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers.get("content-length", 0)))
+
+            path = request_line.split()[1].decode()
+            self.paths.append(path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(self.delay)
+            self.in_flight -= 1
+
+            if path.endswith("/input"):
+                body = f"input for {path}\n".encode()
+            else:
+                body = f"<main><article><p>page {path}</p></article></main>".encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *args):
+        self.server.close()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+
+def create_async_aoc_mod(base_url: str, **kwargs) -> AsyncAocMod:
+    async_aoc_mod = AsyncAocMod(
+        session_id="test_session_id", base_url=base_url, **kwargs
+    )
+    async_aoc_mod.aoc_mod._time_to_wait_after_pull = 0
+    return async_aoc_mod
+
+
+def test_async_fetches_run_concurrently():
+    async def run():
+        async with AsyncStubServer() as stub:
+            async_aoc_mod = create_async_aoc_mod(stub.base_url)
+            inputs = await asyncio.gather(
+                *(async_aoc_mod.get_puzzle_input(2023, day) for day in range(1, 5))
+            )
+        return stub, inputs
+
+    stub, inputs = asyncio.run(run())
+    assert inputs[2] == "input for /2023/day/3/input"
+    assert stub.max_in_flight == 4
+
+
+def test_async_concurrency_limit():
+    async def run():
+        async with AsyncStubServer(delay=0.05) as stub:
+            async_aoc_mod = create_async_aoc_mod(stub.base_url, max_concurrency=2)
+            await asyncio.gather(
+                *(async_aoc_mod.get_puzzle_input(2023, day) for day in range(1, 7))
+            )
+        return stub
+
+    stub = asyncio.run(run())
+    assert len(stub.paths) == 6
+    assert stub.max_in_flight == 2
+
+
+def test_async_shares_state_with_sync_class():
+    async def run():
+        async with AsyncStubServer(delay=0) as stub:
+            aoc_mod = AocMod(session_id="test_session_id", base_url=stub.base_url)
+            async_aoc_mod = AsyncAocMod(aoc_mod=aoc_mod)
+
+            await async_aoc_mod.get_puzzle_input(2023, 1)
+            # the rate-limit window claimed above also applies to the sync class
+            with pytest.raises(AocModError, match="too recently"):
+                aoc_mod.get_puzzle_input(2023, 2)
+
+            # and the cached input is served without a request
+            assert aoc_mod.get_puzzle_input(2023, 1) == "input for /2023/day/1/input"
+        return stub
+
+    stub = asyncio.run(run())
+    assert stub.paths == ["/2023/day/1/input"]
+
+
+def test_setup_fetches_input_and_instructions_concurrently():
+    async def run():
+        async with AsyncStubServer(delay=0.2) as stub:
+            aoc_mod = AocMod(session_id="test_session_id", base_url=stub.base_url)
+            # setup runs its own event loop, so run it in a worker thread
+            await asyncio.to_thread(
+                setup_challenge_day_template, aoc_mod, 2023, 1, "out", ""
+            )
+        return stub
+
+    stub = asyncio.run(run())
+    assert stub.max_in_flight == 2
+
+    day_path = Path("out/challenges/2023/day1")
+    assert day_path.joinpath("input_day1.txt").read_text() == (
+        "input for /2023/day/1/input"
+    )
+    assert "page /2023/day/1" in day_path.joinpath("instructions_day1.md").read_text()
+
+
+def test_get_puzzle_data_in_running_loop():
+    class SyncStub:
+        def get_puzzle_input(self, year, day):
+            return f"input {year} {day}"
+
+        def get_puzzle_instructions(self, year, day):
+            raise AocModError("not unlocked")
+
+    async def run():
+        # asyncio.run can't be nested, so the requests are made one by one
+        return get_puzzle_data(SyncStub(), 2023, 1)
+
+    assert asyncio.run(run()) == ("input 2023 1", "")
+    assert get_puzzle_data(SyncStub(), 2023, 1, get_instructions=False) == (
+        "input 2023 1",
+        "",
+    )
+
+
+def test_fetch_puzzle_data_shares_a_fresh_instance(monkeypatch):
+    class SlowStateStore(StateStore):
+        opened = 0
+
+        def __init__(self, *args, **kwargs):
+            # both fetches ask for the request state before it exists, and
+            # two stores would be two connections deadlocking each other
+            SlowStateStore.opened += 1
+            time.sleep(0.1)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(utilities, "StateStore", SlowStateStore)
+
+    async def run():
+        async with AsyncStubServer(delay=0.2) as stub:
+            aoc_mod = AocMod(session_id="test_session_id", base_url=stub.base_url)
+            data = await fetch_puzzle_data(aoc_mod, 2023, 1)
+        return stub, data
+
+    start = time.perf_counter()
+    stub, data = asyncio.run(run())
+    assert stub.max_in_flight == 2
+    assert data[0] == "input for /2023/day/1/input" and "page /2023/day/1" in data[1]
+    assert SlowStateStore.opened == 1
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,105 @@
+import random
+from itertools import product
+
+import pytest
+
+from aoc_mod.automaton import Automaton, parse_rule
+from aoc_mod.utilities import AocModError
+
+BACKENDS = [pytest.param(True, id="numpy"), pytest.param(False, id="ints")]
+GLIDER = [".#.", "..#", "###"]
+
+
+def step_set(cells: set, dimensions: int, birth: set, survive: set, generations: int):
+    """step a set of live cells the straightforward way"""
+    offsets = [
+        offset for offset in product((-1, 0, 1), repeat=dimensions) if any(offset)
+    ]
+    for _ in range(generations):
+        counts = {}
+        for cell in cells:
+            for offset in offsets:
+                neighbor = tuple(c + o for c, o in zip(cell, offset))
+                counts[neighbor] = counts.get(neighbor, 0) + 1
+        cells = {
+            cell
+            for cell, count in counts.items()
+            if count in (survive if cell in cells else birth)
+        }
+    return cells
+
+
+def test_parse_rule():
+    assert parse_rule("B3/S23", 2) == ({3}, {2, 3})
+    assert parse_rule("b36/s23", 2) == ({3, 6}, {2, 3})
+    assert parse_rule("B3/S2,3,13", 3) == ({3}, {2, 3, 13})
+    assert parse_rule(([3], [2, 3]), 2) == ({3}, {2, 3})
+    assert parse_rule(lambda alive, count: count == 3 or alive and count == 2, 2) == (
+        {3},
+        {2, 3},
+    )
+    for rule in ("B0/S23", "X3/S23", "B3/Sx", "B9/S23"):
+        with pytest.raises(AocModError):
+            parse_rule(rule, 2)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_automaton_glider(use_numpy):
+    automaton = Automaton.from_grid(GLIDER, chunk_size=8, use_numpy=use_numpy)
+    assert len(automaton) == 5 and (0, 1) in automaton and (0, 0) not in automaton
+    assert automaton.bounds() == ((0, 0), (2, 2))
+
+    # a glider moves one cell down and right every 4 generations, across
+    # chunks and into negative coordinates when it flies the other way
+    automaton.step(4 * 10)
+    assert automaton.generation == 40 and automaton.population == 5
+    assert automaton.bounds() == ((10, 10), (12, 12))
+    assert automaton.render() == "\n".join(GLIDER)
+    assert automaton.chunk_count == 1
+
+    flipped = [row[::-1] for row in reversed(GLIDER)]
+    automaton = Automaton.from_grid(flipped, chunk_size=8, use_numpy=use_numpy)
+    automaton.step(4 * 10)
+    assert automaton.bounds() == ((-10, -10), (-8, -8))
+    assert automaton.render() == "\n".join(flipped)
+
+    automaton.discard((-10, -10))
+    automaton.add((-20, 30))
+    assert (-20, 30) in automaton and automaton.population == 5
+    with pytest.raises(AocModError):
+        automaton.add((1, 2, 3))
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+@pytest.mark.parametrize("dimensions", [1, 2, 3, 4])
+def test_automaton_matches_sets(use_numpy, dimensions):
+    rng = random.Random(dimensions)
+    rule = "B1/S1" if dimensions == 1 else "B3/S2,3"
+    birth, survive = parse_rule(rule, dimensions)
+    for _ in range(3):
+        cells = {
+            tuple(rng.randint(-10, 10) for _ in range(dimensions)) for _ in range(40)
+        }
+        automaton = Automaton(
+            cells, rule=rule, dimensions=dimensions, chunk_size=4, use_numpy=use_numpy
+        )
+        automaton.step(4)
+        expected = step_set(cells, dimensions, birth, survive, 4)
+        assert set(automaton.cells()) == expected
+        assert automaton.population == len(expected)
+        if expected:
+            assert automaton.bounds() == (
+                tuple(map(min, zip(*expected))),
+                tuple(map(max, zip(*expected))),
+            )
+
+
+def test_automaton_conway_cubes():
+    # the example of 2020 day 17
+    for dimensions, expected in ((3, 112), (4, 848)):
+        for use_numpy in (True, False):
+            automaton = Automaton.from_grid(
+                ".#.\n..#\n###", dimensions=dimensions, use_numpy=use_numpy
+            )
+            automaton.step(6)
+            assert automaton.population == expected
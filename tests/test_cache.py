@@ -0,0 +1,252 @@
+import sys
+import multiprocessing
+from array import array
+from pathlib import Path
+
+import pytest
+import requests
+
+from aoc_mod import utilities
+from aoc_mod.cache import (
+    PARSED_ALIGNMENT,
+    ParseCache,
+    PuzzleCache,
+    dump_parsed,
+    hash_session,
+    load_parsed,
+)
+from aoc_mod.interactive import setup_challenge_day_template
+from aoc_mod.utilities import AocMod
+
+
+class MockResponse:
+    def __init__(self, text, status_code=200, headers=None):
+        self.text = text
+        self.content = text
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+def test_puzzle_cache_round_trip(tmp_path):
+    cache = PuzzleCache(tmp_path, "test_session_id")
+    assert cache.get(2023, 1, "input") is None
+
+    digest = cache.put(2023, 1, "input", "1\n2\n3")
+    assert cache.get(2023, 1, "input") == "1\n2\n3"
+
+    # a new cache instance loads the index from disk
+    cache_2 = PuzzleCache(tmp_path, "test_session_id")
+    assert cache_2.get(2023, 1, "input") == "1\n2\n3"
+    assert cache_2.get_entry(2023, 1, "input")["sha256"] == digest
+
+
+def test_puzzle_cache_separates_users(tmp_path):
+    PuzzleCache(tmp_path, "user_one").put(2023, 1, "input", "one")
+    PuzzleCache(tmp_path, "user_two").put(2023, 1, "input", "two")
+
+    assert PuzzleCache(tmp_path, "user_one").get(2023, 1, "input") == "one"
+    assert PuzzleCache(tmp_path, "user_two").get(2023, 1, "input") == "two"
+    assert hash_session("") == "anonymous"
+    assert "user_one" not in hash_session("user_one")
+
+
+def write_entries(cache_dir: Path, worker: int) -> None:
+    cache = PuzzleCache(cache_dir, "test_session_id")
+    for day in range(1, 26):
+        cache.set_entry(2000 + worker, day, "input", {"sha256": str(day)})
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs fork and flock")
+def test_puzzle_cache_concurrent_processes(tmp_path):
+    # every process re-reads and rewrites the index, and none loses the
+    # entries of the others
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=write_entries, args=(tmp_path, worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert len(PuzzleCache(tmp_path, "test_session_id").index) == 4 * 25
+
+
+def test_get_puzzle_input_cached(monkeypatch):
+    calls = []
+
+    def mock_get(self, url, timeout, headers=None):
+        calls.append(url)
+        return MockResponse("Test Puzzle Input\n")
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    aoc_mod = AocMod(session_id="test_session_id")
+
+    assert aoc_mod.get_puzzle_input(2023, 1) == "Test Puzzle Input"
+
+    # a repeat pull is served from the cache, even inside the timeout window
+    assert aoc_mod.get_puzzle_input(2023, 1) == "Test Puzzle Input"
+    assert AocMod(session_id="test_session_id").get_puzzle_input(2023, 1)
+    assert len(calls) == 1
+
+
+def test_get_puzzle_instructions_refetched_after_solve(monkeypatch):
+    part_one = "<article><h2>--- Day 1 ---</h2><p>Part one</p></article>"
+    part_two = "<article><h2>--- Part Two ---</h2><p>Part two</p></article>"
+    pages = [f"<main>{part_one}</main>", f"<main>{part_one}{part_two}</main>"]
+
+    def mock_get(self, url, timeout, headers=None):
+        return MockResponse(pages.pop(0))
+
+    def mock_post(self, url, data, timeout):
+        return MockResponse("<article><p>That's the right answer!</p></article>")
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
+    aoc_mod = AocMod(session_id="test_session_id")
+
+    instructions = aoc_mod.get_puzzle_instructions(2023, 1)
+    assert "Part one" in instructions
+    assert aoc_mod.get_puzzle_instructions(2023, 1) == instructions
+
+    aoc_mod.submit_answer(2023, 1, 1, 12345)
+
+    # allow the second pull inside the timeout window
+    aoc_mod._state.set("last_instruction_pull", 0)
+
+    instructions = aoc_mod.get_puzzle_instructions(2023, 1)
+    assert "Part one" in instructions and "Part two" in instructions
+    assert not pages
+
+
+def test_get_puzzle_instructions_revalidated(monkeypatch):
+    part_one = "<article><h2>--- Day 1 ---</h2><p>Part one</p></article>"
+    responses = [
+        MockResponse(f"<main>{part_one}</main>", headers={"ETag": '"v1"'}),
+        MockResponse("", status_code=304),
+        MockResponse(f"<div>sponsor</div><main>{part_one}</main>"),
+    ]
+    sent_headers = []
+    conversions = []
+
+    def mock_get(self, url, timeout, headers=None):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    def mock_post(self, url, data, timeout):
+        return MockResponse("<article><p>That's the right answer!</p></article>")
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
+    extract_children = utilities.extract_children
+    monkeypatch.setattr(
+        utilities,
+        "extract_children",
+        lambda *args: conversions.append(args) or extract_children(*args),
+    )
+    aoc_mod = AocMod(session_id="test_session_id")
+    monkeypatch.setattr(aoc_mod, "_time_to_wait_after_pull", 0)
+
+    instructions = aoc_mod.get_puzzle_instructions(2023, 1)
+    assert "Part one" in instructions and sent_headers == [{}]
+
+    # an unmodified page is not downloaded or converted again
+    aoc_mod.submit_answer(2023, 1, 1, 12345)
+    assert aoc_mod.has_new_instructions(2023, 1)
+    assert aoc_mod.get_puzzle_instructions(2023, 1) == instructions
+    assert sent_headers[1] == {"If-None-Match": '"v1"'}
+    assert not aoc_mod.has_new_instructions(2023, 1)
+
+    # neither is a page that only changed outside of <main>
+    aoc_mod.submit_answer(2023, 1, 2, 67890)
+    assert aoc_mod.get_puzzle_instructions(2023, 1) == instructions
+    assert [args[1] for args in conversions].count("main") == 1
+    assert not responses
+
+
+def test_setup_appends_new_articles(monkeypatch, capsys):
+    part_one = "<article><h2>--- Day 1 ---</h2><p>Part one</p></article>"
+    part_two = "<article><h2>--- Part Two ---</h2><p>Part two</p></article>"
+    answer = "<p>Your puzzle answer was <code>1</code>.</p>"
+    pages = [
+        f"<main>{part_one}<p>To begin, get your puzzle input.</p></main>",
+        f"<main>{part_one}{answer}{part_two}</main>",
+    ]
+
+    def mock_get(self, url, timeout, headers=None):
+        if url.endswith("/input"):
+            return MockResponse("1\n")
+        return MockResponse(pages.pop(0))
+
+    def mock_post(self, url, data, timeout):
+        return MockResponse("<article><p>That's the right answer!</p></article>")
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
+    aoc_mod = AocMod(session_id="test_session_id")
+    monkeypatch.setattr(aoc_mod, "_time_to_wait_after_pull", 0)
+    instructions_path = Path("challenges/2023/day1/instructions_day1.md")
+
+    setup_challenge_day_template(aoc_mod, 2023, 1)
+    with instructions_path.open("a", encoding="utf-8") as f_out:
+        f_out.write("\nmy notes\n")
+
+    # nothing new has been unlocked, so the file is left alone
+    setup_challenge_day_template(aoc_mod, 2023, 1)
+    assert "instruction file already exists" in capsys.readouterr().out
+
+    aoc_mod.submit_answer(2023, 1, 1, 1)
+    setup_challenge_day_template(aoc_mod, 2023, 1)
+    assert "instructions file updated" in capsys.readouterr().out
+    assert instructions_path.read_text(encoding="utf-8") == (
+        "--- Day 1 ---\n-------------\n\nPart one\n\nTo begin, get your puzzle input."
+        "\nmy notes\n\n--- Part Two ---\n----------------\n\nPart two"
+    )
+    assert not pages
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_parse_cache_round_trip(tmp_path, use_mmap):
+    cache = ParseCache(tmp_path)
+    grid = memoryview(bytearray(b"#..#.#")).cast("B", shape=(2, 3))
+    value = {"ints": array("q", [1, -2, 3]), "grid": grid, "edges": [(1, 2)]}
+    assert cache.get("day1", "key", use_mmap=use_mmap) == (False, None)
+
+    assert cache.put("day1", "key", value)
+    found, loaded = cache.get("day1", "key", use_mmap=use_mmap)
+    assert found
+    assert loaded["ints"] == array("q", [1, -2, 3])
+    assert loaded["grid"].shape == (2, 3) and loaded["grid"].tolist() == grid.tolist()
+    assert loaded["edges"] == [(1, 2)]
+
+    # loaded buffers can be changed without touching the cached entry
+    loaded["grid"][0, 0] = ord(".")
+    assert cache.get("day1", "key", use_mmap=use_mmap)[1]["grid"][0, 0] == ord("#")
+
+    # a new key replaces the entry, and values that can't be pickled aren't
+    # stored
+    assert cache.put("day1", "new_key", None) and cache.get("day1", "new_key")[0]
+    assert not cache.get("day1", "key")[0]
+    assert not cache.put("day1", "lambda", lambda: 1)
+    assert not cache.get("day1", "lambda")[0]
+
+
+def test_dump_parsed_numpy():
+    np = pytest.importorskip("numpy")
+    value = [np.arange(10, dtype=np.int64), np.zeros((3, 4), dtype=np.uint8)]
+
+    data = memoryview(bytearray(b"".join(dump_parsed(value))))
+    loaded = load_parsed(data)
+    assert np.array_equal(loaded[0], value[0]) and loaded[1].shape == (3, 4)
+
+    # the arrays are views of the data at aligned offsets, not copies
+    start = np.frombuffer(data, dtype=np.uint8).ctypes.data
+    for array_value in loaded:
+        offset = array_value.ctypes.data - start
+        assert 0 < offset < len(data) and offset % PARSED_ALIGNMENT == 0
+    with pytest.raises(ValueError):
+        load_parsed(memoryview(b"NOTPARSE" + bytes(16)))
@@ -0,0 +1,77 @@
+import pytest
+
+from aoc_mod.cycles import fast_forward, find_cycle
+from aoc_mod.grid import Grid
+from aoc_mod.utilities import AocModError
+
+METHODS = [
+    pytest.param("table", 1, id="table"),
+    pytest.param("table", 4, id="table-sample"),
+    pytest.param("brent", 1, id="brent"),
+]
+
+
+def make_sequence(start: int, length: int):
+    """get a step function going through `start` states before a cycle of
+    `length` states, and a function giving the state after n steps"""
+
+    def step(state: int) -> int:
+        return state + 1 if state + 1 < start + length else start
+
+    def state_at(steps: int) -> int:
+        return steps if steps < start + length else start + (steps - start) % length
+
+    return step, state_at
+
+
+@pytest.mark.parametrize("method,sample", METHODS)
+def test_fast_forward(method, sample):
+    for start, length in ((0, 1), (0, 7), (5, 1), (13, 29), (40, 3)):
+        step, state_at = make_sequence(start, length)
+        for steps in (0, 1, start, start + length, 100, 10**18):
+            result = fast_forward(0, step, steps, method=method, sample=sample)
+            assert result.state == state_at(steps) and result.steps == steps
+            if result.length is not None:
+                assert (result.start, result.length) == (start, length)
+            assert (
+                result.simulated <= steps
+                and result.simulated < 4 * (start + length) + sample
+            )
+
+        cycle = find_cycle(0, step, method=method, sample=sample)
+        assert (cycle.start, cycle.length) == (start, length)
+        assert cycle.state == state_at(cycle.steps)
+
+
+def test_fast_forward_grid():
+    # a robot walking right on a ring of 5 cells, as a Grid state
+    def step(grid: Grid) -> Grid:
+        grid = grid.copy()
+        col = grid.find("@")[1]
+        grid[0, col] = "."
+        grid[0, (col + 1) % grid.cols] = "@"
+        return grid
+
+    result = fast_forward(Grid(["@...."]), step, 10**9 + 2)
+    assert str(result.state) == "..@.." and result.length == 5 and result.start == 0
+
+    with pytest.raises(AocModError, match="no cycle found within 3 steps"):
+        find_cycle(Grid(["@...."]), step, max_steps=3)
+    with pytest.raises(AocModError):
+        fast_forward(0, step, 10, method="floyd")
+    assert fast_forward(0, lambda state: state + 1, 10).length is None
+
+
+@pytest.mark.parametrize("method,sample", METHODS)
+def test_fast_forward_colliding_hashes(method, sample):
+    # hash(-1) == hash(-2), so the states must be compared by more than a hash
+    def step(state: tuple[int, int]) -> tuple[int, int]:
+        return (state[0] - 1, state[1])
+
+    result = fast_forward((-1, 0), step, 5, method=method, sample=sample)
+    assert result.state == (-6, 0) and result.length is None
+    with pytest.raises(AocModError):
+        find_cycle(-1, lambda state: state - 1, method=method, max_steps=10)
+    # keys that can't be packed are compared as they are
+    result = fast_forward(-1, lambda state: state - 1, 5, key=complex)
+    assert result.state == -6 and result.length is None
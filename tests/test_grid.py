@@ -0,0 +1,120 @@
+import pytest
+
+from aoc_mod.grid import BORDER, Grid
+from aoc_mod.search import grid_bfs
+from aoc_mod.utilities import AocModError, parse_input
+
+ROWS = ["#.S", "..#", "E.."]
+
+
+def rotate_rows(rows: list[str]) -> list[str]:
+    """rotate rows of text clockwise"""
+    return ["".join(row[col] for row in reversed(rows)) for col in range(len(rows[0]))]
+
+
+def test_grid_from_input(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("\n".join(ROWS) + "\n")
+
+    grid = Grid.from_input(input_path)
+    assert grid == Grid(parse_input(input_path)) == Grid("\n".join(ROWS))
+    assert grid.shape == (3, 3) and len(grid) == 3
+    assert list(grid) == ROWS and str(grid) == "\n".join(ROWS)
+
+    input_path.write_text("#.\n.\n")
+    with pytest.raises(AocModError, match="not a valid grid"):
+        Grid.from_input(input_path)
+    with pytest.raises(AocModError):
+        Grid([])
+
+
+def test_grid_cells():
+    grid = Grid(ROWS)
+    assert grid[0, 2] == "S" and grid.get((0, 3)) is None and grid.get((2, 0)) == "E"
+    assert (2, 2) in grid and (3, 0) not in grid and (0, -1) not in grid
+    with pytest.raises(IndexError):
+        grid[3, 0]
+
+    start = grid.index(0, 2)
+    assert grid.cell(start) == (0, 2) and grid[start] == "S"
+    assert [grid.cell(index) for index in grid.neighbors(start)] == [(1, 2), (0, 1)]
+    assert [grid.cell(index) for index in grid.neighbors(start, diagonal=True)] == [
+        (1, 2),
+        (1, 1),
+        (0, 1),
+    ]
+    # the border keeps offsets from wrapping around to the next row
+    assert grid.data[start + grid.offsets4[1]] == BORDER
+    assert [grid.cell(index) for index in grid.cells()][:4] == [
+        (0, 0),
+        (0, 1),
+        (0, 2),
+        (1, 0),
+    ]
+
+    grid[1, 0] = "#"
+    grid[grid.index(2, 1)] = ord("#")
+    assert list(grid) == ["#.S", "#.#", "E#."]
+    with pytest.raises(AocModError):
+        grid[0, 0] = "\0"
+
+
+def test_grid_find_count_replace():
+    grid = Grid(ROWS)
+    assert grid.find("S") == (0, 2) and grid.find("ES") == (0, 2)
+    assert grid.find("x") is None
+    assert grid.find_all("#.") == [
+        (0, 0),
+        (0, 1),
+        (1, 0),
+        (1, 1),
+        (1, 2),
+        (2, 1),
+        (2, 2),
+    ]
+    assert grid.count("#") == 2 and grid.count(".#") == 7
+
+    grid.replace("#.", ".#")
+    assert list(grid) == [".#S", "##.", "E##"]
+
+
+def test_grid_views():
+    grid = Grid(ROWS)
+    rotated = grid.rotate()
+    assert list(rotated) == rotate_rows(ROWS)
+    assert list(grid.rotate(2)) == rotate_rows(rotate_rows(ROWS))
+    assert list(grid.rotate(-1)) == rotate_rows(rotate_rows(rotate_rows(ROWS)))
+    assert list(grid.transpose()) == ["#.E", "...", "S#."]
+    assert list(grid.flip_vertical()) == ROWS[::-1]
+    assert list(grid.flip_horizontal()) == [row[::-1] for row in ROWS]
+
+    # views share the bytes of the grid and find cells in their own order
+    rotated[0, 0] = "x"
+    assert grid[2, 0] == "x"
+    assert rotated.find(".") == (0, 1) and rotated.find_all("S") == [(2, 2)]
+    for index in rotated.cells():
+        assert rotated[rotated.cell(index)] == grid[grid.cell(index)]
+        assert set(rotated.neighbors(index)) == set(grid.neighbors(index))
+
+    copy = rotated.copy()
+    assert copy == rotated and copy.tobytes() == rotated.tobytes()
+    copy[0, 0] = "y"
+    assert rotated[0, 0] == "x"
+
+
+def test_grid_search():
+    grid = Grid(ROWS)
+    assert grid_bfs(grid, grid.find("S"), grid.find("E")).distance == 4
+
+
+def test_grid_numpy():
+    np = pytest.importorskip("numpy")
+    grid = Grid(["ab", "cd", "ef"])
+
+    array = grid.rotate().to_numpy()
+    assert array.shape == (2, 3)
+    assert array.tobytes() == grid.rotate().tobytes()
+    array[0, 0] = ord("z")
+    assert grid[2, 0] == "z"
+
+    assert Grid.from_numpy(np.flipud(grid.to_numpy())) == grid.flip_vertical()
@@ -0,0 +1,182 @@
+import random
+
+import markdownify
+import pytest
+from bs4 import BeautifulSoup
+
+from aoc_mod.html_markdown import (
+    MarkdownConverter,
+    UnsupportedHtml,
+    extract_children,
+    html_to_markdown,
+    parse_html,
+    to_markdown,
+)
+
+PAGE = """<!DOCTYPE html>
+<html lang="en-us">
+<head>
+<meta charset="utf-8"/>
+<title>Day 1 - Advent of Code 2023</title>
+<link rel="stylesheet" type="text/css" href="/static/style.css?31"/>
+<script>window.addEventListener('click', function(e){ if (a < b && c) {} });</script>
+</head><!--
+
+
+
+
+Oh, hello!  Funny seeing you here.
+-->
+<body>
+<header><div><h1 class="title-global"><a href="/">Advent of Code</a></h1><nav><ul><li><a href="/2023/about">[About]</a></li></ul></nav></div></header>
+<div id="sidebar"><div id="sponsor"><div class="quiet">Our <a href="/2023/sponsors">sponsors</a> help make Advent of Code possible:</div></div></div><!--/sidebar-->
+
+<main>
+<script>window.addEventListener('copy', function(e) { });</script>
+<article class="day-desc"><h2>--- Day 1: Trebuchet?! ---</h2><p>Something is wrong with global snow production, and you've been selected to take a look. The Elves have even given you a map; on it, they've used <em class="star">stars</em> to mark the top fifty locations that are likely to be having problems.</p>
+<p>You try to ask why they can't just use a <a href="/2015/day/1">weather machine</a> ("not powerful enough") <span title="My hope is that this abomination of a run-on sentence somehow conveys the chaos.">and</span> hang on, a <a href="https://en.wikipedia.org/wiki/Trebuchet" target="_blank">trebuchet</a>.</p>
+<p>For example:</p>
+<pre><code>1abc2
+pqr3stu8vwx
+a1b2c3d4e5f
+treb7uchet
+</code></pre>
+<p>In this example, the values are <code>12</code>, <code>38</code>, <code>15</code>, and <code>77</code>. Adding these together produces <code><em>142</em></code>.</p>
+<ul>
+<li><code>(</code> means he should go <em>up</em> one floor, and <code>)</code> means he should go <em>down</em> one floor.</li>
+<li>The apartment building is very tall &amp; the basement is very deep; he will never find the top or bottom floors.</li>
+</ul>
+<p>Consider your entire calibration document. <em>What is the sum of all of the calibration_values?</em></p>
+</article>
+<p>Your puzzle answer was <code>54304</code>.</p><article class="day-desc"><h2 id="part2">--- Part Two ---</h2><p>Your calculation isn't quite right. It looks like some of the digits are actually <em>spelled out with letters</em>: <code>one</code>, <code>two</code>, and <code>nine</code> <em>also</em> count as valid "digits".</p>
+<ol start="3"><li>first<br>line</li><li>second <b> bold </b></li></ol>
+</article>
+<p>Your puzzle answer was <code>54418</code>.</p><p class="day-success">Both parts of this puzzle are complete! They provide two gold stars: **</p>
+<p>At this point, you should <a href="/2023">return to your Advent calendar</a> and try another puzzle.</p>
+<p>If you still want to see it, you can <a href="1/input" target="_blank">get your puzzle input</a>.</p>
+<form method="post" action="1/answer"><input type="hidden" name="level" value="2"/><p>Answer: <input type="text" name="answer" autocomplete="off"/> <input type="submit" value="[Submit]"/></p></form>
+</main>
+
+<!-- ga -->
+<script>
+(function(i,s,o,g,r,a,m){i['GoogleAnalyticsObject']=r;})(window,document,'script');
+</script>
+</body>
+</html>"""
+
+INLINE_TAGS = ["em", "code", "a", "span", "b", "strong", "i", "s", "sup", "kbd", "q"]
+BLOCK_TAGS = ["p", "ul", "ol", "li", "pre", "h2", "h3", "div", "blockquote", "script"]
+TEXTS = ["hello", "  spaced  ", "a_b*c", "\n  \n", " x ", "`tick`", "1 < 2 & 3", ""]
+
+
+def bs4_children_to_markdown(html: str, container: str) -> list[str]:
+    """convert the children of an element the way AocMod did with bs4"""
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        markdownify.markdownify(str(entry).strip())
+        for entry in soup.find(container).contents
+        if str(entry).strip()
+    ]
+
+
+def lean_children_to_markdown(html: str, container: str) -> list[str]:
+    markdown = []
+    for source_html, document in extract_children(html, container):
+        if not source_html.strip():
+            continue
+        if isinstance(document.children[0], type(document)):
+            markdown.append(to_markdown(document, source_html))
+        else:
+            markdown.append(html_to_markdown(source_html.strip()))
+    return markdown
+
+
+def random_fragment(rng: random.Random, depth: int = 0, unclosed: float = 0.0) -> str:
+    """build random html, leaving out an end tag with probability `unclosed`"""
+    parts = []
+    for _ in range(rng.randint(0, 4)):
+        if rng.random() < 0.4 or depth > 4:
+            parts.append(rng.choice(TEXTS))
+            continue
+
+        tag = rng.choice(INLINE_TAGS + BLOCK_TAGS + ["br", "hr", "img"])
+        attrs = ""
+        if tag == "a":
+            attrs = rng.choice(['href="x.y"', 'href="/1" title="t"', 'href=""', ""])
+        elif tag == "img":
+            attrs = 'src="s.png" alt="alt"'
+        elif tag == "ol":
+            attrs = rng.choice(["", 'start="3"'])
+        if tag in ("br", "hr", "img"):
+            parts.append(f"<{tag} {attrs}>")
+        else:
+            inner = random_fragment(rng, depth + 1, unclosed)
+            end_tag = "" if rng.random() < unclosed else f"</{tag}>"
+            parts.append(f"<{tag} {attrs}>{inner}{end_tag}")
+        if rng.random() < 0.1:
+            parts.append("<!-- comment -->")
+    return "".join(parts)
+
+
+def test_puzzle_page_matches_markdownify():
+    markdown = lean_children_to_markdown(PAGE, "main")
+    assert markdown == bs4_children_to_markdown(PAGE, "main")
+    assert markdown[1].startswith("--- Day 1: Trebuchet?! ---\n----")
+    assert "calibration\\_values" in markdown[1]
+
+
+def test_extract_children_source_html():
+    children = extract_children(PAGE, "main")
+    articles = [source for source, _ in children if source.startswith("<article")]
+    assert len(articles) == 2
+    assert all(article.endswith("</article>") for article in articles)
+    assert articles[1] in PAGE
+
+
+def test_submission_response_matches_markdownify():
+    response = (
+        "<html><body><main><article><p>That's not the right answer; your answer "
+        "is too low. [<a href='/2023/day/1'>Return to Day 1</a>]</p></article>"
+        "</main></body></html>"
+    )
+    assert (
+        lean_children_to_markdown(response, "article")[0]
+        == (bs4_children_to_markdown(response, "article")[0])
+    )
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<p>unclosed <em>tags <code>everywhere</p><p>next",
+        "<div>stray</span> end tags</em></div>",
+        "<p>void <br></br> tags <img src=a.png/> <span/>x</p>",
+        "<pre>\n\n  keep   this\n\n</pre> <pre> </pre>",
+        "<ul><li>one<ul><li>two<ul><li>three</li></ul></li></ul></li></ul>after",
+        "<h1>a  \n b</h1><h4>c\n d</h4><blockquote><p>quoted</p>text</blockquote>",
+        "<a href='http://a_b.c'>http://a_b.c</a> <a>no href</a> &lt;&amp;&gt; &#x41;",
+    ],
+)
+def test_edge_cases_match_markdownify(html):
+    assert html_to_markdown(html) == markdownify.markdownify(html)
+
+
+def test_random_fragments_match_markdownify():
+    rng = random.Random(2023)
+    for _ in range(500):
+        html = random_fragment(rng)
+        assert html_to_markdown(html) == markdownify.markdownify(html), html
+
+    # the children of <main> in a page, with some end tags left out
+    for _ in range(500):
+        html = f"<html><body><main>{random_fragment(rng, unclosed=0.2)}</main></body></html>"
+        assert lean_children_to_markdown(html, "main") == (
+            bs4_children_to_markdown(html, "main")
+        ), html
+
+
+def test_unsupported_html_falls_back_to_markdownify():
+    html = "<table><tr><th>a</th></tr><tr><td>1</td></tr></table>"
+    with pytest.raises(UnsupportedHtml):
+        MarkdownConverter().convert(parse_html(html))
+    assert html_to_markdown(html) == markdownify.markdownify(html)
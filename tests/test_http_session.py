@@ -0,0 +1,84 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from aoc_mod.http_session import JitteredRetry
+from aoc_mod.utilities import AocMod
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """keep-alive handler that fails the first `failures` requests with a 503"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get("Cookie")))
+        if server.failures > 0:
+            server.failures -= 1
+            status, body = 503, b"unavailable"
+        else:
+            status, body = 200, f"input for {self.path}\n".encode()
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    server.connections = 0
+    server.failures = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_jittered_retry_backoff():
+    retry = JitteredRetry(total=5, backoff_factor=1)
+    for _ in range(3):
+        retry = retry.increment(method="GET", url="/")
+
+    # urllib3 backs off 1 * 2 ** 2 seconds after three consecutive errors
+    assert 2.0 <= retry.get_backoff_time() < 6.0
+
+
+def test_session_reuses_connections(stub_server):
+    aoc_mod = AocMod(
+        session_id="test_session_id",
+        base_url=f"http://127.0.0.1:{stub_server.server_port}",
+    )
+    aoc_mod._time_to_wait_after_pull = 0
+
+    for day in range(1, 6):
+        assert aoc_mod.get_puzzle_input(2023, day) == f"input for /2023/day/{day}/input"
+
+    assert stub_server.connections == 1
+    assert stub_server.requests[0][1] == "session=test_session_id"
+
+
+def test_session_retries_server_errors(stub_server):
+    stub_server.failures = 2
+    aoc_mod = AocMod(
+        session_id="test_session_id",
+        base_url=f"http://127.0.0.1:{stub_server.server_port}",
+    )
+
+    assert aoc_mod.get_puzzle_input(2023, 1) == "input for /2023/day/1/input"
+    assert len(stub_server.requests) == 3
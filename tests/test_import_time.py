@@ -0,0 +1,44 @@
+import sys
+import subprocess
+
+# budget (in microseconds) for a cold import of aoc_mod.utilities; it took
+# ~140 ms when requests, bs4 and markdownify were imported at module level
+IMPORT_TIME_BUDGET_US = 75_000
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """run the python interpreter in a fresh process"""
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def get_import_time_us(statement: str, module: str) -> int:
+    """run a statement with -X importtime and return the cumulative import
+    time of a module in microseconds"""
+    result = run_python("-X", "importtime", "-c", statement)
+    for line in result.stderr.splitlines():
+        _, cumulative_us, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative_us)
+    raise AssertionError(f"{module} was not imported")
+
+
+def test_utilities_import_skips_network_libraries():
+    result = run_python(
+        "-c",
+        "import sys; from aoc_mod.utilities import parse_input; "
+        "print(sorted({'requests', 'bs4', 'markdownify', 'urllib3'} & set(sys.modules)))",
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_utilities_import_time():
+    # take the best of a few runs to keep scheduling noise out of the result
+    import_time_us = min(
+        get_import_time_us(
+            "from aoc_mod.utilities import parse_input", "aoc_mod.utilities"
+        )
+        for _ in range(3)
+    )
+    assert import_time_us < IMPORT_TIME_BUDGET_US
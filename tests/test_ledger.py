@@ -0,0 +1,136 @@
+import time
+
+import pytest
+import requests
+
+from aoc_mod.ledger import (
+    VERDICT_CORRECT,
+    VERDICT_RATE_LIMITED,
+    VERDICT_TOO_HIGH,
+    VERDICT_TOO_LOW,
+    VERDICT_UNKNOWN,
+    VERDICT_WRONG,
+    VERDICT_WRONG_LEVEL,
+    SubmissionLedger,
+    parse_verdict,
+)
+from aoc_mod.state import StateStore
+from aoc_mod.utilities import AocMod, AocModError
+
+CORRECT = (
+    '<article><p>That\'s the right answer!  You are <span class="day-success">one '
+    "gold star</span> closer to saving Christmas.</p></article>"
+)
+TOO_HIGH = (
+    "<article><p>That's not the right answer; your answer is too high.  If you're "
+    "stuck, make sure you're using the full input data. Please wait one minute "
+    'before trying again. [<a href="/2023/day/1">Return to Day 1</a>]</p></article>'
+)
+TOO_LOW = (
+    "<article><p>That's not the right answer; your answer is too low.  Please wait "
+    "5 minutes before trying again.</p></article>"
+)
+WRONG = (
+    "<article><p>That's not the right answer.  If you're stuck, make sure you're "
+    "using the full input data.</p></article>"
+)
+TOO_RECENT = (
+    "<article><p>You gave an answer too recently; you have to wait after submitting "
+    "an answer before trying again.  You have 1m 5s left to wait.</p></article>"
+)
+WRONG_LEVEL = (
+    "<article><p>You don't seem to be solving the right level.  Did you already "
+    "complete it?</p></article>"
+)
+
+
+def test_parse_verdict():
+    assert parse_verdict(CORRECT) == (VERDICT_CORRECT, 0)
+    assert parse_verdict(TOO_HIGH) == (VERDICT_TOO_HIGH, 60)
+    assert parse_verdict(TOO_LOW) == (VERDICT_TOO_LOW, 300)
+    assert parse_verdict(WRONG) == (VERDICT_WRONG, 0)
+    assert parse_verdict(TOO_RECENT) == (VERDICT_RATE_LIMITED, 65)
+    assert parse_verdict(WRONG_LEVEL) == (VERDICT_WRONG_LEVEL, 0)
+    assert parse_verdict("<html></html>") == (VERDICT_UNKNOWN, 0)
+
+
+def test_ledger_bounds_and_known_answers(tmp_path):
+    ledger = SubmissionLedger(StateStore(tmp_path.joinpath("state.sqlite3")), "abc")
+    assert ledger.check(2023, 1, 1, 100) is None
+
+    assert ledger.record(2023, 1, 1, 100, WRONG) == VERDICT_WRONG
+    assert ledger.record(2023, 1, 1, 500, TOO_HIGH.replace("one minute", "0 minutes"))
+    assert ledger.record(2023, 1, 1, 900, TOO_HIGH.replace("one minute", "0 minutes"))
+    assert ledger.record(2023, 1, 1, 200, TOO_LOW.replace("5 minutes", "0 minutes"))
+
+    entry = ledger.get(2023, 1, 1)
+    assert (entry["low"], entry["high"]) == (200, 500)
+    assert [sub["answer"] for sub in entry["submissions"]] == [
+        "100",
+        "500",
+        "900",
+        "200",
+    ]
+
+    assert ledger.check(2023, 1, 1, 100).startswith(VERDICT_WRONG)
+    assert ledger.check(2023, 1, 1, "500").startswith(VERDICT_TOO_HIGH)
+    assert ledger.check(2023, 1, 1, 700).startswith(VERDICT_TOO_HIGH)
+    assert ledger.check(2023, 1, 1, 150).startswith(VERDICT_TOO_LOW)
+    assert ledger.check(2023, 1, 1, 300) is None
+
+    # other levels and other users have their own entries
+    assert ledger.check(2023, 1, 2, 700) is None
+    assert SubmissionLedger(ledger._state, "xyz").check(2023, 1, 1, 700) is None
+
+    ledger.record(2023, 1, 1, 300, CORRECT)
+    assert ledger.check(2023, 1, 1, 300) == VERDICT_CORRECT
+    assert ledger.check(2023, 1, 1, 301) == "wrong, the correct answer is 300"
+
+
+def test_ledger_waits_after_submission(tmp_path):
+    ledger = SubmissionLedger(StateStore(tmp_path.joinpath("state.sqlite3")))
+
+    ledger.record(2023, 1, 1, 100, TOO_RECENT)
+    assert ledger.check(2023, 1, 1, 42).startswith(VERDICT_RATE_LIMITED)
+
+    entry = ledger.get(2023, 1, 1)
+    assert time.time() + 60 < entry["wait"] <= time.time() + 65
+
+
+def test_submit_answer_uses_ledger(monkeypatch):
+    responses = [TOO_HIGH.replace("one minute", "0 minutes"), CORRECT]
+    posts = []
+
+    class MockResponse:
+        def __init__(self, text):
+            self.text = text
+            self.content = text
+
+        def raise_for_status(self):
+            pass
+
+    def mock_post(self, url, data, timeout):
+        posts.append(data["answer"])
+        return MockResponse(responses.pop(0))
+
+    monkeypatch.setattr(requests.Session, "post", mock_post)
+    aoc_mod = AocMod(session_id="test_session_id")
+
+    aoc_mod.submit_answer(2023, 1, 1, 500)
+
+    # known wrong answers are rejected locally, without claiming the
+    # submission window or posting anything
+    for answer in (500, 600):
+        with pytest.raises(AocModError, match="too high"):
+            aoc_mod.submit_answer(2023, 1, 1, answer)
+    assert posts == [500]
+
+    aoc_mod._state.set("last_submission_push", 0)
+    assert "That's the right answer" in aoc_mod.submit_answer(2023, 1, 1, 400)
+    assert aoc_mod._get_solved_level(2023, 1) == 1
+
+    # the correct answer is returned from the ledger
+    assert aoc_mod.submit_answer(2023, 1, 1, 400) == CORRECT
+    with pytest.raises(AocModError, match="correct answer is 400"):
+        aoc_mod.submit_answer(2023, 1, 1, 401)
+    assert posts == [500, 400]
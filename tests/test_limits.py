@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import signal
+from pathlib import Path
+
+import pytest
+
+from aoc_mod.limits import ResourceLimits, run_limited
+from aoc_mod.runner import format_results, format_summary, has_failed, run_solution
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="needs fork and /proc"
+)
+
+SOLUTION = """import time
+
+def part_one(lines):
+    time.sleep(10)
+
+
+def part_two(lines):
+    return len(lines)
+"""
+
+
+def get_address_space() -> int:
+    """size of the address space of this process in bytes"""
+    pages = int(Path("/proc/self/statm").read_text().split()[0])
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def busy_loop():
+    while True:
+        pass
+
+
+def test_run_limited():
+    value, error, peak_rss = run_limited(lambda: 42, ResourceLimits(wall_time=5))
+    assert (value, error) == (42, None) and peak_rss > 0
+    assert run_limited(lambda: 1 / 0, ResourceLimits(wall_time=5))[1] == (
+        "ZeroDivisionError: division by zero"
+    )
+    assert run_limited(lambda: os._exit(3), ResourceLimits(wall_time=5))[1] == (
+        "exited with code 3"
+    )
+    kill = lambda: os.kill(os.getpid(), signal.SIGTERM)  # noqa: E731
+    assert run_limited(kill, ResourceLimits(wall_time=5))[1] == "crashed (SIGTERM)"
+
+
+def test_run_limited_timeouts():
+    start = time.perf_counter()
+    value, error, peak_rss = run_limited(
+        lambda: time.sleep(10), ResourceLimits(wall_time=0.2)
+    )
+    assert (value, error) == (None, "timed out") and peak_rss > 0
+    assert run_limited(busy_loop, ResourceLimits(cpu_time=1))[:2] == (
+        None,
+        "timed out",
+    )
+    assert time.perf_counter() - start < 5
+
+    # the peak memory of a part killed at the wall time limit is still known
+    def allocate_and_wait():
+        data = bytearray(64 * 1024**2)
+        time.sleep(10)
+        return len(data)
+
+    error, peak_rss = run_limited(allocate_and_wait, ResourceLimits(wall_time=1))[1:]
+    assert error == "timed out" and peak_rss >= 64 * 1024**2
+
+
+def test_run_limited_memory():
+    limits = ResourceLimits(wall_time=10, memory=get_address_space() + 64 * 1024**2)
+
+    value, error, peak_rss = run_limited(lambda: len(bytearray(16 * 1024**2)), limits)
+    assert value == 16 * 1024**2 and error is None
+    assert peak_rss >= 16 * 1024**2
+
+    assert run_limited(lambda: bytearray(256 * 1024**2), limits)[1] == "out of memory"
+
+
+def test_run_solution_with_limits(tmp_path):
+    day_path = tmp_path.joinpath("challenges/2024/day1")
+    day_path.mkdir(parents=True)
+    day_path.joinpath("day1.py").write_text(SOLUTION)
+    day_path.joinpath("input_day1.txt").write_text("3\n4\n")
+
+    results = run_solution(2024, 1, repeat=3, limits=ResourceLimits(wall_time=0.5))
+
+    assert results["parts"][1]["error"] == "timed out"
+    assert results["parts"][1]["peak_rss"] > 0
+    assert results["parts"][2]["result"] == 2
+    assert results["parts"][2]["peak_rss"] > 0
+    assert len(results["parts"][2]["samples"]) == 3
+    assert has_failed(results)
+
+    assert "part 1    error: timed out" in format_results(results)
+    assert "timed out" in format_summary([results], 1.0)
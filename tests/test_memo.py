@@ -0,0 +1,136 @@
+import sys
+
+import pytest
+
+from aoc_mod.memo import MemoStats, memo_stats, memoize, pack_bits, pack_key
+from aoc_mod.runner import format_results, run_solution
+from aoc_mod.utilities import AocModError
+
+SOLUTION = """
+from aoc_mod.memo import memoize
+
+
+@memoize(maxsize=50)
+def ways(n):
+    return 1 if n < 2 else ways(n - 1) + ways(n - 2)
+
+
+def part_one(numbers):
+    return ways(max(map(int, numbers)) * 10)
+"""
+
+
+def test_memoize():
+    calls = []
+
+    @memoize
+    def fib(n):
+        calls.append(n)
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    assert fib(30) == 832040 and len(calls) == 31
+    stats = fib.stats()
+    assert stats.misses == 31 and stats.hits == 28 and stats.entries == 31
+    assert stats.bytes > 0 and stats.evictions == 0
+    assert memo_stats(__name__)["test_memoize.<locals>.fib"] == stats
+    fib.cache_clear()
+    assert fib.stats() == MemoStats(0, 0, 0, 0, 0)
+
+    @memoize(key="pack")
+    def count(position, seen=frozenset()):
+        return len(seen) + position
+
+    assert count(1, seen=frozenset({(1, 2), (3, 4)})) == 3
+    assert count(1, seen=frozenset({(3, 4), (1, 2)})) == 3
+    assert count.stats().hits == 1
+    with pytest.raises(AocModError):
+        memoize(count, key="unknown")
+
+
+def test_memoize_bounds():
+    @memoize(maxsize=10)
+    def square(n):
+        return n * n
+
+    for n in range(25):
+        square(n)
+    square(24)
+    stats = square.stats()
+    assert stats.entries == 10 and stats.evictions == 15 and stats.hits == 1
+
+    @memoize(maxbytes=2000)
+    def block(n):
+        return tuple(range(n, n + 10))
+
+    for n in range(100):
+        assert block(n) == tuple(range(n, n + 10))
+    assert 0 < block.stats().bytes <= 2000 and block.stats().evictions > 80
+
+
+def test_memoize_iterative():
+    # far deeper than the recursion limit
+    depth = sys.getrecursionlimit() * 20
+
+    @memoize(iterative=True)
+    def total(n):
+        return 0 if n == 0 else n + total(n - 1)
+
+    assert total(depth) == depth * (depth + 1) // 2
+    assert total.stats().entries == depth + 1
+    assert total.stats().misses == depth + 1 and total.stats().hits == 0
+
+    @memoize(iterative=True, segment=50)
+    def paths(row, col):
+        if row == 0 or col == 0:
+            return 1
+        return paths(row - 1, col) + paths(row, col - 1)
+
+    assert paths(300, 300) == paths(299, 300) + paths(300, 299)
+
+    # calls aborted by a deferred call and run again are only counted once
+    def make_steps(iterative: bool):
+        @memoize(iterative=iterative, segment=7)
+        def steps(n):
+            if n < 2:
+                return n
+            return steps(n - 1) + steps(n - 2) + steps(n // 2) + steps(n // 3)
+
+        return steps
+
+    recursive, iterative = make_steps(False), make_steps(True)
+    for n in (300, 200, 700):
+        assert iterative(n) == recursive(n)
+    assert iterative.stats()[:2] == recursive.stats()[:2]
+
+
+def test_pack_key():
+    state = (3, -1, frozenset({"a", "b"}), ("x", None, True, 2.5, b"\x00"))
+    assert pack_key(state) == pack_key(
+        (3, -1, frozenset({"b", "a"}), ("x", None, True, 2.5, b"\x00"))
+    )
+    assert pack_key((1, 2)) != pack_key(((1, 2),)) != pack_key((1, 2, 0))
+    assert pack_key(2**100) != pack_key(-(2**100))
+    assert len(pack_key((1, 2, 3, 4))) < sys.getsizeof((1, 2, 3, 4))
+    assert pack_bits([0, 3, 5]) == 0b101001
+    with pytest.raises(AocModError):
+        pack_key(([1],))
+
+
+def test_run_solution_memo_stats(tmp_path):
+    day_path = tmp_path.joinpath("challenges/2024/day1")
+    day_path.mkdir(parents=True)
+    day_path.joinpath("day1.py").write_text(SOLUTION)
+    day_path.joinpath("input_day1.txt").write_text("3\n1\n4\n")
+
+    results = run_solution(2024, 1)
+    memo = results["parts"][1]["memo"]["ways"]
+    assert memo == {
+        "hits": 38,
+        "misses": 41,
+        "evictions": 0,
+        "entries": 41,
+        "bytes": memo["bytes"],
+    }
+    assert "part 1 memo ways: 38 hits, 41 misses (48.1% hit rate)" in format_results(
+        results
+    )
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+import requests
+
+from aoc_mod.cache import get_cache_dir
+from aoc_mod.utilities import AocMod, AocModError
+
+
+def test_construction_does_no_io(tmp_path):
+    (tmp_path / ".aoc_mod_cache.pkl").write_text("")
+
+    AocMod(session_id="test_session_id", cache_dir=tmp_path / "cache")
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [".aoc_mod_cache.pkl"]
+
+
+def test_get_cache_dir(monkeypatch):
+    monkeypatch.setenv("AOC_MOD_CACHE_DIR", "/tmp/aoc_mod_cache_dir")
+    assert get_cache_dir() == Path("/tmp/aoc_mod_cache_dir")
+
+    monkeypatch.delenv("AOC_MOD_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/xdg_cache")
+    assert get_cache_dir() == Path("/tmp/xdg_cache/aoc_mod")
+
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    assert get_cache_dir() == Path.home() / ".cache" / "aoc_mod"
+
+
+def test_offline_mode(monkeypatch, tmp_path):
+    def mock_request(self, url, *args, **kwargs):
+        raise AssertionError("offline mode made a request")
+
+    monkeypatch.setattr(requests.Session, "get", mock_request)
+    monkeypatch.setattr(requests.Session, "post", mock_request)
+    monkeypatch.setenv("AOC_MOD_OFFLINE", "1")
+
+    aoc_mod = AocMod(session_id="test_session_id", cache_dir=tmp_path / "cache")
+    assert aoc_mod.offline
+
+    with pytest.raises(AocModError, match="offline"):
+        aoc_mod.get_puzzle_input(2023, 1)
+    with pytest.raises(AocModError, match="offline"):
+        aoc_mod.get_puzzle_instructions(2023, 1)
+    with pytest.raises(AocModError, match="offline"):
+        aoc_mod.submit_answer(2023, 1, 1, 12345)
+
+    assert not (tmp_path / "cache").exists()
+    assert not AocMod(offline=False).offline
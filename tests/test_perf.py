@@ -0,0 +1,191 @@
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from aoc_mod.perf import (
+    HISTORY_FILE,
+    STATUS_INCONCLUSIVE,
+    STATUS_INPUT_CHANGED,
+    STATUS_MISSING,
+    STATUS_REGRESSED,
+    STATUS_TOO_FEW_SAMPLES,
+    STATUS_UNCHANGED,
+    compare_runs,
+    load_history,
+    mann_whitney_u,
+    min_p_value,
+    min_samples,
+    select_last_runs,
+)
+
+SOLUTION = """import time
+
+def part_one(lines):
+    return len(lines)
+
+
+def part_two(lines):
+    time.sleep({DELAY})
+    return 2
+"""
+
+
+def create_record(day, parts, commit="a1", input_sha256="i1", parse=(1e-3,)):
+    return {
+        "time": 0.0,
+        "commit": commit,
+        "dirty": False,
+        "year": 2024,
+        "day": day,
+        "input_sha256": input_sha256,
+        "parse": list(parse),
+        "parts": parts,
+    }
+
+
+def run_aoc_mod(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["aoc-mod", *args], capture_output=True, text=True, check=False
+    )
+
+
+def git(*args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        capture_output=True,
+        check=True,
+    )
+
+
+def test_mann_whitney_u():
+    # exact: 2 of the 20 orderings are as extreme as complete separation
+    assert mann_whitney_u([1, 2, 3], [4, 5, 6]) == pytest.approx(0.1)
+    assert mann_whitney_u([1, 2, 3], [3, 2, 1]) == 1.0
+    assert mann_whitney_u([1.0] * 30, [1.0] * 30) == 1.0
+    assert mann_whitney_u([], [1.0]) == 1.0
+
+    # 4 samples against 4 are the fewest that can reach p < 0.05
+    assert min_p_value(3, 3) == pytest.approx(0.1) and min_p_value(1, 1) == 1.0
+    assert min_samples(0.05) == 4 and min_p_value(4, 4) < 0.05
+
+    # normal approximation with ties
+    samples_a = [i % 7 for i in range(30)]
+    samples_b = [i % 7 + 3 for i in range(30)]
+    assert mann_whitney_u(samples_a, samples_b) < 1e-4
+    assert mann_whitney_u(samples_a, samples_a) == 1.0
+
+
+def test_compare_runs():
+    fast = [1e-3 + i * 1e-6 for i in range(10)]
+    slow = [3e-3 + i * 1e-6 for i in range(10)]
+    baseline = [
+        create_record(1, {"1": fast, "2": fast}, parse=fast),
+        create_record(2, {"1": fast}),
+        create_record(3, {"1": fast}),
+        create_record(5, {"1": fast}),
+    ]
+    candidate = [
+        create_record(1, {"1": fast, "2": slow}, commit="b2", parse=fast),
+        create_record(2, {"1": [3e-3]}, commit="b2"),
+        create_record(3, {"1": slow}, commit="b2", input_sha256="i2"),
+        create_record(4, {"1": fast}, commit="b2"),
+        create_record(5, {"1": fast[:5] + slow[:5]}, commit="b2"),
+    ]
+
+    rows = compare_runs(baseline, candidate, threshold=0.2)
+    statuses = {(row["day"], row["part"]): row["status"] for row in rows}
+    assert statuses == {
+        (1, "1"): STATUS_UNCHANGED,
+        (1, "2"): STATUS_REGRESSED,
+        (1, "parse"): STATUS_UNCHANGED,
+        # a single sample can't show a significant change
+        (2, "1"): STATUS_TOO_FEW_SAMPLES,
+        (2, "parse"): STATUS_UNCHANGED,
+        (3, "1"): STATUS_INPUT_CHANGED,
+        (3, "parse"): STATUS_INPUT_CHANGED,
+        (4, "1"): STATUS_MISSING,
+        (4, "parse"): STATUS_MISSING,
+        # half the samples are as fast as before
+        (5, "1"): STATUS_INCONCLUSIVE,
+        (5, "parse"): STATUS_UNCHANGED,
+    }
+    assert rows[1]["ratio"] == pytest.approx(3.0, rel=0.01)
+
+
+def test_select_last_runs():
+    records = [
+        create_record(day, {}, commit=str(i)) for i, day in enumerate([1, 2, 1, 1, 1])
+    ]
+
+    baseline, candidate = select_last_runs(records, 2)
+    assert [record["commit"] for record in candidate] == ["4"]
+    assert [record["commit"] for record in baseline] == ["2", "3"]
+
+
+def test_perf_compare_commits(tmp_path):
+    day_path = tmp_path.joinpath("challenges/2024/day1")
+    day_path.mkdir(parents=True)
+    day_path.joinpath("input_day1.txt").write_text("1\n2\n")
+    solution_path = day_path.joinpath("day1.py")
+    git("init", "-q")
+
+    for delay in (0, 0.01):
+        solution_path.write_text(SOLUTION.replace("{DELAY}", str(delay)))
+        git("add", "challenges/2024/day1/day1.py")
+        git("commit", "-q", "-m", f"delay {delay}")
+        result = run_aoc_mod("-y", "2024", "-d", "1", "run", "--repeat", "5")
+        assert result.returncode == 0, result.stderr
+
+    records = load_history()
+    assert len(records) == 2 and records[0]["commit"] != records[1]["commit"]
+    assert not records[1]["dirty"] and len(records[1]["parts"]["2"]) == 5
+
+    result = run_aoc_mod("perf", "compare", "HEAD~1", "HEAD")
+    assert result.returncode == 1, result.stderr
+    assert "regressed" in result.stdout
+
+    # the other way around, part two got faster
+    result = run_aoc_mod("perf", "compare", "HEAD", "HEAD~1", "--json")
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)[1]["status"] == "improved"
+
+    # the same comparison of the last two runs, with and without a threshold
+    # too large for the slower part two to cross
+    assert run_aoc_mod("perf", "compare").returncode == 1
+    assert run_aoc_mod("perf", "compare", "--threshold", "1e9").returncode == 0
+
+
+def test_run_without_history(tmp_path):
+    day_path = tmp_path.joinpath("challenges/2024/day2")
+    day_path.mkdir(parents=True)
+    day_path.joinpath("input_day2.txt").write_text("1\n")
+    day_path.joinpath("day2.py").write_text(SOLUTION.replace("{DELAY}", "0"))
+
+    result = run_aoc_mod("-y", "2024", "-d", "2", "run", "--no-history")
+    assert result.returncode == 0, result.stderr
+    assert not Path(HISTORY_FILE).exists()
+
+    result = run_aoc_mod("perf", "compare")
+    assert result.returncode == 1
+    assert "No runs to compare" in result.stderr
+
+
+def test_perf_compare_too_few_samples(tmp_path):
+    day_path = tmp_path.joinpath("challenges/2024/day3")
+    day_path.mkdir(parents=True)
+    day_path.joinpath("input_day3.txt").write_text("1\n")
+    day_path.joinpath("day3.py").write_text(SOLUTION.replace("{DELAY}", "0"))
+
+    for _ in range(2):
+        result = run_aoc_mod("-y", "2024", "-d", "3", "run")
+        assert result.returncode == 0, result.stderr
+
+    # single samples can never show a regression, which is an error
+    result = run_aoc_mod("perf", "compare", "--threshold", "1e9")
+    assert result.returncode == 1
+    assert "aoc-mod run --repeat 4" in result.stderr
+
+    result = run_aoc_mod("perf", "compare", "a1", "b2", "c3")
+    assert result.returncode == 2 and "at most 2 commits" in result.stderr
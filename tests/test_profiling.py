@@ -0,0 +1,82 @@
+import pstats
+import functools
+from pathlib import Path
+
+import pytest
+
+from aoc_mod.profiling import StackSampler, profile_call, profile_cpu, profile_memory
+from aoc_mod.utilities import AocModError
+
+
+def busy_helper(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def busy_part(n: int) -> int:
+    return sum(busy_helper(n) for _ in range(200))
+
+
+def allocating_part(n: int) -> list[bytes]:
+    return [bytes(1024) for _ in range(n)]
+
+
+def test_stack_sampler_cuts_stacks_at_root():
+    sampler = StackSampler(busy_part.__code__)
+    sampler.start()
+    try:
+        busy_part(20_000)
+    finally:
+        sampler.stop()
+
+    assert sampler.stacks
+    assert all(stack.startswith("busy_part (") for stack in sampler.stacks)
+    assert any(";busy_helper (" in stack for stack in sampler.stacks)
+
+
+def test_profile_cpu(tmp_path):
+    profile = profile_cpu(busy_part, 2_000, tmp_path.joinpath("profile/part1"))
+
+    assert profile["pstats"].endswith("part1.pstats")
+    stats = pstats.Stats(profile["pstats"])
+    assert any(func[2] == "busy_helper" for func in stats.stats)
+
+    for line in Path(profile["collapsed"]).read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("busy_part (")
+        assert int(count) > 0
+
+
+class BusyPart:
+    def __call__(self, n: int) -> int:
+        return busy_part(n)
+
+
+def test_profile_cpu_callables(tmp_path):
+    # partial objects and callable instances are sampled from the code they run
+    for func, root in [
+        (functools.partial(busy_part), "busy_part ("),
+        (BusyPart(), "__call__ ("),
+    ]:
+        profile = profile_cpu(func, 20_000, tmp_path / "part")
+        collapsed = Path(profile["collapsed"]).read_text().splitlines()
+        assert collapsed and all(line.startswith(root) for line in collapsed)
+
+    # builtins have no code to sample, so they are only profiled with cProfile
+    profile = profile_cpu(sorted, [3, 1, 2], tmp_path / "builtin")
+    assert Path(profile["pstats"]).is_file() and "collapsed" not in profile
+
+
+def test_profile_memory(tmp_path):
+    profile = profile_memory(allocating_part, 1000, tmp_path.joinpath("part2"))
+
+    assert profile["peak"] >= 1000 * 1024
+    location, size, count = profile["top"][0]
+    allocation_line = allocating_part.__code__.co_firstlineno + 1
+    assert location.endswith(f"{Path(__file__).name}:{allocation_line}")
+    assert size >= 1000 * 1024 and count >= 1000
+    assert "peak traced memory" in Path(profile["report"]).read_text()
+
+
+def test_profile_call_unknown_kind(tmp_path):
+    with pytest.raises(AocModError):
+        profile_call("gpu", busy_part, 1, tmp_path.joinpath("part1"))
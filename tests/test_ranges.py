@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from aoc_mod.ranges import BoxSet, RangeMap, RangeSet
+from aoc_mod.utilities import AocModError
+
+# the seeds and maps of the 2023 day 5 example
+SEEDS = [79, 14, 55, 13]
+MAPS = [
+    [(50, 98, 2), (52, 50, 48)],
+    [(0, 15, 37), (37, 52, 2), (39, 0, 15)],
+    [(49, 53, 8), (0, 11, 42), (42, 0, 7), (57, 7, 4)],
+    [(88, 18, 7), (18, 25, 70)],
+    [(45, 77, 23), (81, 45, 19), (68, 64, 13)],
+    [(0, 69, 1), (1, 0, 69)],
+    [(60, 56, 37), (56, 93, 4)],
+]
+
+
+def get_values(ranges: RangeSet) -> set[int]:
+    return {value for item in ranges for value in item}
+
+
+def test_range_set():
+    ranges = RangeSet([(5, 10), range(0, 3), (9, 12), (3, 4), (20, 20)])
+    assert list(ranges) == [range(0, 4), range(5, 12)]
+    assert len(ranges) == 2 and ranges.size == 11 and ranges.bounds() == (0, 12)
+    assert 3 in ranges and 4 not in ranges and -1 not in ranges and 12 not in ranges
+    assert ranges.find(7) == range(5, 12) and ranges.find(4) is None
+    assert RangeSet.from_inclusive([(0, 3), (5, 11)]) == ranges
+    assert repr(ranges) == "RangeSet([(0, 4), (5, 12)])"
+
+    ranges.add(4, 5)
+    assert list(ranges) == [range(0, 12)]
+    ranges.discard(2, 6)
+    assert list(ranges) == [range(0, 2), range(6, 12)]
+    assert not RangeSet() and RangeSet().bounds() is None
+    with pytest.raises(AocModError):
+        RangeSet([range(0, 10, 2)])
+
+
+def test_range_set_operations():
+    rng = random.Random(5)
+
+    def random_ranges():
+        starts = (rng.randint(-50, 50) for _ in range(rng.randint(0, 12)))
+        return [(start, start + rng.randint(0, 10)) for start in starts]
+
+    for _ in range(200):
+        first, second = RangeSet(random_ranges()), RangeSet(random_ranges())
+        first_values, second_values = get_values(first), get_values(second)
+        assert get_values(first | second) == first_values | second_values
+        assert get_values(first & second) == first_values & second_values
+        assert get_values(first - second) == first_values - second_values
+        # the results are sorted and merged like a new set
+        assert first | second == RangeSet(list(first) + list(second))
+        for result in (first | second, first & second, first - second):
+            items = list(result)
+            assert all(a.stop < b.start for a, b in zip(items, items[1:]))
+
+
+def test_range_map():
+    # the lowest location of the seed ranges of the 2023 day 5 example
+    seeds = RangeSet(
+        (start, start + length) for start, length in zip(SEEDS[::2], SEEDS[1::2])
+    )
+    locations = seeds
+    for entries in MAPS:
+        locations = RangeMap.from_lengths(entries).map_ranges(locations)
+    assert locations.bounds()[0] == 46 and locations.size == seeds.size
+
+    soil = RangeMap.from_lengths(MAPS[0])
+    assert [soil.map_value(seed) for seed in (79, 14, 55, 13, 98, 99, 100)] == [
+        81,
+        14,
+        57,
+        13,
+        50,
+        51,
+        100,
+    ]
+    assert list(soil) == [(50, 98, 2), (98, 100, -48)]
+    with pytest.raises(AocModError):
+        RangeMap([(0, 10, 1), (5, 15, 2)])
+
+
+def test_box_set():
+    # the small example of 2021 day 22
+    steps = [
+        (True, ((10, 12), (10, 12), (10, 12))),
+        (True, ((11, 13), (11, 13), (11, 13))),
+        (False, ((9, 11), (9, 11), (9, 11))),
+        (True, ((10, 10), (10, 10), (10, 10))),
+    ]
+    cubes = BoxSet()
+    for on, box in steps:
+        if on:
+            cubes.add(tuple((first, last + 1) for first, last in box))
+        else:
+            cubes.discard(tuple((first, last + 1) for first, last in box))
+    assert cubes.volume == 39
+    assert (10, 10, 10) in cubes and (9, 9, 9) not in cubes and (13, 13, 13) in cubes
+    assert cubes.bounds() == ((10, 14), (10, 14), (10, 14))
+
+    first = BoxSet.from_inclusive([((0, 3), (0, 3))])
+    second = BoxSet([(range(2, 6), range(2, 6))])
+    assert first.volume == 16 and second.volume == 16
+    assert (first | second).volume == 28 and (first & second).volume == 4
+    assert (first - second).volume == 12
@@ -0,0 +1,211 @@
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from aoc_mod.interactive import DEFAULT_FILE_TEMPLATE, create_solution_file
+from aoc_mod.runner import (
+    discover_days,
+    format_results,
+    get_solution_paths,
+    load_timings,
+    run_all,
+    run_solution,
+    summarize_times,
+)
+from aoc_mod.utilities import AocModError
+
+SOLUTION = """
+calls = []
+
+
+def parse(input_path):
+    calls.append("parse")
+    return [int(line) for line in input_path.read_text().split()]
+
+
+def part_one(numbers):
+    calls.append("part_one")
+    print("Part One")
+    return dict(result=sum(numbers), submit=False)
+
+
+def part_two(numbers):
+    calls.append("part_two")
+    return max(numbers)
+"""
+
+
+def create_day(root: Path, year: int, day: int, solution: str) -> Path:
+    day_path = root.joinpath(f"challenges/{year}/day{day}")
+    day_path.mkdir(parents=True)
+    day_path.joinpath(f"day{day}.py").write_text(solution)
+    day_path.joinpath(f"input_day{day}.txt").write_text("3\n1\n4\n")
+    return day_path
+
+
+def test_summarize_times():
+    times = summarize_times(list(range(1, 101)))
+    assert times == {"min": 1e-9, "median": 50.5e-9, "p95": 95e-9}
+    assert summarize_times([7]) == {"min": 7e-9, "median": 7e-9, "p95": 7e-9}
+
+
+def test_get_solution_paths(tmp_path):
+    with pytest.raises(AocModError):
+        get_solution_paths(2024, 1)
+
+    day_path = create_day(tmp_path, 2024, 1, SOLUTION)
+    assert get_solution_paths(2024, 1) == (
+        Path("challenges/2024/day1/day1.py"),
+        Path("challenges/2024/day1/input_day1.txt"),
+    )
+    assert get_solution_paths(2024, 1, root_dir=str(tmp_path))[0] == day_path.joinpath(
+        "day1.py"
+    )
+
+
+def test_run_solution(tmp_path, capsys):
+    create_day(tmp_path, 2024, 1, SOLUTION)
+
+    results = run_solution(2024, 1, repeat=5, warmup=2)
+
+    assert results["year"] == 2024 and results["day"] == 1
+    assert results["parts"][1]["result"] == 8
+    assert results["parts"][2]["result"] == 4
+    for timings in (results["parse"], results["parts"][1], results["parts"][2]):
+        for kind in ("wall", "cpu"):
+            assert 0 <= timings[kind]["min"] <= timings[kind]["median"]
+            assert timings[kind]["median"] <= timings[kind]["p95"]
+
+    # solution output is discarded while it is timed
+    assert "Part One" not in capsys.readouterr().out
+    assert "part 1" in format_results(results)
+
+
+def test_run_solution_parses_input_once(tmp_path):
+    create_day(tmp_path, 2024, 2, SOLUTION)
+
+    run_solution(2024, 2, repeat=3, warmup=1)
+
+    calls = sys.modules["aoc_mod_solution_2024_day2"].calls
+    assert calls.count("parse") == 1
+    assert calls.count("part_one") == calls.count("part_two") == 4
+
+
+def test_run_solution_with_template(tmp_path):
+    day_path = tmp_path.joinpath("challenges/2023/day5")
+    day_path.mkdir(parents=True)
+    create_solution_file(str(DEFAULT_FILE_TEMPLATE), day_path, 2023, 5)
+    day_path.joinpath("input_day5.txt").write_text("line\n")
+
+    results = run_solution(2023, 5)
+    assert results["parts"][1]["result"] == 0
+    assert results["parts"][2]["result"] == 0
+
+
+def test_run_command_json(tmp_path):
+    create_day(tmp_path, 2024, 3, SOLUTION)
+
+    result = subprocess.run(
+        ["aoc-mod", "-y", "2024", "-d", "3", "run", "--repeat", "3", "--json"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    results = json.loads(result.stdout)
+    assert results["parts"]["1"]["result"] == 8
+    assert set(results["parts"]["2"]["wall"]) == {"min", "median", "p95"}
+
+
+def test_run_command_part_error(tmp_path):
+    create_day(tmp_path, 2024, 5, "def part_one(_):\n    raise ValueError('bad')\n")
+
+    result = subprocess.run(
+        ["aoc-mod", "-y", "2024", "-d", "5", "run"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 1
+    assert "part 1    error: ValueError: bad" in result.stdout
+    assert "Traceback" in result.stderr
+
+
+def test_run_command_missing_day():
+    result = subprocess.run(
+        ["aoc-mod", "-y", "2024", "-d", "4", "run"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 1
+    assert "Failed to run 2024, Day 4" in result.stderr
+
+
+def test_discover_days(tmp_path):
+    create_day(tmp_path, 2024, 2, SOLUTION)
+    create_day(tmp_path, 2023, 25, SOLUTION)
+    tmp_path.joinpath("challenges/2023/day3").mkdir()
+    tmp_path.joinpath("challenges/notes/day1").mkdir(parents=True)
+
+    assert discover_days() == [(2023, 25), (2024, 2)]
+
+
+def test_run_all(tmp_path):
+    create_day(tmp_path, 2024, 1, SOLUTION)
+    create_day(tmp_path, 2024, 2, "def part_one(_):\n    raise ValueError('bad')\n")
+    create_day(tmp_path, 2024, 3, "import sys\nsys.exit(1)\n")
+    create_day(tmp_path, 2024, 4, "import os\n\ndef part_one(_):\n    os._exit(1)\n")
+    create_day(tmp_path, 2024, 5, SOLUTION)
+
+    results = run_all(discover_days(), jobs=2)
+
+    assert [(result["year"], result["day"]) for result in results] == [
+        (2024, day) for day in range(1, 6)
+    ]
+    assert results[0]["parts"][1]["result"] == 8
+    assert results[4]["parts"][2]["result"] == 4
+    assert results[1]["parts"][1]["error"] == "ValueError: bad"
+    assert results[2]["error"] == "SystemExit: 1"
+    assert results[3]["error"] == "worker process crashed"
+
+    # timings of the successful days are saved for scheduling the next run
+    assert set(load_timings()) == {"2024/1", "2024/5"}
+
+
+def test_run_command_all(tmp_path):
+    create_day(tmp_path, 2024, 1, SOLUTION)
+    create_day(tmp_path, 2023, 7, SOLUTION)
+
+    result = subprocess.run(
+        ["aoc-mod", "run", "--all", "--jobs", "2", "--json"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    results = json.loads(result.stdout)["results"]
+    assert [(result["year"], result["day"]) for result in results] == [
+        (2023, 7),
+        (2024, 1),
+    ]
+
+
+def test_run_solution_profile(tmp_path):
+    day_path = create_day(tmp_path, 2024, 6, SOLUTION)
+
+    results = run_solution(2024, 6, profile="mem")
+    assert results["parts"][1]["profile"]["report"] == str(
+        Path("challenges/2024/day6/profile/part1.memory.txt")
+    )
+
+    results = run_solution(2024, 6, profile="cpu")
+    assert day_path.joinpath("profile/part2.pstats").is_file()
+    assert day_path.joinpath("profile/part2.collapsed").is_file()
+    assert "part 1 pstats" in format_results(results)
+
+    # without profiling, nothing is written and nothing is reported
+    assert "profile" not in run_solution(2024, 6)["parts"][1]
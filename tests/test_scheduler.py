@@ -0,0 +1,97 @@
+import time
+import argparse
+from pathlib import Path
+
+import pytest
+import requests
+
+from aoc_mod.interactive import int_range
+from aoc_mod.scheduler import SetupScheduler, TokenBucket, format_duration
+from aoc_mod.utilities import AocMod
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class MockResponse:
+    def __init__(self, text, status_code=200, headers=None):
+        self.text = text
+        self.content = text
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+def test_int_range():
+    assert int_range("2015-2018") == [2015, 2016, 2017, 2018]
+    assert int_range("1,3,5-7,3") == [1, 3, 5, 6, 7]
+
+    for value in ("5-1", "a-b", ""):
+        with pytest.raises(argparse.ArgumentTypeError):
+            int_range(value)
+
+
+def test_format_duration():
+    assert format_duration(3) == "3s"
+    assert format_duration(123) == "2m 03s"
+    assert format_duration(3723) == "1h 02m 03s"
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, capacity=2, clock=clock)
+
+    assert bucket.wait_time() == 0
+    bucket.consume()
+    bucket.consume()
+    assert bucket.wait_time() == 2.0
+    assert bucket.wait_time(3) == 6.0
+
+    clock.now += 1
+    assert bucket.wait_time() == 1.0
+    assert TokenBucket(rate=0).wait_time(100) == 0
+
+
+def test_scheduler_paces_and_skips(monkeypatch):
+    clock = FakeClock(now=time.time())
+    requested = []
+
+    def mock_get(self, url, timeout, headers=None):
+        requested.append(url)
+        return MockResponse(f"<main><article>{url}</article></main>")
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    monkeypatch.setattr(time, "time", clock)
+
+    # day 2 has already been set up
+    day_two = Path("challenges/2023/day2")
+    day_two.mkdir(parents=True)
+    for name in ("input_day2.txt", "instructions_day2.md"):
+        day_two.joinpath(name).write_text("done")
+
+    aoc_mod = AocMod(session_id="test_session_id")
+    scheduler = SetupScheduler(aoc_mod, sleep=clock.sleep, clock=clock)
+    scheduler.add([2023], [1, 2, 3])
+    summary = scheduler.run()
+
+    assert summary == {"set_up": 2, "skipped": 1}
+    assert clock.sleeps == [120]
+    assert len(requested) == 4
+    assert Path("challenges/2023/day3/input_day3.txt").exists()
+
+    # a second run finds everything on disk and makes no requests
+    scheduler.add([2023], [1, 2, 3])
+    assert scheduler.run() == {"set_up": 0, "skipped": 3}
+    assert len(requested) == 4
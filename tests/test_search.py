@@ -0,0 +1,203 @@
+import heapq
+import random
+from collections import deque
+
+import pytest
+
+from aoc_mod.search import (
+    SearchResult,
+    astar,
+    bfs,
+    bidirectional_bfs,
+    dijkstra,
+    grid_astar,
+    grid_bfs,
+    grid_bidirectional_bfs,
+    grid_dijkstra,
+)
+from aoc_mod.utilities import AocModError, parse_char_grid
+
+MAZE = [
+    "S..#....",
+    ".#.#.##.",
+    ".#...#..",
+    ".####.#.",
+    "......#G",
+]
+
+
+def random_grid(seed: int, rows: int = 12, cols: int = 15) -> list[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choice("#123456789") for _ in range(cols)) for _ in range(rows)]
+
+
+def grid_neighbors(grid: list[str], cell: tuple[int, int]):
+    row, col = cell
+    for next_row, next_col in (
+        (row - 1, col),
+        (row + 1, col),
+        (row, col - 1),
+        (row, col + 1),
+    ):
+        if 0 <= next_row < len(grid) and 0 <= next_col < len(grid[0]):
+            if grid[next_row][next_col] != "#":
+                yield next_row, next_col
+
+
+def naive_distances(grid: list[str], start: tuple[int, int], weighted: bool) -> dict:
+    distances = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        distance, cell = heapq.heappop(heap)
+        if distance > distances[cell]:
+            continue
+        for next_cell in grid_neighbors(grid, cell):
+            cost = int(grid[next_cell[0]][next_cell[1]]) if weighted else 1
+            if distance + cost < distances.get(next_cell, float("inf")):
+                distances[next_cell] = distance + cost
+                heapq.heappush(heap, (distance + cost, next_cell))
+    return distances
+
+
+def check_path(grid: list[str], path: list, start, goal, distance: int, weighted: bool):
+    assert path[0] == start and path[-1] == goal
+    cost = 0
+    for cell, next_cell in zip(path, path[1:]):
+        assert next_cell in set(grid_neighbors(grid, cell))
+        cost += int(grid[next_cell[0]][next_cell[1]]) if weighted else 1
+    assert cost == distance
+
+
+def test_grid_bfs():
+    result = grid_bfs(MAZE, (0, 0), (4, 7))
+    assert result.goal == (4, 7) and result.distance == 15
+    check_path(MAZE, result.path(), (0, 0), (4, 7), 15, weighted=False)
+    assert result.distance_to((0, 0)) == 0 and (0, 3) not in result
+    assert result.path((0, 3)) == [] and result.distance_to((9, 9)) is None
+
+    # the whole grid is searched without a goal
+    result = grid_bfs(MAZE, (0, 0))
+    assert result.goal is None and result.path() == []
+    assert dict(result.reached()) == naive_distances(MAZE, (0, 0), weighted=False)
+
+    # any grid format gives the same result
+    grid = parse_char_grid_from(MAZE)
+    assert grid_bfs(grid, (0, 0), (4, 7)).distance == 15
+    assert grid_bfs("\n".join(MAZE) + "\n", (0, 0), (4, 7)).distance == 15
+    assert grid_bfs([row.encode() for row in MAZE], (0, 0), (4, 7)).distance == 15
+
+
+def parse_char_grid_from(rows: list[str]):
+    return memoryview(bytearray("".join(rows).encode())).cast(
+        "B", shape=(len(rows), len(rows[0]))
+    )
+
+
+def test_grid_errors(tmp_path):
+    with pytest.raises(AocModError):
+        grid_bfs(MAZE, (5, 0))
+    with pytest.raises(AocModError):
+        grid_bfs(["..", "."], (0, 0))
+
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("\n".join(MAZE))
+    result = grid_bfs(parse_char_grid(input_path), (0, 0), (0, 3))
+    assert result.distance is None and result.path() == []
+    assert grid_bidirectional_bfs(MAZE, (0, 0), (0, 3)).distance is None
+
+    # results must implement the queries of the base class
+    class PartialResult(SearchResult):
+        def distance_to(self, state):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialResult(None, None)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_grid_searches_match_naive(seed):
+    grid = random_grid(seed)
+    start, goal = (0, 0), (len(grid) - 1, len(grid[0]) - 1)
+    unweighted = naive_distances(grid, start, weighted=False)
+    weighted = naive_distances(grid, start, weighted=True)
+
+    assert dict(grid_bfs(grid, start).reached()) == unweighted
+    assert (
+        dict(grid_dijkstra(grid, start, cost=lambda value: value - 48).reached())
+        == weighted
+    )
+
+    for result in (
+        grid_bfs(grid, start, goal),
+        grid_bidirectional_bfs(grid, start, goal),
+    ):
+        assert result.distance == unweighted.get(goal)
+        if result.distance is not None:
+            check_path(
+                grid, result.path(), start, goal, result.distance, weighted=False
+            )
+
+    for result in (
+        grid_dijkstra(grid, start, goal, cost=lambda value: value - 48),
+        grid_astar(grid, start, goal, cost=lambda value: value - 48),
+    ):
+        assert result.distance == weighted.get(goal)
+        if result.distance is not None:
+            check_path(grid, result.path(), start, goal, result.distance, weighted=True)
+
+
+def test_implicit_searches():
+    # steps of +1 and *2 from 1, with *2 costing 3
+    def steps(number):
+        return [(number + 1, 1), (number * 2, 3)] if number < 100 else []
+
+    result = bfs(1, lambda number: [step for step, _ in steps(number)], 37)
+    assert result.distance == 7 and result.path()[0] == 1 and result.path()[-1] == 37
+
+    result = dijkstra(1, steps, 37)
+    naive = {1: 0}
+    queue = deque([1])
+    while queue:
+        number = queue.popleft()
+        for step, cost in steps(number):
+            if naive[number] + cost < naive.get(step, float("inf")):
+                naive[step] = naive[number] + cost
+                queue.append(step)
+    assert result.distance == naive[37]
+    path = result.path()
+    assert path[0] == 1 and path[-1] == 37
+    assert (
+        sum(3 if b == a * 2 and b != a + 1 else 1 for a, b in zip(path, path[1:]))
+        == naive[37]
+    )
+
+    result = astar(1, steps, lambda number: number == 37, lambda number: 0)
+    assert result.goal == 37 and result.distance == naive[37]
+
+    # without a goal every reachable state is settled
+    assert dict(dijkstra(1, steps).reached()) == naive
+    assert bfs(1, lambda number: [], 2).distance is None
+
+
+def test_bidirectional_bfs():
+    def neighbors(state):
+        row, col = state
+        return [(row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)]
+
+    result = bidirectional_bfs((0, 0), (5, -7), neighbors)
+    assert result.distance == 12 and result.goal == (5, -7)
+    path = result.path()
+    assert len(path) == 13 and path[0] == (0, 0) and path[-1] == (5, -7)
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert abs(row - next_row) + abs(col - next_col) == 1
+
+    assert bidirectional_bfs((1, 1), (1, 1), neighbors).path() == [(1, 1)]
+
+    # directed graph: n -> n + 3, reached backwards with n -> n - 3
+    result = bidirectional_bfs(
+        0, 12, lambda n: [n + 3] if n < 30 else [], lambda n: [n - 3] if n > 0 else []
+    )
+    assert result.distance == 4 and result.path() == [0, 3, 6, 9, 12]
+    assert (
+        bidirectional_bfs(0, 13, lambda n: [n + 3] if n < 30 else []).distance is None
+    )
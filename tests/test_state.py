@@ -0,0 +1,119 @@
+import time
+import pickle
+import threading
+import multiprocessing
+
+import pytest
+
+from aoc_mod import utilities
+from aoc_mod.state import StateStore
+from aoc_mod.utilities import AocMod, AocModError
+
+
+def claim_window(path) -> bool:
+    """claim a request window in a fresh process, returning True on success"""
+    store = StateStore(path)
+    with store.transaction():
+        if store.get("last_input_pull"):
+            return False
+        store.set("last_input_pull", 1.0)
+    return True
+
+
+def test_state_store_round_trip(tmp_path):
+    store = StateStore(tmp_path / "state.sqlite3")
+    assert store.get("missing") is None
+    assert store.get("missing", 5) == 5
+
+    store.set("last_input_pull", 12.5)
+    store.set("nested", {"a": [1, 2]})
+    assert StateStore(tmp_path / "state.sqlite3").get("last_input_pull") == 12.5
+    assert store.get("nested") == {"a": [1, 2]}
+
+    store.delete("nested")
+    assert store.get("nested") is None
+
+
+def test_state_store_transaction_rollback(tmp_path):
+    store = StateStore(tmp_path / "state.sqlite3")
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.set("key", 1)
+            raise RuntimeError("abort")
+
+    assert store.get("key") is None
+
+
+def test_state_store_concurrent_claims(tmp_path):
+    path = tmp_path / "state.sqlite3"
+    StateStore(path)
+
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        results = pool.map(claim_window, [path] * 8)
+
+    assert results.count(True) == 1
+
+
+def test_migrate_legacy_cache(tmp_path):
+    legacy_data = {"last_input_pull": 100.0, "last_submission_push": None}
+    (tmp_path / ".aoc_mod_cache.pkl").write_text(pickle.dumps(legacy_data).hex())
+
+    aoc_mod = AocMod(session_id="test_session_id")
+
+    # the legacy file is migrated when the state store is first opened
+    assert aoc_mod._state.get("last_input_pull") == 100.0
+    assert not (tmp_path / ".aoc_mod_cache.pkl").exists()
+    assert aoc_mod._state.get("last_submission_push") is None
+
+
+def test_migrate_legacy_cache_refuses_objects(tmp_path):
+    legacy_path = tmp_path / ".aoc_mod_cache.pkl"
+    legacy_path.write_text(pickle.dumps({"last_input_pull": AocModError("x")}).hex())
+
+    store = StateStore(tmp_path / "state.sqlite3")
+
+    assert not store.migrate_legacy_cache(legacy_path)
+    assert store.get("last_input_pull") is None
+
+
+def test_request_window_is_enforced():
+    aoc_mod = AocMod(session_id="test_session_id")
+    aoc_mod._claim_request_window("last_input_pull", "wait {SECONDS}")
+
+    with pytest.raises(AocModError, match=r"wait \d+"):
+        aoc_mod._claim_request_window("last_input_pull", "wait {SECONDS}")
+
+
+def test_state_store_shared_between_threads(monkeypatch):
+    class SlowStateStore(StateStore):
+        def __init__(self, *args, **kwargs):
+            # widen the window in which another thread could open a store too
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(utilities, "StateStore", SlowStateStore)
+    aoc_mod = AocMod(session_id="test_session_id")
+    barrier = threading.Barrier(4)
+    stores, errors = [], []
+
+    def claim(key: str):
+        barrier.wait()
+        try:
+            stores.append(aoc_mod._state)
+            aoc_mod._claim_request_window(key, "wait {SECONDS}")
+        except Exception as err:
+            errors.append(err)
+
+    threads = [
+        threading.Thread(target=claim, args=(key,))
+        for key in ("input", "instructions", "submission", "other")
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors and len({id(store) for store in stores}) == 1
+    assert time.perf_counter() - start < 5
@@ -1,8 +1,24 @@
+import re
+from array import array
 from pathlib import Path
 
+import pytest
 import requests
 
-from aoc_mod.utilities import AocMod, get_year_and_day, parse_input
+from aoc_mod.runner import load_solution
+from aoc_mod.utilities import (
+    AocMod,
+    AocModError,
+    cached_parse,
+    get_year_and_day,
+    iter_blocks,
+    iter_input,
+    parse_char_grid,
+    parse_input,
+    parse_int_rows,
+    parse_ints,
+    read_input_bytes,
+)
 
 
 def test_set_auth_variables_session_id_set(monkeypatch):
@@ -18,12 +34,14 @@ def test_set_auth_variables_session_id_set(monkeypatch):
 
 
 def test_get_puzzle_instructions(monkeypatch):
-    def mock_get(url, cookies, timeout):
+    def mock_get(self, url, timeout, headers):
         class MockResponse:
             def __init__(self):
                 self.content = (
                     "<main><article>Test Puzzle Instructions</article></main>"
                 )
+                self.status_code = 200
+                self.headers = {}
 
             def raise_for_status(self):
                 pass
@@ -31,19 +49,18 @@ def test_get_puzzle_instructions(monkeypatch):
         return MockResponse()
 
     monkeypatch.setenv("SESSION_ID", "test_session_id")
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
     aoc_mod = AocMod()
 
     # overwrite the timeouts for testing
-    aoc_mod._cache_data = {"last_instruction_pull": 0}
-    aoc_mod._set_cache_data(aoc_mod._cache_data)
+    aoc_mod._state.set("last_instruction_pull", 0)
 
     instructions = aoc_mod.get_puzzle_instructions(2023, 1)
     assert "Test Puzzle Instructions" in instructions
 
 
 def test_get_puzzle_input(monkeypatch):
-    def mock_get(url, cookies, timeout):
+    def mock_get(self, url, timeout):
         class MockResponse:
             def __init__(self):
                 self.text = "Test Puzzle Input"
@@ -54,19 +71,18 @@ def test_get_puzzle_input(monkeypatch):
         return MockResponse()
 
     monkeypatch.setenv("SESSION_ID", "test_session_id")
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
     aoc_mod = AocMod()
 
     # overwrite the timeouts for testing
-    aoc_mod._cache_data = {"last_input_pull": 0}
-    aoc_mod._set_cache_data(aoc_mod._cache_data)
+    aoc_mod._state.set("last_input_pull", 0)
 
     puzzle_input = aoc_mod.get_puzzle_input(2023, 1)
     assert puzzle_input == "Test Puzzle Input"
 
 
 def test_submit_answer(monkeypatch):
-    def mock_post(url, data, cookies, timeout):
+    def mock_post(self, url, data, timeout):
         class MockResponse:
             def __init__(self):
                 self.text = "Test Puzzle Answer Response"
@@ -78,12 +94,11 @@ def test_submit_answer(monkeypatch):
         return MockResponse()
 
     monkeypatch.setenv("SESSION_ID", "test_session_id")
-    monkeypatch.setattr(requests, "post", mock_post)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
     aoc_mod = AocMod()
 
     # overwrite the timeouts for testing
-    aoc_mod._cache_data = {"last_submission_push": 0}
-    aoc_mod._set_cache_data(aoc_mod._cache_data)
+    aoc_mod._state.set("last_submission_push", 0)
 
     response = aoc_mod.submit_answer(2023, 1, 1, 12345)
     assert response == "Test Puzzle Answer Response"
@@ -133,3 +148,145 @@ def test_parse_input(monkeypatch):
     data = parse_input(Path("random_path"))
 
     assert data[0] == "this is some file data for testing"
+
+
+def test_iter_input(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_bytes(b"1 2\r\n3 4\n\n5 6")
+
+    lines = iter_input(input_path)
+    assert next(lines) == "1 2"
+    assert list(lines) == ["3 4", "", "5 6"]
+    assert list(iter_input(input_path)) == parse_input(input_path)
+
+
+def test_iter_blocks(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("a\nb\n\nc\n\n\nd\ne\n\n")
+
+    assert list(iter_blocks(input_path)) == [["a", "b"], ["c"], ["d", "e"]]
+
+
+def test_read_input_bytes(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("12,34\n56\n")
+
+    data = read_input_bytes(input_path)
+    assert [int(x) for x in re.findall(rb"\d+", data)] == [12, 34, 56]
+    assert bytes(data[3:5]) == b"34"
+
+    input_path.write_text("")
+    assert len(read_input_bytes(input_path)) == 0
+
+
+def test_input_readers_missing_file(tmp_path):
+    missing_path = tmp_path / "missing.txt"
+
+    for reader in (parse_input, iter_input, iter_blocks, read_input_bytes):
+        with pytest.raises(AocModError, match="unable to open input file"):
+            reader(missing_path)
+
+
+def test_parse_ints(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("x=-1, y=2\n3-5\n\n70")
+
+    assert parse_ints(input_path) == array("q", [-1, 2, 3, -5, 70])
+    assert parse_ints(input_path, signed=False) == array("q", [1, 2, 3, 5, 70])
+
+    assert parse_int_rows(input_path) == [
+        array("q", [-1, 2]),
+        array("q", [3, -5]),
+        array("q"),
+        array("q", [70]),
+    ]
+
+
+def test_parse_char_grid(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("#.#\n..#\n")
+
+    grid = parse_char_grid(input_path)
+    assert grid.shape == (2, 3)
+    assert grid[0, 2] == ord("#") and grid[1, 0] == ord(".")
+
+    input_path.write_text("#.#\n..\n")
+    with pytest.raises(AocModError, match="rectangular"):
+        parse_char_grid(input_path)
+
+
+def test_typed_parsers_numpy(tmp_path):
+    np = pytest.importorskip("numpy")
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1 -2\n3 4\n")
+
+    ints = parse_ints(input_path, numpy=True)
+    assert ints.dtype == np.int64 and ints.tolist() == [1, -2, 3, 4]
+
+    input_path.write_text("ab\ncd\n")
+    grid = parse_char_grid(input_path, numpy=True)
+    assert grid.shape == (2, 2) and grid.dtype == np.uint8
+    assert bytes(grid[1]) == b"cd"
+
+
+def test_cached_parse(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1 2\n3 4\n")
+    calls = []
+
+    @cached_parse
+    def parse(path):
+        calls.append(path)
+        return parse_int_rows(path)
+
+    assert parse(input_path) == [array("q", [1, 2]), array("q", [3, 4])]
+    assert parse(input_path) == [array("q", [1, 2]), array("q", [3, 4])]
+    assert len(calls) == 1
+
+    # a changed input is parsed again
+    input_path.write_text("5\n")
+    assert parse(input_path) == [array("q", [5])]
+    assert len(calls) == 2
+
+    # a missing input is left to the parse function
+    with pytest.raises(AocModError):
+        parse(tmp_path / "missing.txt")
+
+
+def test_cached_parse_offline(tmp_path, monkeypatch):
+    monkeypatch.setenv("AOC_MOD_OFFLINE", "1")
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1 2\n")
+    calls = []
+
+    @cached_parse(cache_dir=tmp_path / "cache")
+    def parse(path):
+        calls.append(path)
+        return parse_int_rows(path)
+
+    assert parse(input_path) == parse(input_path) == [array("q", [1, 2])]
+    assert len(calls) == 2 and not (tmp_path / "cache").exists()
+
+
+def test_cached_parse_source_change(tmp_path):
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("1 2 3")
+    solution_path = tmp_path / "day1.py"
+    solution = (
+        "from aoc_mod.utilities import cached_parse, parse_ints\n"
+        "calls = []\n\n"
+        "@cached_parse(use_mmap=True)\n"
+        "def parse(input_path):\n"
+        "    calls.append(input_path)\n"
+        "    return sum(parse_ints(input_path))\n"
+    )
+
+    solution_path.write_text(solution)
+    module = load_solution(solution_path)
+    assert module.parse(input_path) == 6 and len(module.calls) == 1
+    module = load_solution(solution_path)
+    assert module.parse(input_path) == 6 and len(module.calls) == 0
+
+    solution_path.write_text(solution.replace("sum(", "max("))
+    module = load_solution(solution_path)
+    assert module.parse(input_path) == 3 and len(module.calls) == 1
@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from aoc_mod.watch import FileWatcher, SolutionWatcher
+
+SOLUTION = """
+def parse(input_path):
+    return [int(line) for line in input_path.read_text().split()]
+
+
+def part_one(numbers):
+    return sum(numbers)
+
+
+def part_two(numbers):
+    return max(numbers)
+"""
+
+
+def create_day(root, solution=SOLUTION):
+    day_path = root.joinpath("challenges/2024/day1")
+    day_path.mkdir(parents=True)
+    day_path.joinpath("day1.py").write_text(solution)
+    day_path.joinpath("input_day1.txt").write_text("3\n1\n4\n")
+    return day_path
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_file_watcher(tmp_path, use_inotify):
+    path = tmp_path.joinpath("watched.txt")
+    path.write_text("one")
+    other_path = tmp_path.joinpath("other.txt")
+
+    with FileWatcher([path], poll_interval=0.01, use_inotify=use_inotify) as watcher:
+        if not use_inotify:
+            assert not watcher.uses_inotify
+        assert watcher.wait(timeout=0.05) == []
+
+        # other files in the same directory aren't changes
+        other_path.write_text("other")
+        assert watcher.wait(timeout=0.05) == []
+
+        timer = threading.Timer(0.05, path.write_text, args=("two",))
+        timer.start()
+        assert watcher.wait(timeout=5) == [path.absolute()]
+        timer.join()
+
+        # a file replaced by another one is a change too
+        other_path.replace(path)
+        assert watcher.wait(timeout=5) == [path.absolute()]
+
+
+def test_solution_watcher(tmp_path, capsys):
+    day_path = create_day(tmp_path)
+    watcher = SolutionWatcher(2024, 1)
+
+    results = watcher.run()
+    assert not results["input_cached"]
+    assert results["parts"][1]["result"] == 8
+    assert results["parts"][2]["result"] == 4
+    assert results["reload"] > 0 and results["total"] > 0
+
+    # a change to the parts reuses the parsed input, even within the same
+    # second as the previous version was written
+    solution_path = day_path.joinpath("day1.py")
+    solution_path.write_text(SOLUTION.replace("max(numbers)", "min(numbers)"))
+    results = watcher.run()
+    assert results["input_cached"]
+    assert results["parts"][2]["result"] == 1
+
+    # changing the input or the parse function parses the input again
+    day_path.joinpath("input_day1.txt").write_text("5\n6\n")
+    results = watcher.run()
+    assert not results["input_cached"]
+    assert results["parts"][1]["result"] == 11
+
+    solution_path.write_text(
+        SOLUTION.replace("int(line)", "int(line) * 2").replace(
+            "return sum(numbers)", "raise ValueError('broken')"
+        )
+    )
+    results = watcher.run()
+    assert not results["input_cached"]
+    assert results["parts"][1] == {"error": "ValueError: broken"}
+    assert results["parts"][2]["result"] == 12
+    assert "ValueError: broken" in capsys.readouterr().err
+
+
+def test_solution_watcher_errors(tmp_path, capsys):
+    day_path = create_day(tmp_path)
+    watcher = SolutionWatcher(2024, 1)
+
+    day_path.joinpath("day1.py").write_text("def part_one(numbers:\n")
+    watcher.run_and_print()
+    output = capsys.readouterr()
+    assert "SyntaxError" in output.err
+
+    day_path.joinpath("day1.py").write_text(SOLUTION)
+    watcher.run_and_print()
+    output = capsys.readouterr()
+    assert "input parsed" in output.out
+    assert "part 1" in output.out